@@ -0,0 +1,57 @@
+"""add_movimento_resumo_mensal
+
+Revision ID: a7c9e1f3b5d6
+Revises: f6b8d0e2a4c5
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c9e1f3b5d6'
+down_revision = 'f6b8d0e2a4c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Cria o resumo mensal de movimentos (com carga inicial) e o índice
+    (escritorio_id, data_entrada) para as consultas por faixa de datas
+    """
+    op.create_table(
+        'movimento_resumo_mensal',
+        sa.Column('escritorio_id', sa.Integer(), nullable=False),
+        sa.Column('mes', sa.Date(), nullable=False),
+        sa.Column('tipo', sa.Integer(), nullable=False),
+        sa.Column('codigo_plano_contas', sa.String(length=50), server_default='', nullable=False),
+        sa.Column('quantidade', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total', sa.Numeric(precision=15, scale=2), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['escritorio_id'], ['escritorio.id'], ),
+        sa.PrimaryKeyConstraint('escritorio_id', 'mes', 'tipo', 'codigo_plano_contas')
+    )
+    op.create_index(
+        'ix_movimentos_escritorio_data_entrada', 'movimentos', ['escritorio_id', 'data_entrada'], unique=False
+    )
+    op.execute("""
+        INSERT INTO movimento_resumo_mensal (escritorio_id, mes, tipo, codigo_plano_contas, quantidade, total)
+        SELECT escritorio_id,
+               date_trunc('month', data_entrada)::date,
+               tipo,
+               COALESCE(codigo_plano_contas, ''),
+               count(*),
+               sum(valor)
+        FROM movimentos
+        WHERE ativo = true
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    """
+    Remove o resumo mensal de movimentos e o índice por data
+    """
+    op.drop_index('ix_movimentos_escritorio_data_entrada', table_name='movimentos')
+    op.drop_table('movimento_resumo_mensal')
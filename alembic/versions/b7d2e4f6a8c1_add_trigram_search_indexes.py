@@ -0,0 +1,65 @@
+"""add trigram search indexes
+
+Revision ID: b7d2e4f6a8c1
+Revises: 52abe1f211ea
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e4f6a8c1'
+down_revision = '52abe1f211ea'
+branch_labels = None
+depends_on = None
+
+
+# (tabela, coluna) pesquisadas com ilike '%termo%' pelas listagens
+CAMPOS_BUSCA = [
+    ('cliente', 'nome'),
+    ('cliente', 'email'),
+    ('cliente', 'identificacao'),
+    ('cliente', 'cidade'),
+    ('projetos', 'descricao'),
+    ('propostas', 'nome'),
+    ('propostas', 'identificacao'),
+    ('propostas', 'descricao'),
+    ('servicos', 'nome'),
+    ('servicos', 'codigo_plano_contas'),
+    ('servicos', 'descricao'),
+    ('servicos', 'descricao_contrato'),
+    ('etapas', 'nome'),
+    ('etapas', 'descricao'),
+    ('tarefas', 'nome'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    
+    # unaccent() não é IMMUTABLE e não pode ser usado em índices;
+    # o wrapper fixa o dicionário e pode ser indexado
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+        $func$
+            SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+        $func$;
+    """)
+    
+    for tabela, coluna in CAMPOS_BUSCA:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{tabela}_{coluna}_trgm "
+            f"ON {tabela} USING gin (f_unaccent({coluna}::text) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    for tabela, coluna in CAMPOS_BUSCA:
+        op.execute(f"DROP INDEX IF EXISTS ix_{tabela}_{coluna}_trgm")
+    
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
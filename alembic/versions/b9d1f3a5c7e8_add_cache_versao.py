@@ -0,0 +1,37 @@
+"""add_cache_versao
+
+Revision ID: b9d1f3a5c7e8
+Revises: a7c9e1f3b5d6
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d1f3a5c7e8'
+down_revision = 'a7c9e1f3b5d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Cria a tabela de versões de cache por escritório e escopo, compartilhada
+    entre os workers
+    """
+    op.create_table(
+        'cache_versao',
+        sa.Column('escritorio_id', sa.Integer(), nullable=False),
+        sa.Column('escopo', sa.String(length=50), nullable=False),
+        sa.Column('versao', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('escritorio_id', 'escopo')
+    )
+
+
+def downgrade() -> None:
+    """
+    Remove a tabela de versões de cache
+    """
+    op.drop_table('cache_versao')
@@ -0,0 +1,159 @@
+"""partition_auditoria_by_month
+
+Revision ID: c3e5a7b9d1f2
+Revises: b7d2e4f6a8c1
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5a7b9d1f2'
+down_revision = 'b7d2e4f6a8c1'
+branch_labels = None
+depends_on = None
+
+
+COLUNAS = (
+    'id, usuario_id, escritorio_id, acao, entidade, entidade_id, descricao, '
+    'ip_address, user_agent, dados_anteriores, dados_novos, "timestamp", created_at, updated_at'
+)
+
+
+def upgrade() -> None:
+    """
+    Converte auditoria em tabela particionada por mês (RANGE em timestamp)
+    
+    - PK passa a ser (id, timestamp), exigência do particionamento
+    - dados_anteriores/dados_novos passam a JSONB
+    - Índices compostos (escritorio_id, timestamp) e (entidade, entidade_id)
+    - Partição default recebe linhas fora das partições mensais existentes
+    - Função auditoria_criar_particao(date) usada pela manutenção
+    """
+    op.execute("ALTER TABLE auditoria RENAME TO auditoria_legado")
+    op.execute("ALTER TABLE auditoria_legado RENAME CONSTRAINT auditoria_pkey TO auditoria_legado_pkey")
+    op.execute("ALTER SEQUENCE auditoria_id_seq OWNED BY NONE")
+    for indice in ('ix_auditoria_id', 'ix_auditoria_usuario_id', 'ix_auditoria_escritorio_id', 'ix_auditoria_timestamp'):
+        op.execute(f"DROP INDEX IF EXISTS {indice}")
+    
+    op.execute("""
+        CREATE TABLE auditoria (
+            id integer NOT NULL DEFAULT nextval('auditoria_id_seq'),
+            usuario_id integer NOT NULL REFERENCES colaborador(id),
+            escritorio_id integer REFERENCES escritorio(id),
+            acao varchar(100) NOT NULL,
+            entidade varchar(100) NOT NULL,
+            entidade_id integer,
+            descricao text,
+            ip_address varchar(45),
+            user_agent varchar(500),
+            dados_anteriores jsonb,
+            dados_novos jsonb,
+            "timestamp" timestamptz NOT NULL DEFAULT now(),
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT auditoria_pkey PRIMARY KEY (id, "timestamp")
+        ) PARTITION BY RANGE ("timestamp")
+    """)
+    op.execute("ALTER SEQUENCE auditoria_id_seq OWNED BY auditoria.id")
+    op.execute("CREATE TABLE auditoria_default PARTITION OF auditoria DEFAULT")
+    
+    # Índices no pai são propagados para todas as partições
+    op.execute('CREATE INDEX ix_auditoria_escritorio_timestamp ON auditoria (escritorio_id, "timestamp" DESC, id DESC)')
+    op.execute('CREATE INDEX ix_auditoria_entidade ON auditoria (entidade, entidade_id, "timestamp" DESC)')
+    op.execute('CREATE INDEX ix_auditoria_usuario_timestamp ON auditoria (usuario_id, "timestamp" DESC)')
+    
+    op.execute("""
+        CREATE OR REPLACE FUNCTION auditoria_criar_particao(inicio date) RETURNS text AS $$
+        DECLARE
+            mes date := date_trunc('month', inicio)::date;
+            fim date := (date_trunc('month', inicio) + interval '1 month')::date;
+            nome text := 'auditoria_p' || to_char(date_trunc('month', inicio), 'YYYYMM');
+        BEGIN
+            IF to_regclass(nome) IS NOT NULL THEN
+                RETURN nome;
+            END IF;
+            
+            -- Linhas do mês que caíram na partição default precisam sair antes de criar a partição
+            CREATE TEMP TABLE auditoria_mover AS
+                SELECT * FROM auditoria_default WHERE "timestamp" >= mes AND "timestamp" < fim;
+            DELETE FROM auditoria_default WHERE "timestamp" >= mes AND "timestamp" < fim;
+            
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF auditoria FOR VALUES FROM (%L) TO (%L)',
+                nome, mes, fim
+            );
+            
+            INSERT INTO auditoria SELECT * FROM auditoria_mover;
+            DROP TABLE auditoria_mover;
+            RETURN nome;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    
+    # Partições mensais do mês mais antigo existente até três meses à frente
+    op.execute("""
+        SELECT auditoria_criar_particao(mes::date)
+        FROM generate_series(
+            date_trunc('month', COALESCE((SELECT min("timestamp") FROM auditoria_legado), now())),
+            date_trunc('month', now()) + interval '3 months',
+            interval '1 month'
+        ) AS mes
+    """)
+    
+    op.execute(f"""
+        INSERT INTO auditoria ({COLUNAS})
+        SELECT id, usuario_id, escritorio_id, acao, entidade, entidade_id, descricao,
+               ip_address, user_agent,
+               NULLIF(dados_anteriores, '')::jsonb, NULLIF(dados_novos, '')::jsonb,
+               "timestamp", created_at, updated_at
+        FROM auditoria_legado
+    """)
+    op.execute("DROP TABLE auditoria_legado")
+
+
+def downgrade() -> None:
+    """
+    Volta auditoria para tabela simples com colunas JSON em texto
+    """
+    op.execute("ALTER TABLE auditoria RENAME TO auditoria_particionada")
+    op.execute("ALTER TABLE auditoria_particionada RENAME CONSTRAINT auditoria_pkey TO auditoria_particionada_pkey")
+    op.execute("ALTER SEQUENCE auditoria_id_seq OWNED BY NONE")
+    
+    op.create_table(
+        'auditoria',
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('auditoria_id_seq')"), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('escritorio_id', sa.Integer(), nullable=True),
+        sa.Column('acao', sa.String(length=100), nullable=False),
+        sa.Column('entidade', sa.String(length=100), nullable=False),
+        sa.Column('entidade_id', sa.Integer(), nullable=True),
+        sa.Column('descricao', sa.Text(), nullable=True),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.String(length=500), nullable=True),
+        sa.Column('dados_anteriores', sa.Text(), nullable=True),
+        sa.Column('dados_novos', sa.Text(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['usuario_id'], ['colaborador.id'], ),
+        sa.ForeignKeyConstraint(['escritorio_id'], ['escritorio.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("ALTER SEQUENCE auditoria_id_seq OWNED BY auditoria.id")
+    op.execute(f"""
+        INSERT INTO auditoria ({COLUNAS})
+        SELECT id, usuario_id, escritorio_id, acao, entidade, entidade_id, descricao,
+               ip_address, user_agent, dados_anteriores::text, dados_novos::text,
+               "timestamp", created_at, updated_at
+        FROM auditoria_particionada
+    """)
+    op.execute("DROP TABLE auditoria_particionada CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS auditoria_criar_particao(date)")
+    
+    op.create_index(op.f('ix_auditoria_id'), 'auditoria', ['id'], unique=False)
+    op.create_index(op.f('ix_auditoria_usuario_id'), 'auditoria', ['usuario_id'], unique=False)
+    op.create_index(op.f('ix_auditoria_escritorio_id'), 'auditoria', ['escritorio_id'], unique=False)
+    op.create_index(op.f('ix_auditoria_timestamp'), 'auditoria', ['timestamp'], unique=False)
@@ -0,0 +1,32 @@
+"""add_image_variants
+
+Revision ID: d4f6b8c0e2a3
+Revises: c3e5a7b9d1f2
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6b8c0e2a3'
+down_revision = 'c3e5a7b9d1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Adiciona o mapa de variantes de tamanho (WebP/JPEG) da foto do colaborador e da logo do escritório
+    """
+    op.add_column('colaborador', sa.Column('foto_variantes', sa.JSON(), nullable=True))
+    op.add_column('escritorio', sa.Column('logo_variantes', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """
+    Remove as colunas de variantes
+    """
+    op.drop_column('escritorio', 'logo_variantes')
+    op.drop_column('colaborador', 'foto_variantes')
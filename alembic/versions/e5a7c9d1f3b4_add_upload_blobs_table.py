@@ -0,0 +1,50 @@
+"""add_upload_blobs_table
+
+Revision ID: e5a7c9d1f3b4
+Revises: d4f6b8c0e2a3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9d1f3b4'
+down_revision = 'd4f6b8c0e2a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Cria tabela de blobs de upload endereçados por conteúdo, com contagem de referências
+    """
+    op.create_table(
+        'upload_blobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('origem_hash', sa.String(length=64), nullable=True),
+        sa.Column('caminho', sa.String(length=500), nullable=False),
+        sa.Column('tamanho', sa.BigInteger(), nullable=False),
+        sa.Column('variantes', sa.JSON(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('hash', name='uq_upload_blobs_hash'),
+        sa.UniqueConstraint('caminho', name='uq_upload_blobs_caminho')
+    )
+    op.create_index(op.f('ix_upload_blobs_id'), 'upload_blobs', ['id'], unique=False)
+    op.create_index(op.f('ix_upload_blobs_origem_hash'), 'upload_blobs', ['origem_hash'], unique=False)
+    op.create_index(op.f('ix_upload_blobs_ref_count'), 'upload_blobs', ['ref_count'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove tabela de blobs de upload
+    """
+    op.drop_index(op.f('ix_upload_blobs_ref_count'), table_name='upload_blobs')
+    op.drop_index(op.f('ix_upload_blobs_origem_hash'), table_name='upload_blobs')
+    op.drop_index(op.f('ix_upload_blobs_id'), table_name='upload_blobs')
+    op.drop_table('upload_blobs')
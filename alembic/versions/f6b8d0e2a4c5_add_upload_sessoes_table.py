@@ -0,0 +1,62 @@
+"""add_upload_sessoes_table
+
+Revision ID: f6b8d0e2a4c5
+Revises: e5a7c9d1f3b4
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b8d0e2a4c5'
+down_revision = 'e5a7c9d1f3b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Cria tabela de sessões de upload em partes de documentos de projeto
+    """
+    op.create_table(
+        'upload_sessoes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('token', sa.String(length=36), nullable=False),
+        sa.Column('escritorio_id', sa.Integer(), nullable=False),
+        sa.Column('projeto_id', sa.Integer(), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('nome', sa.String(length=255), nullable=False),
+        sa.Column('extensao', sa.String(length=10), nullable=True),
+        sa.Column('tipo_documento_id', sa.Integer(), nullable=True),
+        sa.Column('observacao', sa.Text(), nullable=True),
+        sa.Column('tamanho', sa.BigInteger(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=True),
+        sa.Column('intervalos', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), server_default='ativa', nullable=False),
+        sa.Column('expira_em', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('documento_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['escritorio_id'], ['escritorio.id'], ),
+        sa.ForeignKeyConstraint(['projeto_id'], ['projetos.id'], ),
+        sa.ForeignKeyConstraint(['usuario_id'], ['colaborador.id'], ),
+        sa.ForeignKeyConstraint(['documento_id'], ['projeto_documento.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upload_sessoes_id'), 'upload_sessoes', ['id'], unique=False)
+    op.create_index(op.f('ix_upload_sessoes_token'), 'upload_sessoes', ['token'], unique=True)
+    op.create_index(op.f('ix_upload_sessoes_escritorio_id'), 'upload_sessoes', ['escritorio_id'], unique=False)
+    op.create_index(op.f('ix_upload_sessoes_expira_em'), 'upload_sessoes', ['expira_em'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove tabela de sessões de upload
+    """
+    op.drop_index(op.f('ix_upload_sessoes_expira_em'), table_name='upload_sessoes')
+    op.drop_index(op.f('ix_upload_sessoes_escritorio_id'), table_name='upload_sessoes')
+    op.drop_index(op.f('ix_upload_sessoes_token'), table_name='upload_sessoes')
+    op.drop_index(op.f('ix_upload_sessoes_id'), table_name='upload_sessoes')
+    op.drop_table('upload_sessoes')
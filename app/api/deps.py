@@ -1,10 +1,12 @@
-from typing import Generator, Optional
+from typing import Generator, Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.core.security import decode_token
 from app.core.exceptions import UnauthorizedException
+from app.core.principal_cache import get_principal, set_principal
 
 # Security scheme
 security = HTTPBearer()
@@ -19,6 +21,44 @@ def get_current_user(
     """
     from app.models.user import User
     
+    payload, user_id = _decodificar_token(credentials)
+    
+    # Buscar usuário no cache e, se necessário, no banco
+    principal = get_principal(user_id)
+    if principal is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise UnauthorizedException("Usuário não encontrado")
+        principal = _principal_do_usuario(user)
+        set_principal(user_id, principal)
+    
+    return _usuario_com_contexto(principal, payload)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Versão assíncrona de get_current_user (rotas em ASYNC_ROUTERS)
+    """
+    from app.repositories.user_async import UserAsyncRepository
+    
+    payload, user_id = _decodificar_token(credentials)
+    
+    principal = get_principal(user_id)
+    if principal is None:
+        user = await UserAsyncRepository(db).get_principal(user_id)
+        if user is None:
+            raise UnauthorizedException("Usuário não encontrado")
+        principal = _principal_do_usuario(user)
+        set_principal(user_id, principal)
+    
+    return _usuario_com_contexto(principal, payload)
+
+
+def _decodificar_token(credentials: HTTPAuthorizationCredentials) -> Tuple[dict, int]:
+    """Valida o token de acesso e retorna (payload, id do usuário)"""
     token = credentials.credentials
     payload = decode_token(token)
     
@@ -37,12 +77,23 @@ def get_current_user(
     except (ValueError, TypeError):
         raise UnauthorizedException("Token inválido")
     
-    # Buscar usuário no banco
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise UnauthorizedException("Usuário não encontrado")
-    
-    if not user.ativo:
+    return payload, user_id
+
+
+def _principal_do_usuario(user) -> dict:
+    """Dados de identidade guardados no cache do principal"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "nome": user.nome,
+        "perfil": user.perfil,
+        "ativo": user.ativo
+    }
+
+
+def _usuario_com_contexto(principal: dict, payload: dict) -> dict:
+    """Combina o principal com o contexto (escritório/perfil) do token"""
+    if not principal["ativo"]:
         raise UnauthorizedException("Usuário inativo")
     
     # Extrair contexto do token
@@ -52,10 +103,10 @@ def get_current_user(
     is_admin_mode = payload.get("is_admin_mode", False)  # Modo administrativo
     
     return {
-        "id": user.id,
-        "email": user.email,
-        "nome": user.nome,
-        "perfil": user.perfil,
+        "id": principal["id"],
+        "email": principal["email"],
+        "nome": principal["nome"],
+        "perfil": principal["perfil"],
         "escritorio_id": escritorio_id,
         "perfil_contexto": perfil_contexto,  # Perfil no escritório selecionado
         "is_system_admin": is_system_admin,
@@ -80,6 +131,19 @@ def get_current_escritorio(
     Retorna o ID do escritório selecionado
     Não permite acesso em modo administrativo
     """
+    return _escritorio_do_contexto(current_user)
+
+
+def get_current_escritorio_async(
+    current_user: dict = Depends(get_current_user_async)
+) -> int:
+    """
+    Versão de get_current_escritorio para as rotas assíncronas
+    """
+    return _escritorio_do_contexto(current_user)
+
+
+def _escritorio_do_contexto(current_user: dict) -> int:
     # Se estiver em modo administrativo, não tem escritório
     if current_user.get("is_admin_mode"):
         raise HTTPException(
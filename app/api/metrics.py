@@ -0,0 +1,21 @@
+"""
+Endpoint de métricas no formato texto do Prometheus (METRICS_PATH)
+"""
+import secrets
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from app.core.config import settings
+from app.core.metrics import gerar_metricas
+
+router = APIRouter()
+
+
+@router.get(settings.METRICS_PATH, include_in_schema=False)
+def metrics(request: Request):
+    """Métricas de todos os workers (ver PROMETHEUS_MULTIPROC_DIR)"""
+    if settings.METRICS_TOKEN:
+        esperado = f"Bearer {settings.METRICS_TOKEN}"
+        if not secrets.compare_digest(request.headers.get("authorization", ""), esperado):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de métricas inválido")
+    
+    corpo, content_type = gerar_metricas()
+    return Response(content=corpo, media_type=content_type)
@@ -0,0 +1,163 @@
+"""
+Servidor de arquivos de upload (/uploads)
+
+Os blobs do store de uploads são endereçados pelo hash do conteúdo e são
+servidos como imutáveis; os demais arquivos (uuid dos uploads antigos,
+documentos de projeto) podem ser substituídos no mesmo caminho e são
+revalidados pelo ETag a cada uso. Suporta requisições Range de um
+intervalo e, opcionalmente, delega o envio ao proxy via X-Accel-Redirect
+(nginx) ou X-Sendfile (Apache/lighttpd), liberando o worker da API.
+"""
+import mimetypes
+import os
+import re
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.services.upload_store import PREFIXO_BLOBS
+from app.utils.http import etag_corresponde
+
+router = APIRouter()
+
+MODO_APP = "app"
+MODO_X_ACCEL = "x-accel"
+MODO_X_SENDFILE = "x-sendfile"
+
+BLOCO_LEITURA = 256 * 1024
+DIRETORIO_SESSOES = "sessoes"
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Mesmo formato de caminho_blob: blobs/<hash[0:2]>/<hash[2:4]>/<hash>[_<tamanho>].<extensão>
+_CAMINHO_BLOB = re.compile(
+    rf"^{PREFIXO_BLOBS}/([0-9a-f]{{2}})/([0-9a-f]{{2}})/\1\2[0-9a-f]{{60}}(_\d+)?\.[a-z0-9]+$"
+)
+
+
+def _resolver_caminho(caminho: str) -> Path:
+    """Resolve o caminho dentro de UPLOAD_DIR, recusando travessia de diretórios"""
+    raiz = Path(settings.UPLOAD_DIR).resolve()
+    arquivo = (raiz / caminho).resolve()
+    # Arquivos parciais de uploads em andamento não são públicos
+    privado = raiz / DIRETORIO_SESSOES
+    if raiz not in arquivo.parents or privado in arquivo.parents or not arquivo.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Arquivo não encontrado")
+    return arquivo
+
+
+def _enderecado_por_hash(caminho: str) -> bool:
+    """Se o caminho é de um blob do store (o conteúdo nunca muda)"""
+    return _CAMINHO_BLOB.match(caminho) is not None
+
+
+def _etag(caminho: str, estado: os.stat_result) -> str:
+    """ETag forte: o hash do conteúdo nos blobs; tamanho e mtime nos demais arquivos"""
+    if _enderecado_por_hash(caminho):
+        return f'"{Path(caminho).stem}"'
+    return f'"{estado.st_size:x}-{estado.st_mtime_ns:x}"'
+
+
+def _cache_control(caminho: str) -> str:
+    if _enderecado_por_hash(caminho):
+        return f"public, max-age={settings.UPLOAD_CACHE_MAX_AGE}, immutable"
+    return "public, no-cache"
+
+
+def _intervalo(header: Optional[str], tamanho: int) -> Optional[Tuple[int, int]]:
+    """
+    Interpreta um header Range de intervalo único
+    
+    Returns:
+        (inicio, fim) inclusivo, ou None para responder o arquivo inteiro
+    
+    Raises:
+        HTTPException 416 se o intervalo não puder ser atendido
+    """
+    if not header:
+        return None
+    correspondencia = _RANGE.match(header.strip())
+    if not correspondencia:
+        # Vários intervalos ou unidade desconhecida: responder o arquivo inteiro
+        return None
+    
+    inicio, fim = correspondencia.groups()
+    if inicio == "" and fim == "":
+        return None
+    if inicio == "":
+        # Sufixo: últimos N bytes
+        comprimento = int(fim)
+        if comprimento == 0:
+            raise _nao_satisfazivel(tamanho)
+        return max(tamanho - comprimento, 0), tamanho - 1
+    
+    inicio = int(inicio)
+    fim = int(fim) if fim else tamanho - 1
+    if inicio >= tamanho or fim < inicio:
+        raise _nao_satisfazivel(tamanho)
+    return inicio, min(fim, tamanho - 1)
+
+
+def _nao_satisfazivel(tamanho: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail="Intervalo inválido",
+        headers={"Content-Range": f"bytes */{tamanho}"}
+    )
+
+
+def _ler(arquivo: Path, inicio: int, fim: int) -> Iterator[bytes]:
+    with open(arquivo, "rb") as f:
+        f.seek(inicio)
+        restante = fim - inicio + 1
+        while restante > 0:
+            bloco = f.read(min(BLOCO_LEITURA, restante))
+            if not bloco:
+                break
+            restante -= len(bloco)
+            yield bloco
+
+
+@router.api_route("/uploads/{caminho:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def servir_upload(caminho: str, request: Request):
+    """Serve um arquivo de UPLOAD_DIR conforme UPLOAD_SERVE_MODE"""
+    arquivo = _resolver_caminho(caminho)
+    estado = arquivo.stat()
+    etag = _etag(caminho, estado)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": _cache_control(caminho),
+        "Accept-Ranges": "bytes",
+    }
+    
+    if etag_corresponde(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    media_type = mimetypes.guess_type(arquivo.name)[0] or "application/octet-stream"
+    
+    # Envio delegado ao proxy: a API responde só os headers
+    if settings.UPLOAD_SERVE_MODE == MODO_X_ACCEL:
+        headers["X-Accel-Redirect"] = f"{settings.UPLOAD_ACCEL_PREFIX.rstrip('/')}/{caminho}"
+        return Response(media_type=media_type, headers=headers)
+    if settings.UPLOAD_SERVE_MODE == MODO_X_SENDFILE:
+        headers["X-Sendfile"] = str(arquivo)
+        return Response(media_type=media_type, headers=headers)
+    
+    tamanho = estado.st_size
+    range_header = request.headers.get("range")
+    # If-Range com outra versão: responder o arquivo inteiro
+    if_range = request.headers.get("if-range")
+    if range_header and if_range and if_range.strip() != etag:
+        range_header = None
+    intervalo = _intervalo(range_header, tamanho)
+    
+    status_code = status.HTTP_200_OK
+    inicio, fim = 0, tamanho - 1
+    if intervalo is not None:
+        inicio, fim = intervalo
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {inicio}-{fim}/{tamanho}"
+    headers["Content-Length"] = str(fim - inicio + 1)
+    
+    if request.method == "HEAD" or tamanho == 0:
+        return Response(status_code=status_code, media_type=media_type, headers=headers)
+    return StreamingResponse(_ler(arquivo, inicio, fim), status_code=status_code, media_type=media_type, headers=headers)
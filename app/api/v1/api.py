@@ -1,5 +1,7 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, clientes, servicos, status, projetos, propostas, movimentos, colaboradores, escritorios, admin, tarefas
+from app.core.config import settings
+from app.api.v1.endpoints import auth, users, clientes, servicos, status, projetos, propostas, movimentos, colaboradores, escritorios, admin, tarefas, auditoria, documentos, health, relatorios, exportacoes, importacoes
+from app.api.v1.endpoints import clientes_async, projetos_async, servicos_async
 
 api_router = APIRouter()
 
@@ -12,6 +14,19 @@ def health_check():
         "message": "ARQManager API is running"
     }
 
+# Rotas de leitura no engine assíncrono (ASYNC_ROUTERS): registradas antes
+# dos routers síncronos para atenderem os mesmos caminhos
+ASYNC_ROUTERS = {
+    "clientes": (clientes_async.router, "/clientes", "Clientes"),
+    "projetos": (projetos_async.router, "/projetos", "Projetos"),
+    "servicos": (servicos_async.router, "/servicos", "Serviços"),
+}
+for nome in settings.ASYNC_ROUTERS:
+    if nome not in ASYNC_ROUTERS:
+        raise ValueError(f"ASYNC_ROUTERS: rota assíncrona desconhecida '{nome}'")
+    router, prefix, tag = ASYNC_ROUTERS[nome]
+    api_router.include_router(router, prefix=prefix, tags=[tag])
+
 # Incluir routers dos módulos
 api_router.include_router(auth.router, prefix="/auth", tags=["Autenticação"])
 api_router.include_router(users.router, prefix="/users", tags=["Usuários"])
@@ -21,7 +36,13 @@ api_router.include_router(servicos.router, prefix="/servicos", tags=["Serviços"
 api_router.include_router(tarefas.router, prefix="/tarefas", tags=["Tarefas"])
 api_router.include_router(status.router, prefix="/status", tags=["Status"])
 api_router.include_router(projetos.router, prefix="/projetos", tags=["Projetos"])
+api_router.include_router(documentos.router, prefix="/documentos", tags=["Documentos"])
 api_router.include_router(propostas.router, prefix="/propostas", tags=["Propostas"])
 api_router.include_router(movimentos.router, prefix="/movimentos", tags=["Financeiro"])
+api_router.include_router(relatorios.router, prefix="/relatorios", tags=["Financeiro"])
+api_router.include_router(exportacoes.router, prefix="/exportacoes", tags=["Exportações"])
+api_router.include_router(importacoes.router, prefix="/importacoes", tags=["Importações"])
 api_router.include_router(escritorios.router, prefix="/escritorios", tags=["Escritórios"])
 api_router.include_router(admin.router, prefix="/admin", tags=["Administração"])
+api_router.include_router(auditoria.router, prefix="/auditoria", tags=["Auditoria"])
+api_router.include_router(health.router, prefix="/health", tags=["health"])
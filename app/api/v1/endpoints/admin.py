@@ -4,11 +4,12 @@ Endpoints administrativos - apenas para admin do sistema
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.repositories.user import UserRepository, EscritorioRepository
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 from app.api.deps import require_system_admin
 from app.core.security import get_password_hash
+from app.core.principal_cache import invalidar_principal
 from app.models.user import User, user_escritorio
 from typing import List, Optional
 
@@ -208,7 +209,7 @@ def list_system_admins(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     current_user: dict = Depends(require_system_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Lista todos os administradores do sistema"""
     user_repo = UserRepository(db)
@@ -228,7 +229,7 @@ def get_available_escritorio_admins(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     current_user: dict = Depends(require_system_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Lista todos os administradores de escritório disponíveis
@@ -260,7 +261,7 @@ def list_escritorio_admins(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     current_user: dict = Depends(require_system_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Lista todos os administradores de um escritório"""
     user_repo = UserRepository(db)
@@ -402,6 +403,7 @@ def toggle_system_admin_active(
     
     existing_user.ativo = not existing_user.ativo
     db.commit()
+    invalidar_principal(existing_user.id)
     db.refresh(existing_user)
     
     return UserResponse.from_orm(existing_user)
@@ -558,6 +560,7 @@ def toggle_escritorio_admin_active(
     
     existing_user.ativo = not existing_user.ativo
     db.commit()
+    invalidar_principal(existing_user.id)
     db.refresh(existing_user)
     
     return UserResponse.from_orm(existing_user)
@@ -607,3 +610,12 @@ def delete_escritorio_admin(
     
     return None
 
+
+
+@router.get("/metricas/uploads", response_model=dict)
+def get_upload_metricas(
+    current_user: dict = Depends(require_system_admin)
+):
+    """Tempos por etapa do pipeline de upload de imagens (neste processo)"""
+    from app.utils.upload import upload_metricas
+    return upload_metricas.resumo()
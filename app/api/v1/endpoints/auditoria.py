@@ -0,0 +1,49 @@
+"""
+Endpoints de Auditoria
+"""
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_read_db
+from app.api.deps import get_current_user, get_current_escritorio
+from app.utils.pagination import set_next_cursor_header
+from app.repositories.auditoria_repository import AuditoriaRepository
+from app.schemas.auditoria import AuditoriaResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[AuditoriaResponse])
+def listar_auditoria(
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    limit: int = Query(100, ge=1, le=500),
+    entidade: Optional[str] = None,
+    entidade_id: Optional[int] = None,
+    usuario_id: Optional[int] = None,
+    acao: Optional[str] = None,
+    data_inicio: Optional[datetime] = None,
+    data_fim: Optional[datetime] = None,
+    response: Response = None,
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """
+    Lista o log de auditoria do escritório, do mais recente para o mais antigo
+    
+    Paginação por (timestamp, id); o próximo cursor vem no header X-Next-Cursor.
+    Apenas administradores do escritório ou do sistema.
+    """
+    if not current_user.get("is_system_admin") and current_user.get("perfil_contexto") not in ["Admin", "Administrador"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso negado. Apenas administradores podem consultar a auditoria."
+        )
+    
+    registros, next_cursor = AuditoriaRepository(db).get_page_by_cursor(
+        escritorio_id, cursor, limit, entidade, entidade_id, usuario_id, acao, data_inicio, data_fim
+    )
+    set_next_cursor_header(response, next_cursor)
+    return registros
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Body, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.services.auth import AuthService
@@ -8,7 +9,7 @@ from app.schemas.user import (
     EscritorioContextInfo, ChangePasswordRequest, UpdateProfileRequest
 )
 from app.api.deps import get_current_user
-from app.utils.upload import save_upload_file
+from app.services.upload_store import UploadStore
 from typing import List
 
 router = APIRouter()
@@ -168,12 +169,12 @@ async def upload_profile_photo(
     """
     try:
         # Salvar arquivo
-        file_path = save_upload_file(file, subdirectory="colaboradores")
+        file_path, variantes = await UploadStore(db).salvar_imagem(file)
         print(f"Arquivo salvo em: {file_path}")
         
         # Atualizar foto no banco
         service = AuthService(db)
-        updated_user = service.update_profile_photo(current_user["id"], file_path)
+        updated_user = await run_in_threadpool(service.update_profile_photo, current_user["id"], file_path, variantes)
         
         # Log para debug
         print(f"Usuário atualizado - Foto: {updated_user.foto}")
@@ -1,21 +1,18 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from pydantic import BaseModel
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.services.cliente import ClienteService
 from app.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteResponse
+from app.schemas.pagination import PaginatedResponse
 from app.api.deps import get_current_user, get_current_escritorio
+from app.utils.pagination import set_next_cursor_header
 
 router = APIRouter()
 
 
-class ClienteListResponse(BaseModel):
+class ClienteListResponse(PaginatedResponse[ClienteResponse]):
     """Schema de resposta paginada"""
-    items: List[ClienteResponse]
-    total: int
-    skip: int
-    limit: int
 
 
 @router.get("/test")
@@ -31,7 +28,10 @@ def list_clientes(
     ativo: Optional[bool] = None,
     tipo_pessoa: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    approximate_total: bool = Query(False, description="Usar total estimado em conjuntos muito grandes"),
+    response: Response = None,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
 ):
@@ -44,22 +44,40 @@ def list_clientes(
     - ativo: Filtrar por status (True/False)
     - tipo_pessoa: Filtrar por tipo (Física/Jurídica)
     - search: Buscar por nome, email, CPF/CNPJ ou cidade
+    - cursor: Se informado, pagina por (nome, id) ignorando skip
+    - approximate_total: Usa a estimativa do banco como total em conjuntos muito grandes
     
     Retorna:
     - items: Lista de clientes
-    - total: Total de clientes no banco
+    - total: Total de clientes no banco (None na paginação por cursor)
     - skip: Offset usado
     - limit: Limite usado
+    - next_cursor: Cursor da próxima página (também no header X-Next-Cursor)
+    - total_estimado: Se o total é uma estimativa
     """
     service = ClienteService(db)
-    clientes = service.get_all(escritorio_id, skip=skip, limit=limit, ativo=ativo, tipo_pessoa=tipo_pessoa, search=search)
-    total = service.count(escritorio_id, ativo=ativo, tipo_pessoa=tipo_pessoa, search=search)
+    next_cursor = None
+    total_estimado = False
+    if cursor is not None:
+        clientes, next_cursor = service.get_page_by_cursor(
+            escritorio_id, cursor, limit, ativo=ativo, tipo_pessoa=tipo_pessoa, search=search
+        )
+        set_next_cursor_header(response, next_cursor)
+        # Sem COUNT por página: o total só vem na paginação por offset
+        total = None
+    else:
+        clientes, total, total_estimado = service.get_page_with_total(
+            escritorio_id, skip=skip, limit=limit, ativo=ativo, tipo_pessoa=tipo_pessoa,
+            search=search, approximate=approximate_total
+        )
     
     return {
         "items": clientes,
         "total": total,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_estimado": total_estimado
     }
 
 
@@ -0,0 +1,62 @@
+"""
+Endpoints assíncronos de Clientes (engine asyncpg)
+
+Registrado antes de clientes.router quando "clientes" está em ASYNC_ROUTERS,
+substituindo a listagem síncrona com o mesmo contrato.
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.api.deps import get_current_user_async, get_current_escritorio_async
+from app.api.v1.endpoints.clientes import ClienteListResponse
+from app.services.cliente_async import ClienteAsyncService
+from app.utils.pagination import set_next_cursor_header
+
+router = APIRouter()
+
+
+@router.get("/", response_model=ClienteListResponse)
+async def list_clientes(
+    skip: int = Query(0, ge=0, description="Número de registros a pular"),
+    limit: int = Query(20, ge=1, le=100, description="Número de registros por página"),
+    ativo: Optional[bool] = None,
+    tipo_pessoa: Optional[str] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    approximate_total: bool = Query(False, description="Usar total estimado em conjuntos muito grandes"),
+    response: Response = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
+    escritorio_id: int = Depends(get_current_escritorio_async)
+):
+    """
+    Lista todos os clientes com paginação, isolados por escritório
+    
+    Mesmos parâmetros e resposta de GET /clientes/ síncrono.
+    """
+    service = ClienteAsyncService(db)
+    next_cursor = None
+    total_estimado = False
+    if cursor is not None:
+        clientes, next_cursor = await service.get_page_by_cursor(
+            escritorio_id, cursor, limit, ativo=ativo, tipo_pessoa=tipo_pessoa, search=search
+        )
+        set_next_cursor_header(response, next_cursor)
+        # Sem COUNT por página: o total só vem na paginação por offset
+        total = None
+    else:
+        clientes, total, total_estimado = await service.get_page_with_total(
+            escritorio_id, skip=skip, limit=limit, ativo=ativo, tipo_pessoa=tipo_pessoa,
+            search=search, approximate=approximate_total
+        )
+    
+    return {
+        "items": clientes,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_estimado": total_estimado
+    }
@@ -2,7 +2,8 @@
 Endpoints de Colaboradores
 Alias para /users para manter compatibilidade com frontend
 """
-from fastapi import APIRouter, Depends, Query, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, Query, HTTPException, UploadFile, File, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import List, Optional
@@ -13,7 +14,9 @@ from app.schemas.user import UserCreate, UserUpdate, UserResponse, ColaboradorEs
 from app.models.user import ColaboradorEscritorioPerfil
 from app.api.deps import get_current_user, get_current_escritorio
 from app.core.exceptions import ConflictException
-from app.utils.upload import save_upload_file, delete_upload_file, get_file_url
+from app.utils.upload import get_file_url
+from app.services.upload_store import UploadStore
+from app.utils.pagination import set_next_cursor_header
 
 router = APIRouter()
 
@@ -24,6 +27,8 @@ def list_colaboradores(
     limit: int = Query(100, ge=1, le=100),
     ativo: Optional[bool] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    response: Response = None,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
@@ -34,150 +39,14 @@ def list_colaboradores(
     Filtros:
     - ativo: Filtrar por status (True/False)
     - search: Buscar por nome, email ou CPF
+    - cursor: Se informado, pagina por (nome, id); próximo cursor no header X-Next-Cursor
     """
     service = UserService(db)
-    colaboradores = service.get_all(escritorio_id=escritorio_id, skip=skip, limit=limit, ativo=ativo, search=search)
-    
-    # Buscar perfis de cada colaborador
-    result = []
-    for colaborador in colaboradores:
-        try:
-            # Buscar perfis do colaborador no escritório atual
-            perfis = db.query(ColaboradorEscritorioPerfil).filter(
-                ColaboradorEscritorioPerfil.colaborador_id == colaborador.id,
-                ColaboradorEscritorioPerfil.escritorio_id == escritorio_id
-            ).order_by(ColaboradorEscritorioPerfil.perfil).all()
-            
-            # Buscar campos do relacionamento colaborador-escritório
-            dados_escritorio = db.execute(
-                text("""
-                    SELECT socio, banco, agencia, tipo_conta, conta, pix_tipo, pix_chave
-                    FROM colaborador_escritorio 
-                    WHERE colaborador_id = :user_id 
-                    AND escritorio_id = :escritorio_id
-                """),
-                {"user_id": colaborador.id, "escritorio_id": escritorio_id}
-            ).first()
-            
-            socio_value = bool(dados_escritorio[0]) if dados_escritorio and dados_escritorio[0] is not None else False
-            banco_value = dados_escritorio[1] if dados_escritorio and len(dados_escritorio) > 1 and dados_escritorio[1] else None
-            agencia_value = dados_escritorio[2] if dados_escritorio and len(dados_escritorio) > 2 and dados_escritorio[2] else None
-            tipo_conta_value = dados_escritorio[3] if dados_escritorio and len(dados_escritorio) > 3 and dados_escritorio[3] else None
-            conta_value = dados_escritorio[4] if dados_escritorio and len(dados_escritorio) > 4 and dados_escritorio[4] else None
-            
-            # Converter UserResponse para dict
-            if hasattr(colaborador, 'model_dump'):
-                colaborador_dict = colaborador.model_dump()
-            elif hasattr(colaborador, 'dict'):
-                colaborador_dict = colaborador.dict()
-            else:
-                colaborador_dict = {
-                    'id': colaborador.id,
-                    'nome': colaborador.nome,
-                    'email': colaborador.email,
-                    'cpf': colaborador.cpf,
-                    'telefone': colaborador.telefone,
-                    'data_nascimento': colaborador.data_nascimento,
-                    'perfil': colaborador.perfil.value if hasattr(colaborador.perfil, 'value') else str(colaborador.perfil),
-                    'tipo': colaborador.tipo.value if hasattr(colaborador.tipo, 'value') else str(colaborador.tipo),
-                    'ativo': colaborador.ativo,
-                    'foto': colaborador.foto,
-                    'ultimo_acesso': colaborador.ultimo_acesso,
-                    'tipo_pix': colaborador.tipo_pix,
-                    'chave_pix': colaborador.chave_pix,
-                    'is_system_admin': colaborador.is_system_admin,
-                    'created_at': colaborador.created_at,
-                    'updated_at': colaborador.updated_at,
-                    'escritorios': colaborador.escritorios or []
-                }
-            
-            # Serializar perfis
-            perfis_list = []
-            for perfil in perfis:
-                try:
-                    perfis_list.append(ColaboradorEscritorioPerfilResponse.model_validate(perfil, from_attributes=True))
-                except Exception as e:
-                    # Se falhar, tentar criar manualmente
-                    try:
-                        from datetime import datetime
-                        perfis_list.append(ColaboradorEscritorioPerfilResponse(
-                            id=perfil.id,
-                            colaborador_id=perfil.colaborador_id,
-                            escritorio_id=perfil.escritorio_id,
-                            perfil=perfil.perfil,
-                            ativo=perfil.ativo,
-                            created_at=perfil.created_at if perfil.created_at else datetime.now(),
-                            updated_at=perfil.updated_at if perfil.updated_at else datetime.now()
-                        ))
-                    except:
-                        pass
-            
-            colaborador_dict['perfis'] = perfis_list
-            colaborador_dict['socio'] = socio_value
-            colaborador_dict['banco'] = banco_value
-            colaborador_dict['agencia'] = agencia_value
-            colaborador_dict['tipo_conta'] = tipo_conta_value
-            colaborador_dict['conta'] = conta_value
-            result.append(UserResponse(**colaborador_dict))
-        except Exception as e:
-            # Se der erro ao buscar perfis, adicionar colaborador sem perfis
-            if hasattr(colaborador, 'model_dump'):
-                colaborador_dict = colaborador.model_dump()
-            elif hasattr(colaborador, 'dict'):
-                colaborador_dict = colaborador.dict()
-            else:
-                colaborador_dict = {
-                    'id': colaborador.id,
-                    'nome': colaborador.nome,
-                    'email': colaborador.email,
-                    'cpf': colaborador.cpf,
-                    'telefone': colaborador.telefone,
-                    'data_nascimento': colaborador.data_nascimento,
-                    'perfil': colaborador.perfil.value if hasattr(colaborador.perfil, 'value') else str(colaborador.perfil),
-                    'tipo': colaborador.tipo.value if hasattr(colaborador.tipo, 'value') else str(colaborador.tipo),
-                    'ativo': colaborador.ativo,
-                    'foto': colaborador.foto,
-                    'ultimo_acesso': colaborador.ultimo_acesso,
-                    'tipo_pix': colaborador.tipo_pix,
-                    'chave_pix': colaborador.chave_pix,
-                    'is_system_admin': colaborador.is_system_admin,
-                    'created_at': colaborador.created_at,
-                    'updated_at': colaborador.updated_at,
-                    'escritorios': colaborador.escritorios or []
-                }
-            colaborador_dict['perfis'] = []
-            # Buscar dados do relacionamento também no caso de erro
-            try:
-                dados_escritorio = db.execute(
-                    text("""
-                        SELECT socio, banco, agencia, tipo_conta, conta, pix_tipo, pix_chave
-                        FROM colaborador_escritorio 
-                        WHERE colaborador_id = :user_id 
-                        AND escritorio_id = :escritorio_id
-                    """),
-                    {"user_id": colaborador.id, "escritorio_id": escritorio_id}
-                ).first()
-                
-                socio_value = bool(dados_escritorio[0]) if dados_escritorio and dados_escritorio[0] is not None else False
-                banco_value = dados_escritorio[1] if dados_escritorio and len(dados_escritorio) > 1 and dados_escritorio[1] else None
-                agencia_value = dados_escritorio[2] if dados_escritorio and len(dados_escritorio) > 2 and dados_escritorio[2] else None
-                tipo_conta_value = dados_escritorio[3] if dados_escritorio and len(dados_escritorio) > 3 and dados_escritorio[3] else None
-                conta_value = dados_escritorio[4] if dados_escritorio and len(dados_escritorio) > 4 and dados_escritorio[4] else None
-            except:
-                socio_value = False
-                banco_value = None
-                agencia_value = None
-                tipo_conta_value = None
-                conta_value = None
-            
-            colaborador_dict['socio'] = socio_value
-            colaborador_dict['banco'] = banco_value
-            colaborador_dict['agencia'] = agencia_value
-            colaborador_dict['tipo_conta'] = tipo_conta_value
-            colaborador_dict['conta'] = conta_value
-            result.append(UserResponse(**colaborador_dict))
-    
-    return result
+    colaboradores, next_cursor = service.get_colaboradores_escritorio(
+        escritorio_id=escritorio_id, skip=skip, limit=limit, ativo=ativo, search=search, cursor=cursor
+    )
+    set_next_cursor_header(response, next_cursor)
+    return colaboradores
 
 
 @router.post("/", response_model=UserResponse, status_code=201)
@@ -785,45 +654,39 @@ async def upload_colaborador_foto(
 ):
     """
     Faz upload de foto do colaborador
-    """
-    # Verificar se o colaborador está vinculado ao escritório
-    vinculado = db.execute(
-        text("""
-            SELECT COUNT(*) 
-            FROM colaborador_escritorio 
-            WHERE colaborador_id = :user_id 
-            AND escritorio_id = :escritorio_id
-        """),
-        {"user_id": colaborador_id, "escritorio_id": escritorio_id}
-    ).scalar()
     
-    if vinculado == 0:
-        raise HTTPException(
-            status_code=404,
-            detail="Colaborador não encontrado neste escritório"
-        )
-    
-    # Buscar colaborador atual para obter foto antiga
+    As consultas e o commit da sessão rodam no threadpool, fora do event loop.
+    """
     service = UserService(db)
-    colaborador = service.get_by_id(colaborador_id)
-    
-    if not colaborador:
-        raise HTTPException(
-            status_code=404,
-            detail="Colaborador não encontrado"
-        )
     
-    # Salvar novo arquivo
-    try:
-        file_path = save_upload_file(file, subdirectory="colaboradores")
+    def verificar_colaborador() -> None:
+        # Verificar se o colaborador está vinculado ao escritório
+        vinculado = db.execute(
+            text("""
+                SELECT COUNT(*) 
+                FROM colaborador_escritorio 
+                WHERE colaborador_id = :user_id 
+                AND escritorio_id = :escritorio_id
+            """),
+            {"user_id": colaborador_id, "escritorio_id": escritorio_id}
+        ).scalar()
         
-        # Deletar foto antiga se existir
-        if colaborador.foto:
-            delete_upload_file(colaborador.foto)
+        if vinculado == 0:
+            raise HTTPException(
+                status_code=404,
+                detail="Colaborador não encontrado neste escritório"
+            )
         
-        # Atualizar campo foto no banco
-        update_data = UserUpdate(foto=file_path)
-        updated_colaborador = service.update(colaborador_id, update_data)
+        # Buscar colaborador atual para obter foto antiga
+        if not service.get_by_id(colaborador_id):
+            raise HTTPException(
+                status_code=404,
+                detail="Colaborador não encontrado"
+            )
+    
+    def registrar_foto(file_path: str, variantes) -> UserResponse:
+        # Atualizar foto e variantes no banco (libera a foto antiga)
+        updated_colaborador = service.update_foto(colaborador_id, file_path, variantes)
         
         # Buscar campo socio para incluir na resposta
         try:
@@ -851,6 +714,13 @@ async def upload_colaborador_foto(
             pass
         
         return updated_colaborador
+    
+    await run_in_threadpool(verificar_colaborador)
+    
+    # Salvar novo arquivo
+    try:
+        file_path, variantes = await UploadStore(db).salvar_imagem(file)
+        return await run_in_threadpool(registrar_foto, file_path, variantes)
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,108 @@
+"""
+Endpoints de Documentos de Projeto (upload em partes e retomável)
+"""
+import re
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Request, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.api.deps import get_current_user, get_current_escritorio
+from app.core.exceptions import BadRequestException
+from app.services.upload_sessao_service import UploadSessaoService
+from app.schemas.projeto_documento import (
+    UploadSessaoCreate, UploadSessaoResponse, FinalizarUploadRequest, ProjetoDocumentoResponse
+)
+
+router = APIRouter()
+
+_CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+
+@router.post("/uploads", response_model=UploadSessaoResponse, status_code=status.HTTP_201_CREATED)
+def criar_sessao_upload(
+    dados: UploadSessaoCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """
+    Inicia o upload em partes de um documento de projeto
+    
+    Retorna o token da sessão e o tamanho máximo de cada parte.
+    """
+    service = UploadSessaoService(db)
+    sessao = service.criar_sessao(dados, escritorio_id, current_user["id"])
+    return service.montar_resposta(sessao)
+
+
+@router.get("/uploads/{token}", response_model=UploadSessaoResponse)
+def obter_sessao_upload(
+    token: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """Estado da sessão e intervalos já recebidos (para retomar o upload)"""
+    service = UploadSessaoService(db)
+    return service.montar_resposta(service.obter_sessao(token, escritorio_id))
+
+
+@router.put("/uploads/{token}", response_model=UploadSessaoResponse)
+async def enviar_parte_upload(
+    token: str,
+    request: Request,
+    offset: Optional[int] = Query(None, ge=0, description="Deslocamento da parte (alternativa ao Content-Range)"),
+    content_range: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """
+    Envia uma parte do arquivo (corpo binário)
+    
+    Posição via header `Content-Range: bytes inicio-fim/total` ou `?offset=`.
+    Partes podem ser reenviadas e enviadas em qualquer ordem.
+    """
+    tamanho_parte = None
+    if content_range:
+        correspondencia = _CONTENT_RANGE.match(content_range.strip())
+        if not correspondencia:
+            raise BadRequestException("Content-Range inválido; use 'bytes inicio-fim/total'")
+        inicio, fim = int(correspondencia.group(1)), int(correspondencia.group(2))
+        if fim < inicio:
+            raise BadRequestException("Content-Range inválido")
+        tamanho_parte = fim - inicio + 1
+    elif offset is not None:
+        inicio = offset
+    else:
+        raise BadRequestException("Informe Content-Range ou offset")
+    
+    service = UploadSessaoService(db)
+    sessao = await service.receber_parte(token, escritorio_id, inicio, tamanho_parte, request.stream())
+    return service.montar_resposta(sessao)
+
+
+@router.post("/uploads/{token}/finalizar", response_model=ProjetoDocumentoResponse, status_code=status.HTTP_201_CREATED)
+async def finalizar_upload(
+    token: str,
+    dados: FinalizarUploadRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """Verifica o sha256 do arquivo completo e cria o documento do projeto"""
+    service = UploadSessaoService(db)
+    return await service.finalizar(token, escritorio_id, dados.sha256)
+
+
+@router.delete("/uploads/{token}", status_code=status.HTTP_204_NO_CONTENT)
+def cancelar_upload(
+    token: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """Cancela a sessão e descarta as partes recebidas"""
+    UploadSessaoService(db).cancelar(token, escritorio_id)
+    return None
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.services.escritorio import EscritorioService
@@ -11,6 +12,7 @@ from app.schemas.user import (
     UserResponse
 )
 from app.api.deps import require_system_admin, get_current_user, require_escritorio_access, require_escritorio_edit_access
+from app.core.principal_cache import invalidar_principais
 from typing import Dict, List, Optional
 
 router = APIRouter()
@@ -140,6 +142,7 @@ def toggle_escritorio_active(
     
     novo_status = not escritorio.ativo
     escritorio.ativo = novo_status
+    usuarios_alterados = []
     
     # Se estiver desativando, desativar todos os usuários vinculados
     if not novo_status:
@@ -171,6 +174,7 @@ def toggle_escritorio_active(
             # Se não tiver outros escritórios ativos, desativar o usuário
             if outros_escritorios_count == 0 and not usuario.is_system_admin:
                 usuario.ativo = False
+                usuarios_alterados.append(usuario.id)
         
         # Desativar o vínculo na tabela de associação
         db.execute(
@@ -183,6 +187,7 @@ def toggle_escritorio_active(
         )
     
     db.commit()
+    invalidar_principais(usuarios_alterados)
     db.refresh(escritorio)
     
     return EscritorioResponse.from_orm(escritorio)
@@ -218,36 +223,44 @@ async def upload_escritorio_logo(
     Permite acesso se:
     - É admin do sistema (pode fazer upload em qualquer escritório)
     - É admin do escritório (pode fazer upload apenas no próprio escritório)
+    
+    As consultas e o commit da sessão rodam no threadpool, fora do event loop.
     """
     # Verificar permissões de edição
-    require_escritorio_edit_access(escritorio_id, current_user, db)
-    from app.utils.upload import save_upload_file, delete_upload_file
+    await run_in_threadpool(require_escritorio_edit_access, escritorio_id, current_user, db)
+    from app.services.upload_store import UploadStore
     
     try:
         # Verificar se escritório existe
         repo = EscritorioRepository(db)
-        escritorio = repo.get_by_id(escritorio_id)
+        escritorio = await run_in_threadpool(repo.get_by_id, escritorio_id)
         
         if not escritorio:
             raise HTTPException(status_code=404, detail="Escritório não encontrado")
         
         # Salvar arquivo
-        file_path = save_upload_file(file, subdirectory="escritorios")
-        
-        # Deletar logo antiga se existir
-        if hasattr(escritorio, 'logo') and escritorio.logo:
-            try:
-                delete_upload_file(escritorio.logo)
-            except Exception:
-                pass  # Ignorar erros ao deletar logo antiga
-        
-        # Atualizar logo no banco
-        escritorio.logo = file_path
+        store = UploadStore(db)
+        file_path, variantes = await store.salvar_imagem(file)
         
-        db.commit()
-        db.refresh(escritorio)
+        def registrar_logo() -> EscritorioResponse:
+            # Liberar logo antiga se existir
+            if hasattr(escritorio, 'logo') and escritorio.logo:
+                try:
+                    store.remover_referencia(escritorio.logo, escritorio.logo_variantes)
+                except Exception:
+                    pass  # Ignorar erros ao liberar logo antiga
+            
+            # Atualizar logo no banco
+            escritorio.logo = file_path
+            escritorio.logo_variantes = variantes
+            store.adicionar_referencia(file_path)
+            
+            db.commit()
+            db.refresh(escritorio)
+            
+            return EscritorioResponse.from_orm(escritorio)
         
-        return EscritorioResponse.from_orm(escritorio)
+        return await run_in_threadpool(registrar_logo)
     except HTTPException:
         raise
     except Exception as e:
@@ -271,7 +284,7 @@ def delete_escritorio_logo(
     """
     # Verificar permissões de edição
     require_escritorio_edit_access(escritorio_id, current_user, db)
-    from app.utils.upload import delete_upload_file
+    from app.services.upload_store import UploadStore
     
     try:
         # Verificar se escritório existe
@@ -281,15 +294,16 @@ def delete_escritorio_logo(
         if not escritorio:
             raise HTTPException(status_code=404, detail="Escritório não encontrado")
         
-        # Deletar logo se existir
+        # Liberar logo se existir
         if escritorio.logo:
             try:
-                delete_upload_file(escritorio.logo)
+                UploadStore(db).remover_referencia(escritorio.logo, escritorio.logo_variantes)
             except Exception:
-                pass  # Ignorar erros ao deletar
+                pass  # Ignorar erros ao liberar
         
         # Remover logo do banco
         escritorio.logo = None
+        escritorio.logo_variantes = None
         
         db.commit()
         db.refresh(escritorio)
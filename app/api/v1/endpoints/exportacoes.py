@@ -0,0 +1,106 @@
+"""
+Endpoints de Exportação (CSV/XLSX em streaming)
+"""
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends, Query, Request
+
+from app.api.deps import get_current_user, get_current_escritorio
+from app.database import marca_ultima_escrita
+from app.repositories.cliente import ClienteRepository
+from app.repositories.movimento_repository import MovimentoRepository
+from app.repositories.projeto_repository import ProjetoRepository
+from app.repositories.proposta_repository import PropostaRepository
+from app.services.exportacao import FORMATO_CSV, resposta_exportacao
+
+router = APIRouter()
+
+FORMATO = Query(FORMATO_CSV, description="csv ou xlsx")
+GZIP = Query(False, description="Compactar o CSV em gzip (.csv.gz)")
+
+
+@router.get("/clientes")
+def exportar_clientes(
+    request: Request,
+    formato: str = FORMATO,
+    gzip: bool = GZIP,
+    ativo: Optional[bool] = None,
+    tipo_pessoa: Optional[str] = None,
+    search: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """Exporta os clientes do escritório com os mesmos filtros da listagem"""
+    return resposta_exportacao(
+        "clientes",
+        lambda db: ClienteRepository(db).get_exportacao(escritorio_id, ativo, tipo_pessoa, search),
+        formato, gzip, request.headers.get("authorization"), marca_ultima_escrita(request)
+    )
+
+
+@router.get("/projetos")
+def exportar_projetos(
+    request: Request,
+    formato: str = FORMATO,
+    gzip: bool = GZIP,
+    ativo: Optional[bool] = None,
+    cliente_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    search: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """Exporta os projetos do escritório com os mesmos filtros da listagem"""
+    return resposta_exportacao(
+        "projetos",
+        lambda db: ProjetoRepository(db).get_exportacao(escritorio_id, ativo, cliente_id, status_id, search),
+        formato, gzip, request.headers.get("authorization"), marca_ultima_escrita(request)
+    )
+
+
+@router.get("/propostas")
+def exportar_propostas(
+    request: Request,
+    formato: str = FORMATO,
+    gzip: bool = GZIP,
+    cliente_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    ano: Optional[int] = None,
+    search: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """Exporta as propostas do escritório com os mesmos filtros da listagem"""
+    return resposta_exportacao(
+        "propostas",
+        lambda db: PropostaRepository(db).get_exportacao(escritorio_id, cliente_id, status_id, ano, search),
+        formato, gzip, request.headers.get("authorization"), marca_ultima_escrita(request)
+    )
+
+
+@router.get("/movimentos")
+def exportar_movimentos(
+    request: Request,
+    formato: str = FORMATO,
+    gzip: bool = GZIP,
+    tipo: Optional[int] = None,
+    projeto_id: Optional[int] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    ativo: Optional[bool] = None,
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """
+    Exporta os movimentos financeiros do escritório com os mesmos filtros da listagem
+    
+    Ordenados por data de entrada; para o fechamento anual use
+    data_inicio/data_fim do ano inteiro.
+    """
+    return resposta_exportacao(
+        "movimentos",
+        lambda db: MovimentoRepository(db).get_exportacao(
+            escritorio_id, tipo, projeto_id, data_inicio, data_fim, ativo
+        ),
+        formato, gzip, request.headers.get("authorization"), marca_ultima_escrita(request)
+    )
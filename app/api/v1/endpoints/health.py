@@ -0,0 +1,67 @@
+"""
+Endpoints de saúde da infraestrutura (administradores do sistema)
+"""
+import time
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db_pool import get_pool_metricas, status_pool
+from app.database import engine, get_async_engine_if_started, get_db, replicas
+from app.api.deps import require_system_admin
+
+router = APIRouter()
+
+
+@router.get("/db", response_model=dict)
+def health_db(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_system_admin)
+):
+    """
+    Saúde do banco e estatísticas dos pools de conexão (neste processo)
+    
+    Retorna a latência de um SELECT 1, a configuração e o estado atual de
+    cada pool e os eventos acumulados (espera no checkout, overflow,
+    timeouts, invalidações, pings).
+    """
+    inicio = time.perf_counter()
+    try:
+        db.execute(text("SELECT 1"))
+        banco = {"status": "ok", "latencia_ms": round((time.perf_counter() - inicio) * 1000, 2)}
+    except Exception as e:
+        banco = {"status": "erro", "erro": str(e)}
+    
+    engines = {"primary": engine}
+    async_engine = get_async_engine_if_started()
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    if replicas is not None:
+        engines.update(replicas.engines)
+    
+    metricas = get_pool_metricas()
+    pools = {}
+    for nome, eng in engines.items():
+        pools[nome] = {
+            "estado": status_pool(eng),
+            "eventos": metricas[nome].resumo() if nome in metricas else {},
+        }
+        if replicas is not None and nome in replicas.engines:
+            pools[nome]["saudavel"] = replicas.saudavel(nome)
+    
+    return {
+        "banco": banco,
+        "configuracao": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pre_ping": settings.DB_PRE_PING,
+            "pre_ping_intervalo_s": settings.DB_PRE_PING_INTERVAL_SECONDS,
+            "pgbouncer": settings.DB_PGBOUNCER,
+            "replicas": len(settings.DATABASE_REPLICA_URLS),
+            "estrategia_replicas": settings.DB_REPLICA_STRATEGY,
+        },
+        "pools": pools,
+    }
@@ -0,0 +1,66 @@
+"""
+Endpoints de Importação em massa (CSV/XLSX)
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+from app.database import get_db
+from app.api.deps import get_current_user, get_current_escritorio
+from app.services.importacao import ImportacaoService, formato_do_arquivo
+
+router = APIRouter()
+
+FORMATO = Query(None, description="csv ou xlsx (padrão: pela extensão do arquivo; .csv.gz é aceito)")
+DRY_RUN = Query(False, description="Apenas validar, sem gravar")
+
+
+def _validar_tamanho(file: UploadFile) -> None:
+    if file.size is not None and file.size > settings.IMPORT_MAX_SIZE:
+        raise BadRequestException(
+            f"Arquivo muito grande. Tamanho máximo: {settings.IMPORT_MAX_SIZE / (1024 * 1024):.1f}MB"
+        )
+
+
+@router.post("/clientes")
+def importar_clientes(
+    file: UploadFile = File(...),
+    formato: Optional[str] = FORMATO,
+    dry_run: bool = DRY_RUN,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """
+    Importa clientes de uma planilha, vinculados ao escritório
+    
+    Colunas obrigatórias: nome, email, telefone e cpf_cnpj (ou Identificação);
+    aceita o CSV/XLSX das exportações. Linhas inválidas ou com CPF/CNPJ
+    repetido são listadas em "erros" e as demais são importadas.
+    """
+    _validar_tamanho(file)
+    formato, compactado = formato_do_arquivo(file.filename, formato)
+    return ImportacaoService(db).importar_clientes(file.file, escritorio_id, formato, compactado, dry_run)
+
+
+@router.post("/movimentos")
+def importar_movimentos(
+    file: UploadFile = File(...),
+    formato: Optional[str] = FORMATO,
+    dry_run: bool = DRY_RUN,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """
+    Importa movimentos financeiros de uma planilha, vinculados ao escritório
+    
+    Colunas obrigatórias: data_entrada, tipo (1/2/3 ou Despesa/Receita/
+    Transferência), descricao e valor; aceita o CSV/XLSX das exportações.
+    Linhas inválidas são listadas em "erros" e as demais são importadas.
+    """
+    _validar_tamanho(file)
+    formato, compactado = formato_do_arquivo(file.filename, formato)
+    return ImportacaoService(db).importar_movimentos(file.file, escritorio_id, formato, compactado, dry_run)
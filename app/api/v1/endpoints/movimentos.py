@@ -3,18 +3,21 @@ Endpoints de Movimentos Financeiros
 """
 from typing import List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Response
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.api.deps import get_current_user, get_current_escritorio
+from app.utils.pagination import set_next_cursor_header
+from app.schemas.pagination import PaginatedResponse
 from app.repositories.movimento_repository import MovimentoRepository
+from app.services.movimento_service import MovimentoService
 from app.schemas.movimento import MovimentoCreate, MovimentoUpdate, MovimentoResponse
 
 router = APIRouter()
 
 
-@router.get("", response_model=List[MovimentoResponse])
+@router.get("", response_model=PaginatedResponse[MovimentoResponse])
 def listar_movimentos(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
@@ -23,13 +26,44 @@ def listar_movimentos(
     data_inicio: Optional[date] = None,
     data_fim: Optional[date] = None,
     ativo: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    approximate_total: bool = Query(False, description="Usar total estimado em conjuntos muito grandes"),
+    response: Response = None,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
 ):
-    """Lista todos os movimentos financeiros, isolados por escritório"""
+    """
+    Lista todos os movimentos financeiros com paginação, isolados por escritório
+    
+    Retorna items/total/skip/limit. Se cursor for informado, pagina por
+    (data_entrada, id) decrescente e retorna next_cursor (também no header X-Next-Cursor).
+    Na paginação por cursor, total vem nulo (sem COUNT a cada página).
+    """
     repo = MovimentoRepository(db)
-    return repo.get_all(escritorio_id, skip, limit, tipo, projeto_id, data_inicio, data_fim, ativo)
+    next_cursor = None
+    total_estimado = False
+    
+    if cursor is not None:
+        movimentos, next_cursor = repo.get_page_by_cursor(
+            escritorio_id, cursor, limit, tipo, projeto_id, data_inicio, data_fim, ativo
+        )
+        set_next_cursor_header(response, next_cursor)
+        # Sem COUNT por página: o total só vem na paginação por offset
+        total = None
+    else:
+        movimentos, total, total_estimado = repo.get_page_with_total(
+            escritorio_id, skip, limit, tipo, projeto_id, data_inicio, data_fim, ativo, approximate_total
+        )
+    
+    return {
+        "items": movimentos,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_estimado": total_estimado
+    }
 
 
 @router.post("", response_model=MovimentoResponse, status_code=status.HTTP_201_CREATED)
@@ -40,8 +74,7 @@ def criar_movimento(
     escritorio_id: int = Depends(get_current_escritorio)
 ):
     """Cria um novo movimento financeiro, vinculado ao escritório"""
-    repo = MovimentoRepository(db)
-    return repo.create(movimento, escritorio_id)
+    return MovimentoService(db).criar_movimento(movimento, escritorio_id)
 
 
 @router.get("/resumo")
@@ -49,7 +82,7 @@ def obter_resumo(
     data_inicio: Optional[date] = None,
     data_fim: Optional[date] = None,
     tipo: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
 ):
@@ -58,10 +91,26 @@ def obter_resumo(
     return repo.get_resumo(escritorio_id, data_inicio, data_fim, tipo)
 
 
+@router.get("/resumo/mensal")
+def obter_resumo_mensal(
+    ano: Optional[int] = Query(None, ge=1900, le=9999, description="Ano inteiro (ignora data_inicio/data_fim)"),
+    data_inicio: Optional[date] = Query(None, description="Mês inicial (qualquer dia do mês)"),
+    data_fim: Optional[date] = Query(None, description="Mês final (qualquer dia do mês)"),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """Retorna receitas, despesas e saldo mês a mês, isolados por escritório"""
+    if ano:
+        data_inicio, data_fim = date(ano, 1, 1), date(ano, 12, 1)
+    repo = MovimentoRepository(db)
+    return repo.get_resumo_mensal(escritorio_id, data_inicio, data_fim)
+
+
 @router.get("/mes/{ano}/{mes}", response_model=List[MovimentoResponse])
 def obter_por_mes(
-    ano: int,
-    mes: int,
+    ano: int = Path(..., ge=1900, le=9999),
+    mes: int = Path(..., ge=1, le=12),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
@@ -100,16 +149,7 @@ def atualizar_movimento(
     escritorio_id: int = Depends(get_current_escritorio)
 ):
     """Atualiza um movimento, garantindo que pertence ao escritório"""
-    repo = MovimentoRepository(db)
-    movimento = repo.update(movimento_id, movimento_data, escritorio_id)
-    
-    if not movimento:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Movimento não encontrado"
-        )
-    
-    return movimento
+    return MovimentoService(db).atualizar_movimento(movimento_id, movimento_data, escritorio_id)
 
 
 @router.delete("/{movimento_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -120,10 +160,4 @@ def deletar_movimento(
     escritorio_id: int = Depends(get_current_escritorio)
 ):
     """Deleta um movimento, garantindo que pertence ao escritório"""
-    repo = MovimentoRepository(db)
-    
-    if not repo.delete(movimento_id, escritorio_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Movimento não encontrado"
-        )
+    MovimentoService(db).deletar_movimento(movimento_id, escritorio_id)
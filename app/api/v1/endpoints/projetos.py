@@ -2,11 +2,13 @@
 Endpoints de Projetos
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.api.deps import get_current_user, get_current_escritorio
+from app.utils.pagination import set_next_cursor_header
+from app.schemas.pagination import PaginatedResponse
 from app.repositories.projeto_repository import ProjetoRepository
 from app.schemas.projeto import (
     ProjetoCreate, ProjetoUpdate, ProjetoResponse,
@@ -16,7 +18,7 @@ from app.schemas.projeto import (
 router = APIRouter()
 
 
-@router.get("", response_model=List[ProjetoResponse])
+@router.get("", response_model=PaginatedResponse[ProjetoResponse])
 def listar_projetos(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
@@ -24,17 +26,44 @@ def listar_projetos(
     cliente_id: Optional[int] = None,
     status_id: Optional[int] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    approximate_total: bool = Query(False, description="Usar total estimado em conjuntos muito grandes"),
+    response: Response = None,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
 ):
-    """Lista todos os projetos, isolados por escritório"""
+    """
+    Lista todos os projetos com paginação, isolados por escritório
+    
+    Retorna items/total/skip/limit. Se cursor for informado, pagina por
+    (data_inicio, id) decrescente e retorna next_cursor (também no header X-Next-Cursor).
+    Na paginação por cursor, total vem nulo (sem COUNT a cada página).
+    """
     repo = ProjetoRepository(db)
+    next_cursor = None
+    total_estimado = False
     
-    if search:
-        return repo.search(escritorio_id, search, skip, limit)
+    if cursor is not None:
+        projetos, next_cursor = repo.get_page_by_cursor(
+            escritorio_id, cursor, limit, ativo, cliente_id, status_id, search
+        )
+        set_next_cursor_header(response, next_cursor)
+        # Sem COUNT por página: o total só vem na paginação por offset
+        total = None
+    else:
+        projetos, total, total_estimado = repo.get_page_with_total(
+            escritorio_id, skip, limit, ativo, cliente_id, status_id, search, approximate_total
+        )
     
-    return repo.get_all(escritorio_id, skip, limit, ativo, cliente_id, status_id)
+    return {
+        "items": projetos,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_estimado": total_estimado
+    }
 
 
 @router.post("", response_model=ProjetoResponse, status_code=status.HTTP_201_CREATED)
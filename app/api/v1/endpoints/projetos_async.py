@@ -0,0 +1,65 @@
+"""
+Endpoints assíncronos de Projetos (engine asyncpg)
+
+Registrado antes de projetos.router quando "projetos" está em ASYNC_ROUTERS,
+substituindo a listagem síncrona com o mesmo contrato.
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.api.deps import get_current_user_async, get_current_escritorio_async
+from app.utils.pagination import set_next_cursor_header
+from app.schemas.pagination import PaginatedResponse
+from app.repositories.projeto_async_repository import ProjetoAsyncRepository
+from app.schemas.projeto import ProjetoResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=PaginatedResponse[ProjetoResponse])
+async def listar_projetos(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    ativo: Optional[bool] = None,
+    cliente_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    approximate_total: bool = Query(False, description="Usar total estimado em conjuntos muito grandes"),
+    response: Response = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
+    escritorio_id: int = Depends(get_current_escritorio_async)
+):
+    """
+    Lista todos os projetos com paginação, isolados por escritório
+    
+    Mesmos parâmetros e resposta de GET /projetos síncrono.
+    """
+    repo = ProjetoAsyncRepository(db)
+    next_cursor = None
+    total_estimado = False
+    
+    if cursor is not None:
+        projetos, next_cursor = await repo.get_page_by_cursor(
+            escritorio_id, cursor, limit, ativo, cliente_id, status_id, search
+        )
+        set_next_cursor_header(response, next_cursor)
+        # Sem COUNT por página: o total só vem na paginação por offset
+        total = None
+    else:
+        projetos, total, total_estimado = await repo.get_page_with_total(
+            escritorio_id, skip, limit, ativo, cliente_id, status_id, search, approximate_total
+        )
+    
+    return {
+        # Serializado aqui, com a sessão aberta e os relacionamentos já carregados
+        "items": [ProjetoResponse.model_validate(p) for p in projetos],
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_estimado": total_estimado
+    }
@@ -2,18 +2,20 @@
 Endpoints de Propostas
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.api.deps import get_current_user, get_current_escritorio
+from app.utils.pagination import set_next_cursor_header
+from app.schemas.pagination import PaginatedResponse
 from app.repositories.proposta_repository import PropostaRepository
 from app.schemas.proposta import PropostaCreate, PropostaUpdate, PropostaResponse
 
 router = APIRouter()
 
 
-@router.get("", response_model=List[PropostaResponse])
+@router.get("", response_model=PaginatedResponse[PropostaResponse])
 def listar_propostas(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
@@ -21,17 +23,45 @@ def listar_propostas(
     status_id: Optional[int] = None,
     ano: Optional[int] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    approximate_total: bool = Query(False, description="Usar total estimado em conjuntos muito grandes"),
+    response: Response = None,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
 ):
-    """Lista todas as propostas, isoladas por escritório"""
+    """
+    Lista todas as propostas com paginação, isoladas por escritório
+    
+    Retorna items/total/skip/limit. Se cursor for informado, pagina por
+    (ano_proposta, numero_proposta, id) decrescente e retorna next_cursor
+    (também no header X-Next-Cursor).
+    Na paginação por cursor, total vem nulo (sem COUNT a cada página).
+    """
     repo = PropostaRepository(db)
+    next_cursor = None
+    total_estimado = False
     
-    if search:
-        return repo.search(escritorio_id, search, skip, limit)
+    if cursor is not None:
+        propostas, next_cursor = repo.get_page_by_cursor(
+            escritorio_id, cursor, limit, cliente_id, status_id, ano, search
+        )
+        set_next_cursor_header(response, next_cursor)
+        # Sem COUNT por página: o total só vem na paginação por offset
+        total = None
+    else:
+        propostas, total, total_estimado = repo.get_page_with_total(
+            escritorio_id, skip, limit, cliente_id, status_id, ano, search, approximate_total
+        )
     
-    return repo.get_all(escritorio_id, skip, limit, cliente_id, status_id, ano)
+    return {
+        "items": propostas,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_estimado": total_estimado
+    }
 
 
 @router.post("", response_model=PropostaResponse, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,53 @@
+"""
+Endpoints de Relatórios Financeiros (DRE e fluxo de caixa)
+"""
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_read_db
+from app.api.deps import get_current_user, get_current_escritorio
+from app.services.relatorio_financeiro import RelatorioFinanceiroService
+
+router = APIRouter()
+
+
+def _periodo(data_inicio: Optional[date], data_fim: Optional[date]) -> tuple:
+    """Período padrão: do início do ano até hoje"""
+    hoje = date.today()
+    return data_inicio or date(hoje.year, 1, 1), data_fim or hoje
+
+
+@router.get("/dre")
+def obter_dre(
+    data_inicio: Optional[date] = Query(None, description="Início do período (padrão: início do ano)"),
+    data_fim: Optional[date] = Query(None, description="Fim do período (padrão: hoje)"),
+    incluir_zeradas: bool = Query(False, description="Incluir contas sem movimento no período"),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """
+    Demonstrativo de resultado pelo plano de contas, isolado por escritório
+    
+    Cada conta traz receitas, despesas e resultado do período já somados
+    com os das contas filhas; movimentos sem conta correspondente ficam em
+    sem_classificacao.
+    """
+    inicio, fim = _periodo(data_inicio, data_fim)
+    return RelatorioFinanceiroService(db).dre(escritorio_id, inicio, fim, incluir_zeradas)
+
+
+@router.get("/fluxo-caixa")
+def obter_fluxo_caixa(
+    data_inicio: Optional[date] = Query(None, description="Início do período (padrão: início do ano)"),
+    data_fim: Optional[date] = Query(None, description="Fim do período (padrão: hoje)"),
+    incluir_zeradas: bool = Query(False, description="Incluir contas sem movimento no período"),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+    escritorio_id: int = Depends(get_current_escritorio)
+):
+    """Fluxo de caixa mês a mês pelo plano de contas, com saldo acumulado, isolado por escritório"""
+    inicio, fim = _periodo(data_inicio, data_fim)
+    return RelatorioFinanceiroService(db).fluxo_caixa(escritorio_id, inicio, fim, incluir_zeradas)
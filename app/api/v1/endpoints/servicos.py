@@ -2,14 +2,15 @@
 Endpoints de Serviços
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.api.deps import get_current_user, get_current_escritorio
 from app.services.servico_service import ServicoService
 from app.services.etapa_service import EtapaService
 from app.services.tarefa_service import TarefaService
+from app.utils.http import etag_corresponde
 from app.schemas.servico import (
     ServicoCreate, ServicoUpdate, ServicoResponse,
     EtapaCreate, EtapaUpdate, EtapaResponse,
@@ -26,7 +27,7 @@ def listar_servicos(
     limit: int = Query(100, ge=1, le=100),
     ativo: Optional[bool] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
 ):
@@ -37,14 +38,25 @@ def listar_servicos(
 
 @router.get("/hierarquia", response_model=List[ServicoResponse])
 def listar_servicos_hierarquia(
+    request: Request,
     ativo: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
 ):
-    """Lista todos os serviços com etapas e tarefas aninhadas (hierarquia completa)"""
+    """
+    Lista todos os serviços com etapas e tarefas aninhadas (hierarquia completa)
+    
+    Retorna ETag; com If-None-Match igual ao ETag atual responde 304 sem corpo.
+    """
     service = ServicoService(db)
-    return service.listar_servicos_hierarquia(escritorio_id, ativo)
+    etag, corpo = service.obter_hierarquia_serializada(escritorio_id, ativo)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if etag_corresponde(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=corpo, media_type="application/json", headers=headers)
 
 
 @router.post("", response_model=ServicoResponse, status_code=status.HTTP_201_CREATED)
@@ -315,15 +327,6 @@ def reordenar_tarefas(
     escritorio_id: int = Depends(get_current_escritorio)
 ):
     """Reordena tarefas de uma etapa em lote"""
-    # Validar se etapa pertence ao serviço
-    etapa_service = EtapaService(db)
-    etapa = etapa_service.obter_etapa(etapa_id, escritorio_id)
-    
-    if etapa.servico_id != servico_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Etapa não pertence ao serviço informado"
-        )
-    
+    # A validação de que a etapa pertence ao serviço é feita na mesma consulta das tarefas
     tarefa_service = TarefaService(db)
-    return tarefa_service.reordenar_tarefas(etapa_id, request.tarefa_ids, escritorio_id)
+    return tarefa_service.reordenar_tarefas(etapa_id, request.tarefa_ids, escritorio_id, servico_id=servico_id)
@@ -0,0 +1,40 @@
+"""
+Endpoints assíncronos de Serviços (engine asyncpg)
+
+Registrado antes de servicos.router quando "servicos" está em ASYNC_ROUTERS,
+substituindo a hierarquia síncrona com o mesmo contrato (ETag/304).
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.api.deps import get_current_user_async, get_current_escritorio_async
+from app.services.servico_async_service import ServicoAsyncService
+from app.utils.http import etag_corresponde
+from app.schemas.servico import ServicoResponse
+
+router = APIRouter()
+
+
+@router.get("/hierarquia", response_model=List[ServicoResponse])
+async def listar_servicos_hierarquia(
+    request: Request,
+    ativo: Optional[bool] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
+    escritorio_id: int = Depends(get_current_escritorio_async)
+):
+    """
+    Lista todos os serviços com etapas e tarefas aninhadas (hierarquia completa)
+    
+    Retorna ETag; com If-None-Match igual ao ETag atual responde 304 sem corpo.
+    """
+    service = ServicoAsyncService(db)
+    etag, corpo = await service.obter_hierarquia_serializada(escritorio_id, ativo)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if etag_corresponde(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=corpo, media_type="application/json", headers=headers)
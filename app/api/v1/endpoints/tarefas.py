@@ -2,11 +2,13 @@
 Endpoints de Tarefas
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.api.deps import get_current_user, get_current_escritorio
+from app.utils.pagination import set_next_cursor_header
+from app.schemas.pagination import PaginatedResponse
 from app.services.tarefa_service import TarefaService
 from app.schemas.servico import (
     TarefaCreate, TarefaUpdate, TarefaResponse
@@ -15,23 +17,50 @@ from app.schemas.servico import (
 router = APIRouter()
 
 
-@router.get("", response_model=List[TarefaResponse])
+@router.get("", response_model=PaginatedResponse[TarefaResponse])
 def listar_tarefas(
     etapa_id: Optional[int] = Query(None, description="Filtrar por etapa"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = Query(None, description="Buscar por nome"),
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    approximate_total: bool = Query(False, description="Usar total estimado em conjuntos muito grandes"),
+    response: Response = None,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
     escritorio_id: int = Depends(get_current_escritorio)
 ):
-    """Lista todas as tarefas, opcionalmente filtradas por etapa"""
+    """
+    Lista todas as tarefas com paginação, opcionalmente filtradas por etapa
+    
+    Retorna items/total/skip/limit. Se cursor for informado, pagina por
+    (ordem, id) e retorna next_cursor (também no header X-Next-Cursor).
+    Na paginação por cursor, total vem nulo (sem COUNT a cada página).
+    """
     service = TarefaService(db)
+    next_cursor = None
+    total_estimado = False
     
-    if search:
-        return service.buscar_tarefas(escritorio_id, search, etapa_id, skip, limit)
+    if cursor is not None:
+        tarefas, next_cursor = service.listar_tarefas_por_cursor(
+            escritorio_id, etapa_id, cursor, limit, search
+        )
+        set_next_cursor_header(response, next_cursor)
+        # Sem COUNT por página: o total só vem na paginação por offset
+        total = None
+    else:
+        tarefas, total, total_estimado = service.listar_tarefas_com_total(
+            escritorio_id, etapa_id, skip, limit, search, approximate_total
+        )
     
-    return service.listar_tarefas(escritorio_id, etapa_id, skip, limit)
+    return {
+        "items": tarefas,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_estimado": total_estimado
+    }
 
 
 @router.get("/stats/count")
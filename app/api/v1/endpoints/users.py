@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
 from app.services.user import UserService
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
 from app.api.deps import get_current_user
+from app.utils.pagination import set_next_cursor_header
 
 router = APIRouter()
 
@@ -15,6 +16,8 @@ def list_users(
     limit: int = Query(100, ge=1, le=100),
     ativo: Optional[bool] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Cursor para paginação por chave (vazio para a primeira página)"),
+    response: Response = None,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -24,8 +27,13 @@ def list_users(
     Filtros:
     - ativo: Filtrar por status (True/False)
     - search: Buscar por nome, email ou CPF
+    - cursor: Se informado, pagina por (nome, id); próximo cursor no header X-Next-Cursor
     """
     service = UserService(db)
+    if cursor is not None:
+        users, next_cursor = service.get_page_by_cursor(cursor=cursor, limit=limit, ativo=ativo, search=search)
+        set_next_cursor_header(response, next_cursor)
+        return users
     return service.get_all(skip=skip, limit=limit, ativo=ativo, search=search)
 
 
@@ -0,0 +1,80 @@
+"""
+Cache em memória com expiração (TTL) e descarte LRU
+
+Os consumidores dependem apenas da interface CacheBackend, permitindo
+trocar o backend em memória por um compartilhado (ex.: Redis) sem
+alterar o código que usa o cache.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class CacheBackend(ABC):
+    """Interface mínima de um backend de cache"""
+    
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Valor da chave ou None se ausente/expirada"""
+    
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """Grava o valor da chave"""
+    
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """Remove a chave (sem erro se ausente)"""
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove todas as chaves"""
+
+
+class InMemoryCache(CacheBackend):
+    """
+    Cache limitado por processo
+    
+    Args:
+        max_size: Número máximo de entradas (as menos usadas são descartadas)
+        ttl_seconds: Tempo de vida de cada entrada
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
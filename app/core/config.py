@@ -1,5 +1,6 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import List, Literal, Optional
 from functools import lru_cache
 
 
@@ -18,12 +19,46 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_ECHO: bool = False
     
+    # Pool de conexões (por processo/worker)
+    # DB_PRE_PING: checkout (ping a cada checkout), periodic (ping se a conexão
+    # ficou ociosa no pool por mais de DB_PRE_PING_INTERVAL_SECONDS) ou off
+    # DB_PGBOUNCER: compatível com PgBouncer em transaction pooling
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_PRE_PING: Literal["checkout", "periodic", "off"] = "periodic"
+    DB_PRE_PING_INTERVAL_SECONDS: int = 30
+    DB_PGBOUNCER: bool = False
+    
+    # Réplicas de leitura (rotas GET com get_read_db)
+    # DB_REPLICA_STRATEGY: round_robin ou least_connections
+    # DB_REPLICA_STICKY_SECONDS: leituras no primário após uma escrita do usuário
+    # (marca assinada devolvida pelo cliente no header X-Ultima-Escrita ou cookie)
+    # DB_REPLICA_RETRY_SECONDS: tempo fora da seleção após falha de conexão
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_REPLICA_STRATEGY: str = "round_robin"
+    DB_REPLICA_STICKY_SECONDS: int = 5
+    DB_REPLICA_RETRY_SECONDS: int = 30
+    
+    # Engine assíncrono (asyncpg) para rotas de leitura
+    # ASYNC_ROUTERS: rotas servidas pelo engine assíncrono (clientes, projetos, servicos)
+    ASYNC_DATABASE_URL: Optional[str] = None  # Padrão: DATABASE_URL com postgresql+asyncpg
+    ASYNC_ROUTERS: List[str] = []
+    ASYNC_DB_POOL_SIZE: int = 20
+    ASYNC_DB_MAX_OVERFLOW: int = 20
+    
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Cache do usuário autenticado (get_current_user)
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:3000"]
     
@@ -34,9 +69,90 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     SMTP_FROM: Optional[str] = None
     
+    # Paginação
+    # Acima desta estimativa, listagens com approximate_total=true usam o total estimado
+    PAGINATION_APPROX_COUNT_THRESHOLD: int = 100000
+    
+    # Exportações (CSV/XLSX): linhas buscadas por vez no cursor do servidor
+    EXPORT_BATCH_SIZE: int = 2000
+    
+    # Importações (CSV/XLSX): linhas por INSERT, erros listados na resposta e tamanho máximo do arquivo
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000
+    IMPORT_MAX_SIZE: int = 52428800  # 50MB
+    
+    # Cache da hierarquia de serviços (/servicos/hierarquia)
+    HIERARQUIA_CACHE_TTL_SECONDS: int = 300
+    HIERARQUIA_CACHE_MAX_SIZE: int = 1000
+    
+    # Cache dos relatórios financeiros (DRE / fluxo de caixa) por escritório e período
+    RELATORIO_CACHE_TTL_SECONDS: int = 600
+    RELATORIO_CACHE_MAX_SIZE: int = 500
+    
+    # Busca textual: auto (trigram no PostgreSQL com f_unaccent instalada, ilike nos demais), trigram ou ilike
+    SEARCH_BACKEND: str = "auto"
+    
+    # Auditoria assíncrona (fila em memória gravada em lotes por uma thread)
+    AUDIT_ASYNC_ENABLED: bool = True
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    # Fila cheia: drop (descarta e contabiliza) ou block (aguarda até AUDIT_BLOCK_TIMEOUT_SECONDS)
+    AUDIT_QUEUE_POLICY: str = "drop"
+    AUDIT_BLOCK_TIMEOUT_SECONDS: float = 0.05
+    # Lote que falha ao gravar: novas tentativas, com espera inicial dobrando a cada uma
+    AUDIT_WRITE_RETRIES: int = 3
+    AUDIT_RETRY_BACKOFF_SECONDS: float = 0.5
+    AUDIT_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+    # Partições mensais: meses mantidos (0 = sem retenção) e meses criados à frente
+    AUDIT_RETENTION_MONTHS: int = 12
+    AUDIT_PARTITIONS_AHEAD: int = 3
+    
     # Upload
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
+    # Processamento de imagens fora do event loop: threads do pool e uploads simultâneos
+    UPLOAD_PROCESSING_WORKERS: int = 2
+    UPLOAD_PROCESSING_CONCURRENCY: int = 4
+    # Uploads acima deste tempo total têm os tempos por etapa registrados no log
+    UPLOAD_SLOW_LOG_MS: int = 2000
+    # Variantes de tamanho (px, lado maior) geradas para fotos e logos, em WebP e JPEG
+    IMAGE_VARIANT_SIZES: List[int] = [64, 256, 1024]
+    # Variante usada em listagens (foto_miniatura/logo_miniatura)
+    IMAGE_LIST_VARIANT_SIZE: int = 64
+    # Coleta de lixo do store de uploads (scripts/gc_uploads.py)
+    UPLOAD_GC_BATCH_SIZE: int = 500
+    UPLOAD_GC_GRACE_MINUTES: int = 60
+    # Envio de /uploads: app (a API lê o arquivo), x-accel (nginx) ou x-sendfile (Apache/lighttpd)
+    UPLOAD_SERVE_MODE: str = "app"
+    # Location interna do nginx que aponta para UPLOAD_DIR (modo x-accel)
+    UPLOAD_ACCEL_PREFIX: str = "/_protected_uploads"
+    # max-age dos blobs do store (endereçados por hash, servidos como imutáveis)
+    UPLOAD_CACHE_MAX_AGE: int = 31536000
+    # Upload em partes de documentos de projeto
+    DOCUMENT_UPLOAD_MAX_SIZE: int = 5 * 1024 ** 3  # 5GB
+    DOCUMENT_UPLOAD_MAX_CHUNK_SIZE: int = 64 * 1024 ** 2  # 64MB
+    DOCUMENT_UPLOAD_SESSION_TTL_HOURS: int = 48
+    
+    # Métricas (Prometheus)
+    # Com vários workers, defina a variável de ambiente PROMETHEUS_MULTIPROC_DIR
+    # Fora de ENVIRONMENT=development, METRICS_ENABLED exige METRICS_TOKEN
+    METRICS_ENABLED: bool = False
+    METRICS_PATH: str = "/metrics"
+    METRICS_TOKEN: Optional[str] = None  # Se definido, exige "Authorization: Bearer <token>"
+    METRICS_OVERHEAD_BUDGET_US: int = 150  # Limite de custo por requisição (scripts/benchmark_metrics.py)
+    
+    # Profiler de SQL por requisição (apenas desenvolvimento/homologação)
+    SQL_PROFILER_ENABLED: bool = False
+    SQL_PROFILER_N_PLUS_ONE_THRESHOLD: int = 5  # Mesma consulta mais vezes que isso na requisição
+    SQL_PROFILER_SLOW_REQUEST_MS: int = 500
+    SQL_PROFILER_TOP: int = 5  # Consultas listadas no log de requisição lenta
+    
+    @model_validator(mode="after")
+    def validar_token_metricas(self):
+        if self.METRICS_ENABLED and not self.METRICS_TOKEN and self.ENVIRONMENT != "development":
+            raise ValueError("METRICS_TOKEN é obrigatório com METRICS_ENABLED fora de ENVIRONMENT=development")
+        return self
     
     class Config:
         env_file = ".env"
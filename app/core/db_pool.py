@@ -0,0 +1,194 @@
+"""
+Pool de conexões configurável e instrumentado
+
+Configuração (Settings):
+- DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT / DB_POOL_RECYCLE
+- DB_PRE_PING: "checkout" (ping a cada checkout, padrão do SQLAlchemy),
+  "periodic" (ping só se a conexão ficou ociosa no pool, desde o último
+  checkin, por mais de DB_PRE_PING_INTERVAL_SECONDS) ou "off"
+- DB_PGBOUNCER: modo compatível com PgBouncer em transaction pooling
+  (sem cache de prepared statements no servidor)
+
+As métricas (espera no checkout, uso de overflow, timeouts, invalidações)
+são por processo e expostas em /api/v1/health/db.
+"""
+import threading
+import time
+from typing import Dict, Optional
+from uuid import uuid4
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+
+
+PRE_PING_CHECKOUT = "checkout"
+PRE_PING_PERIODIC = "periodic"
+PRE_PING_OFF = "off"
+
+
+class PoolMetricas:
+    """Contadores de eventos de um pool (thread-safe)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.resetar()
+    
+    def resetar(self) -> None:
+        with self._lock:
+            self._dados = {
+                "conexoes_abertas": 0,
+                "checkouts": 0,
+                "checkins": 0,
+                "timeouts": 0,
+                "invalidacoes": 0,
+                "invalidacoes_suaves": 0,
+                "pings": 0,
+                "pings_falhos": 0,
+                "checkouts_com_overflow": 0,
+                "overflow_max": 0,
+                "espera_soma": 0.0,
+                "espera_max": 0.0,
+            }
+    
+    def incrementar(self, nome: str, valor: int = 1) -> None:
+        with self._lock:
+            self._dados[nome] += valor
+    
+    def registrar_espera(self, segundos: float, overflow: int) -> None:
+        with self._lock:
+            self._dados["checkouts"] += 1
+            self._dados["espera_soma"] += segundos
+            self._dados["espera_max"] = max(self._dados["espera_max"], segundos)
+            if overflow > 0:
+                self._dados["checkouts_com_overflow"] += 1
+                self._dados["overflow_max"] = max(self._dados["overflow_max"], overflow)
+    
+    def resumo(self) -> Dict[str, float]:
+        """Contadores e tempos de espera no checkout (ms)"""
+        with self._lock:
+            dados = dict(self._dados)
+        checkouts = dados.pop("checkouts")
+        soma = dados.pop("espera_soma")
+        dados["checkouts"] = checkouts
+        dados["espera_media_ms"] = round(soma / checkouts * 1000, 3) if checkouts else 0.0
+        dados["espera_max_ms"] = round(dados.pop("espera_max") * 1000, 3)
+        return dados
+
+
+class _MedirCheckout:
+    """Mede a espera por uma conexão livre (inclui abrir uma nova) e os timeouts"""
+    
+    metricas: PoolMetricas
+    
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except exc.TimeoutError:
+            self.metricas.incrementar("timeouts")
+            raise
+        self.metricas.registrar_espera(time.perf_counter() - inicio, self.overflow())
+        return conexao
+
+
+class InstrumentedQueuePool(_MedirCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_MedirCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+# Métricas por engine ("primary", "async", ...)
+_metricas: Dict[str, PoolMetricas] = {}
+
+
+def get_pool_metricas() -> Dict[str, PoolMetricas]:
+    return dict(_metricas)
+
+
+def engine_kwargs(nome: str, assincrono: bool = False, driver: Optional[str] = None) -> dict:
+    """
+    Argumentos de create_engine/create_async_engine para o pool configurado
+    
+    Args:
+        nome: Nome do engine nas métricas
+        assincrono: Engine do SQLAlchemy asyncio
+        driver: Driver da URL (ex.: "asyncpg"), para as opções do modo PgBouncer
+    """
+    metricas = _metricas.setdefault(nome, PoolMetricas())
+    pool_class = InstrumentedAsyncQueuePool if assincrono else InstrumentedQueuePool
+    kwargs = {
+        "poolclass": type(pool_class.__name__, (pool_class,), {"metricas": metricas}),
+        "pool_size": settings.DB_POOL_SIZE if not assincrono else settings.ASYNC_DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW if not assincrono else settings.ASYNC_DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_PRE_PING == PRE_PING_CHECKOUT,
+    }
+    
+    if settings.DB_PGBOUNCER and driver == "asyncpg":
+        # Em transaction pooling cada transação pode ir para outro backend:
+        # prepared statements nomeados e em cache não podem ser reaproveitados
+        kwargs["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return kwargs
+
+
+def instrumentar_engine(nome: str, engine) -> None:
+    """Registra os eventos do pool e a validação periódica (DB_PRE_PING=periodic)"""
+    metricas = _metricas.setdefault(nome, PoolMetricas())
+    
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        metricas.incrementar("conexoes_abertas")
+        connection_record.info["ociosa_desde"] = time.monotonic()
+    
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        metricas.incrementar("checkins")
+        connection_record.info["ociosa_desde"] = time.monotonic()
+    
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        metricas.incrementar("invalidacoes")
+    
+    @event.listens_for(engine, "soft_invalidate")
+    def _soft_invalidate(dbapi_connection, connection_record, exception):
+        metricas.incrementar("invalidacoes_suaves")
+    
+    if settings.DB_PRE_PING == PRE_PING_PERIODIC:
+        @event.listens_for(engine, "checkout")
+        def _validar(dbapi_connection, connection_record, connection_proxy):
+            if time.monotonic() - connection_record.info.get("ociosa_desde", 0) < settings.DB_PRE_PING_INTERVAL_SECONDS:
+                return
+            metricas.incrementar("pings")
+            try:
+                cursor = dbapi_connection.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                finally:
+                    cursor.close()
+            except Exception:
+                metricas.incrementar("pings_falhos")
+                # O pool descarta a conexão e tenta outra
+                raise exc.DisconnectionError()
+
+
+def status_pool(engine) -> dict:
+    """Estado atual do pool de um engine"""
+    pool = engine.pool
+    dados = {"classe": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        dados.update({
+            "tamanho": pool.size(),
+            "ociosas": pool.checkedin(),
+            "em_uso": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+    return dados
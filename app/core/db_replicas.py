@@ -0,0 +1,167 @@
+"""
+Roteamento de leituras para réplicas (DATABASE_REPLICA_URLS)
+
+- Rotas GET seguras usam get_read_db: a sessão lê de uma réplica escolhida
+  por round-robin ou menor número de conexões em uso (DB_REPLICA_STRATEGY).
+  Escritas e flushes sempre vão para o primário.
+- Read-your-writes: após uma escrita do usuário, as leituras dele ficam no
+  primário por DB_REPLICA_STICKY_SECONDS. A marca da escrita (assinar_escrita)
+  vai ao cliente no header X-Ultima-Escrita e no cookie arq_ultima_escrita e
+  volta nas leituras seguintes, servidas por qualquer worker; sem a marca,
+  vale só o registro local do processo que recebeu a escrita.
+- Uma réplica que falha ao conectar fica fora da seleção por
+  DB_REPLICA_RETRY_SECONDS e a sessão cai para o primário.
+"""
+import hashlib
+import hmac
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Delete, Insert, Update
+from app.core.cache import InMemoryCache
+from app.core.config import settings
+from app.core.db_pool import engine_kwargs, instrumentar_engine
+
+
+ESTRATEGIA_ROUND_ROBIN = "round_robin"
+ESTRATEGIA_MENOS_CONEXOES = "least_connections"
+
+HEADER_ULTIMA_ESCRITA = "X-Ultima-Escrita"
+COOKIE_ULTIMA_ESCRITA = "arq_ultima_escrita"
+
+
+class ReplicaSet:
+    """Engines das réplicas com seleção e controle de saúde"""
+    
+    def __init__(self, urls: List[str]):
+        self.engines: Dict[str, Engine] = {}
+        for indice, url in enumerate(urls):
+            nome = f"replica_{indice}"
+            engine = create_engine(
+                url,
+                echo=settings.DATABASE_ECHO,
+                **engine_kwargs(nome, driver=make_url(url).get_driver_name())
+            )
+            instrumentar_engine(nome, engine)
+            self._monitorar(nome, engine)
+            self.engines[nome] = engine
+        self._nomes = list(self.engines)
+        self._ciclo = itertools.cycle(self._nomes)
+        self._lock = threading.Lock()
+        self._indisponivel_ate: Dict[str, float] = {}
+    
+    def _monitorar(self, nome: str, engine: Engine) -> None:
+        """Tira a réplica da seleção quando o driver reporta desconexão"""
+        @event.listens_for(engine, "handle_error")
+        def _erro(context):
+            if context.is_disconnect:
+                self.marcar_indisponivel(nome)
+    
+    def escolher(self) -> Optional[str]:
+        """Nome da réplica para a próxima sessão ou None se nenhuma estiver saudável"""
+        agora = time.monotonic()
+        with self._lock:
+            saudaveis = [nome for nome in self._nomes if self._indisponivel_ate.get(nome, 0) <= agora]
+            if not saudaveis:
+                return None
+            if settings.DB_REPLICA_STRATEGY == ESTRATEGIA_MENOS_CONEXOES:
+                return min(saudaveis, key=lambda nome: self.engines[nome].pool.checkedout())
+            for _ in self._nomes:
+                nome = next(self._ciclo)
+                if nome in saudaveis:
+                    return nome
+        return None
+    
+    def marcar_indisponivel(self, nome: str) -> None:
+        with self._lock:
+            self._indisponivel_ate[nome] = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+    
+    def saudavel(self, nome: str) -> bool:
+        with self._lock:
+            return self._indisponivel_ate.get(nome, 0) <= time.monotonic()
+
+
+class RoutingSession(Session):
+    """
+    Sessão que envia leituras para a réplica definida em info["replica"]
+    
+    Sem réplica definida (ou com escrita/flush em andamento) usa o bind
+    padrão, que é o engine primário.
+    """
+    
+    replicas: Optional[ReplicaSet] = None
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        nome = self.info.get("replica")
+        if (
+            nome
+            and self.replicas is not None
+            and not self._flushing
+            and not isinstance(clause, (Insert, Update, Delete))
+        ):
+            return self.replicas.engines[nome]
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def usar_primario(db: Session) -> None:
+    """Faz as próximas consultas da sessão irem para o primário"""
+    db.info.pop("replica", None)
+
+
+# Última escrita por usuário neste processo (clientes que não devolvem a marca)
+_escritas = InMemoryCache(max_size=100000, ttl_seconds=settings.DB_REPLICA_STICKY_SECONDS)
+
+
+def _assinatura(conteudo: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), f"escrita:{conteudo}".encode(), hashlib.sha256).hexdigest()
+
+
+def assinar_escrita(user_id: int, momento: Optional[float] = None) -> str:
+    """Marca "<user_id>.<ms>.<hmac>" da última escrita do usuário"""
+    conteudo = f"{user_id}.{int((time.time() if momento is None else momento) * 1000)}"
+    return f"{conteudo}.{_assinatura(conteudo)}"
+
+
+def _marca_valida(user_id: int, marca: Optional[str]) -> bool:
+    """Marca assinada do próprio usuário e ainda dentro da janela de aderência"""
+    try:
+        dono, milissegundos, assinatura = (marca or "").split(".")
+        if int(dono) != user_id:
+            return False
+        idade = time.time() - int(milissegundos) / 1000
+    except ValueError:
+        return False
+    return (
+        hmac.compare_digest(assinatura, _assinatura(f"{dono}.{milissegundos}"))
+        and 0 <= idade < settings.DB_REPLICA_STICKY_SECONDS
+    )
+
+
+def registrar_escrita(user_id: int) -> None:
+    """Mantém as leituras do usuário no primário pela janela de aderência (neste processo)"""
+    if settings.DATABASE_REPLICA_URLS and settings.DB_REPLICA_STICKY_SECONDS > 0:
+        _escritas.set(user_id, True)
+
+
+def escreveu_recentemente(user_id: Optional[int], marca: Optional[str] = None) -> bool:
+    """Se o usuário escreveu há menos de DB_REPLICA_STICKY_SECONDS (marca do cliente ou registro local)"""
+    if user_id is None:
+        return False
+    return _escritas.get(user_id) is not None or _marca_valida(user_id, marca)
+
+
+def usuario_do_token(authorization: Optional[str]) -> Optional[int]:
+    """ID do usuário do header Authorization (sem validar o restante do contexto)"""
+    from app.core.security import decode_token
+    
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    payload = decode_token(authorization[7:])
+    try:
+        return int(payload["sub"]) if payload else None
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,176 @@
+"""
+Métricas da aplicação no formato do Prometheus
+
+- Latência das requisições por rota (template, não o caminho real), método
+  e status, e requisições em andamento
+- Quantidade de comandos SQL e tempo de banco por requisição, coletados
+  pelos eventos before/after_cursor_execute de todos os engines
+- Contadores da fila de auditoria e tempos do pipeline de upload
+
+Com vários workers, defina PROMETHEUS_MULTIPROC_DIR (diretório vazio a cada
+inicialização) para que /metrics agregue os valores de todos os processos;
+no gunicorn, chame marcar_processo_encerrado no hook child_exit.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+
+ROTA_NAO_ENCONTRADA = "<nao_encontrada>"
+
+# Faixas em segundos: requisições típicas ficam entre 5ms e 1s
+_FAIXAS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_FAIXAS_COMANDOS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+REQUISICAO_DURACAO = Histogram(
+    "http_request_duration_seconds",
+    "Duração das requisições HTTP",
+    ("method", "route", "status"),
+    buckets=_FAIXAS_LATENCIA,
+)
+REQUISICOES_EM_ANDAMENTO = Gauge(
+    "http_requests_in_progress",
+    "Requisições HTTP em andamento",
+    ("method",),
+    multiprocess_mode="livesum",
+)
+REQUISICAO_COMANDOS_SQL = Histogram(
+    "http_request_db_statements",
+    "Comandos SQL executados por requisição",
+    ("route",),
+    buckets=_FAIXAS_COMANDOS,
+)
+REQUISICAO_TEMPO_BANCO = Histogram(
+    "http_request_db_seconds",
+    "Tempo gasto no banco por requisição",
+    ("route",),
+    buckets=_FAIXAS_LATENCIA,
+)
+COMANDOS_SQL = Counter(
+    "db_statements_total",
+    "Comandos SQL executados (inclusive fora de requisições)",
+)
+AUDITORIA_EVENTOS = Counter(
+    "audit_events_total",
+    "Eventos da fila de auditoria (enfileirados, gravados, descartados, falhas, retentativas, lotes)",
+    ("evento",),
+)
+AUDITORIA_FILA = Gauge(
+    "audit_queue_size",
+    "Registros de auditoria aguardando gravação",
+    multiprocess_mode="livesum",
+)
+UPLOAD_ETAPA_DURACAO = Histogram(
+    "upload_stage_duration_seconds",
+    "Duração de cada etapa do pipeline de upload",
+    ("stage",),
+    buckets=_FAIXAS_LATENCIA,
+)
+
+
+class _BancoNaRequisicao:
+    """Acumulador do banco da requisição atual (compartilhado com as threads do threadpool)"""
+    
+    __slots__ = ("comandos", "segundos")
+    
+    def __init__(self):
+        self.comandos = 0
+        self.segundos = 0.0
+
+
+_banco_atual: ContextVar[Optional[_BancoNaRequisicao]] = ContextVar("banco_atual", default=None)
+
+
+def _antes_do_comando(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metricas_inicio", []).append(time.perf_counter())
+
+
+def _depois_do_comando(conn, cursor, statement, parameters, context, executemany):
+    inicio = conn.info["metricas_inicio"].pop()
+    COMANDOS_SQL.inc()
+    banco = _banco_atual.get()
+    if banco is not None:
+        banco.comandos += 1
+        banco.segundos += time.perf_counter() - inicio
+
+
+def _erro_no_comando(context):
+    # after_cursor_execute não é chamado quando o comando falha
+    conn = context.connection
+    if conn is not None and conn.info.get("metricas_inicio"):
+        conn.info["metricas_inicio"].pop()
+
+
+def registrar_eventos_banco() -> None:
+    """Mede os comandos SQL de todos os engines (idempotente)"""
+    if event.contains(Engine, "before_cursor_execute", _antes_do_comando):
+        return
+    event.listen(Engine, "before_cursor_execute", _antes_do_comando)
+    event.listen(Engine, "after_cursor_execute", _depois_do_comando)
+    event.listen(Engine, "handle_error", _erro_no_comando)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP
+    
+    A rota é o template do FastAPI (ex.: /api/v1/clientes/{cliente_id}),
+    disponível no escopo depois do roteamento; caminhos sem rota usam um
+    rótulo único para não criar séries ilimitadas.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == settings.METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+        
+        metodo = scope["method"]
+        status = 500
+        
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+        
+        banco = _BancoNaRequisicao()
+        token = _banco_atual.set(banco)
+        em_andamento = REQUISICOES_EM_ANDAMENTO.labels(metodo)
+        em_andamento.inc()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracao = time.perf_counter() - inicio
+            em_andamento.dec()
+            _banco_atual.reset(token)
+            rota = getattr(scope.get("route"), "path", ROTA_NAO_ENCONTRADA)
+            REQUISICAO_DURACAO.labels(metodo, rota, str(status)).observe(duracao)
+            REQUISICAO_COMANDOS_SQL.labels(rota).observe(banco.comandos)
+            REQUISICAO_TEMPO_BANCO.labels(rota).observe(banco.segundos)
+
+
+def gerar_metricas() -> tuple:
+    """(corpo, content-type) de /metrics, agregando os workers se multiprocesso"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def marcar_processo_encerrado(pid: int) -> None:
+    """Remove os gauges do worker encerrado (hook child_exit do gunicorn)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,46 @@
+"""
+Cache do usuário autenticado (principal) usado por get_current_user
+
+Guarda apenas os dados de identidade necessários para autorizar a
+requisição. Toda alteração de usuário que afete esses dados (ativo,
+nome, email, perfil, senha) deve chamar invalidar_principal.
+"""
+from typing import Iterable, Optional
+from app.core.cache import CacheBackend, InMemoryCache
+from app.core.config import settings
+
+
+_backend: CacheBackend = InMemoryCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def set_principal_cache_backend(backend: CacheBackend) -> None:
+    """Substitui o backend do cache (ex.: por um cache compartilhado)"""
+    global _backend
+    _backend = backend
+
+
+def get_principal(user_id: int) -> Optional[dict]:
+    """Retorna o principal em cache ou None"""
+    if not settings.PRINCIPAL_CACHE_ENABLED:
+        return None
+    return _backend.get(user_id)
+
+
+def set_principal(user_id: int, principal: dict) -> None:
+    """Armazena o principal no cache"""
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        _backend.set(user_id, principal)
+
+
+def invalidar_principal(user_id: int) -> None:
+    """Remove o usuário do cache após alterações"""
+    _backend.delete(user_id)
+
+
+def invalidar_principais(user_ids: Iterable[int]) -> None:
+    """Remove vários usuários do cache"""
+    for user_id in user_ids:
+        _backend.delete(user_id)
@@ -0,0 +1,153 @@
+"""
+Profiler de SQL por requisição (desenvolvimento/homologação)
+
+Com SQL_PROFILER_ENABLED, registra cada comando da requisição com seu tempo
+e uma impressão digital (SQL normalizado, sem literais nem parâmetros) e:
+- envia o header Server-Timing (tempo de banco, quantidade de comandos e
+  tempo total da aplicação até o início da resposta);
+- aponta N+1 quando a mesma impressão digital roda mais de
+  SQL_PROFILER_N_PLUS_ONE_THRESHOLD vezes na requisição;
+- registra as requisições acima de SQL_PROFILER_SLOW_REQUEST_MS com os
+  comandos que mais pesaram.
+
+Desligado (padrão), nem os eventos nem o middleware são registrados.
+"""
+import re
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+
+_LITERAL_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETRO = re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+|\?")
+_LISTA_IN = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES = re.compile(r"\bVALUES\s*\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*", re.IGNORECASE)
+_ESPACOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def impressao_digital(sql: str) -> str:
+    """SQL normalizado: literais e parâmetros viram ?, listas IN/VALUES colapsadas"""
+    sql = _LITERAL_TEXTO.sub("?", sql)
+    sql = _PARAMETRO.sub("?", sql)
+    sql = _NUMERO.sub("?", sql)
+    sql = _LISTA_IN.sub("IN (...)", sql)
+    sql = _VALUES.sub("VALUES (...)", sql)
+    return _ESPACOS.sub(" ", sql).strip()
+
+
+class PerfilRequisicao:
+    """Comandos executados em uma requisição"""
+    
+    __slots__ = ("inicio", "comandos")
+    
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.comandos: List[Tuple[str, float]] = []
+    
+    @property
+    def tempo_banco(self) -> float:
+        return sum(duracao for _, duracao in self.comandos)
+    
+    def agrupar(self) -> List[Dict]:
+        """Comandos agrupados por impressão digital, do maior tempo total para o menor"""
+        grupos: Dict[str, List[float]] = defaultdict(list)
+        for sql, duracao in self.comandos:
+            grupos[impressao_digital(sql)].append(duracao)
+        resumo = [
+            {"sql": sql, "vezes": len(duracoes), "total_ms": round(sum(duracoes) * 1000, 2)}
+            for sql, duracoes in grupos.items()
+        ]
+        return sorted(resumo, key=lambda grupo: grupo["total_ms"], reverse=True)
+    
+    def suspeitas_n_mais_um(self, limite: int) -> List[Dict]:
+        return [grupo for grupo in self.agrupar() if grupo["vezes"] > limite]
+
+
+_perfil_atual: ContextVar[Optional[PerfilRequisicao]] = ContextVar("perfil_sql", default=None)
+
+
+def _antes_do_comando(conn, cursor, statement, parameters, context, executemany):
+    if _perfil_atual.get() is not None:
+        conn.info.setdefault("profiler_inicio", []).append(time.perf_counter())
+
+
+def _depois_do_comando(conn, cursor, statement, parameters, context, executemany):
+    perfil = _perfil_atual.get()
+    inicios = conn.info.get("profiler_inicio")
+    if perfil is not None and inicios:
+        perfil.comandos.append((statement, time.perf_counter() - inicios.pop()))
+
+
+def _erro_no_comando(context):
+    conn = context.connection
+    if conn is not None and conn.info.get("profiler_inicio"):
+        conn.info["profiler_inicio"].pop()
+
+
+def registrar_eventos_profiler() -> None:
+    """Registra os eventos de cursor em todos os engines (idempotente)"""
+    if event.contains(Engine, "before_cursor_execute", _antes_do_comando):
+        return
+    event.listen(Engine, "before_cursor_execute", _antes_do_comando)
+    event.listen(Engine, "after_cursor_execute", _depois_do_comando)
+    event.listen(Engine, "handle_error", _erro_no_comando)
+
+
+def _server_timing(perfil: PerfilRequisicao) -> bytes:
+    total = (time.perf_counter() - perfil.inicio) * 1000
+    banco = perfil.tempo_banco * 1000
+    return (
+        f'db;dur={banco:.1f};desc="{len(perfil.comandos)} comandos SQL", app;dur={total:.1f}'
+    ).encode("latin-1")
+
+
+def _relatar(metodo: str, caminho: str, perfil: PerfilRequisicao) -> None:
+    duracao_ms = (time.perf_counter() - perfil.inicio) * 1000
+    suspeitas = perfil.suspeitas_n_mais_um(settings.SQL_PROFILER_N_PLUS_ONE_THRESHOLD)
+    for grupo in suspeitas:
+        print(
+            f"⚠️ Possível N+1 em {metodo} {caminho}: {grupo['vezes']}x ({grupo['total_ms']}ms) {grupo['sql'][:300]}"
+        )
+    
+    if duracao_ms >= settings.SQL_PROFILER_SLOW_REQUEST_MS:
+        principais = perfil.agrupar()[:settings.SQL_PROFILER_TOP]
+        print(
+            f"🐢 Requisição lenta {metodo} {caminho}: {duracao_ms:.1f}ms, "
+            f"{len(perfil.comandos)} comandos SQL em {perfil.tempo_banco * 1000:.1f}ms"
+        )
+        for grupo in principais:
+            print(f"    {grupo['vezes']}x {grupo['total_ms']}ms {grupo['sql'][:300]}")
+
+
+class SQLProfilerMiddleware:
+    """Middleware ASGI que ativa o profiler para cada requisição HTTP"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        perfil = PerfilRequisicao()
+        token = _perfil_atual.set(perfil)
+        
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                mensagem["headers"] = [*mensagem.get("headers", []), (b"server-timing", _server_timing(perfil))]
+            await send(mensagem)
+        
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _perfil_atual.reset(token)
+            rota = getattr(scope.get("route"), "path", scope["path"])
+            _relatar(scope["method"], rota, perfil)
@@ -1,20 +1,34 @@
+from typing import AsyncGenerator, Optional
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.db_pool import engine_kwargs, instrumentar_engine
+from app.core.db_replicas import (
+    COOKIE_ULTIMA_ESCRITA, HEADER_ULTIMA_ESCRITA, ReplicaSet, RoutingSession,
+    escreveu_recentemente, usar_primario, usuario_do_token
+)
 
-# Create engine
+# Create engine (pool configurado em Settings: DB_POOL_*, DB_PRE_PING, DB_PGBOUNCER)
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    **engine_kwargs("primary", driver=make_url(settings.DATABASE_URL).get_driver_name())
 )
+instrumentar_engine("primary", engine)
 
 # Create session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Réplicas de leitura (DATABASE_REPLICA_URLS): usadas apenas via get_read_db
+replicas: Optional[ReplicaSet] = ReplicaSet(settings.DATABASE_REPLICA_URLS) if settings.DATABASE_REPLICA_URLS else None
+RoutingSession.replicas = replicas
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
 # Base class for models
 Base = declarative_base()
 
@@ -26,3 +40,103 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def marca_ultima_escrita(request: Request) -> Optional[str]:
+    """Marca da última escrita devolvida pelo cliente (header X-Ultima-Escrita ou cookie)"""
+    return request.headers.get(HEADER_ULTIMA_ESCRITA) or request.cookies.get(COOKIE_ULTIMA_ESCRITA)
+
+
+def abrir_sessao_leitura(authorization: Optional[str] = None, ultima_escrita: Optional[str] = None) -> Session:
+    """
+    Sessão somente leitura em uma réplica (o chamador fecha a sessão)
+    
+    Usa o primário se não houver réplicas, se o usuário do token escreveu há
+    menos de DB_REPLICA_STICKY_SECONDS (marca ultima_escrita ou registro do
+    processo) ou se a réplica escolhida não aceitar conexão.
+    """
+    db = ReadSessionLocal()
+    try:
+        if replicas is not None and not escreveu_recentemente(usuario_do_token(authorization), ultima_escrita):
+            nome = replicas.escolher()
+            if nome:
+                db.info["replica"] = nome
+                try:
+                    # Conecta já para poder cair para o primário antes da primeira consulta
+                    db.connection()
+                except OperationalError:
+                    replicas.marcar_indisponivel(nome)
+                    db.rollback()
+                    usar_primario(db)
+    except Exception:
+        db.close()
+        raise
+    return db
+
+
+def get_read_db(request: Request):
+    """Dependency para rotas GET somente leitura: sessão em uma réplica (ver abrir_sessao_leitura)"""
+    db = abrir_sessao_leitura(request.headers.get("authorization"), marca_ultima_escrita(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Engine assíncrono (asyncpg), criado sob demanda para as rotas de leitura
+# habilitadas em ASYNC_ROUTERS; as demais rotas seguem no engine síncrono
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+
+def get_async_database_url() -> str:
+    """URL do engine assíncrono: ASYNC_DATABASE_URL ou DATABASE_URL com o driver asyncpg"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """Engine assíncrono (criado na primeira chamada)"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        url = get_async_database_url()
+        _async_engine = create_async_engine(
+            url,
+            echo=settings.DATABASE_ECHO,
+            **engine_kwargs("async", assincrono=True, driver=make_url(url).get_driver_name())
+        )
+        instrumentar_engine("async", _async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Nova sessão assíncrona"""
+    get_async_engine()
+    return _AsyncSessionLocal()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency para obter sessão assíncrona do banco"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_engine_if_started() -> Optional[AsyncEngine]:
+    """Engine assíncrono, se já tiver sido criado"""
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Fecha as conexões do engine assíncrono (shutdown)"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
@@ -1,6 +1,5 @@
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -8,6 +7,15 @@ from pydantic import ValidationError
 from pathlib import Path
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.api import uploads, metrics
+from app.core.metrics import MetricsMiddleware, registrar_eventos_banco
+from app.core.sql_profiler import SQLProfilerMiddleware, registrar_eventos_profiler
+from app.services.auditoria_writer import iniciar_auditoria_writer, parar_auditoria_writer
+from app.utils.upload import shutdown_upload_pool
+from app.database import dispose_async_engine
+from app.core.db_replicas import (
+    COOKIE_ULTIMA_ESCRITA, HEADER_ULTIMA_ESCRITA, assinar_escrita, registrar_escrita, usuario_do_token
+)
 
 # Create FastAPI app
 app = FastAPI(
@@ -57,6 +65,39 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Read-your-writes: após uma escrita bem-sucedida, as leituras do usuário
+# ficam no primário por DB_REPLICA_STICKY_SECONDS (ver get_read_db). A marca
+# assinada vai no header e no cookie para valer em qualquer worker
+@app.middleware("http")
+async def registrar_escritas(request: Request, call_next):
+    response = await call_next(request)
+    if (
+        settings.DATABASE_REPLICA_URLS
+        and settings.DB_REPLICA_STICKY_SECONDS > 0
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        user_id = usuario_do_token(request.headers.get("authorization"))
+        if user_id is not None:
+            registrar_escrita(user_id)
+            marca = assinar_escrita(user_id)
+            response.headers[HEADER_ULTIMA_ESCRITA] = marca
+            response.set_cookie(
+                COOKIE_ULTIMA_ESCRITA, marca, max_age=settings.DB_REPLICA_STICKY_SECONDS,
+                httponly=True, samesite="lax"
+            )
+    return response
+
+# Métricas: latência por rota e tempo de banco por requisição (/metrics)
+if settings.METRICS_ENABLED:
+    registrar_eventos_banco()
+    app.add_middleware(MetricsMiddleware)
+
+# Profiler de SQL (Server-Timing, N+1 e requisições lentas); desligado por padrão
+if settings.SQL_PROFILER_ENABLED:
+    registrar_eventos_profiler()
+    app.add_middleware(SQLProfilerMiddleware)
+
 # Handler para erros de validação
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -105,10 +146,13 @@ async def general_exception_handler(request: Request, exc: Exception):
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
-# Servir arquivos estáticos de upload
+# Servir arquivos de upload (cache imutável, Range e envio opcional pelo proxy)
 upload_dir = Path(settings.UPLOAD_DIR)
 upload_dir.mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=str(upload_dir)), name="uploads")
+app.include_router(uploads.router)
+
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 
 @app.get("/", tags=["root"])
@@ -137,9 +181,14 @@ async def startup_event():
     print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} iniciado!")
     print(f"📚 Documentação: http://{settings.HOST}:{settings.PORT}/docs")
     print(f"🔧 Ambiente: {settings.ENVIRONMENT}")
+    iniciar_auditoria_writer()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Evento executado ao encerrar a aplicação"""
     print("👋 Encerrando aplicação...")
+    # Grava os registros de auditoria ainda na fila
+    parar_auditoria_writer()
+    shutdown_upload_pool()
+    await dispose_async_engine()
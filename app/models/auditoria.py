@@ -1,8 +1,12 @@
 """
 Modelo de Auditoria/Logs
 Registra todas as ações dos usuários por escritório
+
+No PostgreSQL a tabela é particionada por mês em timestamp (ver
+AuditoriaManutencaoService), por isso a PK é (id, timestamp).
 """
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.base import BaseModel
@@ -11,30 +15,25 @@ from app.models.base import BaseModel
 class Auditoria(BaseModel):
     """Modelo de Auditoria - Registra ações dos usuários"""
     __tablename__ = "auditoria"
+    __table_args__ = (
+        Index("ix_auditoria_escritorio_timestamp", "escritorio_id", "timestamp", "id"),
+        Index("ix_auditoria_entidade", "entidade", "entidade_id", "timestamp"),
+        Index("ix_auditoria_usuario_timestamp", "usuario_id", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
     
-    usuario_id = Column(Integer, ForeignKey('colaborador.id'), nullable=False, index=True)
-    escritorio_id = Column(Integer, ForeignKey('escritorio.id'), nullable=True, index=True)  # Nullable para ações administrativas
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    usuario_id = Column(Integer, ForeignKey('colaborador.id'), nullable=False)
+    escritorio_id = Column(Integer, ForeignKey('escritorio.id'), nullable=True)  # Nullable para ações administrativas
     acao = Column(String(100), nullable=False)  # CREATE, UPDATE, DELETE, VIEW, LOGIN, etc.
     entidade = Column(String(100), nullable=False)  # Cliente, Projeto, Proposta, etc.
     entidade_id = Column(Integer, nullable=True)  # ID da entidade afetada
     descricao = Column(Text)  # Descrição detalhada da ação
     ip_address = Column(String(45))  # IPv4 ou IPv6
     user_agent = Column(String(500))  # User agent do navegador
-    dados_anteriores = Column(Text)  # JSON com dados antes da alteração (para UPDATE)
-    dados_novos = Column(Text)  # JSON com dados após a alteração (para UPDATE)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    dados_anteriores = Column(JSON().with_variant(JSONB, "postgresql"))  # Dados antes da alteração (para UPDATE)
+    dados_novos = Column(JSON().with_variant(JSONB, "postgresql"))  # Dados após a alteração (para UPDATE)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, primary_key=True)
     
     def __repr__(self):
         return f"<Auditoria(id={self.id}, usuario_id={self.usuario_id}, acao='{self.acao}', entidade='{self.entidade}')>"
-
-
-
-
-
-
-
-
-
-
-
-
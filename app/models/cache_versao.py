@@ -0,0 +1,20 @@
+"""
+Modelo de Versão de Cache
+Contador por (escritório, escopo) incrementado a cada escrita que invalida
+o cache do escopo; as chaves de cache levam a versão, então todos os
+workers deixam de usar as entradas antigas. escritorio_id = 0 é a versão
+geral do escopo (invalida todos os escritórios).
+"""
+from sqlalchemy import Column, Integer, BigInteger, String
+from app.models.base import Base
+
+
+class CacheVersao(Base):
+    __tablename__ = "cache_versao"
+    
+    escritorio_id = Column(Integer, primary_key=True)  # 0 = todos os escritórios
+    escopo = Column(String(50), primary_key=True)  # hierarquia, relatorios
+    versao = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<CacheVersao(escritorio_id={self.escritorio_id}, escopo={self.escopo}, versao={self.versao})>"
@@ -20,7 +20,7 @@ class Etapa(Base, TimestampMixin):
     
     # Relacionamentos
     servico = relationship("Servico", back_populates="etapas")
-    tarefas = relationship("Tarefa", back_populates="etapa", cascade="all, delete-orphan", order_by="Tarefa.ordem")
+    tarefas = relationship("Tarefa", back_populates="etapa", cascade="all, delete-orphan", order_by="[Tarefa.ordem, Tarefa.id]")
     
     def __repr__(self):
         return f"<Etapa(id={self.id}, nome='{self.nome}', servico_id={self.servico_id})>"
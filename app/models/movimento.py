@@ -1,13 +1,16 @@
 """
 Modelo de Movimento Financeiro
 """
-from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base, TimestampMixin
 
 
 class Movimento(Base, TimestampMixin):
     __tablename__ = "movimentos"
+    __table_args__ = (
+        Index("ix_movimentos_escritorio_data_entrada", "escritorio_id", "data_entrada"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     projeto_id = Column(Integer, ForeignKey("projetos.id"), nullable=True)
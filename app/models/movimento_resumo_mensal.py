@@ -0,0 +1,23 @@
+"""
+Modelo de Resumo Mensal de Movimentos
+Totais pré-agregados por (escritório, mês, tipo, plano de contas), mantidos
+incrementalmente pelo MovimentoRepository
+"""
+from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey
+from app.models.base import Base
+
+
+class MovimentoResumoMensal(Base):
+    __tablename__ = "movimento_resumo_mensal"
+    
+    escritorio_id = Column(Integer, ForeignKey("escritorio.id"), primary_key=True)
+    mes = Column(Date, primary_key=True)  # Primeiro dia do mês de data_entrada
+    tipo = Column(Integer, primary_key=True)
+    codigo_plano_contas = Column(String(50), primary_key=True, default="")  # "" = sem plano de contas
+    
+    # Apenas movimentos ativos
+    quantidade = Column(Integer, nullable=False, default=0)
+    total = Column(Numeric(15, 2), nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<MovimentoResumoMensal(escritorio_id={self.escritorio_id}, mes={self.mes}, tipo={self.tipo}, total={self.total})>"
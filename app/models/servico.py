@@ -20,7 +20,10 @@ class Servico(Base, TimestampMixin):
     escritorio_id = Column(Integer, ForeignKey("escritorio.id"), nullable=False, index=True)
     
     # Relacionamentos
-    etapas = relationship("Etapa", back_populates="servico", cascade="all, delete-orphan")
+    etapas = relationship(
+        "Etapa", back_populates="servico", cascade="all, delete-orphan",
+        order_by="[Etapa.ordem, Etapa.id]"
+    )
     
     def __repr__(self):
         return f"<Servico(id={self.id}, nome='{self.nome}')>"
@@ -0,0 +1,21 @@
+"""
+Modelo de Blob de Upload
+Arquivo armazenado por conteúdo (hash), compartilhado entre os registros que o referenciam
+"""
+from sqlalchemy import Column, Integer, BigInteger, String, JSON
+from app.models.base import BaseModel, TimestampMixin
+
+
+class UploadBlob(BaseModel, TimestampMixin):
+    """Arquivo endereçado por conteúdo com contagem de referências"""
+    __tablename__ = "upload_blobs"
+    
+    hash = Column(String(64), nullable=False, unique=True)  # sha256 do arquivo processado
+    origem_hash = Column(String(64), nullable=True, index=True)  # sha256 do upload original (evita reprocessar)
+    caminho = Column(String(500), nullable=False, unique=True)  # Caminho relativo em UPLOAD_DIR
+    tamanho = Column(BigInteger, nullable=False)  # Bytes do arquivo principal
+    variantes = Column(JSON, nullable=True)  # {"64": {"webp": ..., "jpg": ...}, ...}
+    ref_count = Column(Integer, nullable=False, default=0, index=True)
+    
+    def __repr__(self):
+        return f"<UploadBlob(id={self.id}, caminho='{self.caminho}', ref_count={self.ref_count})>"
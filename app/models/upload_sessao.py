@@ -0,0 +1,29 @@
+"""
+Modelo de Sessão de Upload
+Upload em partes (retomável) de documentos de projeto
+"""
+from sqlalchemy import Column, Integer, String, Text, BigInteger, ForeignKey, DateTime, JSON
+from app.models.base import BaseModel, TimestampMixin
+
+
+class UploadSessao(BaseModel, TimestampMixin):
+    """Sessão de upload em partes de um ProjetoDocumento"""
+    __tablename__ = "upload_sessoes"
+    
+    token = Column(String(36), nullable=False, unique=True, index=True)  # Identificador público (uuid4)
+    escritorio_id = Column(Integer, ForeignKey('escritorio.id'), nullable=False, index=True)
+    projeto_id = Column(Integer, ForeignKey('projetos.id'), nullable=False)
+    usuario_id = Column(Integer, ForeignKey('colaborador.id'), nullable=False)
+    nome = Column(String(255), nullable=False)
+    extensao = Column(String(10))
+    tipo_documento_id = Column(Integer)
+    observacao = Column(Text)
+    tamanho = Column(BigInteger, nullable=False)  # Tamanho total do arquivo em bytes
+    sha256 = Column(String(64))  # Checksum informado na criação (opcional)
+    intervalos = Column(JSON, nullable=False, default=list)  # Intervalos recebidos [[inicio, fim), ...]
+    status = Column(String(20), nullable=False, default="ativa")  # ativa, finalizada, cancelada
+    expira_em = Column(DateTime(timezone=True), nullable=False, index=True)
+    documento_id = Column(Integer, ForeignKey('projeto_documento.id'), nullable=True)
+    
+    def __repr__(self):
+        return f"<UploadSessao(token='{self.token}', nome='{self.nome}', status='{self.status}')>"
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, Table, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, Date, Table, ForeignKey, UniqueConstraint, JSON
 from sqlalchemy.orm import relationship
+from app.core.config import settings
 from app.models.base import BaseModel, TimestampMixin
+from app.utils.variantes import get_variant_path
 
 
 # Tabela de associação User <-> Escritorio (mantida para compatibilidade)
@@ -59,9 +61,15 @@ class Escritorio(BaseModel, TimestampMixin):
     observacao_contrato_padrao = Column(String(1000))
     ativo = Column(Boolean, default=True)
     logo = Column(String(500), nullable=True)  # Caminho da logo do escritório
+    logo_variantes = Column(JSON, nullable=True)  # {"64": {"webp": ..., "jpg": ...}, ...}
     
     # Relacionamentos
     colaboradores = relationship("User", secondary=user_escritorio, back_populates="escritorios")
+    
+    @property
+    def logo_miniatura(self):
+        """Variante da logo usada em listagens e cabeçalho (lida pelo EscritorioResponse)"""
+        return get_variant_path(self.logo, self.logo_variantes, settings.IMAGE_LIST_VARIANT_SIZE)
 
 
 class User(BaseModel, TimestampMixin):
@@ -78,6 +86,7 @@ class User(BaseModel, TimestampMixin):
     tipo = Column(String(20), default="Geral")  # Geral, Terceirizado
     ativo = Column(Boolean, default=True)
     foto = Column(String(500))
+    foto_variantes = Column(JSON, nullable=True)  # {"64": {"webp": ..., "jpg": ...}, ...}
     ultimo_acesso = Column(Date)
     is_system_admin = Column(Boolean, default=False)  # Admin do sistema
     
@@ -89,5 +98,10 @@ class User(BaseModel, TimestampMixin):
     escritorios = relationship("Escritorio", secondary=user_escritorio, back_populates="colaboradores")
     perfis_escritorio = relationship("ColaboradorEscritorioPerfil", backref="colaborador", cascade="all, delete-orphan")
     
+    @property
+    def foto_miniatura(self):
+        """Variante da foto usada em listagens e avatares (lida pelo UserResponse)"""
+        return get_variant_path(self.foto, self.foto_variantes, settings.IMAGE_LIST_VARIANT_SIZE)
+    
     def __repr__(self):
         return f"<User {self.nome} ({self.email})>"
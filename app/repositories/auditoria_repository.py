@@ -0,0 +1,50 @@
+"""
+Repositório de Auditoria
+"""
+from typing import List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.models.auditoria import Auditoria
+from app.utils.pagination import paginate_by_cursor
+
+
+class AuditoriaRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        entidade: Optional[str] = None,
+        entidade_id: Optional[int] = None,
+        usuario_id: Optional[int] = None,
+        acao: Optional[str] = None,
+        data_inicio: Optional[datetime] = None,
+        data_fim: Optional[datetime] = None
+    ) -> Tuple[List[Auditoria], Optional[str]]:
+        """
+        Lista registros paginando por (timestamp, id) decrescente, isolados por escritório
+        
+        Usa ix_auditoria_escritorio_timestamp; com entidade informada, ix_auditoria_entidade.
+        Filtros de período limitam as partições lidas.
+        """
+        query = self.db.query(Auditoria).filter(Auditoria.escritorio_id == escritorio_id)
+        
+        if entidade:
+            query = query.filter(Auditoria.entidade == entidade)
+            if entidade_id is not None:
+                query = query.filter(Auditoria.entidade_id == entidade_id)
+        if usuario_id is not None:
+            query = query.filter(Auditoria.usuario_id == usuario_id)
+        if acao:
+            query = query.filter(Auditoria.acao == acao)
+        if data_inicio:
+            query = query.filter(Auditoria.timestamp >= data_inicio)
+        if data_fim:
+            query = query.filter(Auditoria.timestamp < data_fim)
+        
+        return paginate_by_cursor(
+            query, [Auditoria.timestamp, Auditoria.id], cursor, limit, descending=True
+        )
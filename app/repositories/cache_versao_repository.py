@@ -0,0 +1,56 @@
+"""
+Versões de cache compartilhadas entre os workers (tabela cache_versao)
+
+A versão de um escopo para o escritório é a soma do contador do escritório
+com o contador geral (escritorio_id = 0); como os dois só crescem, qualquer
+invalidação produz uma versão nova. A versão deve ser lida na mesma sessão
+(e antes) da carga dos dados: numa réplica atrasada, versão e dados são do
+mesmo ponto do log, e uma carga concorrente com uma escrita fica salva sob
+a versão antiga, que ninguém mais consulta.
+"""
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.cache_versao import CacheVersao
+
+
+ESCOPO_HIERARQUIA = "hierarquia"
+ESCOPO_RELATORIOS = "relatorios"
+
+TODOS_ESCRITORIOS = 0
+
+
+def consulta_versao(escopo: str, escritorio_id: int):
+    """SELECT da versão atual do escopo para o escritório (também usado pelas sessões assíncronas)"""
+    return select(func.coalesce(func.sum(CacheVersao.versao), 0)).where(
+        CacheVersao.escopo == escopo,
+        CacheVersao.escritorio_id.in_((TODOS_ESCRITORIOS, escritorio_id))
+    )
+
+
+class CacheVersaoRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def obter(self, escopo: str, escritorio_id: int) -> int:
+        """Versão atual do escopo para o escritório"""
+        return int(self.db.execute(consulta_versao(escopo, escritorio_id)).scalar())
+    
+    def incrementar(self, escopo: str, escritorio_id: Optional[int] = None) -> None:
+        """
+        Incrementa a versão do escritório (ou a geral, se None)
+        
+        Roda em uma transação própria no primário, depois do commit da
+        escrita: não expira os objetos da sessão nem depende do commit dela.
+        """
+        chave = {"escritorio_id": escritorio_id or TODOS_ESCRITORIOS, "escopo": escopo}
+        engine = self.db.get_bind(clause=CacheVersao.__table__.insert())
+        dialeto = postgresql if engine.dialect.name == "postgresql" else sqlite
+        comando = dialeto.insert(CacheVersao).values(**chave, versao=1)
+        comando = comando.on_conflict_do_update(
+            index_elements=[CacheVersao.escritorio_id, CacheVersao.escopo],
+            set_={"versao": CacheVersao.versao + 1}
+        )
+        with engine.begin() as conexao:
+            conexao.execute(comando)
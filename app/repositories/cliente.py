@@ -1,13 +1,20 @@
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from app.models.cliente import Cliente
 from app.schemas.cliente import ClienteCreate, ClienteUpdate
-from typing import List, Optional
+from app.repositories.search import TextSearch
+from app.utils.pagination import paginate_by_cursor, fetch_page_with_total
+from typing import List, Optional, Tuple
+
+
+# Campos usados na busca textual (indexados pela migração de busca trigram)
+CAMPOS_BUSCA = (Cliente.nome, Cliente.email, Cliente.identificacao, Cliente.cidade)
 
 
 class ClienteRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.text_search = TextSearch(db)
     
     def get_all(
         self, 
@@ -19,6 +26,46 @@ class ClienteRepository:
         search: Optional[str] = None
     ) -> List[Cliente]:
         """Lista todos os clientes com filtros, isolados por escritório"""
+        query = self._filtered_query(escritorio_id, ativo, tipo_pessoa, search)
+        ordem = self.text_search.order_by(CAMPOS_BUSCA, search, [Cliente.nome, Cliente.id])
+        return query.order_by(*ordem).offset(skip).limit(limit).all()
+    
+    def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[Cliente], Optional[str]]:
+        """Lista clientes paginando por (nome, id), isolados por escritório"""
+        query = self._filtered_query(escritorio_id, ativo, tipo_pessoa, search)
+        return paginate_by_cursor(query, [Cliente.nome, Cliente.id], cursor, limit)
+    
+    def get_page_with_total(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None,
+        approximate: bool = False
+    ) -> Tuple[List[Cliente], int, bool]:
+        """Lista clientes e total do filtro em uma única consulta, isolados por escritório"""
+        query = self._filtered_query(escritorio_id, ativo, tipo_pessoa, search)
+        ordem = self.text_search.order_by(CAMPOS_BUSCA, search, [Cliente.nome, Cliente.id])
+        return fetch_page_with_total(query, ordem, skip, limit, approximate)
+    
+    def _filtered_query(
+        self,
+        escritorio_id: int,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None
+    ):
+        """Query base com os filtros da listagem, isolada por escritório"""
         query = self.db.query(Cliente).filter(Cliente.escritorio_id == escritorio_id)
         
         if ativo is not None:
@@ -28,16 +75,9 @@ class ClienteRepository:
             query = query.filter(Cliente.tipo_pessoa == tipo_pessoa)
         
         if search:
-            query = query.filter(
-                or_(
-                    Cliente.nome.ilike(f"%{search}%"),
-                    Cliente.email.ilike(f"%{search}%"),
-                    Cliente.identificacao.ilike(f"%{search}%"),
-                    Cliente.cidade.ilike(f"%{search}%")
-                )
-            )
+            query = query.filter(self.text_search.condition(CAMPOS_BUSCA, search))
         
-        return query.offset(skip).limit(limit).all()
+        return query
     
     def get_by_id(self, cliente_id: int, escritorio_id: int) -> Optional[Cliente]:
         """Busca cliente por ID, garantindo que pertence ao escritório"""
@@ -62,12 +102,32 @@ class ClienteRepository:
     
     def create(self, cliente: ClienteCreate, escritorio_id: int) -> Cliente:
         """Cria novo cliente, vinculado ao escritório"""
+        db_cliente = Cliente(**self._dados_cliente(cliente, escritorio_id))
+        self.db.add(db_cliente)
+        self.db.commit()
+        self.db.refresh(db_cliente)
+        return db_cliente
+    
+    def create_em_lote(self, clientes: List[ClienteCreate], escritorio_id: int) -> None:
+        """Insere vários clientes com INSERT multi-linha (sem commit), vinculados ao escritório"""
+        if clientes:
+            self.db.execute(insert(Cliente), [self._dados_cliente(cliente, escritorio_id) for cliente in clientes])
+    
+    def get_identificacoes(self, escritorio_id: int) -> List[str]:
+        """CPF/CNPJ de todos os clientes do escritório"""
+        return self.db.execute(
+            select(Cliente.identificacao).where(Cliente.escritorio_id == escritorio_id)
+        ).scalars().all()
+    
+    @staticmethod
+    def _dados_cliente(cliente: ClienteCreate, escritorio_id: int) -> dict:
+        """Colunas do banco a partir do schema de criação"""
         # Mapear campos do frontend para o banco
         # Priorizar campos separados, usar endereco como fallback
         logradouro = cliente.logradouro or cliente.endereco
         uf = cliente.uf or cliente.estado
         
-        cliente_data = {
+        return {
             'nome': cliente.nome,
             'email': cliente.email,
             'telefone': cliente.telefone,
@@ -85,12 +145,6 @@ class ClienteRepository:
             'ativo': cliente.ativo if cliente.ativo is not None else True,
             'escritorio_id': escritorio_id
         }
-        
-        db_cliente = Cliente(**cliente_data)
-        self.db.add(db_cliente)
-        self.db.commit()
-        self.db.refresh(db_cliente)
-        return db_cliente
     
     def update(self, cliente_id: int, cliente: ClienteUpdate, escritorio_id: int) -> Optional[Cliente]:
         """Atualiza cliente, garantindo que pertence ao escritório"""
@@ -154,6 +208,40 @@ class ClienteRepository:
         self.db.commit()
         return True
     
+    def get_exportacao(
+        self,
+        escritorio_id: int,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None
+    ):
+        """Cabeçalho e consulta de colunas (sem objetos ORM) para exportação, com os filtros da listagem"""
+        colunas = [
+            ("ID", Cliente.id),
+            ("Nome", Cliente.nome),
+            ("Razão social", Cliente.razao_social),
+            ("Tipo de pessoa", Cliente.tipo_pessoa),
+            ("Identificação", Cliente.identificacao),
+            ("E-mail", Cliente.email),
+            ("Telefone", Cliente.telefone),
+            ("WhatsApp", Cliente.whatsapp),
+            ("Data de nascimento", Cliente.data_nascimento),
+            ("Logradouro", Cliente.logradouro),
+            ("Número", Cliente.numero),
+            ("Complemento", Cliente.complemento),
+            ("Bairro", Cliente.bairro),
+            ("Cidade", Cliente.cidade),
+            ("UF", Cliente.uf),
+            ("CEP", Cliente.cep),
+            ("Inscrição estadual", Cliente.inscricao_estadual),
+            ("Inscrição municipal", Cliente.inscricao_municipal),
+            ("Ativo", Cliente.ativo),
+        ]
+        query = self._filtered_query(escritorio_id, ativo, tipo_pessoa, search)
+        ordem = self.text_search.order_by(CAMPOS_BUSCA, search, [Cliente.nome, Cliente.id])
+        query = query.with_entities(*(coluna for _, coluna in colunas)).order_by(*ordem)
+        return [titulo for titulo, _ in colunas], query
+    
     def count(
         self,
         escritorio_id: int,
@@ -162,22 +250,4 @@ class ClienteRepository:
         search: Optional[str] = None
     ) -> int:
         """Conta total de clientes com filtros, isolados por escritório"""
-        query = self.db.query(Cliente).filter(Cliente.escritorio_id == escritorio_id)
-        
-        if ativo is not None:
-            query = query.filter(Cliente.ativo == ativo)
-        
-        if tipo_pessoa:
-            query = query.filter(Cliente.tipo_pessoa == tipo_pessoa)
-        
-        if search:
-            query = query.filter(
-                or_(
-                    Cliente.nome.ilike(f"%{search}%"),
-                    Cliente.email.ilike(f"%{search}%"),
-                    Cliente.identificacao.ilike(f"%{search}%"),
-                    Cliente.cidade.ilike(f"%{search}%")
-                )
-            )
-        
-        return query.count()
+        return self._filtered_query(escritorio_id, ativo, tipo_pessoa, search).count()
@@ -0,0 +1,103 @@
+"""
+Repositório assíncrono de Clientes (listagem)
+
+Mesmos filtros e ordenação de ClienteRepository, com select() em uma
+AsyncSession. Usado pelas rotas habilitadas em ASYNC_ROUTERS.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.cliente import Cliente
+from app.repositories.cliente import CAMPOS_BUSCA
+from app.repositories.search import TextSearch
+from app.utils.pagination import paginate_by_cursor_async, fetch_page_with_total_async
+
+
+class ClienteAsyncRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.text_search: Optional[TextSearch] = None
+    
+    async def _busca(self) -> TextSearch:
+        """TextSearch da sessão (a verificação do trigram é aguardada na primeira busca)"""
+        if self.text_search is None:
+            self.text_search = await TextSearch.criar_async(self.db)
+        return self.text_search
+    
+    async def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[Cliente], Optional[str]]:
+        """Lista clientes paginando por (nome, id), isolados por escritório"""
+        busca = await self._busca()
+        stmt = self._filtered_select(busca, escritorio_id, ativo, tipo_pessoa, search)
+        return await paginate_by_cursor_async(self.db, stmt, [Cliente.nome, Cliente.id], cursor, limit)
+    
+    async def get_page_with_total(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None,
+        approximate: bool = False
+    ) -> Tuple[List[Cliente], int, bool]:
+        """Lista clientes e total do filtro em uma única consulta, isolados por escritório"""
+        busca = await self._busca()
+        stmt = self._filtered_select(busca, escritorio_id, ativo, tipo_pessoa, search)
+        ordem = busca.order_by(CAMPOS_BUSCA, search, [Cliente.nome, Cliente.id])
+        return await fetch_page_with_total_async(self.db, stmt, ordem, skip, limit, approximate)
+    
+    async def count(
+        self,
+        escritorio_id: int,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> int:
+        """Conta total de clientes com filtros, isolados por escritório"""
+        busca = await self._busca()
+        stmt = self._filtered_select(busca, escritorio_id, ativo, tipo_pessoa, search)
+        result = await self.db.execute(select(func.count()).select_from(stmt.subquery()))
+        return result.scalar_one()
+    
+    async def get_nomes(self, cliente_ids: Iterable[int], escritorio_id: int) -> Dict[int, str]:
+        """Nomes dos clientes informados em uma única consulta (id -> nome)"""
+        ids = set(cliente_ids)
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(Cliente.id, Cliente.nome).where(
+                Cliente.id.in_(ids),
+                Cliente.escritorio_id == escritorio_id
+            )
+        )
+        return {cliente_id: nome for cliente_id, nome in result.all()}
+    
+    def _filtered_select(
+        self,
+        busca: TextSearch,
+        escritorio_id: int,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None
+    ):
+        """select() base com os filtros da listagem, isolado por escritório"""
+        stmt = select(Cliente).where(Cliente.escritorio_id == escritorio_id)
+        
+        if ativo is not None:
+            stmt = stmt.where(Cliente.ativo == ativo)
+        
+        if tipo_pessoa:
+            stmt = stmt.where(Cliente.tipo_pessoa == tipo_pessoa)
+        
+        if search:
+            stmt = stmt.where(busca.condition(CAMPOS_BUSCA, search))
+        
+        return stmt
@@ -3,7 +3,9 @@ Repositório de Etapas
 """
 from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.etapa import Etapa
+from app.repositories.ordenacao import atualizar_ordem
 from app.schemas.servico import EtapaCreate, EtapaUpdate
 
 
@@ -49,6 +51,21 @@ class EtapaRepository:
         self.db.refresh(etapa)
         return etapa
     
+    def reordenar(self, etapas: List[Etapa], etapa_ids: List[int], escritorio_id: int) -> List[Etapa]:
+        """
+        Grava a nova ordem (etapa_ids na ordem desejada) com um único UPDATE (sem commit)
+        
+        `etapas` são as já carregadas do serviço; recebem os valores gravados sem
+        refresh e voltam ordenadas pela nova ordem.
+        """
+        gravados = atualizar_ordem(self.db, Etapa.__table__, etapa_ids, escritorio_id)
+        for etapa in etapas:
+            if etapa.id in gravados:
+                ordem, updated_at = gravados[etapa.id]
+                set_committed_value(etapa, "ordem", ordem)
+                set_committed_value(etapa, "updated_at", updated_at)
+        return sorted(etapas, key=lambda etapa: (etapa.ordem or 0, etapa.id))
+    
     def delete(self, etapa_id: int, escritorio_id: int) -> bool:
         """Deleta etapa, garantindo que pertence ao escritório"""
         etapa = self.get_by_id(etapa_id, escritorio_id)
@@ -1,17 +1,28 @@
 """
 Repositório de Movimentos Financeiros
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import date
+from decimal import Decimal
+from sqlalchemy import String, case, cast, insert
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, extract
 from app.models.movimento import Movimento
+from app.models.projeto import Projeto
 from app.schemas.movimento import MovimentoCreate, MovimentoUpdate
+from app.repositories.movimento_resumo_repository import (
+    MovimentoResumoRepository, contribuicao, inicio_do_mes, proximo_mes
+)
+from app.utils.pagination import paginate_by_cursor, fetch_page_with_total
+
+
+# Rótulos de Movimento.tipo
+TIPOS_MOVIMENTO = {1: "Despesa", 2: "Receita", 3: "Transferência"}
 
 
 class MovimentoRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.resumo = MovimentoResumoRepository(db)
     
     def get_all(
         self,
@@ -25,7 +36,62 @@ class MovimentoRepository:
         ativo: Optional[bool] = None
     ) -> List[Movimento]:
         """Lista todos os movimentos com filtros, isolados por escritório"""
-        query = self.db.query(Movimento).filter(Movimento.escritorio_id == escritorio_id).options(joinedload(Movimento.projeto))
+        query = self._filtered_query(
+            escritorio_id, tipo, projeto_id, data_inicio, data_fim, ativo
+        ).options(joinedload(Movimento.projeto))
+        
+        return query.order_by(Movimento.data_entrada.desc(), Movimento.id.desc()).offset(skip).limit(limit).all()
+    
+    def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        tipo: Optional[int] = None,
+        projeto_id: Optional[int] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        ativo: Optional[bool] = None
+    ) -> Tuple[List[Movimento], Optional[str]]:
+        """Lista movimentos paginando por (data_entrada, id) decrescente, isolados por escritório"""
+        query = self._filtered_query(
+            escritorio_id, tipo, projeto_id, data_inicio, data_fim, ativo
+        ).options(joinedload(Movimento.projeto))
+        return paginate_by_cursor(
+            query, [Movimento.data_entrada, Movimento.id], cursor, limit, descending=True
+        )
+    
+    def get_page_with_total(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        tipo: Optional[int] = None,
+        projeto_id: Optional[int] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        ativo: Optional[bool] = None,
+        approximate: bool = False
+    ) -> Tuple[List[Movimento], int, bool]:
+        """Lista movimentos e total do filtro em uma única consulta, isolados por escritório"""
+        query = self._filtered_query(
+            escritorio_id, tipo, projeto_id, data_inicio, data_fim, ativo
+        ).options(joinedload(Movimento.projeto))
+        return fetch_page_with_total(
+            query, [Movimento.data_entrada.desc(), Movimento.id.desc()], skip, limit, approximate
+        )
+    
+    def _filtered_query(
+        self,
+        escritorio_id: int,
+        tipo: Optional[int] = None,
+        projeto_id: Optional[int] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        ativo: Optional[bool] = None
+    ):
+        """Query base com os filtros da listagem, isolada por escritório"""
+        query = self.db.query(Movimento).filter(Movimento.escritorio_id == escritorio_id)
         
         if tipo:
             query = query.filter(Movimento.tipo == tipo)
@@ -42,7 +108,7 @@ class MovimentoRepository:
         if ativo is not None:
             query = query.filter(Movimento.ativo == ativo)
         
-        return query.order_by(Movimento.data_entrada.desc()).offset(skip).limit(limit).all()
+        return query
     
     def get_by_id(self, movimento_id: int, escritorio_id: int) -> Optional[Movimento]:
         """Busca movimento por ID, garantindo que pertence ao escritório"""
@@ -53,40 +119,120 @@ class MovimentoRepository:
             Movimento.escritorio_id == escritorio_id
         ).first()
     
+    def _get_para_escrita(self, movimento_id: int, escritorio_id: int) -> Optional[Movimento]:
+        """Busca e bloqueia o movimento até o commit (o delta do resumo parte do estado lido)"""
+        return self.db.query(Movimento).filter(
+            Movimento.id == movimento_id,
+            Movimento.escritorio_id == escritorio_id
+        ).with_for_update().first()
+    
     def create(self, movimento_data: MovimentoCreate, escritorio_id: int) -> Movimento:
         """Cria novo movimento, vinculado ao escritório"""
         movimento_dict = movimento_data.model_dump()
         movimento_dict['escritorio_id'] = escritorio_id
         movimento = Movimento(**movimento_dict)
         self.db.add(movimento)
+        self.db.flush()
+        self.resumo.aplicar(None, contribuicao(movimento))
         self.db.commit()
         self.db.refresh(movimento)
         return movimento
     
+    def create_em_lote(self, movimentos: List[MovimentoCreate], escritorio_id: int) -> None:
+        """
+        Insere vários movimentos com INSERT multi-linha (sem commit), vinculados ao escritório
+        
+        Os totais entram no resumo mensal com um único upsert por lote; após o
+        commit, o serviço deve chamar invalidar_relatorios.
+        """
+        if not movimentos:
+            return
+        linhas = [{**movimento.model_dump(), 'escritorio_id': escritorio_id} for movimento in movimentos]
+        self.db.execute(insert(Movimento), linhas)
+        
+        deltas: Dict[tuple, tuple] = {}
+        for linha in linhas:
+            if linha['ativo'] is not True:
+                continue
+            chave = (escritorio_id, inicio_do_mes(linha['data_entrada']), linha['tipo'], linha['codigo_plano_contas'] or "")
+            quantidade, total = deltas.get(chave, (0, Decimal(0)))
+            deltas[chave] = (quantidade + 1, total + linha['valor'])
+        self.resumo.aplicar_deltas(deltas)
+    
     def update(self, movimento_id: int, movimento_data: MovimentoUpdate, escritorio_id: int) -> Optional[Movimento]:
         """Atualiza movimento, garantindo que pertence ao escritório"""
-        movimento = self.get_by_id(movimento_id, escritorio_id)
+        movimento = self._get_para_escrita(movimento_id, escritorio_id)
         if not movimento:
             return None
         
+        anterior = contribuicao(movimento)
         update_data = movimento_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(movimento, field, value)
         
+        self.db.flush()
+        self.resumo.aplicar(anterior, contribuicao(movimento))
         self.db.commit()
         self.db.refresh(movimento)
         return movimento
     
     def delete(self, movimento_id: int, escritorio_id: int) -> bool:
         """Remove movimento, garantindo que pertence ao escritório"""
-        movimento = self.get_by_id(movimento_id, escritorio_id)
+        movimento = self._get_para_escrita(movimento_id, escritorio_id)
         if not movimento:
             return False
         
+        self.resumo.aplicar(contribuicao(movimento), None)
         self.db.delete(movimento)
         self.db.commit()
         return True
     
+    def get_exportacao(
+        self,
+        escritorio_id: int,
+        tipo: Optional[int] = None,
+        projeto_id: Optional[int] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        ativo: Optional[bool] = None
+    ):
+        """Cabeçalho e consulta de colunas (sem objetos ORM) para exportação, com os filtros da listagem"""
+        colunas = [
+            ("ID", Movimento.id),
+            ("Data de entrada", Movimento.data_entrada),
+            ("Data de efetivação", Movimento.data_efetivacao),
+            ("Competência", Movimento.competencia),
+            ("Tipo", case(TIPOS_MOVIMENTO, value=Movimento.tipo, else_=cast(Movimento.tipo, String))),
+            ("Descrição", Movimento.descricao),
+            ("Observação", Movimento.observacao),
+            ("Projeto", Projeto.descricao),
+            ("Valor", Movimento.valor),
+            ("Acréscimo", Movimento.valor_acrescido),
+            ("Desconto", Movimento.valor_desconto),
+            ("Valor resultante", Movimento.valor_resultante),
+            ("Plano de contas", Movimento.codigo_plano_contas),
+            ("Ativo", Movimento.ativo),
+        ]
+        query = self._filtered_query(
+            escritorio_id, tipo, projeto_id, data_inicio, data_fim, ativo
+        ).outerjoin(Movimento.projeto)
+        query = query.with_entities(*(coluna for _, coluna in colunas)).order_by(
+            Movimento.data_entrada, Movimento.id
+        )
+        return [titulo for titulo, _ in colunas], query
+    
+    def count(
+        self,
+        escritorio_id: int,
+        tipo: Optional[int] = None,
+        projeto_id: Optional[int] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        ativo: Optional[bool] = None
+    ) -> int:
+        """Conta total de movimentos com filtros, isolados por escritório"""
+        return self._filtered_query(escritorio_id, tipo, projeto_id, data_inicio, data_fim, ativo).count()
+    
     def get_resumo(
         self,
         escritorio_id: int,
@@ -94,31 +240,33 @@ class MovimentoRepository:
         data_fim: Optional[date] = None,
         tipo: Optional[int] = None
     ) -> dict:
-        """Retorna resumo financeiro, isolado por escritório"""
-        query = self.db.query(
-            func.sum(Movimento.valor).label('total')
-        ).filter(
-            Movimento.ativo == True,
-            Movimento.escritorio_id == escritorio_id
-        )
-        
-        if data_inicio:
-            query = query.filter(Movimento.data_entrada >= data_inicio)
-        
-        if data_fim:
-            query = query.filter(Movimento.data_entrada <= data_fim)
-        
-        if tipo:
-            query = query.filter(Movimento.tipo == tipo)
-        
-        result = query.first()
-        return {"total": float(result.total) if result.total else 0.0}
+        """Retorna resumo financeiro, isolado por escritório (a partir do resumo mensal)"""
+        total = self.resumo.get_total(escritorio_id, data_inicio, data_fim, tipo)
+        return {"total": float(total)}
+    
+    def get_resumo_mensal(
+        self,
+        escritorio_id: int,
+        mes_inicio: Optional[date] = None,
+        mes_fim: Optional[date] = None
+    ) -> dict:
+        """Receitas, despesas e saldo mês a mês e no período, isolados por escritório"""
+        meses = self.resumo.get_mensal(escritorio_id, mes_inicio, mes_fim)
+        receitas = sum(mes["receitas"] for mes in meses)
+        despesas = sum(mes["despesas"] for mes in meses)
+        return {
+            "meses": meses,
+            "receitas": receitas,
+            "despesas": despesas,
+            "saldo": receitas - despesas,
+        }
     
     def get_por_mes(self, escritorio_id: int, ano: int, mes: int) -> List[Movimento]:
         """Retorna movimentos de um mês específico, isolados por escritório"""
+        inicio = date(ano, mes, 1)
         return self.db.query(Movimento).filter(
             Movimento.escritorio_id == escritorio_id,
-            extract('year', Movimento.data_entrada) == ano,
-            extract('month', Movimento.data_entrada) == mes,
+            Movimento.data_entrada >= inicio,
+            Movimento.data_entrada < proximo_mes(inicio),
             Movimento.ativo == True
         ).order_by(Movimento.data_entrada).all()
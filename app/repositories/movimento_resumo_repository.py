@@ -0,0 +1,274 @@
+"""
+Repositório do Resumo Mensal de Movimentos
+
+Cada movimento ativo contribui com (1, valor) para a linha
+(escritório, mês de data_entrada, tipo, plano de contas). Criações,
+alterações e exclusões aplicam deltas com upsert atômico na mesma transação
+do movimento; reconstruir() refaz a tabela a partir dos movimentos.
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import Date, and_, cast, delete, false, func, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.movimento import Movimento
+from app.models.movimento_resumo_mensal import MovimentoResumoMensal
+
+
+TIPO_DESPESA = 1
+TIPO_RECEITA = 2
+
+
+class Contribuicao(NamedTuple):
+    """Parcela de um movimento no resumo"""
+    escritorio_id: int
+    mes: date
+    tipo: int
+    codigo_plano_contas: str
+    valor: Decimal
+
+
+def inicio_do_mes(dia: date) -> date:
+    return dia.replace(day=1)
+
+
+def proximo_mes(dia: date) -> date:
+    return (dia.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def ultimo_dia_do_mes(dia: date) -> bool:
+    return proximo_mes(dia) - timedelta(days=1) == dia
+
+
+def dividir_periodo(
+    data_inicio: Optional[date],
+    data_fim: Optional[date]
+) -> Tuple[Optional[Tuple[Optional[date], Optional[date]]], List[Tuple[date, date]]]:
+    """
+    Separa o período em meses inteiros e dias avulsos nas pontas
+    
+    Retorna ((primeiro_mes, ultimo_mes) ou None se não há mês inteiro,
+    [(inicio, fim), ...] dos dias avulsos). Extremos None = sem limite;
+    período invertido (início depois do fim) não tem meses nem dias.
+    """
+    if data_inicio and data_fim and data_inicio > data_fim:
+        return None, []
+    if data_inicio and data_fim and inicio_do_mes(data_inicio) == inicio_do_mes(data_fim):
+        if data_inicio.day != 1 or not ultimo_dia_do_mes(data_fim):
+            return None, [(data_inicio, data_fim)]
+    
+    primeiro_mes = None
+    ultimo_mes = None
+    faixas = []
+    if data_inicio:
+        primeiro_mes = inicio_do_mes(data_inicio)
+        if data_inicio.day != 1:
+            primeiro_mes = proximo_mes(data_inicio)
+            faixas.append((data_inicio, primeiro_mes - timedelta(days=1)))
+    
+    if data_fim:
+        ultimo_mes = inicio_do_mes(data_fim)
+        if not ultimo_dia_do_mes(data_fim):
+            faixas.append((ultimo_mes, data_fim))
+            ultimo_mes = inicio_do_mes(ultimo_mes - timedelta(days=1))
+    
+    if primeiro_mes and ultimo_mes and primeiro_mes > ultimo_mes:
+        return None, faixas
+    return (primeiro_mes, ultimo_mes), faixas
+
+
+def contribuicao(movimento: Movimento) -> Optional[Contribuicao]:
+    """Contribuição do movimento no estado atual (None se inativo)"""
+    if movimento.ativo is not True:
+        return None
+    return Contribuicao(
+        movimento.escritorio_id,
+        inicio_do_mes(movimento.data_entrada),
+        movimento.tipo,
+        movimento.codigo_plano_contas or "",
+        Decimal(movimento.valor),
+    )
+
+
+class MovimentoResumoRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def aplicar(self, anterior: Optional[Contribuicao], atual: Optional[Contribuicao]) -> None:
+        """Troca a contribuição anterior pela atual (sem commit)"""
+        if anterior == atual:
+            return
+        deltas: Dict[tuple, tuple] = {}
+        for item, sinal in ((anterior, -1), (atual, 1)):
+            if item is None:
+                continue
+            chave = item[:4]
+            quantidade, total = deltas.get(chave, (0, Decimal(0)))
+            deltas[chave] = (quantidade + sinal, total + sinal * item.valor)
+        self.aplicar_deltas(deltas)
+    
+    def aplicar_deltas(self, deltas: Dict[tuple, tuple]) -> None:
+        """
+        Soma deltas às linhas do resumo (sem commit)
+        
+        Args:
+            deltas: {(escritorio_id, mes, tipo, codigo_plano_contas): (quantidade, total)}
+        """
+        linhas = [
+            {
+                "escritorio_id": escritorio_id,
+                "mes": mes,
+                "tipo": tipo,
+                "codigo_plano_contas": codigo,
+                "quantidade": quantidade,
+                "total": total,
+            }
+            # Ordem fixa das chaves evita deadlock entre transações concorrentes
+            for (escritorio_id, mes, tipo, codigo), (quantidade, total) in sorted(deltas.items())
+            if quantidade or total
+        ]
+        if not linhas:
+            return
+        comando = insert(MovimentoResumoMensal).values(linhas)
+        self.db.execute(comando.on_conflict_do_update(
+            index_elements=["escritorio_id", "mes", "tipo", "codigo_plano_contas"],
+            set_={
+                "quantidade": MovimentoResumoMensal.quantidade + comando.excluded.quantidade,
+                "total": MovimentoResumoMensal.total + comando.excluded.total,
+            }
+        ))
+    
+    def reconstruir(self, escritorio_id: Optional[int] = None) -> int:
+        """
+        Recalcula o resumo a partir dos movimentos (backfill/correção)
+        
+        Bloqueia escritas em movimentos até o commit para que nenhum delta
+        concorrente se perca. Retorna o número de linhas geradas.
+        """
+        self.db.execute(text("LOCK TABLE movimentos IN SHARE MODE"))
+        
+        remover = delete(MovimentoResumoMensal)
+        mes = cast(func.date_trunc("month", Movimento.data_entrada), Date)
+        codigo = func.coalesce(Movimento.codigo_plano_contas, "")
+        origem = select(
+            Movimento.escritorio_id, mes, Movimento.tipo, codigo, func.count(), func.sum(Movimento.valor)
+        ).where(Movimento.ativo == True).group_by(Movimento.escritorio_id, mes, Movimento.tipo, codigo)
+        if escritorio_id is not None:
+            remover = remover.where(MovimentoResumoMensal.escritorio_id == escritorio_id)
+            origem = origem.where(Movimento.escritorio_id == escritorio_id)
+        
+        self.db.execute(remover)
+        resultado = self.db.execute(
+            insert(MovimentoResumoMensal).from_select(
+                ["escritorio_id", "mes", "tipo", "codigo_plano_contas", "quantidade", "total"], origem
+            )
+        )
+        self.db.commit()
+        return resultado.rowcount
+    
+    def get_total(
+        self,
+        escritorio_id: int,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        tipo: Optional[int] = None
+    ) -> Decimal:
+        """Soma dos movimentos ativos no período"""
+        lancamentos = self.lancamentos(escritorio_id, data_inicio, data_fim, tipo)
+        return self.db.execute(select(func.sum(lancamentos.c.total))).scalar() or Decimal(0)
+    
+    def lancamentos(
+        self,
+        escritorio_id: int,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        tipo: Optional[int] = None
+    ):
+        """
+        Subconsulta (mes, tipo, codigo_plano_contas, total) dos movimentos ativos no período
+        
+        Meses inteiros vêm do resumo; os dias avulsos nas pontas do período
+        (no máximo dois meses parciais) vêm dos movimentos por faixa de data.
+        """
+        meses, faixas = dividir_periodo(data_inicio, data_fim)
+        partes = []
+        
+        if meses is not None:
+            primeiro_mes, ultimo_mes = meses
+            parte = select(
+                MovimentoResumoMensal.mes,
+                MovimentoResumoMensal.tipo,
+                MovimentoResumoMensal.codigo_plano_contas,
+                MovimentoResumoMensal.total,
+            ).where(MovimentoResumoMensal.escritorio_id == escritorio_id)
+            if primeiro_mes:
+                parte = parte.where(MovimentoResumoMensal.mes >= primeiro_mes)
+            if ultimo_mes:
+                parte = parte.where(MovimentoResumoMensal.mes <= ultimo_mes)
+            if tipo:
+                parte = parte.where(MovimentoResumoMensal.tipo == tipo)
+            partes.append(parte)
+        
+        for inicio, fim in faixas:
+            # Faixa de data_entrada: usa o índice (escritorio_id, data_entrada)
+            parte = select(
+                cast(func.date_trunc("month", Movimento.data_entrada), Date).label("mes"),
+                Movimento.tipo,
+                func.coalesce(Movimento.codigo_plano_contas, "").label("codigo_plano_contas"),
+                Movimento.valor.label("total"),
+            ).where(
+                Movimento.escritorio_id == escritorio_id,
+                Movimento.ativo == True,
+                and_(Movimento.data_entrada >= inicio, Movimento.data_entrada <= fim)
+            )
+            if tipo:
+                parte = parte.where(Movimento.tipo == tipo)
+            partes.append(parte)
+        
+        if not partes:
+            # Período invertido: subconsulta vazia com as mesmas colunas
+            partes.append(select(
+                MovimentoResumoMensal.mes,
+                MovimentoResumoMensal.tipo,
+                MovimentoResumoMensal.codigo_plano_contas,
+                MovimentoResumoMensal.total,
+            ).where(false()))
+        
+        consulta = partes[0] if len(partes) == 1 else union_all(*partes)
+        return consulta.subquery("lancamentos")
+    
+    def get_mensal(
+        self,
+        escritorio_id: int,
+        mes_inicio: Optional[date] = None,
+        mes_fim: Optional[date] = None
+    ) -> List[dict]:
+        """Receitas, despesas e saldo por mês (meses entre mes_inicio e mes_fim)"""
+        receitas = func.sum(MovimentoResumoMensal.total).filter(MovimentoResumoMensal.tipo == TIPO_RECEITA)
+        despesas = func.sum(MovimentoResumoMensal.total).filter(MovimentoResumoMensal.tipo == TIPO_DESPESA)
+        query = self.db.query(
+            MovimentoResumoMensal.mes,
+            func.coalesce(receitas, 0).label("receitas"),
+            func.coalesce(despesas, 0).label("despesas"),
+            func.sum(MovimentoResumoMensal.quantidade).label("quantidade"),
+        ).filter(MovimentoResumoMensal.escritorio_id == escritorio_id)
+        
+        if mes_inicio:
+            query = query.filter(MovimentoResumoMensal.mes >= inicio_do_mes(mes_inicio))
+        if mes_fim:
+            query = query.filter(MovimentoResumoMensal.mes <= inicio_do_mes(mes_fim))
+        
+        linhas = query.group_by(MovimentoResumoMensal.mes).having(
+            func.sum(MovimentoResumoMensal.quantidade) > 0
+        ).order_by(MovimentoResumoMensal.mes).all()
+        return [
+            {
+                "mes": linha.mes.strftime("%Y-%m"),
+                "receitas": float(linha.receitas),
+                "despesas": float(linha.despesas),
+                "saldo": float(linha.receitas - linha.despesas),
+                "quantidade": int(linha.quantidade),
+            }
+            for linha in linhas
+        ]
@@ -0,0 +1,40 @@
+"""
+Reordenação em lote (campo ordem) com um único UPDATE
+
+No PostgreSQL as novas posições vão em UPDATE ... FROM (VALUES (id, ordem), ...);
+em outros bancos, como SQLite nos testes locais, em um SET ordem = CASE id ...
+Em ambos os casos é uma instrução só, sem commit, e os valores gravados
+voltam via RETURNING para atualizar os objetos já carregados sem refresh.
+"""
+from datetime import datetime
+from typing import Dict, List, Tuple
+from sqlalchemy import Integer, Table, case, column, update, values
+from sqlalchemy.orm import Session
+
+
+def atualizar_ordem(db: Session, tabela: Table, ids: List[int], escritorio_id: int) -> Dict[int, Tuple[int, datetime]]:
+    """
+    Grava ordem = posição na lista para cada ID (sem commit)
+    
+    Returns:
+        {id: (ordem, updated_at)} das linhas atualizadas
+    """
+    if not ids:
+        return {}
+    
+    if db.get_bind().dialect.name == "postgresql":
+        novas = values(
+            column("id", Integer), column("ordem", Integer), name="novas"
+        ).data([(registro_id, ordem) for ordem, registro_id in enumerate(ids)])
+        comando = update(tabela).where(
+            tabela.c.id == novas.c.id,
+            tabela.c.escritorio_id == escritorio_id
+        ).values(ordem=novas.c.ordem)
+    else:
+        comando = update(tabela).where(
+            tabela.c.id.in_(ids),
+            tabela.c.escritorio_id == escritorio_id
+        ).values(ordem=case({registro_id: ordem for ordem, registro_id in enumerate(ids)}, value=tabela.c.id))
+    
+    resultado = db.execute(comando.returning(tabela.c.id, tabela.c.ordem, tabela.c.updated_at))
+    return {linha.id: (linha.ordem, linha.updated_at) for linha in resultado}
@@ -0,0 +1,107 @@
+"""
+Repositório assíncrono de Projetos (listagem)
+
+Mesmos filtros e ordenação de ProjetoRepository, com select() em uma
+AsyncSession. Usado pelas rotas habilitadas em ASYNC_ROUTERS.
+"""
+from typing import List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.projeto import Projeto
+from app.repositories.projeto_repository import CAMPOS_BUSCA
+from app.repositories.search import TextSearch
+from app.utils.pagination import paginate_by_cursor_async, fetch_page_with_total_async
+
+
+class ProjetoAsyncRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.text_search: Optional[TextSearch] = None
+    
+    async def _busca(self) -> TextSearch:
+        """TextSearch da sessão (a verificação do trigram é aguardada na primeira busca)"""
+        if self.text_search is None:
+            self.text_search = await TextSearch.criar_async(self.db)
+        return self.text_search
+    
+    async def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[Projeto], Optional[str]]:
+        """Lista projetos paginando por (data_inicio, id) decrescente, isolados por escritório"""
+        busca = await self._busca()
+        stmt = self._filtered_select(busca, escritorio_id, ativo, cliente_id, status_id, search).options(
+            selectinload(Projeto.colaboradores)
+        )
+        return await paginate_by_cursor_async(
+            self.db, stmt, [Projeto.data_inicio, Projeto.id], cursor, limit, descending=True
+        )
+    
+    async def get_page_with_total(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        search: Optional[str] = None,
+        approximate: bool = False
+    ) -> Tuple[List[Projeto], int, bool]:
+        """Lista projetos e total do filtro em uma única consulta, isolados por escritório"""
+        # Sem lazy load em AsyncSession: carrega tudo que ProjetoResponse serializa
+        busca = await self._busca()
+        stmt = self._filtered_select(busca, escritorio_id, ativo, cliente_id, status_id, search).options(
+            selectinload(Projeto.colaboradores)
+        )
+        ordem = busca.order_by(
+            CAMPOS_BUSCA, search, [Projeto.data_inicio.desc(), Projeto.id.desc()]
+        )
+        return await fetch_page_with_total_async(self.db, stmt, ordem, skip, limit, approximate)
+    
+    async def count(
+        self,
+        escritorio_id: int,
+        ativo: Optional[bool] = None,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> int:
+        """Conta total de projetos com filtros, isolados por escritório"""
+        busca = await self._busca()
+        stmt = self._filtered_select(busca, escritorio_id, ativo, cliente_id, status_id, search)
+        result = await self.db.execute(select(func.count()).select_from(stmt.subquery()))
+        return result.scalar_one()
+    
+    def _filtered_select(
+        self,
+        busca: TextSearch,
+        escritorio_id: int,
+        ativo: Optional[bool] = None,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        search: Optional[str] = None
+    ):
+        """select() base com os filtros da listagem, isolado por escritório"""
+        stmt = select(Projeto).where(Projeto.escritorio_id == escritorio_id)
+        
+        if ativo is not None:
+            stmt = stmt.where(Projeto.ativo == ativo)
+        
+        if cliente_id:
+            stmt = stmt.where(Projeto.cliente_id == cliente_id)
+        
+        if status_id:
+            stmt = stmt.where(Projeto.status_id == status_id)
+        
+        if search:
+            stmt = stmt.where(busca.condition(CAMPOS_BUSCA, search))
+        
+        return stmt
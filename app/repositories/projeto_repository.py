@@ -1,16 +1,26 @@
 """
 Repositório de Projetos
 """
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session, joinedload
+from app.models.cliente import Cliente
 from app.models.projeto import Projeto
 from app.models.projeto_colaborador import ProjetoColaborador
+from app.models.servico import Servico
+from app.models.status import Status
 from app.schemas.projeto import ProjetoCreate, ProjetoUpdate
+from app.repositories.search import TextSearch
+from app.utils.pagination import paginate_by_cursor, fetch_page_with_total
+
+
+# Campos usados na busca textual (indexados pela migração de busca trigram)
+CAMPOS_BUSCA = (Projeto.descricao,)
 
 
 class ProjetoRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.text_search = TextSearch(db)
     
     def get_all(
         self,
@@ -22,12 +32,66 @@ class ProjetoRepository:
         status_id: Optional[int] = None
     ) -> List[Projeto]:
         """Lista todos os projetos com filtros, isolados por escritório"""
-        query = self.db.query(Projeto).filter(Projeto.escritorio_id == escritorio_id).options(
+        query = self._filtered_query(escritorio_id, ativo, cliente_id, status_id).options(
+            joinedload(Projeto.cliente),
+            joinedload(Projeto.servico),
+            joinedload(Projeto.status),
+            joinedload(Projeto.colaboradores)
+        )
+        return query.offset(skip).limit(limit).all()
+    
+    def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[Projeto], Optional[str]]:
+        """Lista projetos paginando por (data_inicio, id) decrescente, isolados por escritório"""
+        query = self._filtered_query(escritorio_id, ativo, cliente_id, status_id, search).options(
+            joinedload(Projeto.cliente),
+            joinedload(Projeto.servico),
+            joinedload(Projeto.status),
+            joinedload(Projeto.colaboradores)
+        )
+        return paginate_by_cursor(query, [Projeto.data_inicio, Projeto.id], cursor, limit, descending=True)
+    
+    def get_page_with_total(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        search: Optional[str] = None,
+        approximate: bool = False
+    ) -> Tuple[List[Projeto], int, bool]:
+        """Lista projetos e total do filtro em uma única consulta, isolados por escritório"""
+        query = self._filtered_query(escritorio_id, ativo, cliente_id, status_id, search).options(
             joinedload(Projeto.cliente),
             joinedload(Projeto.servico),
             joinedload(Projeto.status),
             joinedload(Projeto.colaboradores)
         )
+        ordem = self.text_search.order_by(
+            CAMPOS_BUSCA, search, [Projeto.data_inicio.desc(), Projeto.id.desc()]
+        )
+        return fetch_page_with_total(query, ordem, skip, limit, approximate)
+    
+    def _filtered_query(
+        self,
+        escritorio_id: int,
+        ativo: Optional[bool] = None,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        search: Optional[str] = None
+    ):
+        """Query base com os filtros da listagem, isolada por escritório"""
+        query = self.db.query(Projeto).filter(Projeto.escritorio_id == escritorio_id)
         
         if ativo is not None:
             query = query.filter(Projeto.ativo == ativo)
@@ -38,7 +102,10 @@ class ProjetoRepository:
         if status_id:
             query = query.filter(Projeto.status_id == status_id)
         
-        return query.offset(skip).limit(limit).all()
+        if search:
+            query = query.filter(self.text_search.condition(CAMPOS_BUSCA, search))
+        
+        return query
     
     def get_by_id(self, projeto_id: int, escritorio_id: int) -> Optional[Projeto]:
         """Busca projeto por ID, garantindo que pertence ao escritório"""
@@ -52,6 +119,17 @@ class ProjetoRepository:
             Projeto.escritorio_id == escritorio_id
         ).first()
     
+    def get_ids_do_escritorio(self, projeto_ids: Iterable[int], escritorio_id: int) -> Set[int]:
+        """Dentre os IDs informados, os dos projetos que pertencem ao escritório"""
+        projeto_ids = set(projeto_ids)
+        if not projeto_ids:
+            return set()
+        linhas = self.db.query(Projeto.id).filter(
+            Projeto.id.in_(projeto_ids),
+            Projeto.escritorio_id == escritorio_id
+        ).all()
+        return {linha.id for linha in linhas}
+    
     def create(self, projeto_data: ProjetoCreate, escritorio_id: int) -> Projeto:
         """Cria novo projeto, vinculado ao escritório"""
         # Criar projeto
@@ -96,37 +174,60 @@ class ProjetoRepository:
         self.db.commit()
         return True
     
+    def get_exportacao(
+        self,
+        escritorio_id: int,
+        ativo: Optional[bool] = None,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        search: Optional[str] = None
+    ):
+        """Cabeçalho e consulta de colunas (sem objetos ORM) para exportação, com os filtros da listagem"""
+        colunas = [
+            ("ID", Projeto.id),
+            ("Número", Projeto.numero_projeto),
+            ("Ano", Projeto.ano_projeto),
+            ("Descrição", Projeto.descricao),
+            ("Cliente", Cliente.nome),
+            ("Serviço", Servico.nome),
+            ("Status", Status.descricao),
+            ("Data de início", Projeto.data_inicio),
+            ("Previsão de término", Projeto.data_previsao_fim),
+            ("Data de término", Projeto.data_fim),
+            ("Metragem", Projeto.metragem),
+            ("Valor do contrato", Projeto.valor_contrato),
+            ("Saldo do contrato", Projeto.saldo_contrato),
+            ("Ativo", Projeto.ativo),
+        ]
+        query = self._filtered_query(escritorio_id, ativo, cliente_id, status_id, search).outerjoin(
+            Projeto.cliente
+        ).outerjoin(Projeto.servico).outerjoin(Projeto.status)
+        ordem = self.text_search.order_by(
+            CAMPOS_BUSCA, search, [Projeto.data_inicio.desc(), Projeto.id.desc()]
+        )
+        query = query.with_entities(*(coluna for _, coluna in colunas)).order_by(*ordem)
+        return [titulo for titulo, _ in colunas], query
+    
     def count(
         self,
         escritorio_id: int,
         ativo: Optional[bool] = None,
         cliente_id: Optional[int] = None,
-        status_id: Optional[int] = None
+        status_id: Optional[int] = None,
+        search: Optional[str] = None
     ) -> int:
         """Conta total de projetos com filtros, isolados por escritório"""
-        query = self.db.query(Projeto).filter(Projeto.escritorio_id == escritorio_id)
-        
-        if ativo is not None:
-            query = query.filter(Projeto.ativo == ativo)
-        
-        if cliente_id:
-            query = query.filter(Projeto.cliente_id == cliente_id)
-        
-        if status_id:
-            query = query.filter(Projeto.status_id == status_id)
-        
-        return query.count()
+        return self._filtered_query(escritorio_id, ativo, cliente_id, status_id, search).count()
     
     def search(self, escritorio_id: int, search_term: str, skip: int = 0, limit: int = 100) -> List[Projeto]:
-        """Busca projetos por termo, isolados por escritório"""
-        return self.db.query(Projeto).options(
+        """Busca projetos por termo, ordenados por relevância, isolados por escritório"""
+        query = self._filtered_query(escritorio_id, search=search_term).options(
             joinedload(Projeto.cliente),
             joinedload(Projeto.servico),
             joinedload(Projeto.status)
-        ).filter(
-            Projeto.escritorio_id == escritorio_id,
-            Projeto.descricao.ilike(f"%{search_term}%")
-        ).offset(skip).limit(limit).all()
+        )
+        ordem = self.text_search.order_by(CAMPOS_BUSCA, search_term, [Projeto.id])
+        return query.order_by(*ordem).offset(skip).limit(limit).all()
     
     # Métodos para colaboradores
     def add_colaborador(self, projeto_id: int, colaborador_id: int, escritorio_id: int, funcao: Optional[str] = None) -> Optional[ProjetoColaborador]:
@@ -1,15 +1,25 @@
 """
 Repositório de Propostas
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session, joinedload
+from app.models.cliente import Cliente
 from app.models.proposta import Proposta
+from app.models.servico import Servico
+from app.models.status import Status
 from app.schemas.proposta import PropostaCreate, PropostaUpdate
+from app.repositories.search import TextSearch
+from app.utils.pagination import paginate_by_cursor, fetch_page_with_total
+
+
+# Campos usados na busca textual (indexados pela migração de busca trigram)
+CAMPOS_BUSCA = (Proposta.nome, Proposta.identificacao, Proposta.descricao)
 
 
 class PropostaRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.text_search = TextSearch(db)
     
     def get_all(
         self,
@@ -21,11 +31,72 @@ class PropostaRepository:
         ano: Optional[int] = None
     ) -> List[Proposta]:
         """Lista todas as propostas com filtros, isoladas por escritório"""
-        query = self.db.query(Proposta).filter(Proposta.escritorio_id == escritorio_id).options(
+        query = self._filtered_query(escritorio_id, cliente_id, status_id, ano).options(
+            joinedload(Proposta.cliente),
+            joinedload(Proposta.servico),
+            joinedload(Proposta.status)
+        )
+        
+        return query.order_by(Proposta.ano_proposta.desc(), Proposta.numero_proposta.desc()).offset(skip).limit(limit).all()
+    
+    def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        ano: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[Proposta], Optional[str]]:
+        """Lista propostas paginando por (ano_proposta, numero_proposta, id) decrescente"""
+        query = self._filtered_query(escritorio_id, cliente_id, status_id, ano, search).options(
             joinedload(Proposta.cliente),
             joinedload(Proposta.servico),
             joinedload(Proposta.status)
         )
+        return paginate_by_cursor(
+            query,
+            [Proposta.ano_proposta, Proposta.numero_proposta, Proposta.id],
+            cursor,
+            limit,
+            descending=True
+        )
+    
+    def get_page_with_total(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        ano: Optional[int] = None,
+        search: Optional[str] = None,
+        approximate: bool = False
+    ) -> Tuple[List[Proposta], int, bool]:
+        """Lista propostas e total do filtro em uma única consulta, isoladas por escritório"""
+        query = self._filtered_query(escritorio_id, cliente_id, status_id, ano, search).options(
+            joinedload(Proposta.cliente),
+            joinedload(Proposta.servico),
+            joinedload(Proposta.status)
+        )
+        ordem = self.text_search.order_by(
+            CAMPOS_BUSCA,
+            search,
+            [Proposta.ano_proposta.desc(), Proposta.numero_proposta.desc(), Proposta.id.desc()]
+        )
+        return fetch_page_with_total(query, ordem, skip, limit, approximate)
+    
+    def _filtered_query(
+        self,
+        escritorio_id: int,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        ano: Optional[int] = None,
+        search: Optional[str] = None
+    ):
+        """Query base com os filtros da listagem, isolada por escritório"""
+        query = self.db.query(Proposta).filter(Proposta.escritorio_id == escritorio_id)
         
         if cliente_id:
             query = query.filter(Proposta.cliente_id == cliente_id)
@@ -36,7 +107,10 @@ class PropostaRepository:
         if ano:
             query = query.filter(Proposta.ano_proposta == ano)
         
-        return query.order_by(Proposta.ano_proposta.desc(), Proposta.numero_proposta.desc()).offset(skip).limit(limit).all()
+        if search:
+            query = query.filter(self.text_search.condition(CAMPOS_BUSCA, search))
+        
+        return query
     
     def get_by_id(self, proposta_id: int, escritorio_id: int) -> Optional[Proposta]:
         """Busca proposta por ID, garantindo que pertence ao escritório"""
@@ -83,39 +157,62 @@ class PropostaRepository:
         self.db.commit()
         return True
     
+    def get_exportacao(
+        self,
+        escritorio_id: int,
+        cliente_id: Optional[int] = None,
+        status_id: Optional[int] = None,
+        ano: Optional[int] = None,
+        search: Optional[str] = None
+    ):
+        """Cabeçalho e consulta de colunas (sem objetos ORM) para exportação, com os filtros da listagem"""
+        colunas = [
+            ("ID", Proposta.id),
+            ("Número", Proposta.numero_proposta),
+            ("Ano", Proposta.ano_proposta),
+            ("Nome", Proposta.nome),
+            ("Identificação", Proposta.identificacao),
+            ("Cliente", Cliente.nome),
+            ("Serviço", Servico.nome),
+            ("Status", Status.descricao),
+            ("Data", Proposta.data_proposta),
+            ("Valor", Proposta.valor_proposta),
+            ("Valor à vista", Proposta.valor_avista),
+            ("Valor da parcela a prazo", Proposta.valor_parcela_aprazo),
+            ("Forma de pagamento", Proposta.forma_pagamento),
+            ("Prazo", Proposta.prazo),
+        ]
+        query = self._filtered_query(escritorio_id, cliente_id, status_id, ano, search).outerjoin(
+            Proposta.cliente
+        ).outerjoin(Proposta.servico).outerjoin(Proposta.status)
+        ordem = self.text_search.order_by(
+            CAMPOS_BUSCA,
+            search,
+            [Proposta.ano_proposta.desc(), Proposta.numero_proposta.desc(), Proposta.id.desc()]
+        )
+        query = query.with_entities(*(coluna for _, coluna in colunas)).order_by(*ordem)
+        return [titulo for titulo, _ in colunas], query
+    
     def count(
         self,
         escritorio_id: int,
         cliente_id: Optional[int] = None,
         status_id: Optional[int] = None,
-        ano: Optional[int] = None
+        ano: Optional[int] = None,
+        search: Optional[str] = None
     ) -> int:
         """Conta total de propostas com filtros, isoladas por escritório"""
-        query = self.db.query(Proposta).filter(Proposta.escritorio_id == escritorio_id)
-        
-        if cliente_id:
-            query = query.filter(Proposta.cliente_id == cliente_id)
-        
-        if status_id:
-            query = query.filter(Proposta.status_id == status_id)
-        
-        if ano:
-            query = query.filter(Proposta.ano_proposta == ano)
-        
-        return query.count()
+        return self._filtered_query(escritorio_id, cliente_id, status_id, ano, search).count()
     
     def search(self, escritorio_id: int, search_term: str, skip: int = 0, limit: int = 100) -> List[Proposta]:
-        """Busca propostas por termo, isoladas por escritório"""
-        return self.db.query(Proposta).options(
+        """Busca propostas por termo, ordenadas por relevância, isoladas por escritório"""
+        query = self._filtered_query(escritorio_id, search=search_term).options(
             joinedload(Proposta.cliente),
             joinedload(Proposta.servico),
             joinedload(Proposta.status)
-        ).filter(
-            Proposta.escritorio_id == escritorio_id,
-            (Proposta.nome.ilike(f"%{search_term}%")) |
-            (Proposta.identificacao.ilike(f"%{search_term}%")) |
-            (Proposta.descricao.ilike(f"%{search_term}%"))
-        ).offset(skip).limit(limit).all()
+        )
+        ordem = self.text_search.order_by(CAMPOS_BUSCA, search_term, [Proposta.id])
+        return query.order_by(*ordem).offset(skip).limit(limit).all()
     
     def get_proximo_numero(self, escritorio_id: int, ano: int) -> int:
         """Retorna o próximo número de proposta para o ano, isolado por escritório"""
@@ -0,0 +1,105 @@
+"""
+Busca textual das listagens
+
+No PostgreSQL (com a migração de índices trigram aplicada) a busca ignora
+acentos via f_unaccent, usa os índices GIN pg_trgm e ordena por relevância
+(word_similarity). Em outros bancos, como SQLite nos testes locais, cai no
+ilike simples sem ordenação por relevância.
+
+Com SEARCH_BACKEND=auto, a presença de f_unaccent e word_similarity é
+verificada uma vez por banco (por processo); sem a migração aplicada a
+busca usa ilike até o processo ser reiniciado. Com uma AsyncSession a
+verificação precisa ser aguardada: use TextSearch.criar_async.
+"""
+import threading
+from typing import Dict, Optional, Sequence
+from sqlalchemy import func, or_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+
+_CONSULTA_TRIGRAM = text(
+    "SELECT to_regproc('f_unaccent') IS NOT NULL "
+    "AND to_regproc('word_similarity') IS NOT NULL"
+)
+
+_trigram_disponivel: Dict[str, bool] = {}
+_trigram_lock = threading.Lock()
+
+
+def _chave_banco(db) -> str:
+    return db.get_bind().url.render_as_string(hide_password=True)
+
+
+def _trigram_configurado(db) -> Optional[bool]:
+    """Uso do trigram pela configuração e pelo dialeto; None se depende do banco (auto no PostgreSQL)"""
+    backend = settings.SEARCH_BACKEND
+    if backend == "ilike":
+        return False
+    if backend == "trigram":
+        return True
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return _trigram_disponivel.get(_chave_banco(db))
+
+
+def _funcoes_trigram_instaladas(db: Session) -> bool:
+    """f_unaccent e word_similarity existem no banco (verificado uma vez por URL)"""
+    chave = _chave_banco(db)
+    with _trigram_lock:
+        disponivel = _trigram_disponivel.get(chave)
+        if disponivel is None:
+            disponivel = bool(db.execute(_CONSULTA_TRIGRAM).scalar())
+            _trigram_disponivel[chave] = disponivel
+    return disponivel
+
+
+class TextSearch:
+    def __init__(self, db: Session, trigram: Optional[bool] = None):
+        """
+        Args:
+            trigram: Uso do trigram já decidido (ex.: por criar_async); None
+                consulta o banco de forma síncrona se necessário
+        """
+        self.db = db
+        if trigram is None:
+            trigram = _trigram_configurado(db)
+        if trigram is None:
+            trigram = _funcoes_trigram_instaladas(db)
+        self.trigram = trigram
+    
+    @classmethod
+    async def criar_async(cls, db: AsyncSession) -> "TextSearch":
+        """TextSearch para uma AsyncSession, aguardando a verificação das funções trigram"""
+        trigram = _trigram_configurado(db)
+        if trigram is None:
+            resultado = await db.execute(_CONSULTA_TRIGRAM)
+            trigram = bool(resultado.scalar())
+            _trigram_disponivel[_chave_banco(db)] = trigram
+        return cls(db, trigram)
+    
+    def condition(self, columns: Sequence, term: str):
+        """Condição que casa o termo em qualquer uma das colunas"""
+        pattern = f"%{term}%"
+        if not self.trigram:
+            return or_(*[column.ilike(pattern) for column in columns])
+        # Mesma expressão dos índices (f_unaccent(coluna)) para que sejam usados
+        termo = func.f_unaccent(pattern)
+        return or_(*[func.f_unaccent(column).ilike(termo) for column in columns])
+    
+    def rank(self, columns: Sequence, term: str):
+        """Expressão de relevância (maior é melhor) ou None se não suportado"""
+        if not self.trigram:
+            return None
+        termo = func.f_unaccent(term)
+        scores = [func.word_similarity(termo, func.f_unaccent(column)) for column in columns]
+        return scores[0] if len(scores) == 1 else func.greatest(*scores)
+    
+    def order_by(self, columns: Sequence, term: Optional[str], default: Sequence) -> list:
+        """Ordenação da listagem: relevância primeiro quando houver termo de busca"""
+        if term:
+            rank = self.rank(columns, term)
+            if rank is not None:
+                return [rank.desc(), *default]
+        return list(default)
@@ -0,0 +1,33 @@
+"""
+Repositório assíncrono de Serviços (hierarquia serviço > etapas > tarefas)
+"""
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.servico import Servico
+from app.models.etapa import Etapa
+from app.repositories.cache_versao_repository import ESCOPO_HIERARQUIA, consulta_versao
+
+
+class ServicoAsyncRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_hierarquia(self, escritorio_id: int, ativo: Optional[bool] = None) -> List[Servico]:
+        """Lista serviços com etapas e tarefas aninhadas (hierarquia completa)"""
+        stmt = select(Servico).where(Servico.escritorio_id == escritorio_id).options(
+            # Etapas e tarefas já vêm ordenadas por (ordem, id) pelo order_by dos relacionamentos
+            selectinload(Servico.etapas).selectinload(Etapa.tarefas)
+        )
+        
+        if ativo is not None:
+            stmt = stmt.where(Servico.ativo == ativo)
+        
+        result = await self.db.execute(stmt.order_by(Servico.id))
+        return list(result.scalars().all())
+    
+    async def get_versao_hierarquia(self, escritorio_id: int) -> int:
+        """Versão do cache da hierarquia do escritório (ver CacheVersaoRepository)"""
+        result = await self.db.execute(consulta_versao(ESCOPO_HIERARQUIA, escritorio_id))
+        return int(result.scalar())
@@ -2,15 +2,19 @@
 Repositório de Serviços
 """
 from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.models.servico import Servico
 from app.models.etapa import Etapa
+from app.models.tarefa import Tarefa
 from app.schemas.servico import ServicoCreate, ServicoUpdate
+from app.repositories.search import TextSearch
 
 
 class ServicoRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.text_search = TextSearch(db)
     
     def get_all(self, escritorio_id: int, skip: int = 0, limit: int = 100, ativo: Optional[bool] = None) -> List[Servico]:
         """Lista todos os serviços, isolados por escritório"""
@@ -86,63 +90,43 @@ class ServicoRepository:
         return query.count()
     
     def search(self, escritorio_id: int, search_term: str, skip: int = 0, limit: int = 100) -> List[Servico]:
-        """Busca serviços por nome, código do plano de contas ou descrição, isolados por escritório"""
-        from sqlalchemy import or_
-        from app.models.etapa import Etapa
-        from app.models.tarefa import Tarefa
-        
-        search_pattern = f"%{search_term}%"
-        
-        # Buscar serviços que correspondem ao termo de busca
-        query = self.db.query(Servico).filter(
+        """
+        Busca serviços por nome, código do plano de contas ou descrição, isolados por escritório
+        
+        Também retorna serviços cujas etapas ou tarefas casam com o termo. Os ids
+        são calculados em uma única consulta (UNION) e paginados no banco; a
+        hierarquia é carregada depois com selectinload apenas para a página.
+        """
+        servicos_com_termo = select(Servico.id.label("id")).where(
             Servico.escritorio_id == escritorio_id,
-            or_(
-                Servico.nome.ilike(search_pattern),
-                Servico.codigo_plano_contas.ilike(search_pattern),
-                Servico.descricao.ilike(search_pattern),
-                Servico.descricao_contrato.ilike(search_pattern)
+            self.text_search.condition(
+                [Servico.nome, Servico.codigo_plano_contas, Servico.descricao, Servico.descricao_contrato],
+                search_term
             )
-        ).options(
-            joinedload(Servico.etapas).joinedload(Etapa.tarefas)
         )
         
-        # Também buscar serviços que têm etapas ou tarefas com o termo
-        # (usando subquery para evitar duplicatas)
-        etapas_com_termo = self.db.query(Etapa.servico_id).join(Servico).filter(
+        etapas_com_termo = select(Etapa.servico_id.label("id")).join(
+            Servico, Servico.id == Etapa.servico_id
+        ).where(
             Servico.escritorio_id == escritorio_id,
-            or_(
-                Etapa.nome.ilike(search_pattern),
-                Etapa.descricao.ilike(search_pattern)
-            )
-        ).distinct()
+            self.text_search.condition([Etapa.nome, Etapa.descricao], search_term)
+        )
         
-        tarefas_com_termo = self.db.query(Tarefa.etapa_id).join(Etapa).join(Servico).filter(
+        tarefas_com_termo = select(Etapa.servico_id.label("id")).join(
+            Tarefa, Tarefa.etapa_id == Etapa.id
+        ).join(
+            Servico, Servico.id == Etapa.servico_id
+        ).where(
             Servico.escritorio_id == escritorio_id,
-            Tarefa.nome.ilike(search_pattern)
-        ).distinct()
-        
-        etapas_com_tarefas = self.db.query(Etapa.servico_id).filter(
-            Etapa.id.in_(tarefas_com_termo.subquery())
-        ).distinct()
-        
-        # Combinar todas as buscas
-        servicos_ids = set()
-        for servico in query.all():
-            servicos_ids.add(servico.id)
-        
-        for servico_id in etapas_com_termo:
-            servicos_ids.add(servico_id[0])
-        
-        for servico_id in etapas_com_tarefas:
-            servicos_ids.add(servico_id[0])
+            self.text_search.condition([Tarefa.nome], search_term)
+        )
         
-        # Retornar serviços encontrados com relacionamentos carregados
-        if servicos_ids:
-            return self.db.query(Servico).filter(
-                Servico.escritorio_id == escritorio_id,
-                Servico.id.in_(servicos_ids)
-            ).options(
-                joinedload(Servico.etapas).joinedload(Etapa.tarefas)
-            ).order_by(Servico.id).offset(skip).limit(limit).all()
+        # UNION já remove duplicados; a página é recortada sobre os ids
+        ids = union(servicos_com_termo, etapas_com_termo, tarefas_com_termo).subquery()
+        pagina_ids = select(ids.c.id).order_by(ids.c.id).offset(skip).limit(limit)
         
-        return []
+        return self.db.query(Servico).filter(
+            Servico.id.in_(pagina_ids)
+        ).options(
+            selectinload(Servico.etapas).selectinload(Etapa.tarefas)
+        ).order_by(Servico.id).all()
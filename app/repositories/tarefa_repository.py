@@ -1,15 +1,21 @@
 """
 Repositório de Tarefas
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.tarefa import Tarefa
+from app.repositories.ordenacao import atualizar_ordem
 from app.schemas.servico import TarefaCreate, TarefaUpdate
+from app.repositories.search import TextSearch
+from app.utils.pagination import paginate_by_cursor, fetch_page_with_total
 
 
 class TarefaRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.text_search = TextSearch(db)
     
     def get_by_etapa(self, etapa_id: int, escritorio_id: int) -> List[Tarefa]:
         """Lista tarefas de uma etapa, garantindo que pertencem ao escritório"""
@@ -34,6 +40,52 @@ class TarefaRepository:
         
         return query.order_by(Tarefa.ordem, Tarefa.id).offset(skip).limit(limit).all()
     
+    def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        etapa_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        search: Optional[str] = None
+    ) -> Tuple[List[Tarefa], Optional[str]]:
+        """Lista tarefas paginando por (ordem, id), isoladas por escritório"""
+        query = self._filtered_query(escritorio_id, etapa_id, search)
+        
+        # ordem é opcional no banco; nulos são tratados como 0 para manter a chave comparável
+        return paginate_by_cursor(
+            query,
+            [func.coalesce(Tarefa.ordem, 0), Tarefa.id],
+            cursor,
+            limit,
+            row_key=lambda tarefa: [tarefa.ordem or 0, tarefa.id]
+        )
+    
+    def get_page_with_total(
+        self,
+        escritorio_id: int,
+        etapa_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        approximate: bool = False
+    ) -> Tuple[List[Tarefa], int, bool]:
+        """Lista tarefas e total do filtro em uma única consulta, isoladas por escritório"""
+        query = self._filtered_query(escritorio_id, etapa_id, search)
+        ordem = self.text_search.order_by([Tarefa.nome], search, [Tarefa.ordem, Tarefa.id])
+        return fetch_page_with_total(query, ordem, skip, limit, approximate)
+    
+    def _filtered_query(self, escritorio_id: int, etapa_id: Optional[int] = None, search: Optional[str] = None):
+        """Query base com os filtros da listagem, isolada por escritório"""
+        query = self.db.query(Tarefa).filter(Tarefa.escritorio_id == escritorio_id)
+        
+        if etapa_id:
+            query = query.filter(Tarefa.etapa_id == etapa_id)
+        
+        if search:
+            query = query.filter(self.text_search.condition([Tarefa.nome], search))
+        
+        return query
+    
     def create(self, etapa_id: int, tarefa_data: TarefaCreate, escritorio_id: int) -> Tarefa:
         """Cria nova tarefa, vinculada à etapa e ao escritório"""
         tarefa_dict = tarefa_data.model_dump()
@@ -58,6 +110,21 @@ class TarefaRepository:
         self.db.refresh(tarefa)
         return tarefa
     
+    def reordenar(self, tarefas: List[Tarefa], tarefa_ids: List[int], escritorio_id: int) -> List[Tarefa]:
+        """
+        Grava a nova ordem (tarefa_ids na ordem desejada) com um único UPDATE (sem commit)
+        
+        `tarefas` são as já carregadas da etapa; recebem os valores gravados sem
+        refresh e voltam ordenadas pela nova ordem.
+        """
+        gravados = atualizar_ordem(self.db, Tarefa.__table__, tarefa_ids, escritorio_id)
+        for tarefa in tarefas:
+            if tarefa.id in gravados:
+                ordem, updated_at = gravados[tarefa.id]
+                set_committed_value(tarefa, "ordem", ordem)
+                set_committed_value(tarefa, "updated_at", updated_at)
+        return sorted(tarefas, key=lambda tarefa: (tarefa.ordem or 0, tarefa.id))
+    
     def delete(self, tarefa_id: int, escritorio_id: int) -> bool:
         """Deleta tarefa, garantindo que pertence ao escritório"""
         tarefa = self.get_by_id(tarefa_id, escritorio_id)
@@ -68,23 +135,14 @@ class TarefaRepository:
         self.db.commit()
         return True
     
-    def count(self, escritorio_id: int, etapa_id: Optional[int] = None) -> int:
+    def count(self, escritorio_id: int, etapa_id: Optional[int] = None, search: Optional[str] = None) -> int:
         """Conta tarefas, opcionalmente filtradas por etapa, isoladas por escritório"""
-        query = self.db.query(Tarefa).filter(Tarefa.escritorio_id == escritorio_id)
-        if etapa_id:
-            query = query.filter(Tarefa.etapa_id == etapa_id)
-        return query.count()
+        return self._filtered_query(escritorio_id, etapa_id, search).count()
     
     def search(self, escritorio_id: int, search_term: str, etapa_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Tarefa]:
         """Busca tarefas por termo, opcionalmente filtradas por etapa, isoladas por escritório"""
-        query = self.db.query(Tarefa).filter(
-            Tarefa.escritorio_id == escritorio_id,
-            Tarefa.nome.ilike(f"%{search_term}%")
-        )
-        
-        if etapa_id:
-            query = query.filter(Tarefa.etapa_id == etapa_id)
-        
-        return query.order_by(Tarefa.ordem, Tarefa.id).offset(skip).limit(limit).all()
+        query = self._filtered_query(escritorio_id, etapa_id, search_term)
+        ordem = self.text_search.order_by([Tarefa.nome], search_term, [Tarefa.ordem, Tarefa.id])
+        return query.order_by(*ordem).offset(skip).limit(limit).all()
 
 
@@ -1,9 +1,15 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, text
-from app.models.user import User, Escritorio, user_escritorio
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import or_, text, literal_column
+from app.models.user import User, Escritorio, ColaboradorEscritorioPerfil, user_escritorio
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash
-from typing import List, Optional
+from app.core.principal_cache import invalidar_principal, invalidar_principais
+from app.utils.pagination import paginate_by_cursor
+from typing import Dict, List, Optional, Tuple
+
+
+# Colunas de colaborador_escritorio que não estão mapeadas em user_escritorio
+VINCULO_COLUNAS = ("socio", "banco", "agencia", "tipo_conta", "conta", "pix_tipo", "pix_chave")
 
 
 class UserRepository:
@@ -28,20 +34,44 @@ class UserRepository:
             ativo: Filtrar por status ativo/inativo
             search: Buscar por nome, email ou CPF
         """
+        query = self._filtered_query(escritorio_id, ativo, search)
+        return query.offset(skip).limit(limit).all()
+    
+    def get_page_by_cursor(
+        self,
+        escritorio_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        """Lista usuários paginando por (nome, id)"""
+        query = self._filtered_query(escritorio_id, ativo, search)
+        return paginate_by_cursor(query, [User.nome, User.id], cursor, limit)
+    
+    def _filtered_query(
+        self,
+        escritorio_id: Optional[int] = None,
+        ativo: Optional[bool] = None,
+        search: Optional[str] = None
+    ):
+        """Query base da listagem de usuários"""
         if escritorio_id:
             # Filtrar apenas colaboradores vinculados ao escritório
+            # (a chave do vínculo é colaborador+escritório, então não há duplicados)
             query = self.db.query(User).join(
                 user_escritorio, User.id == user_escritorio.c.colaborador_id
             ).filter(
                 user_escritorio.c.escritorio_id == escritorio_id
-            ).distinct()
-            # Carregar escritórios apenas se necessário (pode causar problemas de serialização)
-            # query = query.options(joinedload(User.escritorios))
+            )
         else:
             # Listar todos os usuários (para admin do sistema)
             query = self.db.query(User)
-            # query = query.options(joinedload(User.escritorios))
         
+        return self._apply_filters(query, ativo, search)
+    
+    def _apply_filters(self, query, ativo: Optional[bool] = None, search: Optional[str] = None):
+        """Aplica filtros de status e busca textual"""
         if ativo is not None:
             query = query.filter(User.ativo == ativo)
         
@@ -53,8 +83,81 @@ class UserRepository:
                     User.cpf.ilike(f"%{search}%")
                 )
             )
+        return query
+    
+    def get_colaboradores_escritorio(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[User, Dict, List[ColaboradorEscritorioPerfil]]], Optional[str]]:
+        """
+        Lista colaboradores do escritório junto com os dados do vínculo
+        (sócio, dados bancários, pix) e os perfis no escritório.
         
-        return query.offset(skip).limit(limit).all()
+        Usa número fixo de consultas independente do tamanho da página:
+        uma para colaboradores + vínculo, uma para os escritórios (selectinload)
+        e uma para os perfis.
+        
+        Se cursor for informado, pagina por (nome, id) ignorando skip.
+        
+        Returns:
+            Tupla (lista de (usuario, vinculo, perfis), próximo cursor)
+        """
+        query = self.db.query(
+            User,
+            *[literal_column(f"colaborador_escritorio.{coluna}") for coluna in VINCULO_COLUNAS]
+        ).join(
+            user_escritorio, User.id == user_escritorio.c.colaborador_id
+        ).filter(
+            user_escritorio.c.escritorio_id == escritorio_id
+        ).options(selectinload(User.escritorios))
+        
+        query = self._apply_filters(query, ativo, search)
+        next_cursor = None
+        if cursor is not None:
+            rows, next_cursor = paginate_by_cursor(
+                query, [User.nome, User.id], cursor, limit,
+                row_key=lambda row: [row[0].nome, row[0].id]
+            )
+        else:
+            rows = query.order_by(User.nome, User.id).offset(skip).limit(limit).all()
+        
+        perfis_por_colaborador = self.get_perfis_por_colaborador(
+            [row[0].id for row in rows], escritorio_id
+        )
+        
+        return [
+            (
+                row[0],
+                dict(zip(VINCULO_COLUNAS, row[1:])),
+                perfis_por_colaborador.get(row[0].id, [])
+            )
+            for row in rows
+        ], next_cursor
+    
+    def get_perfis_por_colaborador(
+        self, colaborador_ids: List[int], escritorio_id: int
+    ) -> Dict[int, List[ColaboradorEscritorioPerfil]]:
+        """Busca em uma única consulta os perfis de vários colaboradores no escritório"""
+        if not colaborador_ids:
+            return {}
+        
+        perfis = self.db.query(ColaboradorEscritorioPerfil).filter(
+            ColaboradorEscritorioPerfil.colaborador_id.in_(colaborador_ids),
+            ColaboradorEscritorioPerfil.escritorio_id == escritorio_id
+        ).order_by(
+            ColaboradorEscritorioPerfil.colaborador_id,
+            ColaboradorEscritorioPerfil.perfil
+        ).all()
+        
+        resultado: Dict[int, List[ColaboradorEscritorioPerfil]] = {}
+        for perfil in perfis:
+            resultado.setdefault(perfil.colaborador_id, []).append(perfil)
+        return resultado
     
     def get_by_id(self, user_id: int) -> Optional[User]:
         """Busca usuário por ID com relacionamentos carregados"""
@@ -117,6 +220,24 @@ class UserRepository:
         for field, value in update_data.items():
             setattr(db_user, field, value)
         
+        self.db.commit()
+        invalidar_principal(user_id)
+        self.db.refresh(db_user)
+        return db_user
+    
+    def update_foto(self, user_id: int, foto: str, foto_variantes: Optional[dict] = None) -> Optional[User]:
+        """Atualiza a foto do usuário e suas variantes, ajustando as referências no store de uploads"""
+        from app.services.upload_store import UploadStore
+        
+        db_user = self.get_by_id(user_id)
+        if not db_user:
+            return None
+        
+        store = UploadStore(self.db)
+        store.remover_referencia(db_user.foto, db_user.foto_variantes)
+        store.adicionar_referencia(foto)
+        db_user.foto = foto
+        db_user.foto_variantes = foto_variantes
         self.db.commit()
         self.db.refresh(db_user)
         return db_user
@@ -150,17 +271,12 @@ class UserRepository:
             db_user.ativo = False
         
         self.db.commit()
+        invalidar_principal(user_id)
         return True
     
     def count(self, escritorio_id: Optional[int] = None) -> int:
         """Conta total de usuários, opcionalmente filtrado por escritório"""
-        if escritorio_id:
-            return self.db.query(User).join(
-                user_escritorio, User.id == user_escritorio.c.colaborador_id
-            ).filter(
-                user_escritorio.c.escritorio_id == escritorio_id
-            ).distinct().count()
-        return self.db.query(User).count()
+        return self._filtered_query(escritorio_id).count()
 
 
 class EscritorioRepository:
@@ -209,6 +325,7 @@ class EscritorioRepository:
         if not escritorio:
             return False
         
+        usuarios_alterados = []
         if permanent:
             # Hard delete - remove do banco permanentemente
             # IMPORTANTE: Excluir todos os dados relacionados ao escritório
@@ -242,6 +359,7 @@ class EscritorioRepository:
                     )
                     # Excluir o usuário
                     self.db.delete(usuario)
+                    usuarios_alterados.append(usuario.id)
             
             # 2. Remover relacionamentos com colaboradores
             self.db.execute(
@@ -306,6 +424,7 @@ class EscritorioRepository:
                 # Se não tiver outros escritórios ativos, desativar o usuário
                 if outros_escritorios_count == 0 and not usuario.is_system_admin:
                     usuario.ativo = False
+                    usuarios_alterados.append(usuario.id)
             
             # Desativar o vínculo na tabela de associação
             self.db.execute(
@@ -318,4 +437,5 @@ class EscritorioRepository:
             )
         
         self.db.commit()
+        invalidar_principais(usuarios_alterados)
         return True
@@ -0,0 +1,20 @@
+"""
+Repositório assíncrono de Usuários (leituras da autenticação)
+"""
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+
+
+class UserAsyncRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_principal(self, user_id: int) -> Optional[Row]:
+        """Busca apenas os dados de identidade usados por get_current_user_async"""
+        result = await self.db.execute(
+            select(User.id, User.email, User.nome, User.perfil, User.ativo).where(User.id == user_id)
+        )
+        return result.first()
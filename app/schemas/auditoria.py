@@ -0,0 +1,24 @@
+"""
+Schemas para Auditoria
+"""
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+
+class AuditoriaResponse(BaseModel):
+    id: int
+    usuario_id: int
+    escritorio_id: Optional[int] = None
+    acao: str
+    entidade: str
+    entidade_id: Optional[int] = None
+    descricao: Optional[str] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    dados_anteriores: Optional[Dict[str, Any]] = None
+    dados_novos: Optional[Dict[str, Any]] = None
+    timestamp: datetime
+
+    class Config:
+        from_attributes = True
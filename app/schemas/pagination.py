@@ -0,0 +1,17 @@
+"""
+Schemas de respostas paginadas
+"""
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    """Envelope de listagem paginada"""
+    items: List[T]
+    total: Optional[int] = None  # None na paginação por cursor (sem COUNT por página)
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None  # Preenchido na paginação por cursor
+    total_estimado: bool = False  # True quando total vem da estimativa do planejador
@@ -0,0 +1,65 @@
+"""
+Schemas para Documentos de Projeto e Sessões de Upload
+"""
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+from datetime import datetime
+
+
+def _normalizar_sha256(v: Optional[str]) -> Optional[str]:
+    if v is None:
+        return v
+    v = v.strip().lower()
+    if len(v) != 64 or any(c not in "0123456789abcdef" for c in v):
+        raise ValueError('sha256 deve ter 64 caracteres hexadecimais')
+    return v
+
+
+class UploadSessaoCreate(BaseModel):
+    projeto_id: int
+    nome: str = Field(..., max_length=255)
+    tamanho: int = Field(..., gt=0)  # Tamanho total em bytes
+    tipo_documento_id: Optional[int] = None
+    observacao: Optional[str] = None
+    sha256: Optional[str] = None  # Checksum do arquivo (pode ser informado só ao finalizar)
+    
+    @validator('sha256')
+    def validate_sha256(cls, v):
+        return _normalizar_sha256(v)
+
+
+class UploadSessaoResponse(BaseModel):
+    token: str
+    projeto_id: int
+    nome: str
+    tamanho: int
+    recebido: int  # Total de bytes recebidos
+    intervalos: List[List[int]]  # Intervalos recebidos [inicio, fim) em bytes
+    status: str
+    expira_em: datetime
+    tamanho_maximo_parte: int
+    documento_id: Optional[int] = None
+
+
+class FinalizarUploadRequest(BaseModel):
+    sha256: Optional[str] = None  # Obrigatório se não informado na criação
+    
+    @validator('sha256')
+    def validate_sha256(cls, v):
+        return _normalizar_sha256(v)
+
+
+class ProjetoDocumentoResponse(BaseModel):
+    id: int
+    projeto_id: int
+    tipo_documento_id: Optional[int] = None
+    nome: str
+    arquivo: Optional[str] = None
+    extensao: Optional[str] = None
+    observacao: Optional[str] = None
+    ativo: bool = True
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import date, datetime
 from enum import Enum
 
@@ -112,6 +112,8 @@ class EscritorioResponse(EscritorioBase):
     observacao_proposta_padrao: Optional[str] = None
     observacao_contrato_padrao: Optional[str] = None
     logo: Optional[str] = None
+    logo_variantes: Optional[Dict[str, Dict[str, str]]] = None
+    logo_miniatura: Optional[str] = None  # Variante pequena para listagens e cabeçalho (Escritorio.logo_miniatura)
     created_at: datetime
     updated_at: datetime
     
@@ -289,6 +291,8 @@ class UserResponse(UserBase):
     id: int
     ativo: bool
     foto: Optional[str] = None
+    foto_variantes: Optional[Dict[str, Dict[str, str]]] = None
+    foto_miniatura: Optional[str] = None  # Variante pequena para listagens e avatares (User.foto_miniatura)
     ultimo_acesso: Optional[date] = None
     tipo_pix: Optional[str] = None
     chave_pix: Optional[str] = None
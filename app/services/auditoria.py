@@ -4,16 +4,23 @@ Registra ações dos usuários por escritório
 """
 from sqlalchemy.orm import Session
 from app.models.auditoria import Auditoria
+from app.services.auditoria_writer import get_auditoria_writer
 from typing import Optional, Dict, Any
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 class AuditoriaService:
     """Serviço para registrar ações de auditoria"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, sincrono: bool = False):
+        """
+        Args:
+            db: Sessão do banco
+            sincrono: Se True, grava na própria sessão mesmo com o writer assíncrono ativo
+        """
         self.db = db
+        self.sincrono = sincrono
     
     def registrar(
         self,
@@ -44,9 +51,9 @@ class AuditoriaService:
             dados_novos: Dados após a alteração (para UPDATE)
         
         Returns:
-            Auditoria criada
+            Auditoria criada (no modo assíncrono, ainda não persistida e sem id)
         """
-        auditoria = Auditoria(
+        valores = dict(
             usuario_id=usuario_id,
             escritorio_id=escritorio_id,
             acao=acao,
@@ -55,15 +62,30 @@ class AuditoriaService:
             descricao=descricao,
             ip_address=ip_address,
             user_agent=user_agent,
-            dados_anteriores=json.dumps(dados_anteriores, default=str) if dados_anteriores else None,
-            dados_novos=json.dumps(dados_novos, default=str) if dados_novos else None
+            dados_anteriores=self._normalizar_dados(dados_anteriores),
+            dados_novos=self._normalizar_dados(dados_novos),
+            # Momento da ação, e não o da gravação do lote
+            timestamp=datetime.now(timezone.utc)
         )
         
+        writer = None if self.sincrono else get_auditoria_writer()
+        if writer is not None:
+            writer.enfileirar(valores)
+            return Auditoria(**valores)
+        
+        auditoria = Auditoria(**valores)
         self.db.add(auditoria)
         self.db.commit()
         self.db.refresh(auditoria)
         return auditoria
     
+    @staticmethod
+    def _normalizar_dados(dados: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Converte valores não serializáveis (datas, Decimal) para gravar como JSON"""
+        if not dados:
+            return None
+        return json.loads(json.dumps(dados, default=str))
+    
     def registrar_criacao(
         self,
         usuario_id: int,
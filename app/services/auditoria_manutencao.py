@@ -0,0 +1,86 @@
+"""
+Manutenção das partições mensais da auditoria (PostgreSQL)
+
+- criar_particoes_futuras: garante as partições dos próximos meses
+- aplicar_retencao: remove partições inteiras mais antigas que a retenção
+  (DROP TABLE da partição, sem DELETE linha a linha)
+"""
+from datetime import date
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+
+PREFIXO_PARTICAO = "auditoria_p"
+
+
+def _somar_meses(mes: date, meses: int) -> date:
+    indice = mes.year * 12 + (mes.month - 1) + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+class AuditoriaManutencaoService:
+    """Cria e remove partições mensais da tabela auditoria"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def listar_particoes(self) -> List[str]:
+        """Nomes das partições mensais existentes, em ordem cronológica"""
+        rows = self.db.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = 'auditoria' AND c.relname LIKE :prefixo
+            ORDER BY c.relname
+        """), {"prefixo": f"{PREFIXO_PARTICAO}%"}).scalars().all()
+        return list(rows)
+    
+    def criar_particoes_futuras(self, meses: int = None, hoje: date = None) -> List[str]:
+        """Cria (se necessário) as partições do mês atual e dos próximos meses"""
+        meses = settings.AUDIT_PARTITIONS_AHEAD if meses is None else meses
+        inicio = (hoje or date.today()).replace(day=1)
+        criadas = []
+        for deslocamento in range(meses + 1):
+            mes = _somar_meses(inicio, deslocamento)
+            nome = self.db.execute(
+                text("SELECT auditoria_criar_particao(:mes)"), {"mes": mes}
+            ).scalar()
+            criadas.append(nome)
+        self.db.commit()
+        return criadas
+    
+    def particoes_expiradas(self, retencao_meses: int = None, hoje: date = None) -> List[str]:
+        """Partições cujo mês inteiro está fora da janela de retenção"""
+        retencao_meses = settings.AUDIT_RETENTION_MONTHS if retencao_meses is None else retencao_meses
+        limite = _somar_meses((hoje or date.today()).replace(day=1), -retencao_meses)
+        sufixo_limite = limite.strftime("%Y%m")
+        return [
+            nome for nome in self.listar_particoes()
+            if nome[len(PREFIXO_PARTICAO):] < sufixo_limite
+        ]
+    
+    def aplicar_retencao(self, retencao_meses: int = None, hoje: date = None, dry_run: bool = False) -> List[str]:
+        """
+        Remove as partições expiradas
+        
+        Args:
+            retencao_meses: Meses mantidos além do atual (padrão: AUDIT_RETENTION_MONTHS; 0 desativa)
+            dry_run: Apenas lista o que seria removido
+        """
+        retencao_meses = settings.AUDIT_RETENTION_MONTHS if retencao_meses is None else retencao_meses
+        if retencao_meses <= 0:
+            return []
+        
+        expiradas = self.particoes_expiradas(retencao_meses, hoje)
+        if dry_run:
+            return expiradas
+        
+        for nome in expiradas:
+            # DETACH antes do DROP evita bloquear a tabela pai por mais tempo que o necessário
+            self.db.execute(text(f'ALTER TABLE auditoria DETACH PARTITION "{nome}"'))
+            self.db.execute(text(f'DROP TABLE "{nome}"'))
+        self.db.commit()
+        return expiradas
@@ -0,0 +1,215 @@
+"""
+Gravação assíncrona e em lote dos registros de auditoria
+
+Os registros são colocados em uma fila em memória limitada e gravados por
+uma thread em segundo plano com INSERTs em lote, tirando o commit extra do
+caminho da requisição. Quando a fila enche, a política configurada decide
+entre descartar o registro ou aguardar (backpressure) por um tempo limitado.
+Um lote que falha ao gravar é repetido com espera crescente; se ainda assim
+falhar, os registros são contados em audit_events_total{evento="falhas"}.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import insert
+from app.core.config import settings
+from app.core.metrics import AUDITORIA_EVENTOS, AUDITORIA_FILA
+from app.models.auditoria import Auditoria
+
+
+POLITICA_DESCARTAR = "drop"
+POLITICA_AGUARDAR = "block"
+
+
+class AuditoriaWriter:
+    """Fila limitada de registros de auditoria drenada por uma thread em lotes"""
+    
+    def __init__(
+        self,
+        session_factory: Callable,
+        max_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        politica: str = POLITICA_DESCARTAR,
+        block_timeout: float = 0.05,
+        retentativas: int = 3,
+        espera_retentativa: float = 0.5
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.politica = politica
+        self.block_timeout = block_timeout
+        self.retentativas = retentativas
+        self.espera_retentativa = espera_retentativa
+        self._fila: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_size)
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._contadores = {
+            "enfileirados": 0,
+            "gravados": 0,
+            "descartados": 0,
+            "falhas": 0,
+            "retentativas": 0,
+            "lotes": 0,
+        }
+    
+    @property
+    def ativo(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def iniciar(self) -> None:
+        """Inicia a thread de gravação (idempotente)"""
+        if self.ativo:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="auditoria-writer", daemon=True)
+        self._thread.start()
+    
+    def parar(self, timeout: float = 10.0) -> None:
+        """Encerra a thread gravando o que ainda estiver na fila"""
+        if not self.ativo:
+            return
+        self._parar.set()
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def enfileirar(self, registro: Dict[str, Any]) -> bool:
+        """
+        Coloca um registro na fila
+        
+        Returns:
+            False se o registro foi descartado por fila cheia
+        """
+        try:
+            if self.politica == POLITICA_AGUARDAR:
+                self._fila.put(registro, timeout=self.block_timeout)
+            else:
+                self._fila.put_nowait(registro)
+        except queue.Full:
+            self._incrementar("descartados")
+            return False
+        self._incrementar("enfileirados")
+        AUDITORIA_FILA.inc()
+        return True
+    
+    def estatisticas(self) -> Dict[str, int]:
+        """Contadores do writer e tamanho atual da fila"""
+        with self._lock:
+            dados = dict(self._contadores)
+        dados["pendentes"] = self._fila.qsize()
+        return dados
+    
+    def _incrementar(self, contador: str, valor: int = 1) -> None:
+        with self._lock:
+            self._contadores[contador] += valor
+        AUDITORIA_EVENTOS.labels(contador).inc(valor)
+    
+    def _executar(self) -> None:
+        while not self._parar.is_set():
+            lote = self._coletar_lote()
+            if lote:
+                self._gravar(lote)
+        
+        # Encerramento: esvaziar a fila
+        while True:
+            lote = self._drenar(self.batch_size)
+            if not lote:
+                break
+            self._gravar(lote)
+    
+    def _coletar_lote(self) -> List[Dict[str, Any]]:
+        """Aguarda até completar um lote ou estourar o intervalo de flush"""
+        lote: List[Dict[str, Any]] = []
+        limite = time.monotonic() + self.flush_interval
+        while len(lote) < self.batch_size and not self._parar.is_set():
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                lote.append(self._fila.get(timeout=restante))
+            except queue.Empty:
+                break
+        return lote
+    
+    def _drenar(self, quantidade: int) -> List[Dict[str, Any]]:
+        lote = []
+        while len(lote) < quantidade:
+            try:
+                lote.append(self._fila.get_nowait())
+            except queue.Empty:
+                break
+        return lote
+    
+    def _gravar(self, lote: List[Dict[str, Any]]) -> None:
+        """Grava o lote com um único INSERT (executemany), repetindo em caso de falha"""
+        AUDITORIA_FILA.dec(len(lote))
+        espera = self.espera_retentativa
+        for tentativa in range(self.retentativas + 1):
+            if tentativa:
+                self._incrementar("retentativas")
+                time.sleep(espera)
+                espera *= 2
+            try:
+                self._inserir(lote)
+            except Exception as e:
+                erro = e
+                continue
+            self._incrementar("gravados", len(lote))
+            self._incrementar("lotes")
+            return
+        
+        self._incrementar("falhas", len(lote))
+        print(f"Erro ao gravar lote de auditoria ({len(lote)} registros, {self.retentativas + 1} tentativas): {erro}")
+    
+    def _inserir(self, lote: List[Dict[str, Any]]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(insert(Auditoria), lote)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+_writer: Optional[AuditoriaWriter] = None
+
+
+def get_auditoria_writer() -> Optional[AuditoriaWriter]:
+    """Retorna o writer em execução ou None (modo síncrono)"""
+    if _writer is not None and _writer.ativo:
+        return _writer
+    return None
+
+
+def iniciar_auditoria_writer() -> Optional[AuditoriaWriter]:
+    """Cria e inicia o writer global se AUDIT_ASYNC_ENABLED estiver ativo"""
+    global _writer
+    if not settings.AUDIT_ASYNC_ENABLED:
+        return None
+    if _writer is None:
+        from app.database import SessionLocal
+        _writer = AuditoriaWriter(
+            session_factory=SessionLocal,
+            max_size=settings.AUDIT_QUEUE_MAX_SIZE,
+            batch_size=settings.AUDIT_BATCH_SIZE,
+            flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+            politica=settings.AUDIT_QUEUE_POLICY,
+            block_timeout=settings.AUDIT_BLOCK_TIMEOUT_SECONDS,
+            retentativas=settings.AUDIT_WRITE_RETRIES,
+            espera_retentativa=settings.AUDIT_RETRY_BACKOFF_SECONDS
+        )
+    _writer.iniciar()
+    return _writer
+
+
+def parar_auditoria_writer() -> None:
+    """Grava os registros pendentes e encerra o writer global"""
+    global _writer
+    if _writer is not None:
+        _writer.parar(timeout=settings.AUDIT_SHUTDOWN_TIMEOUT_SECONDS)
+        _writer = None
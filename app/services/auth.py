@@ -8,6 +8,7 @@ from app.schemas.user import (
 )
 from app.core.security import verify_password, create_access_token, create_refresh_token, decode_token
 from app.core.exceptions import UnauthorizedException, NotFoundException
+from app.core.principal_cache import invalidar_principal
 from typing import Optional, List
 
 
@@ -359,6 +360,7 @@ class AuthService:
         from app.core.security import get_password_hash
         user.senha = get_password_hash(senha_nova)
         self.db.commit()
+        invalidar_principal(user_id)
         self.db.refresh(user)
         
         return True
@@ -426,7 +428,12 @@ class AuthService:
                     esc.cor = "#6366f1"
         return UserResponse.model_validate(user)
     
-    def update_profile_photo(self, user_id: int, foto_path: str) -> UserResponse:
+    def update_profile_photo(
+        self,
+        user_id: int,
+        foto_path: str,
+        foto_variantes: Optional[dict] = None
+    ) -> UserResponse:
         """
         Atualiza a foto de perfil do usuário logado
         """
@@ -434,16 +441,20 @@ class AuthService:
         if not user:
             raise NotFoundException("Usuário não encontrado")
         
-        # Deletar foto antiga se existir
+        from app.services.upload_store import UploadStore
+        store = UploadStore(self.db)
+        
+        # Liberar foto antiga se existir
         if user.foto:
-            from app.utils.upload import delete_upload_file
             try:
-                delete_upload_file(user.foto)
+                store.remover_referencia(user.foto, user.foto_variantes)
             except Exception:
-                pass  # Ignorar erros ao deletar foto antiga
+                pass  # Ignorar erros ao liberar foto antiga
         
         # Atualizar foto
         user.foto = foto_path
+        user.foto_variantes = foto_variantes
+        store.adicionar_referencia(foto_path)
         self.db.commit()
         self.db.refresh(user)
         
@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 from app.repositories.cliente import ClienteRepository
 from app.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteResponse
 from app.core.exceptions import NotFoundException, ConflictException
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class ClienteService:
@@ -23,6 +23,37 @@ class ClienteService:
         clientes = self.repository.get_all(escritorio_id, skip, limit, ativo, tipo_pessoa, search)
         return [ClienteResponse.from_orm(c, self.db) for c in clientes]
     
+    def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[ClienteResponse], Optional[str]]:
+        """Lista clientes paginando por cursor, isolados por escritório"""
+        clientes, next_cursor = self.repository.get_page_by_cursor(
+            escritorio_id, cursor, limit, ativo, tipo_pessoa, search
+        )
+        return [ClienteResponse.from_orm(c, self.db) for c in clientes], next_cursor
+    
+    def get_page_with_total(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None,
+        approximate: bool = False
+    ) -> Tuple[List[ClienteResponse], int, bool]:
+        """Lista clientes e total em uma única consulta, isolados por escritório"""
+        clientes, total, estimado = self.repository.get_page_with_total(
+            escritorio_id, skip, limit, ativo, tipo_pessoa, search, approximate
+        )
+        return [ClienteResponse.from_orm(c, self.db) for c in clientes], total, estimado
+    
     def get_by_id(self, cliente_id: int, escritorio_id: int) -> ClienteResponse:
         """Busca cliente por ID, garantindo que pertence ao escritório"""
         cliente = self.repository.get_by_id(cliente_id, escritorio_id)
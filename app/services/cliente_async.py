@@ -0,0 +1,73 @@
+"""
+Service assíncrono de Clientes (listagem nas rotas de ASYNC_ROUTERS)
+"""
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.cliente import Cliente
+from app.repositories.cliente_async import ClienteAsyncRepository
+from app.schemas.cliente import ClienteResponse
+
+
+class ClienteAsyncService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = ClienteAsyncRepository(db)
+    
+    async def get_page_by_cursor(
+        self,
+        escritorio_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[ClienteResponse], Optional[str]]:
+        """Lista clientes paginando por cursor, isolados por escritório"""
+        clientes, next_cursor = await self.repository.get_page_by_cursor(
+            escritorio_id, cursor, limit, ativo, tipo_pessoa, search
+        )
+        return await self._serializar(clientes, escritorio_id), next_cursor
+    
+    async def get_page_with_total(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None,
+        approximate: bool = False
+    ) -> Tuple[List[ClienteResponse], int, bool]:
+        """Lista clientes e total em uma única consulta, isolados por escritório"""
+        clientes, total, estimado = await self.repository.get_page_with_total(
+            escritorio_id, skip, limit, ativo, tipo_pessoa, search, approximate
+        )
+        return await self._serializar(clientes, escritorio_id), total, estimado
+    
+    async def count(
+        self,
+        escritorio_id: int,
+        ativo: Optional[bool] = None,
+        tipo_pessoa: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> int:
+        """Conta total de clientes, isolados por escritório"""
+        return await self.repository.count(escritorio_id, ativo, tipo_pessoa, search)
+    
+    async def _serializar(self, clientes: List[Cliente], escritorio_id: int) -> List[ClienteResponse]:
+        """
+        Serializa como ClienteResponse.from_orm, mas resolve os nomes de
+        indicado_por (ID numérico) de toda a página em uma única consulta
+        """
+        indicadores = {int(c.indicado_por) for c in clientes if c.indicado_por and c.indicado_por.isdigit()}
+        nomes = await self.repository.get_nomes(indicadores, escritorio_id)
+        
+        result = []
+        for cliente in clientes:
+            response = ClienteResponse.from_orm(cliente)
+            if cliente.indicado_por and cliente.indicado_por.isdigit():
+                nome = nomes.get(int(cliente.indicado_por))
+                if nome:
+                    response.observacoes = f"Indicado por: {nome}"
+            result.append(response)
+        return result
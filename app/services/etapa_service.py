@@ -8,8 +8,9 @@ from fastapi import HTTPException, status
 from app.repositories.etapa_repository import EtapaRepository
 from app.repositories.tarefa_repository import TarefaRepository
 from app.repositories.servico_repository import ServicoRepository
-from app.schemas.servico import EtapaCreate, EtapaUpdate
+from app.schemas.servico import EtapaCreate, EtapaUpdate, EtapaResponse
 from app.models.etapa import Etapa
+from app.services.servico_hierarquia_cache import invalidar_hierarquia
 
 
 class EtapaService:
@@ -81,7 +82,9 @@ class EtapaService:
                 detail="Ordem deve ser um número positivo ou zero"
             )
         
-        return self.etapa_repo.create(servico_id, etapa_data, escritorio_id)
+        etapa = self.etapa_repo.create(servico_id, etapa_data, escritorio_id)
+        invalidar_hierarquia(self.db, escritorio_id)
+        return etapa
     
     def atualizar_etapa(
         self, 
@@ -103,6 +106,7 @@ class EtapaService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Etapa não encontrada"
             )
+        invalidar_hierarquia(self.db, escritorio_id)
         return etapa_atualizada
     
     def deletar_etapa(self, etapa_id: int, escritorio_id: int) -> bool:
@@ -122,31 +126,30 @@ class EtapaService:
                 detail="Não é possível excluir etapa que possui tarefas. Exclua as tarefas primeiro."
             )
         
-        return self.etapa_repo.delete(etapa_id, escritorio_id)
+        deletado = self.etapa_repo.delete(etapa_id, escritorio_id)
+        invalidar_hierarquia(self.db, escritorio_id)
+        return deletado
     
     def reordenar_etapas(
         self,
         servico_id: int,
         etapa_ids: List[int],
         escritorio_id: int
-    ) -> List[Etapa]:
+    ) -> List[EtapaResponse]:
         """
         Reordena etapas de um serviço em lote
-        Recebe uma lista de IDs na nova ordem e atualiza o campo ordem de cada etapa
+        Recebe uma lista de IDs na nova ordem e grava todas as posições em um único UPDATE
         """
-        # Validar se serviço existe e pertence ao escritório
-        servico = self.servico_repo.get_by_id(servico_id, escritorio_id)
-        if not servico:
+        # Etapas do serviço (com tarefas, para a resposta): valida a lista em uma consulta
+        etapas = self.etapa_repo.get_by_servico(servico_id, escritorio_id)
+        if not etapas and not self.servico_repo.get_by_id(servico_id, escritorio_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Serviço não encontrado"
             )
         
-        # Validar se todas as etapas pertencem ao serviço e escritório
-        etapas = self.etapa_repo.get_by_servico(servico_id, escritorio_id)
         etapa_ids_existentes = {etapa.id for etapa in etapas}
-        
-        if len(etapa_ids) != len(etapa_ids_existentes):
+        if len(etapa_ids) != len(etapa_ids_existentes) or len(set(etapa_ids)) != len(etapa_ids):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Número de etapas não corresponde ao esperado"
@@ -159,19 +162,9 @@ class EtapaService:
                     detail=f"Etapa {etapa_id} não pertence ao serviço {servico_id}"
                 )
         
-        # Atualizar ordem de cada etapa
-        etapas_atualizadas = []
-        for ordem, etapa_id in enumerate(etapa_ids):
-            etapa = self.etapa_repo.get_by_id(etapa_id, escritorio_id)
-            if etapa:
-                etapa_atualizada = self.etapa_repo.update(
-                    etapa_id,
-                    EtapaUpdate(ordem=ordem),
-                    escritorio_id
-                )
-                if etapa_atualizada:
-                    etapas_atualizadas.append(etapa_atualizada)
-        
-        return etapas_atualizadas
-
-
+        etapas = self.etapa_repo.reordenar(etapas, etapa_ids, escritorio_id)
+        # Resposta montada antes do commit, que expiraria os objetos (um refresh por etapa)
+        resposta = [EtapaResponse.model_validate(etapa) for etapa in etapas]
+        self.db.commit()
+        invalidar_hierarquia(self.db, escritorio_id)
+        return resposta
@@ -0,0 +1,87 @@
+"""
+Exportações em CSV/XLSX com streaming
+
+A consulta roda em uma sessão própria, aberta quando o download começa e
+fechada ao final: a sessão das dependências já foi encerrada quando o
+StreamingResponse começa a enviar o corpo. As linhas vêm do cursor no
+servidor (yield_per) em lotes de EXPORT_BATCH_SIZE, então a memória fica
+constante independente do tamanho da tabela.
+"""
+from datetime import date
+from typing import Callable, Iterator, List, Optional, Tuple
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+from app.database import abrir_sessao_leitura
+from app.utils.exportacao import (
+    MEDIA_TYPE_CSV, MEDIA_TYPE_GZIP, MEDIA_TYPE_XLSX, comprimir_gzip, gerar_csv, gerar_xlsx
+)
+
+
+FORMATO_CSV = "csv"
+FORMATO_XLSX = "xlsx"
+
+MontarConsulta = Callable[[Session], Tuple[List[str], Query]]
+
+
+def gerar_exportacao(
+    montar_consulta: MontarConsulta,
+    formato: str,
+    nome_planilha: str,
+    authorization: Optional[str] = None,
+    ultima_escrita: Optional[str] = None
+) -> Iterator[bytes]:
+    """Blocos do arquivo exportado, lendo a consulta em lotes no cursor do servidor"""
+    db = abrir_sessao_leitura(authorization, ultima_escrita)
+    try:
+        cabecalho, query = montar_consulta(db)
+        linhas = query.yield_per(settings.EXPORT_BATCH_SIZE)
+        if formato == FORMATO_XLSX:
+            yield from gerar_xlsx(cabecalho, linhas, nome_planilha)
+        else:
+            yield from gerar_csv(cabecalho, linhas)
+    finally:
+        db.close()
+
+
+def resposta_exportacao(
+    nome: str,
+    montar_consulta: MontarConsulta,
+    formato: str = FORMATO_CSV,
+    gzip: bool = False,
+    authorization: Optional[str] = None,
+    ultima_escrita: Optional[str] = None
+) -> StreamingResponse:
+    """
+    StreamingResponse de download com o arquivo exportado
+    
+    Args:
+        nome: Nome base do arquivo e da planilha (ex.: "movimentos")
+        montar_consulta: Recebe a sessão e retorna (cabeçalho, consulta de colunas)
+        formato: "csv" ou "xlsx"
+        gzip: Compactar o CSV (.csv.gz); o XLSX já é compactado
+        authorization: Header Authorization, para a escolha da réplica
+        ultima_escrita: Marca da última escrita do cliente (read-your-writes)
+    """
+    if formato not in (FORMATO_CSV, FORMATO_XLSX):
+        raise BadRequestException("Formato inválido: use csv ou xlsx")
+    if gzip and formato == FORMATO_XLSX:
+        raise BadRequestException("O XLSX já é compactado: gzip só se aplica ao CSV")
+    
+    blocos = gerar_exportacao(montar_consulta, formato, nome.capitalize(), authorization, ultima_escrita)
+    arquivo = f"{nome}-{date.today():%Y%m%d}.{formato}"
+    media_type = MEDIA_TYPE_XLSX if formato == FORMATO_XLSX else MEDIA_TYPE_CSV
+    if gzip:
+        blocos = comprimir_gzip(blocos)
+        arquivo += ".gz"
+        media_type = MEDIA_TYPE_GZIP
+    
+    return StreamingResponse(
+        blocos,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{arquivo}"',
+            "Cache-Control": "no-store",
+        },
+    )
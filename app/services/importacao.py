@@ -0,0 +1,394 @@
+"""
+Importação em massa de clientes e movimentos (CSV/XLSX)
+
+O arquivo é lido linha a linha (ver app.utils.importacao), cada linha é
+convertida e validada com o schema de criação (ClienteCreate /
+MovimentoCreate) e as válidas são inseridas em lotes de IMPORT_BATCH_SIZE
+com INSERT multi-linha. Linhas com erro são reportadas e puladas, sem
+interromper as demais; todos os lotes entram em uma única transação,
+confirmada ao final. Com dry_run nada é gravado: o resultado mostra o que
+seria importado.
+
+Aceita o próprio formato das exportações (";" , vírgula decimal,
+dd/mm/aaaa, rótulos de tipo), então um arquivo exportado pode ser
+reimportado em outro escritório.
+"""
+import gzip
+import re
+import time
+import zipfile
+import zlib
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import String
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+from app.models.cliente import Cliente
+from app.models.movimento import Movimento
+from app.repositories.cliente import ClienteRepository
+from app.repositories.movimento_repository import MovimentoRepository, TIPOS_MOVIMENTO
+from app.repositories.projeto_repository import ProjetoRepository
+from app.schemas.cliente import ClienteCreate
+from app.schemas.movimento import MovimentoCreate
+from app.services.relatorio_financeiro_cache import invalidar_relatorios
+from app.utils.importacao import (
+    ArquivoInvalido, LinhaImportada, booleano, data, inteiro, ler_csv, ler_xlsx,
+    normalizar_cabecalho, numerico, rotulo, texto
+)
+
+
+FORMATO_CSV = "csv"
+FORMATO_XLSX = "xlsx"
+
+Conversor = Callable[[Any], Any]
+
+
+def _tipo_pessoa(valor: Any) -> Optional[str]:
+    chave = normalizar_cabecalho(valor)
+    if not chave:
+        return None
+    if chave in ("fisica", "pessoa_fisica", "pf", "cpf"):
+        return "fisica"
+    if chave in ("juridica", "pessoa_juridica", "pj", "cnpj"):
+        return "juridica"
+    raise ValueError(f"Tipo de pessoa inválido: '{valor}' (use Física ou Jurídica)")
+
+
+def _mapa_colunas(campos: Dict[str, tuple]) -> Dict[str, Tuple[str, Conversor]]:
+    """{campo: (conversor, *cabeçalhos aceitos)} -> {cabeçalho normalizado: (campo, conversor)}"""
+    return {
+        normalizar_cabecalho(cabecalho): (campo, conversor)
+        for campo, (conversor, *cabecalhos) in campos.items()
+        for cabecalho in (campo, *cabecalhos)
+    }
+
+
+def _limites_texto(modelo, colunas: Dict[str, str]) -> Dict[str, int]:
+    """Tamanho máximo dos campos de texto, pelas colunas do modelo ({campo: coluna})"""
+    tabela = modelo.__table__
+    return {
+        campo: tabela.c[coluna].type.length
+        for campo, coluna in colunas.items()
+        if isinstance(tabela.c[coluna].type, String) and tabela.c[coluna].type.length
+    }
+
+
+COLUNAS_CLIENTE = _mapa_colunas({
+    "nome": (texto,),
+    "email": (texto, "e-mail"),
+    "telefone": (texto, "celular"),
+    "cpf_cnpj": (texto, "identificação", "cpf", "cnpj", "documento"),
+    "tipo_pessoa": (_tipo_pessoa, "tipo de pessoa"),
+    "data_nascimento": (data, "data de nascimento", "nascimento"),
+    "logradouro": (texto, "endereço"),
+    "numero": (texto, "número"),
+    "complemento": (texto,),
+    "bairro": (texto,),
+    "cidade": (texto,),
+    "uf": (texto, "estado"),
+    "cep": (texto,),
+    "observacoes": (texto, "observações", "indicado por"),
+    "ativo": (booleano,),
+})
+OBRIGATORIAS_CLIENTE = ("nome", "email", "telefone", "cpf_cnpj")
+LIMITES_CLIENTE = _limites_texto(Cliente, {
+    "nome": "nome", "email": "email", "telefone": "telefone", "cpf_cnpj": "identificacao",
+    "logradouro": "logradouro", "numero": "numero", "complemento": "complemento", "bairro": "bairro",
+    "cidade": "cidade", "uf": "uf", "cep": "cep", "observacoes": "indicado_por",
+})
+
+def _numerico_coluna(modelo, coluna: str):
+    """Conversor numérico com a precisão e a escala da coluna do modelo"""
+    tipo = modelo.__table__.c[coluna].type
+    return numerico(tipo.precision, tipo.scale)
+
+
+# Valores de Movimento são Numeric(15, 2): 2 casas e até 13 dígitos inteiros
+VALOR_MOVIMENTO = _numerico_coluna(Movimento, "valor")
+
+COLUNAS_MOVIMENTO = _mapa_colunas({
+    "data_entrada": (data, "data de entrada", "data"),
+    "data_efetivacao": (data, "data de efetivação"),
+    "competencia": (data, "competência"),
+    "tipo": (rotulo(TIPOS_MOVIMENTO),),
+    "descricao": (texto, "descrição"),
+    "observacao": (texto, "observação"),
+    "projeto_id": (inteiro, "id do projeto"),
+    "valor": (VALOR_MOVIMENTO,),
+    "valor_acrescido": (VALOR_MOVIMENTO, "acréscimo"),
+    "valor_desconto": (VALOR_MOVIMENTO, "desconto"),
+    "valor_resultante": (VALOR_MOVIMENTO, "valor resultante"),
+    "codigo_plano_contas": (texto, "plano de contas"),
+    "ativo": (booleano,),
+})
+OBRIGATORIAS_MOVIMENTO = ("data_entrada", "tipo", "descricao", "valor")
+LIMITES_MOVIMENTO = _limites_texto(Movimento, {
+    "descricao": "descricao", "observacao": "observacao", "codigo_plano_contas": "codigo_plano_contas",
+})
+
+
+def formato_do_arquivo(nome_arquivo: Optional[str], formato: Optional[str] = None) -> Tuple[str, bool]:
+    """(formato, compactado com gzip) pelo parâmetro informado ou pela extensão do arquivo"""
+    nome = (nome_arquivo or "").lower()
+    compactado = nome.endswith(".gz")
+    if compactado:
+        nome = nome[:-3]
+    if not formato:
+        formato = FORMATO_XLSX if nome.endswith(".xlsx") else FORMATO_CSV
+    if formato not in (FORMATO_CSV, FORMATO_XLSX):
+        raise BadRequestException("Formato inválido: use csv ou xlsx")
+    if compactado and formato == FORMATO_XLSX:
+        raise BadRequestException("O XLSX já é compactado: gzip só se aplica ao CSV")
+    return formato, compactado
+
+
+def _chave_documento(identificacao: str) -> str:
+    """CPF/CNPJ comparável: só dígitos (123.456.789-00 == 12345678900)"""
+    return re.sub(r"\D", "", identificacao) or identificacao.strip().upper()
+
+
+class ResultadoImportacao:
+    """Contadores e erros por linha de uma importação"""
+    
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.total_linhas = 0
+        self.validas = 0
+        self.duplicadas = 0
+        self.linhas_com_erro: Set[int] = set()
+        self.erros: List[dict] = []
+        self.erros_omitidos = 0
+        self.colunas_ignoradas: List[str] = []
+        self.inicio = time.perf_counter()
+    
+    def erro(self, linha: int, coluna: Optional[str], mensagem: str) -> None:
+        self.linhas_com_erro.add(linha)
+        if len(self.erros) < settings.IMPORT_MAX_ERRORS:
+            self.erros.append({"linha": linha, "coluna": coluna, "mensagem": mensagem})
+        else:
+            self.erros_omitidos += 1
+    
+    def to_dict(self) -> dict:
+        duracao = time.perf_counter() - self.inicio
+        return {
+            "dry_run": self.dry_run,
+            "total_linhas": self.total_linhas,
+            "validas": self.validas,
+            "importadas": 0 if self.dry_run else self.validas,
+            "duplicadas": self.duplicadas,
+            "com_erro": len(self.linhas_com_erro),
+            "erros": self.erros,
+            "erros_omitidos": self.erros_omitidos,
+            "colunas_ignoradas": self.colunas_ignoradas,
+            "duracao_segundos": round(duracao, 3),
+            "linhas_por_segundo": round(self.total_linhas / duracao, 1) if duracao else 0.0,
+        }
+
+
+class ImportacaoService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.clientes = ClienteRepository(db)
+        self.movimentos = MovimentoRepository(db)
+        self.projetos = ProjetoRepository(db)
+    
+    def importar_clientes(
+        self,
+        arquivo: BinaryIO,
+        escritorio_id: int,
+        formato: str = FORMATO_CSV,
+        compactado: bool = False,
+        dry_run: bool = False
+    ) -> dict:
+        """
+        Importa clientes para o escritório
+        
+        CPF/CNPJ repetido (no arquivo ou já cadastrado no escritório) é
+        reportado como erro da linha; a comparação ignora a formatação.
+        """
+        existentes = {_chave_documento(doc) for doc in self.clientes.get_identificacoes(escritorio_id) if doc}
+        vistos: Set[str] = set()
+        
+        def validar_lote(lote: List[Tuple[int, ClienteCreate]], resultado: ResultadoImportacao) -> List[ClienteCreate]:
+            validos = []
+            for numero, cliente in lote:
+                chave = _chave_documento(cliente.cpf_cnpj)
+                if chave in existentes or chave in vistos:
+                    resultado.duplicadas += 1
+                    origem = "neste escritório" if chave in existentes else "em outra linha do arquivo"
+                    resultado.erro(numero, "cpf_cnpj", f"CPF/CNPJ {cliente.cpf_cnpj} já cadastrado {origem}")
+                    continue
+                vistos.add(chave)
+                validos.append(cliente)
+            return validos
+        
+        return self._importar(
+            arquivo, formato, compactado, dry_run,
+            ClienteCreate, COLUNAS_CLIENTE, OBRIGATORIAS_CLIENTE, LIMITES_CLIENTE,
+            validar_lote,
+            lambda clientes: self.clientes.create_em_lote(clientes, escritorio_id)
+        )
+    
+    def importar_movimentos(
+        self,
+        arquivo: BinaryIO,
+        escritorio_id: int,
+        formato: str = FORMATO_CSV,
+        compactado: bool = False,
+        dry_run: bool = False
+    ) -> dict:
+        """
+        Importa movimentos financeiros para o escritório
+        
+        O resumo mensal é atualizado na mesma transação (um upsert por lote)
+        e os relatórios financeiros do escritório são invalidados ao final.
+        """
+        def validar_lote(lote: List[Tuple[int, MovimentoCreate]], resultado: ResultadoImportacao) -> List[MovimentoCreate]:
+            projetos = self.projetos.get_ids_do_escritorio(
+                (movimento.projeto_id for _, movimento in lote if movimento.projeto_id), escritorio_id
+            )
+            validos = []
+            for numero, movimento in lote:
+                if movimento.tipo not in TIPOS_MOVIMENTO:
+                    resultado.erro(numero, "tipo", f"Tipo inválido: {movimento.tipo} (use {', '.join(TIPOS_MOVIMENTO.values())})")
+                elif movimento.projeto_id and movimento.projeto_id not in projetos:
+                    resultado.erro(numero, "projeto_id", f"Projeto {movimento.projeto_id} não encontrado neste escritório")
+                else:
+                    validos.append(movimento)
+            return validos
+        
+        resultado = self._importar(
+            arquivo, formato, compactado, dry_run,
+            MovimentoCreate, COLUNAS_MOVIMENTO, OBRIGATORIAS_MOVIMENTO, LIMITES_MOVIMENTO,
+            validar_lote,
+            lambda movimentos: self.movimentos.create_em_lote(movimentos, escritorio_id)
+        )
+        if resultado["importadas"]:
+            invalidar_relatorios(self.db, escritorio_id)
+        return resultado
+    
+    def _importar(
+        self,
+        arquivo: BinaryIO,
+        formato: str,
+        compactado: bool,
+        dry_run: bool,
+        schema: Type[BaseModel],
+        colunas: Dict[str, Tuple[str, Conversor]],
+        obrigatorias: Tuple[str, ...],
+        limites: Dict[str, int],
+        validar_lote: Callable[[List[Tuple[int, Any]], ResultadoImportacao], List[Any]],
+        inserir_lote: Callable[[List[Any]], None]
+    ) -> dict:
+        resultado = ResultadoImportacao(dry_run)
+        try:
+            linhas = self._ler(arquivo, formato, compactado)
+            try:
+                _, cabecalho = next(linhas)
+            except StopIteration:
+                raise BadRequestException("Arquivo vazio")
+            
+            # Posição de cada coluna reconhecida; a primeira ocorrência de um campo vale
+            posicoes: List[Tuple[int, str, str, Conversor]] = []
+            mapeados = set()
+            for posicao, titulo in enumerate(cabecalho):
+                campo, conversor = colunas.get(normalizar_cabecalho(titulo), (None, None))
+                if campo is None or campo in mapeados:
+                    if titulo not in (None, ""):
+                        resultado.colunas_ignoradas.append(str(titulo))
+                    continue
+                mapeados.add(campo)
+                posicoes.append((posicao, campo, str(titulo), conversor))
+            
+            faltando = [campo for campo in obrigatorias if campo not in mapeados]
+            if faltando:
+                raise BadRequestException(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+            titulos = {campo: titulo for _, campo, titulo, _ in posicoes}
+            
+            lote: List[Tuple[int, Any]] = []
+            for numero, valores in linhas:
+                resultado.total_linhas += 1
+                registro = self._validar_linha(numero, valores, posicoes, titulos, schema, limites, resultado)
+                if registro is not None:
+                    lote.append((numero, registro))
+                if len(lote) >= settings.IMPORT_BATCH_SIZE:
+                    self._processar_lote(lote, validar_lote, inserir_lote, resultado)
+                    lote = []
+            self._processar_lote(lote, validar_lote, inserir_lote, resultado)
+            
+            if dry_run:
+                self.db.rollback()
+            else:
+                self.db.commit()
+        except ArquivoInvalido as erro:
+            self.db.rollback()
+            raise BadRequestException(str(erro))
+        except (OSError, EOFError, zlib.error, zipfile.BadZipFile):
+            # gzip ou XLSX corrompido/truncado no meio da leitura
+            self.db.rollback()
+            raise BadRequestException("Arquivo corrompido ou incompleto")
+        except Exception:
+            self.db.rollback()
+            raise
+        return resultado.to_dict()
+    
+    def _ler(self, arquivo: BinaryIO, formato: str, compactado: bool) -> Iterator[LinhaImportada]:
+        if compactado:
+            arquivo = gzip.GzipFile(fileobj=arquivo, mode="rb")
+        return ler_xlsx(arquivo) if formato == FORMATO_XLSX else ler_csv(arquivo)
+    
+    def _validar_linha(
+        self,
+        numero: int,
+        valores: List[Any],
+        posicoes: List[Tuple[int, str, str, Conversor]],
+        titulos: Dict[str, str],
+        schema: Type[BaseModel],
+        limites: Dict[str, int],
+        resultado: ResultadoImportacao
+    ) -> Optional[BaseModel]:
+        """Converte e valida uma linha; registra os erros e retorna None se inválida"""
+        dados = {}
+        valida = True
+        for posicao, campo, titulo, conversor in posicoes:
+            bruto = valores[posicao] if posicao < len(valores) else None
+            try:
+                valor = conversor(bruto)
+            except ValueError as erro:
+                resultado.erro(numero, titulo, str(erro))
+                valida = False
+                continue
+            if valor is None:
+                # Ausente: vale o padrão do schema (ou o erro de campo obrigatório)
+                continue
+            limite = limites.get(campo)
+            if limite and isinstance(valor, str) and len(valor) > limite:
+                resultado.erro(numero, titulo, f"Texto com {len(valor)} caracteres (máximo {limite})")
+                valida = False
+                continue
+            dados[campo] = valor
+        if not valida:
+            return None
+        
+        try:
+            return schema(**dados)
+        except ValidationError as erro:
+            for detalhe in erro.errors():
+                campo = str(detalhe["loc"][0]) if detalhe.get("loc") else None
+                resultado.erro(numero, titulos.get(campo, campo), detalhe.get("msg", "Valor inválido"))
+            return None
+    
+    def _processar_lote(
+        self,
+        lote: List[Tuple[int, Any]],
+        validar_lote: Callable[[List[Tuple[int, Any]], ResultadoImportacao], List[Any]],
+        inserir_lote: Callable[[List[Any]], None],
+        resultado: ResultadoImportacao
+    ) -> None:
+        if not lote:
+            return
+        validos = validar_lote(lote, resultado)
+        resultado.validas += len(validos)
+        if validos and not resultado.dry_run:
+            inserir_lote(validos)
@@ -0,0 +1,54 @@
+"""
+Service de Movimentos Financeiros - Lógica de negócio
+
+Escritas em movimentos passam por aqui para invalidar os relatórios
+financeiros do escritório depois do commit.
+"""
+from typing import Optional
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.models.movimento import Movimento
+from app.repositories.movimento_repository import MovimentoRepository
+from app.repositories.movimento_resumo_repository import MovimentoResumoRepository
+from app.schemas.movimento import MovimentoCreate, MovimentoUpdate
+from app.services.relatorio_financeiro_cache import invalidar_relatorios
+
+
+class MovimentoService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.movimento_repo = MovimentoRepository(db)
+        self.resumo_repo = MovimentoResumoRepository(db)
+    
+    def criar_movimento(self, movimento_data: MovimentoCreate, escritorio_id: int) -> Movimento:
+        """Cria um movimento, vinculado ao escritório"""
+        movimento = self.movimento_repo.create(movimento_data, escritorio_id)
+        invalidar_relatorios(self.db, escritorio_id)
+        return movimento
+    
+    def atualizar_movimento(self, movimento_id: int, movimento_data: MovimentoUpdate, escritorio_id: int) -> Movimento:
+        """Atualiza um movimento, garantindo que pertence ao escritório"""
+        movimento = self.movimento_repo.update(movimento_id, movimento_data, escritorio_id)
+        if not movimento:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Movimento não encontrado"
+            )
+        invalidar_relatorios(self.db, escritorio_id)
+        return movimento
+    
+    def deletar_movimento(self, movimento_id: int, escritorio_id: int) -> None:
+        """Deleta um movimento, garantindo que pertence ao escritório"""
+        if not self.movimento_repo.delete(movimento_id, escritorio_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Movimento não encontrado"
+            )
+        invalidar_relatorios(self.db, escritorio_id)
+    
+    def reconstruir_resumo(self, escritorio_id: Optional[int] = None) -> int:
+        """Recalcula o resumo mensal (do escritório ou de todos) e retorna o número de linhas"""
+        linhas = self.resumo_repo.reconstruir(escritorio_id)
+        invalidar_relatorios(self.db, escritorio_id)
+        return linhas
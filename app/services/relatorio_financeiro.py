@@ -0,0 +1,255 @@
+"""
+Relatórios financeiros pelo plano de contas (DRE e fluxo de caixa)
+
+Uma única consulta percorre a árvore do plano de contas do escritório com
+uma CTE recursiva e a junta aos totais por conta e mês (resumo mensal de
+movimentos + dias avulsos nas pontas do período); o acúmulo dos subtotais
+de cada nó até a raiz é feito em memória, das folhas para cima. O custo
+depende do número de contas x meses, não do número de movimentos.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional
+from sqlalchemy import func, literal, select
+from sqlalchemy.orm import Session
+from app.core.exceptions import BadRequestException
+from app.models.plano_contas import PlanoContas
+from app.repositories.movimento_resumo_repository import (
+    MovimentoResumoRepository, TIPO_DESPESA, TIPO_RECEITA
+)
+from app.services.relatorio_financeiro_cache import chave_relatorio, obter_relatorio, salvar_relatorio
+
+
+# Proteção contra ciclos no plano de contas (pai apontando para descendente)
+PROFUNDIDADE_MAXIMA = 20
+
+ZERO = Decimal(0)
+
+
+class RelatorioFinanceiroService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.resumo = MovimentoResumoRepository(db)
+    
+    def dre(self, escritorio_id: int, data_inicio: date, data_fim: date, incluir_zeradas: bool = False) -> dict:
+        """Demonstrativo de resultado: receitas, despesas e resultado por conta no período"""
+        return self._relatorio(escritorio_id, data_inicio, data_fim, False, incluir_zeradas)
+    
+    def fluxo_caixa(self, escritorio_id: int, data_inicio: date, data_fim: date, incluir_zeradas: bool = False) -> dict:
+        """Fluxo de caixa: o mesmo demonstrativo aberto mês a mês, com saldo acumulado"""
+        return self._relatorio(escritorio_id, data_inicio, data_fim, True, incluir_zeradas)
+    
+    def _relatorio(
+        self,
+        escritorio_id: int,
+        data_inicio: date,
+        data_fim: date,
+        mensal: bool,
+        incluir_zeradas: bool
+    ) -> dict:
+        if data_inicio > data_fim:
+            raise BadRequestException("data_inicio deve ser anterior ou igual a data_fim")
+        
+        chave = chave_relatorio(self.db, escritorio_id, data_inicio, data_fim, mensal, incluir_zeradas)
+        em_cache = obter_relatorio(chave)
+        if em_cache is not None:
+            return em_cache
+        
+        relatorio = self._calcular(escritorio_id, data_inicio, data_fim, mensal, incluir_zeradas)
+        salvar_relatorio(chave, relatorio)
+        return relatorio
+    
+    def _consulta(self, escritorio_id: int, data_inicio: date, data_fim: date):
+        """Árvore do plano de contas (CTE recursiva) x totais por conta e mês"""
+        conta = PlanoContas.__table__
+        arvore = select(
+            conta.c.id,
+            conta.c.plano_contas_pai_id.label("pai_id"),
+            conta.c.codigo,
+            conta.c.descricao,
+            conta.c.tipo,
+            literal(0).label("profundidade"),
+        ).where(
+            conta.c.escritorio_id == escritorio_id,
+            conta.c.plano_contas_pai_id.is_(None)
+        ).cte("arvore", recursive=True)
+        
+        filha = conta.alias("filha")
+        arvore = arvore.union_all(
+            select(
+                filha.c.id,
+                filha.c.plano_contas_pai_id,
+                filha.c.codigo,
+                filha.c.descricao,
+                filha.c.tipo,
+                arvore.c.profundidade + 1,
+            ).where(
+                filha.c.plano_contas_pai_id == arvore.c.id,
+                filha.c.escritorio_id == escritorio_id,
+                arvore.c.profundidade < PROFUNDIDADE_MAXIMA
+            )
+        )
+        
+        lancamentos = self.resumo.lancamentos(escritorio_id, data_inicio, data_fim)
+        totais = select(
+            lancamentos.c.codigo_plano_contas.label("codigo"),
+            lancamentos.c.mes,
+            func.sum(lancamentos.c.total).filter(lancamentos.c.tipo == TIPO_RECEITA).label("receitas"),
+            func.sum(lancamentos.c.total).filter(lancamentos.c.tipo == TIPO_DESPESA).label("despesas"),
+        ).where(
+            lancamentos.c.tipo.in_((TIPO_RECEITA, TIPO_DESPESA))
+        ).group_by(lancamentos.c.codigo_plano_contas, lancamentos.c.mes).cte("totais")
+        
+        # FULL JOIN: contas sem movimento e códigos de movimento sem conta também aparecem
+        return select(
+            arvore.c.id,
+            arvore.c.pai_id,
+            arvore.c.codigo,
+            arvore.c.descricao,
+            arvore.c.tipo,
+            arvore.c.profundidade,
+            totais.c.codigo.label("codigo_lancamento"),
+            totais.c.mes,
+            totais.c.receitas,
+            totais.c.despesas,
+        ).select_from(
+            arvore.join(totais, arvore.c.codigo == totais.c.codigo, full=True)
+        ).order_by(arvore.c.profundidade, arvore.c.codigo, arvore.c.id, totais.c.mes)
+    
+    def _calcular(
+        self,
+        escritorio_id: int,
+        data_inicio: date,
+        data_fim: date,
+        mensal: bool,
+        incluir_zeradas: bool
+    ) -> dict:
+        nos: Dict[int, dict] = {}
+        ordem: List[dict] = []
+        sem_conta = _novo_no(None, None, "", "Sem classificação", None, 0)
+        codigos_sem_conta = set()
+        atribuidos = set()
+        
+        for linha in self.db.execute(self._consulta(escritorio_id, data_inicio, data_fim)):
+            if linha.id is None:
+                # Código de movimento sem conta correspondente (ou vazio)
+                codigos_sem_conta.add(linha.codigo_lancamento)
+                _somar(sem_conta, linha.mes, linha.receitas, linha.despesas)
+                continue
+            
+            no = nos.get(linha.id)
+            if no is None:
+                no = _novo_no(linha.id, linha.pai_id, linha.codigo, linha.descricao, linha.tipo, linha.profundidade + 1)
+                nos[linha.id] = no
+                ordem.append(no)
+            
+            # Contas com código repetido: o total fica só na primeira
+            if linha.mes is not None and (linha.codigo, linha.mes) not in atribuidos:
+                atribuidos.add((linha.codigo, linha.mes))
+                _somar(no, linha.mes, linha.receitas, linha.despesas)
+        
+        # Ordem por profundidade: ligar de cima para baixo, acumular de baixo para cima
+        raizes = []
+        for no in ordem:
+            pai = nos.get(no["pai_id"])
+            (pai["filhas"] if pai else raizes).append(no)
+        for no in reversed(ordem):
+            pai = nos.get(no["pai_id"])
+            if pai:
+                for mes, (receitas, despesas) in no["meses"].items():
+                    _somar(pai, mes, receitas, despesas)
+        
+        receitas = sum((no["receitas"] for no in raizes), sem_conta["receitas"])
+        despesas = sum((no["despesas"] for no in raizes), sem_conta["despesas"])
+        relatorio = {
+            "escritorio_id": escritorio_id,
+            "data_inicio": data_inicio.isoformat(),
+            "data_fim": data_fim.isoformat(),
+            "receitas": float(receitas),
+            "despesas": float(despesas),
+            "resultado": float(receitas - despesas),
+            "contas": [
+                conta for conta in (_formatar(no, mensal, incluir_zeradas) for no in raizes) if conta is not None
+            ],
+            "sem_classificacao": {
+                **_formatar(sem_conta, mensal, True),
+                "codigos": sorted(codigo for codigo in codigos_sem_conta if codigo),
+            },
+        }
+        
+        if mensal:
+            meses: Dict[date, list] = defaultdict(lambda: [ZERO, ZERO])
+            for no in [*raizes, sem_conta]:
+                for mes, (receitas_mes, despesas_mes) in no["meses"].items():
+                    meses[mes][0] += receitas_mes
+                    meses[mes][1] += despesas_mes
+            acumulado = ZERO
+            relatorio["meses"] = []
+            for mes in sorted(meses):
+                receitas_mes, despesas_mes = meses[mes]
+                acumulado += receitas_mes - despesas_mes
+                relatorio["meses"].append({
+                    "mes": mes.strftime("%Y-%m"),
+                    "receitas": float(receitas_mes),
+                    "despesas": float(despesas_mes),
+                    "saldo": float(receitas_mes - despesas_mes),
+                    "saldo_acumulado": float(acumulado),
+                })
+        return relatorio
+
+
+def _novo_no(conta_id: Optional[int], pai_id: Optional[int], codigo: str, descricao: str, tipo: Optional[str], nivel: int) -> dict:
+    return {
+        "id": conta_id,
+        "pai_id": pai_id,
+        "codigo": codigo,
+        "descricao": descricao,
+        "tipo": tipo,
+        "nivel": nivel,
+        "receitas": ZERO,
+        "despesas": ZERO,
+        "meses": {},
+        "filhas": [],
+    }
+
+
+def _somar(no: dict, mes: Optional[date], receitas: Optional[Decimal], despesas: Optional[Decimal]) -> None:
+    if mes is None:
+        return
+    receitas = receitas or ZERO
+    despesas = despesas or ZERO
+    no["receitas"] += receitas
+    no["despesas"] += despesas
+    receitas_mes, despesas_mes = no["meses"].get(mes, (ZERO, ZERO))
+    no["meses"][mes] = (receitas_mes + receitas, despesas_mes + despesas)
+
+
+def _formatar(no: dict, mensal: bool, incluir_zeradas: bool) -> Optional[dict]:
+    """Nó no formato da resposta (None se zerado e sem filhas com valor)"""
+    filhas = [conta for conta in (_formatar(filha, mensal, incluir_zeradas) for filha in no["filhas"]) if conta is not None]
+    if not incluir_zeradas and not filhas and not no["meses"]:
+        return None
+    
+    conta = {
+        "id": no["id"],
+        "codigo": no["codigo"],
+        "descricao": no["descricao"],
+        "tipo": no["tipo"],
+        "nivel": no["nivel"],
+        "receitas": float(no["receitas"]),
+        "despesas": float(no["despesas"]),
+        "resultado": float(no["receitas"] - no["despesas"]),
+        "filhas": filhas,
+    }
+    if mensal:
+        conta["meses"] = [
+            {
+                "mes": mes.strftime("%Y-%m"),
+                "receitas": float(receitas),
+                "despesas": float(despesas),
+                "saldo": float(receitas - despesas),
+            }
+            for mes, (receitas, despesas) in sorted(no["meses"].items())
+        ]
+    return conta
@@ -0,0 +1,50 @@
+"""
+Cache dos relatórios financeiros (DRE / fluxo de caixa) por escritório e período
+
+As chaves levam a versão do escritório na tabela cache_versao (ver
+CacheVersaoRepository): invalidar_relatorios incrementa a versão e as
+entradas antigas deixam de ser encontradas (saem por LRU/TTL). Qualquer
+escrita em movimentos deve chamar invalidar_relatorios depois do commit
+(ver MovimentoService). A chave deve ser obtida antes de calcular o
+relatório, na mesma sessão, para que um cálculo concorrente com uma escrita
+não seja salvo como atual.
+
+Com o backend padrão (InMemoryCache) cada worker tem as próprias entradas,
+mas a versão é compartilhada pelo banco.
+"""
+from typing import Any, Hashable, Optional
+from sqlalchemy.orm import Session
+from app.core.cache import CacheBackend, InMemoryCache
+from app.core.config import settings
+from app.repositories.cache_versao_repository import CacheVersaoRepository, ESCOPO_RELATORIOS
+
+
+_backend: CacheBackend = InMemoryCache(
+    max_size=settings.RELATORIO_CACHE_MAX_SIZE,
+    ttl_seconds=settings.RELATORIO_CACHE_TTL_SECONDS
+)
+
+
+def set_relatorio_cache_backend(backend: CacheBackend) -> None:
+    """Substitui o backend do cache (ex.: por um cache compartilhado)"""
+    global _backend
+    _backend = backend
+
+
+def chave_relatorio(db: Session, escritorio_id: int, *parametros: Hashable) -> tuple:
+    """Chave do relatório na versão atual do escritório (lida na sessão do cálculo)"""
+    versao = CacheVersaoRepository(db).obter(ESCOPO_RELATORIOS, escritorio_id)
+    return (escritorio_id, versao, *parametros)
+
+
+def obter_relatorio(chave: tuple) -> Optional[Any]:
+    return _backend.get(chave)
+
+
+def salvar_relatorio(chave: tuple, relatorio: Any) -> None:
+    _backend.set(chave, relatorio)
+
+
+def invalidar_relatorios(db: Session, escritorio_id: Optional[int] = None) -> None:
+    """Nova versão dos relatórios do escritório (ou de todos, se None)"""
+    CacheVersaoRepository(db).incrementar(ESCOPO_RELATORIOS, escritorio_id)
@@ -0,0 +1,334 @@
+"""
+Gerador de dados sintéticos multi-escritório (benchmarks)
+
+Estende EscritorioSeeds criando, para cada escritório, colaboradores com
+perfis, clientes, árvore serviço > etapas > tarefas, plano de contas,
+propostas, projetos e movimentos em escala configurável. Os dados são
+determinísticos para a mesma semente, permitindo comparar execuções.
+Use sempre um banco dedicado: nada é removido depois.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.security import get_password_hash
+from app.models.cliente import Cliente
+from app.models.etapa import Etapa
+from app.models.movimento import Movimento
+from app.models.plano_contas import PlanoContas
+from app.models.projeto import Projeto
+from app.models.projeto_colaborador import ProjetoColaborador
+from app.models.proposta import Proposta
+from app.models.servico import Servico
+from app.models.status import Status
+from app.models.tarefa import Tarefa
+from app.models.user import ColaboradorEscritorioPerfil, Escritorio, User, user_escritorio
+from app.services.movimento_service import MovimentoService
+from app.services.seeds import EscritorioSeeds
+
+
+SENHA_PADRAO = "benchmark123"
+
+ESCALA_PADRAO = {
+    "colaboradores": 20,
+    "clientes": 2000,
+    "servicos": 10,
+    "etapas_por_servico": 6,
+    "tarefas_por_etapa": 5,
+    "propostas": 1500,
+    "projetos": 1500,
+    "movimentos": 5000,
+}
+
+PERFIS = ("Administrador", "Coordenador de Projetos", "Produção")
+NOMES = ("Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Heitor", "Íris", "João", "Lúcia", "Marcos")
+SOBRENOMES = ("Silva", "Souza", "Oliveira", "Pereira", "Costa", "Rodrigues", "Almeida", "Nascimento", "Araújo", "Gomes")
+CIDADES = (("São Paulo", "SP"), ("Rio de Janeiro", "RJ"), ("Belo Horizonte", "MG"), ("Curitiba", "PR"), ("Recife", "PE"))
+
+# Plano de contas: (código, descrição, tipo, código do pai)
+PLANO_CONTAS = (
+    ("1", "Receitas", "receita", None),
+    ("1.1", "Projetos", "receita", "1"),
+    ("1.1.1", "Projetos arquitetônicos", "receita", "1.1"),
+    ("1.1.2", "Projetos de interiores", "receita", "1.1"),
+    ("1.2", "Consultorias", "receita", "1"),
+    ("2", "Despesas", "despesa", None),
+    ("2.1", "Pessoal", "despesa", "2"),
+    ("2.1.1", "Salários", "despesa", "2.1"),
+    ("2.1.2", "Terceirizados", "despesa", "2.1"),
+    ("2.2", "Operacionais", "despesa", "2"),
+    ("2.2.1", "Aluguel", "despesa", "2.2"),
+    ("2.2.2", "Software", "despesa", "2.2"),
+)
+CONTAS_RECEITA = ("1.1.1", "1.1.2", "1.2")
+CONTAS_DESPESA = ("2.1.1", "2.1.2", "2.2.1", "2.2.2")
+TIPO_DESPESA = 1
+TIPO_RECEITA = 2
+
+
+class DadosSinteticosSeeds(EscritorioSeeds):
+    """
+    Gera escritórios completos com dados sintéticos
+    
+    Args:
+        db: Sessão do banco
+        semente: Semente do gerador aleatório (mesma semente, mesmos dados)
+        escala: Quantidades por escritório (sobrescreve ESCALA_PADRAO)
+    """
+    
+    def __init__(self, db: Session, semente: int = 42, escala: Optional[Dict[str, int]] = None):
+        super().__init__(db)
+        self.semente = semente
+        self.escala = {**ESCALA_PADRAO, **(escala or {})}
+        self.random = random.Random(semente)
+        # bcrypt é caro: um único hash para todos os colaboradores sintéticos
+        self._senha_hash = get_password_hash(SENHA_PADRAO)
+    
+    def gerar(self, escritorios: int) -> List[dict]:
+        """Cria `escritorios` escritórios completos e retorna o resumo de cada um"""
+        return [self.gerar_escritorio(indice) for indice in range(escritorios)]
+    
+    def gerar_escritorio(self, indice: int) -> dict:
+        """Cria um escritório com todos os dados da escala (commit ao final)"""
+        escritorio = Escritorio(
+            nome_fantasia=f"Escritório Sintético {self.semente}-{indice}",
+            razao_social=f"Escritório Sintético {self.semente}-{indice} Ltda",
+            documento=f"9{self.semente % 10000:04d}{indice:06d}",
+            email=f"contato-{self.semente}-{indice}@sintetico.arqmanager",
+            ativo=True
+        )
+        self.db.add(escritorio)
+        self.db.flush()
+        escritorio_id = escritorio.id
+        
+        self.criar_todos_seeds(escritorio_id)
+        status_ids = [s.id for s in self.db.query(Status.id).filter(Status.escritorio_id == escritorio_id)]
+        
+        colaboradores = self.criar_colaboradores(escritorio_id, indice)
+        clientes = self.criar_clientes(escritorio_id)
+        servicos = self.criar_hierarquia_servicos(escritorio_id)
+        self.criar_plano_contas(escritorio_id)
+        propostas = self.criar_propostas(escritorio_id, clientes, servicos, status_ids)
+        projetos = self.criar_projetos(escritorio_id, clientes, servicos, status_ids, colaboradores)
+        movimentos = self.criar_movimentos(escritorio_id, projetos)
+        # Inserção em lote não passa pelo MovimentoRepository: recalcula o resumo mensal (faz o commit)
+        MovimentoService(self.db).reconstruir_resumo(escritorio_id)
+        
+        return {
+            "escritorio_id": escritorio_id,
+            # Primeiro colaborador é Administrador: usado para autenticar o benchmark
+            "admin_id": colaboradores[0],
+            "admin_email": self._email(indice, 0),
+            "colaboradores": len(colaboradores),
+            "clientes": len(clientes),
+            "servicos": len(servicos),
+            "propostas": propostas,
+            "projetos": len(projetos),
+            "movimentos": movimentos,
+        }
+    
+    def criar_colaboradores(self, escritorio_id: int, indice: int) -> List[int]:
+        """Colaboradores vinculados ao escritório, com perfis variados"""
+        linhas = []
+        for numero in range(self.escala["colaboradores"]):
+            linhas.append({
+                "nome": self._nome(),
+                "email": self._email(indice, numero),
+                "senha": self._senha_hash,
+                "perfil": PERFIS[0] if numero == 0 else self.random.choice(PERFIS),
+                "tipo": "Geral",
+                "ativo": True,
+                "is_system_admin": False,
+            })
+        ids = self._inserir(User, linhas)
+        
+        self.db.execute(insert(user_escritorio), [
+            {"colaborador_id": colaborador_id, "escritorio_id": escritorio_id, "perfil": linha["perfil"], "ativo": True}
+            for colaborador_id, linha in zip(ids, linhas)
+        ])
+        self.db.execute(insert(ColaboradorEscritorioPerfil), [
+            {"colaborador_id": colaborador_id, "escritorio_id": escritorio_id, "perfil": linha["perfil"], "ativo": True}
+            for colaborador_id, linha in zip(ids, linhas)
+        ])
+        return ids
+    
+    def criar_clientes(self, escritorio_id: int) -> List[int]:
+        linhas = []
+        for numero in range(self.escala["clientes"]):
+            juridica = self.random.random() < 0.3
+            cidade, uf = self.random.choice(CIDADES)
+            linhas.append({
+                "nome": f"{self._nome()} {'Arquitetura Ltda' if juridica else ''}".strip(),
+                "email": f"cliente{numero}-{escritorio_id}@sintetico.arqmanager",
+                "identificacao": f"{self.random.randrange(10 ** 13, 10 ** 14) if juridica else self.random.randrange(10 ** 10, 10 ** 11)}",
+                "tipo_pessoa": "Jurídica" if juridica else "Física",
+                "telefone": f"119{self.random.randrange(10 ** 7, 10 ** 8)}",
+                "cidade": cidade,
+                "uf": uf,
+                "ativo": self.random.random() > 0.05,
+                "escritorio_id": escritorio_id,
+            })
+        return self._inserir(Cliente, linhas)
+    
+    def criar_hierarquia_servicos(self, escritorio_id: int) -> List[int]:
+        """Serviços com etapas e tarefas ordenadas"""
+        servicos = self._inserir(Servico, [
+            {
+                "nome": f"Serviço {numero + 1}",
+                "descricao": f"Serviço sintético {numero + 1}",
+                "valor_base": Decimal(self.random.randrange(2000, 50000)),
+                "ativo": True,
+                "escritorio_id": escritorio_id,
+            }
+            for numero in range(self.escala["servicos"])
+        ])
+        etapas = []
+        for servico_id in servicos:
+            for ordem in range(self.escala["etapas_por_servico"]):
+                etapas.append({
+                    "servico_id": servico_id,
+                    "nome": f"Etapa {ordem + 1}",
+                    "ordem": ordem,
+                    "obrigatoria": True,
+                    "escritorio_id": escritorio_id,
+                })
+        etapa_ids = self._inserir(Etapa, etapas)
+        tarefas = [
+            {
+                "etapa_id": etapa_id,
+                "nome": f"Tarefa {ordem + 1}",
+                "ordem": ordem,
+                "tem_prazo": True,
+                "precisa_detalhamento": False,
+                "escritorio_id": escritorio_id,
+            }
+            for etapa_id in etapa_ids
+            for ordem in range(self.escala["tarefas_por_etapa"])
+        ]
+        self._inserir(Tarefa, tarefas)
+        return servicos
+    
+    def criar_plano_contas(self, escritorio_id: int) -> Dict[str, int]:
+        """Árvore de receitas e despesas (códigos de PLANO_CONTAS)"""
+        ids: Dict[str, int] = {}
+        for codigo, descricao, tipo, pai in PLANO_CONTAS:
+            conta = PlanoContas(
+                codigo=codigo,
+                descricao=descricao,
+                tipo=tipo,
+                nivel=codigo.count(".") + 1,
+                plano_contas_pai_id=ids.get(pai),
+                escritorio_id=escritorio_id,
+                ativo=True
+            )
+            self.db.add(conta)
+            self.db.flush()
+            ids[codigo] = conta.id
+        return ids
+    
+    def criar_propostas(self, escritorio_id: int, clientes: List[int], servicos: List[int], status_ids: List[int]) -> int:
+        hoje = date.today()
+        linhas = []
+        for numero in range(self.escala["propostas"]):
+            data_proposta = hoje - timedelta(days=self.random.randrange(0, 3 * 365))
+            linhas.append({
+                "cliente_id": self.random.choice(clientes),
+                "servico_id": self.random.choice(servicos),
+                "status_id": self.random.choice(status_ids),
+                "escritorio_id": escritorio_id,
+                "nome": f"Proposta {numero + 1}",
+                "numero_proposta": numero + 1,
+                "ano_proposta": data_proposta.year,
+                "data_proposta": data_proposta,
+                "valor_proposta": Decimal(self.random.randrange(5000, 200000)),
+            })
+        self._inserir(Proposta, linhas)
+        return len(linhas)
+    
+    def criar_projetos(
+        self,
+        escritorio_id: int,
+        clientes: List[int],
+        servicos: List[int],
+        status_ids: List[int],
+        colaboradores: List[int]
+    ) -> List[int]:
+        hoje = date.today()
+        linhas = []
+        for numero in range(self.escala["projetos"]):
+            inicio = hoje - timedelta(days=self.random.randrange(0, 3 * 365))
+            valor = Decimal(self.random.randrange(5000, 200000))
+            linhas.append({
+                "cliente_id": self.random.choice(clientes),
+                "servico_id": self.random.choice(servicos),
+                "status_id": self.random.choice(status_ids),
+                "escritorio_id": escritorio_id,
+                "descricao": f"Projeto {numero + 1} - residência {self._nome()}",
+                "numero_projeto": numero + 1,
+                "ano_projeto": inicio.year,
+                "data_inicio": inicio,
+                "data_previsao_fim": inicio + timedelta(days=self.random.randrange(30, 365)),
+                "valor_contrato": valor,
+                "saldo_contrato": valor,
+                "ativo": True,
+            })
+        projetos = self._inserir(Projeto, linhas)
+        
+        equipe = []
+        for projeto_id in projetos:
+            for colaborador_id in self.random.sample(colaboradores, min(3, len(colaboradores))):
+                equipe.append({
+                    "projeto_id": projeto_id,
+                    "colaborador_id": colaborador_id,
+                    "ativo": True,
+                    "escritorio_id": escritorio_id,
+                })
+        if equipe:
+            self.db.execute(insert(ProjetoColaborador), equipe)
+        return projetos
+    
+    def criar_movimentos(self, escritorio_id: int, projetos: List[int]) -> int:
+        hoje = date.today()
+        linhas = []
+        for numero in range(self.escala["movimentos"]):
+            receita = self.random.random() < 0.45
+            entrada = hoje - timedelta(days=self.random.randrange(0, 3 * 365))
+            valor = Decimal(self.random.randrange(100, 30000))
+            linhas.append({
+                "projeto_id": self.random.choice(projetos) if receita and projetos else None,
+                "escritorio_id": escritorio_id,
+                "tipo": TIPO_RECEITA if receita else TIPO_DESPESA,
+                "data_entrada": entrada,
+                "data_efetivacao": entrada + timedelta(days=self.random.randrange(0, 30)),
+                "competencia": entrada.replace(day=1),
+                "descricao": f"{'Recebimento' if receita else 'Pagamento'} {numero + 1}",
+                "valor": valor,
+                "valor_resultante": valor,
+                "codigo_plano_contas": self.random.choice(CONTAS_RECEITA if receita else CONTAS_DESPESA),
+                "ativo": True,
+            })
+        # Lotes menores para não montar um único INSERT gigante
+        for inicio in range(0, len(linhas), 1000):
+            self.db.execute(insert(Movimento), linhas[inicio:inicio + 1000])
+        return len(linhas)
+    
+    def _inserir(self, modelo, linhas: List[dict]) -> List[int]:
+        """INSERT em lote retornando os ids na ordem das linhas"""
+        if not linhas:
+            return []
+        ids: List[int] = []
+        for inicio in range(0, len(linhas), 1000):
+            resultado = self.db.execute(
+                insert(modelo).returning(modelo.id, sort_by_parameter_order=True),
+                linhas[inicio:inicio + 1000]
+            )
+            ids.extend(resultado.scalars().all())
+        return ids
+    
+    def _nome(self) -> str:
+        return f"{self.random.choice(NOMES)} {self.random.choice(SOBRENOMES)} {self.random.choice(SOBRENOMES)}"
+    
+    def _email(self, indice: int, numero: int) -> str:
+        return f"colaborador{numero}-{self.semente}-{indice}@sintetico.arqmanager"
@@ -0,0 +1,32 @@
+"""
+Service assíncrono de Serviços (hierarquia nas rotas de ASYNC_ROUTERS)
+"""
+from typing import Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.servico_async_repository import ServicoAsyncRepository
+from app.services.servico_hierarquia_cache import chave_hierarquia, obter_hierarquia, salvar_hierarquia
+from app.services.servico_service import serializar_hierarquia
+
+
+class ServicoAsyncService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.servico_repo = ServicoAsyncRepository(db)
+    
+    async def obter_hierarquia_serializada(
+        self,
+        escritorio_id: int,
+        ativo: Optional[bool] = None
+    ) -> Tuple[str, bytes]:
+        """
+        Retorna (etag, JSON) da hierarquia, compartilhando o cache por escritório
+        com ServicoService (invalidado pelas escritas síncronas)
+        """
+        versao = await self.servico_repo.get_versao_hierarquia(escritorio_id)
+        chave = chave_hierarquia(escritorio_id, ativo, versao)
+        em_cache = obter_hierarquia(chave)
+        if em_cache is not None:
+            return em_cache
+        
+        servicos = await self.servico_repo.get_hierarquia(escritorio_id, ativo)
+        return salvar_hierarquia(chave, serializar_hierarquia(servicos))
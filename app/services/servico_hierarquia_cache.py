@@ -0,0 +1,57 @@
+"""
+Cache da hierarquia serviço → etapas → tarefas por escritório
+
+Guarda o JSON já serializado de /servicos/hierarquia junto com seu ETag,
+sob a versão do escritório na tabela cache_versao (ver
+CacheVersaoRepository). Qualquer escrita feita por ServicoService,
+EtapaService ou TarefaService deve chamar invalidar_hierarquia para o
+escritório afetado, depois do commit.
+
+Com o backend padrão (InMemoryCache) cada worker tem as próprias entradas,
+mas a versão é compartilhada pelo banco: depois de uma escrita nenhum
+worker serve o corpo (ou 304) anterior.
+"""
+import hashlib
+from typing import Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.cache import CacheBackend, InMemoryCache
+from app.core.config import settings
+from app.repositories.cache_versao_repository import CacheVersaoRepository, ESCOPO_HIERARQUIA
+
+
+_backend: CacheBackend = InMemoryCache(
+    max_size=settings.HIERARQUIA_CACHE_MAX_SIZE,
+    ttl_seconds=settings.HIERARQUIA_CACHE_TTL_SECONDS
+)
+
+
+def set_hierarquia_cache_backend(backend: CacheBackend) -> None:
+    """Substitui o backend do cache (ex.: por um cache compartilhado)"""
+    global _backend
+    _backend = backend
+
+
+def chave_hierarquia(escritorio_id: int, ativo: Optional[bool], versao: int) -> tuple:
+    """
+    Chave da hierarquia na versão informada; a versão deve ser lida antes de
+    carregar os dados, para que uma carga concorrente com uma escrita não seja
+    salva como atual
+    """
+    return (escritorio_id, ativo, versao)
+
+
+def obter_hierarquia(chave: tuple) -> Optional[Tuple[str, bytes]]:
+    """Retorna (etag, corpo JSON) em cache ou None"""
+    return _backend.get(chave)
+
+
+def salvar_hierarquia(chave: tuple, corpo: bytes) -> Tuple[str, bytes]:
+    """Armazena o corpo serializado e retorna (etag, corpo)"""
+    etag = f'"{hashlib.sha256(corpo).hexdigest()[:32]}"'
+    _backend.set(chave, (etag, corpo))
+    return etag, corpo
+
+
+def invalidar_hierarquia(db: Session, escritorio_id: int) -> None:
+    """Nova versão da hierarquia do escritório (as entradas antigas saem por LRU/TTL)"""
+    CacheVersaoRepository(db).incrementar(ESCOPO_HIERARQUIA, escritorio_id)
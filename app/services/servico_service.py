@@ -1,14 +1,26 @@
 """
 Service de Serviços - Lógica de negócio
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import json
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException, status
 
 from app.repositories.servico_repository import ServicoRepository
 from app.repositories.etapa_repository import EtapaRepository
-from app.schemas.servico import ServicoCreate, ServicoUpdate
+from app.schemas.servico import ServicoCreate, ServicoUpdate, ServicoResponse
 from app.models.servico import Servico
+from app.models.etapa import Etapa
+from app.repositories.cache_versao_repository import CacheVersaoRepository, ESCOPO_HIERARQUIA
+from app.services.servico_hierarquia_cache import (
+    chave_hierarquia, obter_hierarquia, salvar_hierarquia, invalidar_hierarquia
+)
+
+
+def serializar_hierarquia(servicos: List[Servico]) -> bytes:
+    """JSON da hierarquia (serviços com etapas e tarefas já carregadas)"""
+    dados = [ServicoResponse.model_validate(s).model_dump(mode="json") for s in servicos]
+    return json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 
 class ServicoService:
@@ -70,7 +82,9 @@ class ServicoService:
                         detail=f"Código do plano de contas '{servico_data.codigo_plano_contas}' já existe para este escritório"
                     )
         
-        return self.servico_repo.create(servico_data, escritorio_id)
+        servico = self.servico_repo.create(servico_data, escritorio_id)
+        invalidar_hierarquia(self.db, escritorio_id)
+        return servico
     
     def atualizar_servico(
         self, 
@@ -102,6 +116,7 @@ class ServicoService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Serviço não encontrado"
             )
+        invalidar_hierarquia(self.db, escritorio_id)
         return servico_atualizado
     
     def deletar_servico(self, servico_id: int, escritorio_id: int) -> bool:
@@ -121,7 +136,9 @@ class ServicoService:
                 detail="Não é possível excluir serviço que possui etapas. Exclua as etapas primeiro."
             )
         
-        return self.servico_repo.delete(servico_id, escritorio_id)
+        deletado = self.servico_repo.delete(servico_id, escritorio_id)
+        invalidar_hierarquia(self.db, escritorio_id)
+        return deletado
     
     def contar_servicos(
         self, 
@@ -137,30 +154,35 @@ class ServicoService:
         ativo: Optional[bool] = None
     ) -> List[Servico]:
         """Lista serviços com etapas e tarefas aninhadas (hierarquia completa)"""
-        from sqlalchemy.orm import joinedload
-        from app.models.etapa import Etapa
-        from app.models.tarefa import Tarefa
-        
         query = self.db.query(Servico).filter(
             Servico.escritorio_id == escritorio_id
         ).options(
-            joinedload(Servico.etapas).joinedload(Etapa.tarefas)
+            # Etapas e tarefas já vêm ordenadas por (ordem, id) pelo order_by dos relacionamentos
+            selectinload(Servico.etapas).selectinload(Etapa.tarefas)
         )
         
         if ativo is not None:
             query = query.filter(Servico.ativo == ativo)
         
         # Ordenar serviços por ID
-        servicos = query.order_by(Servico.id).all()
-        
-        # Ordenar etapas e tarefas manualmente (garantir ordem correta: ordem, id)
-        for servico in servicos:
-            if servico.etapas:
-                servico.etapas = sorted(servico.etapas, key=lambda e: (e.ordem, e.id))
-                for etapa in servico.etapas:
-                    if etapa.tarefas:
-                        etapa.tarefas = sorted(etapa.tarefas, key=lambda t: (t.ordem, t.id))
+        return query.order_by(Servico.id).all()
+    
+    def obter_hierarquia_serializada(
+        self,
+        escritorio_id: int,
+        ativo: Optional[bool] = None
+    ) -> Tuple[str, bytes]:
+        """
+        Retorna (etag, JSON) da hierarquia, usando o cache por escritório
+        O cache é invalidado pelas escritas de serviços, etapas e tarefas
+        """
+        # Versão lida na mesma sessão e antes dos dados (ver CacheVersaoRepository)
+        versao = CacheVersaoRepository(self.db).obter(ESCOPO_HIERARQUIA, escritorio_id)
+        chave = chave_hierarquia(escritorio_id, ativo, versao)
+        em_cache = obter_hierarquia(chave)
+        if em_cache is not None:
+            return em_cache
         
-        return servicos
-
+        servicos = self.listar_servicos_hierarquia(escritorio_id, ativo)
+        return salvar_hierarquia(chave, serializar_hierarquia(servicos))
 
@@ -1,7 +1,7 @@
 """
 Service de Tarefas - Lógica de negócio
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
@@ -9,6 +9,7 @@ from app.repositories.tarefa_repository import TarefaRepository
 from app.repositories.etapa_repository import EtapaRepository
 from app.schemas.servico import TarefaCreate, TarefaUpdate, TarefaResponse
 from app.models.tarefa import Tarefa
+from app.services.servico_hierarquia_cache import invalidar_hierarquia
 
 
 class TarefaService:
@@ -27,6 +28,29 @@ class TarefaService:
         """Lista tarefas, opcionalmente filtradas por etapa"""
         return self.tarefa_repo.get_all(escritorio_id, etapa_id, skip, limit)
     
+    def listar_tarefas_com_total(
+        self,
+        escritorio_id: int,
+        etapa_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        approximate: bool = False
+    ) -> Tuple[List[Tarefa], int, bool]:
+        """Lista tarefas e total em uma única consulta, opcionalmente filtradas por etapa e termo"""
+        return self.tarefa_repo.get_page_with_total(escritorio_id, etapa_id, skip, limit, search, approximate)
+    
+    def listar_tarefas_por_cursor(
+        self,
+        escritorio_id: int,
+        etapa_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        search: Optional[str] = None
+    ) -> Tuple[List[Tarefa], Optional[str]]:
+        """Lista tarefas paginando por cursor, opcionalmente filtradas por etapa e termo"""
+        return self.tarefa_repo.get_page_by_cursor(escritorio_id, etapa_id, cursor, limit, search)
+    
     def obter_tarefa(self, tarefa_id: int, escritorio_id: int) -> Tarefa:
         """Obtém uma tarefa por ID"""
         tarefa = self.tarefa_repo.get_by_id(tarefa_id, escritorio_id)
@@ -101,7 +125,9 @@ class TarefaService:
                 )
             tarefa_data.cor = cor
         
-        return self.tarefa_repo.create(etapa_id, tarefa_data, escritorio_id)
+        tarefa = self.tarefa_repo.create(etapa_id, tarefa_data, escritorio_id)
+        invalidar_hierarquia(self.db, escritorio_id)
+        return tarefa
     
     def atualizar_tarefa(
         self, 
@@ -143,6 +169,7 @@ class TarefaService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Tarefa não encontrada"
             )
+        invalidar_hierarquia(self.db, escritorio_id)
         return tarefa_atualizada
     
     def deletar_tarefa(self, tarefa_id: int, escritorio_id: int) -> bool:
@@ -154,7 +181,9 @@ class TarefaService:
                 detail="Tarefa não encontrada"
             )
         
-        return self.tarefa_repo.delete(tarefa_id, escritorio_id)
+        deletado = self.tarefa_repo.delete(tarefa_id, escritorio_id)
+        invalidar_hierarquia(self.db, escritorio_id)
+        return deletado
     
     def listar_tarefas_por_etapa(
         self, 
@@ -175,10 +204,11 @@ class TarefaService:
     def contar_tarefas(
         self, 
         escritorio_id: int, 
-        etapa_id: Optional[int] = None
+        etapa_id: Optional[int] = None,
+        search: Optional[str] = None
     ) -> int:
-        """Conta tarefas, opcionalmente filtradas por etapa"""
-        return self.tarefa_repo.count(escritorio_id, etapa_id)
+        """Conta tarefas, opcionalmente filtradas por etapa e termo"""
+        return self.tarefa_repo.count(escritorio_id, etapa_id, search)
     
     def buscar_tarefas(
         self, 
@@ -201,13 +231,14 @@ class TarefaService:
         self,
         etapa_id: int,
         tarefa_ids: List[int],
-        escritorio_id: int
-    ) -> List[Tarefa]:
+        escritorio_id: int,
+        servico_id: Optional[int] = None
+    ) -> List[TarefaResponse]:
         """
         Reordena tarefas de uma etapa em lote
-        Recebe uma lista de IDs na nova ordem e atualiza o campo ordem de cada tarefa
+        Recebe uma lista de IDs na nova ordem e grava todas as posições em um único UPDATE
         """
-        # Validar se etapa existe e pertence ao escritório
+        # Etapa com as tarefas: valida etapa, serviço e a lista em uma consulta
         etapa = self.etapa_repo.get_by_id(etapa_id, escritorio_id)
         if not etapa:
             raise HTTPException(
@@ -215,11 +246,14 @@ class TarefaService:
                 detail="Etapa não encontrada"
             )
         
-        # Validar se todas as tarefas pertencem à etapa e escritório
-        tarefas = self.tarefa_repo.get_by_etapa(etapa_id, escritorio_id)
-        tarefa_ids_existentes = {tarefa.id for tarefa in tarefas}
+        if servico_id is not None and etapa.servico_id != servico_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Etapa não pertence ao serviço informado"
+            )
         
-        if len(tarefa_ids) != len(tarefa_ids_existentes):
+        tarefa_ids_existentes = {tarefa.id for tarefa in etapa.tarefas}
+        if len(tarefa_ids) != len(tarefa_ids_existentes) or len(set(tarefa_ids)) != len(tarefa_ids):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Número de tarefas não corresponde ao esperado"
@@ -232,19 +266,11 @@ class TarefaService:
                     detail=f"Tarefa {tarefa_id} não pertence à etapa {etapa_id}"
                 )
         
-        # Atualizar ordem de cada tarefa
-        tarefas_atualizadas = []
-        for ordem, tarefa_id in enumerate(tarefa_ids):
-            tarefa = self.tarefa_repo.get_by_id(tarefa_id, escritorio_id)
-            if tarefa:
-                tarefa_atualizada = self.tarefa_repo.update(
-                    tarefa_id,
-                    TarefaUpdate(ordem=ordem),
-                    escritorio_id
-                )
-                if tarefa_atualizada:
-                    tarefas_atualizadas.append(tarefa_atualizada)
-        
-        return tarefas_atualizadas
+        tarefas = self.tarefa_repo.reordenar(list(etapa.tarefas), tarefa_ids, escritorio_id)
+        # Resposta montada antes do commit, que expiraria os objetos (um refresh por tarefa)
+        resposta = [TarefaResponse.model_validate(tarefa) for tarefa in tarefas]
+        self.db.commit()
+        invalidar_hierarquia(self.db, escritorio_id)
+        return resposta
 
 
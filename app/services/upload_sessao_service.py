@@ -0,0 +1,302 @@
+"""
+Service de Sessões de Upload - upload em partes e retomável de documentos de projeto
+
+Fluxo: criar a sessão (tamanho total), enviar partes com PUT informando o
+deslocamento (Content-Range ou ?offset=), consultar os intervalos já recebidos
+para retomar sem reenviar dados e finalizar, quando o checksum sha256 é
+verificado e o arquivo vai para o store de uploads como ProjetoDocumento.
+
+As partes são gravadas direto na posição do arquivo parcial, em blocos, sem
+manter o arquivo (nem a parte) inteiro em memória.
+"""
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.exceptions import NotFoundException, BadRequestException, ConflictException
+from app.models.upload_sessao import UploadSessao
+from app.models.projeto import Projeto
+from app.models.projeto_documento import ProjetoDocumento
+from app.schemas.projeto_documento import UploadSessaoCreate, UploadSessaoResponse
+from app.services.upload_store import UploadStore
+
+
+STATUS_ATIVA = "ativa"
+STATUS_FINALIZADA = "finalizada"
+STATUS_CANCELADA = "cancelada"
+
+# Bloco acumulado antes de cada escrita em disco
+BLOCO_ESCRITA = 1024 * 1024
+
+
+def mesclar_intervalos(intervalos: List[List[int]], inicio: int, fim: int) -> List[List[int]]:
+    """Adiciona [inicio, fim) aos intervalos recebidos, unindo sobreposições e adjacências"""
+    resultado = []
+    for atual_inicio, atual_fim in sorted(intervalos + [[inicio, fim]]):
+        if resultado and atual_inicio <= resultado[-1][1]:
+            resultado[-1][1] = max(resultado[-1][1], atual_fim)
+        else:
+            resultado.append([atual_inicio, atual_fim])
+    return resultado
+
+
+def _gravar_bloco(caminho: Path, posicao: int, conteudo: bytes) -> None:
+    with open(caminho, "r+b") as f:
+        f.seek(posicao)
+        f.write(conteudo)
+
+
+def _calcular_sha256(caminho: Path) -> str:
+    digest = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(BLOCO_ESCRITA), b""):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+class UploadSessaoService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    @staticmethod
+    def caminho_parcial(token: str) -> Path:
+        return Path(settings.UPLOAD_DIR) / "sessoes" / f"{token}.part"
+    
+    def criar_sessao(self, dados: UploadSessaoCreate, escritorio_id: int, usuario_id: int) -> UploadSessao:
+        """Cria a sessão e reserva o arquivo parcial com o tamanho total"""
+        if dados.tamanho > settings.DOCUMENT_UPLOAD_MAX_SIZE:
+            raise BadRequestException(
+                f"Arquivo muito grande. Tamanho máximo: {settings.DOCUMENT_UPLOAD_MAX_SIZE / (1024 ** 3):.1f}GB"
+            )
+        
+        projeto = self.db.query(Projeto.id).filter(
+            Projeto.id == dados.projeto_id,
+            Projeto.escritorio_id == escritorio_id
+        ).first()
+        if not projeto:
+            raise NotFoundException("Projeto não encontrado")
+        
+        sessao = UploadSessao(
+            token=str(uuid.uuid4()),
+            escritorio_id=escritorio_id,
+            projeto_id=dados.projeto_id,
+            usuario_id=usuario_id,
+            nome=dados.nome,
+            extensao=Path(dados.nome).suffix.lower()[:10] or None,
+            tipo_documento_id=dados.tipo_documento_id,
+            observacao=dados.observacao,
+            tamanho=dados.tamanho,
+            sha256=dados.sha256,
+            intervalos=[],
+            status=STATUS_ATIVA,
+            expira_em=datetime.now(timezone.utc) + timedelta(hours=settings.DOCUMENT_UPLOAD_SESSION_TTL_HOURS)
+        )
+        
+        caminho = self.caminho_parcial(sessao.token)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(caminho, "wb") as f:
+            f.truncate(dados.tamanho)
+        
+        self.db.add(sessao)
+        self.db.commit()
+        self.db.refresh(sessao)
+        return sessao
+    
+    def obter_sessao(self, token: str, escritorio_id: int, bloquear: bool = False) -> UploadSessao:
+        """Busca a sessão do escritório (com FOR UPDATE se bloquear)"""
+        query = self.db.query(UploadSessao).filter(
+            UploadSessao.token == token,
+            UploadSessao.escritorio_id == escritorio_id
+        )
+        if bloquear:
+            query = query.with_for_update()
+        sessao = query.first()
+        if not sessao:
+            raise NotFoundException("Sessão de upload não encontrada")
+        return sessao
+    
+    def _exigir_ativa(self, sessao: UploadSessao) -> None:
+        if sessao.status != STATUS_ATIVA:
+            raise ConflictException(f"Sessão de upload {sessao.status}")
+        if sessao.expira_em < datetime.now(timezone.utc):
+            raise ConflictException("Sessão de upload expirada")
+    
+    def _validar_parte(self, token: str, escritorio_id: int, inicio: int) -> UploadSessao:
+        sessao = self.obter_sessao(token, escritorio_id)
+        self._exigir_ativa(sessao)
+        if inicio < 0 or inicio >= sessao.tamanho:
+            raise BadRequestException("Deslocamento fora do arquivo")
+        return sessao
+    
+    def _registrar_intervalo(self, token: str, escritorio_id: int, inicio: int, fim: int) -> UploadSessao:
+        # Registrar o intervalo com a linha bloqueada (partes podem chegar em paralelo)
+        sessao = self.obter_sessao(token, escritorio_id, bloquear=True)
+        sessao.intervalos = mesclar_intervalos(sessao.intervalos or [], inicio, fim)
+        self.db.commit()
+        self.db.refresh(sessao)
+        return sessao
+    
+    async def receber_parte(
+        self,
+        token: str,
+        escritorio_id: int,
+        inicio: int,
+        tamanho_parte: Optional[int],
+        corpo: AsyncIterator[bytes]
+    ) -> UploadSessao:
+        """
+        Grava uma parte a partir de `inicio` e registra o intervalo recebido
+        
+        Consultas e commits rodam no threadpool (Session síncrona), fora do event loop.
+        
+        Args:
+            tamanho_parte: Tamanho esperado (Content-Range); a parte é rejeitada se
+                diferente, e nada é gravado além dele
+            corpo: Corpo da requisição em blocos (request.stream())
+        """
+        sessao = await run_in_threadpool(self._validar_parte, token, escritorio_id, inicio)
+        tamanho_total = sessao.tamanho
+        
+        caminho = self.caminho_parcial(token)
+        posicao = inicio
+        buffer = bytearray()
+        async for bloco in corpo:
+            buffer.extend(bloco)
+            if posicao + len(buffer) - inicio > settings.DOCUMENT_UPLOAD_MAX_CHUNK_SIZE:
+                raise BadRequestException("Parte maior que o tamanho máximo permitido")
+            if tamanho_parte is not None and posicao + len(buffer) - inicio > tamanho_parte:
+                # Não grava além do intervalo informado (sobrescreveria dados de outras partes)
+                raise BadRequestException("Parte maior que o intervalo informado")
+            if posicao + len(buffer) > tamanho_total:
+                raise BadRequestException("Parte ultrapassa o tamanho do arquivo")
+            if len(buffer) >= BLOCO_ESCRITA:
+                await run_in_threadpool(_gravar_bloco, caminho, posicao, bytes(buffer))
+                posicao += len(buffer)
+                buffer.clear()
+        if buffer:
+            await run_in_threadpool(_gravar_bloco, caminho, posicao, bytes(buffer))
+            posicao += len(buffer)
+        
+        recebidos = posicao - inicio
+        if recebidos == 0:
+            raise BadRequestException("Parte vazia")
+        if tamanho_parte is not None and recebidos != tamanho_parte:
+            raise BadRequestException("Parte incompleta; reenvie o intervalo")
+        
+        return await run_in_threadpool(self._registrar_intervalo, token, escritorio_id, inicio, posicao)
+    
+    def _validar_finalizacao(self, sessao: UploadSessao, sha256: Optional[str]) -> str:
+        """Confere estado e intervalos da sessão e retorna o sha256 esperado"""
+        self._exigir_ativa(sessao)
+        
+        if sessao.intervalos != [[0, sessao.tamanho]]:
+            raise ConflictException("Upload incompleto; consulte os intervalos recebidos")
+        
+        esperado = sha256 or sessao.sha256
+        if not esperado:
+            raise BadRequestException("Informe o sha256 do arquivo para finalizar")
+        if sessao.sha256 and sha256 and sha256 != sessao.sha256:
+            raise BadRequestException("sha256 diferente do informado na criação da sessão")
+        return esperado
+    
+    def _preparar_finalizacao(self, token: str, escritorio_id: int, sha256: Optional[str]) -> str:
+        sessao = self.obter_sessao(token, escritorio_id)
+        # Leitura sem FOR UPDATE: nenhum lock da sessão fica aberto durante o hash
+        return self._validar_finalizacao(sessao, sha256)
+    
+    def _concluir_finalizacao(
+        self,
+        token: str,
+        escritorio_id: int,
+        sha256: Optional[str],
+        calculado: str
+    ) -> ProjetoDocumento:
+        # Linha bloqueada até o commit: finalizações concorrentes não duplicam o documento
+        sessao = self.obter_sessao(token, escritorio_id, bloquear=True)
+        # Revalida com o lock: outra finalização pode ter concluído durante o hash
+        esperado = self._validar_finalizacao(sessao, sha256)
+        if calculado != esperado:
+            raise BadRequestException("Checksum sha256 não confere; reenvie o arquivo")
+        
+        caminho = self.caminho_parcial(token)
+        store = UploadStore(self.db)
+        # Sem commit intermediário: o lock da sessão vale até o commit final
+        arquivo = store.importar_arquivo(caminho, calculado, sessao.extensao or "", commit=False)
+        
+        documento = ProjetoDocumento(
+            projeto_id=sessao.projeto_id,
+            tipo_documento_id=sessao.tipo_documento_id,
+            nome=sessao.nome,
+            arquivo=arquivo,
+            extensao=(sessao.extensao or "").lstrip(".") or None,
+            observacao=sessao.observacao,
+            ativo=True,
+            escritorio_id=escritorio_id
+        )
+        self.db.add(documento)
+        self.db.flush()
+        store.adicionar_referencia(arquivo)
+        
+        sessao.status = STATUS_FINALIZADA
+        sessao.documento_id = documento.id
+        self.db.commit()
+        self.db.refresh(documento)
+        return documento
+    
+    async def finalizar(
+        self,
+        token: str,
+        escritorio_id: int,
+        sha256: Optional[str] = None
+    ) -> ProjetoDocumento:
+        """
+        Verifica integridade e checksum e cria o ProjetoDocumento
+        
+        O sha256 é calculado antes de bloquear a sessão (um receber_parte
+        concorrente não espera pelo hash), e o trecho do lock ao commit roda
+        inteiro no threadpool.
+        """
+        await run_in_threadpool(self._preparar_finalizacao, token, escritorio_id, sha256)
+        calculado = await run_in_threadpool(_calcular_sha256, self.caminho_parcial(token))
+        return await run_in_threadpool(self._concluir_finalizacao, token, escritorio_id, sha256, calculado)
+    
+    def cancelar(self, token: str, escritorio_id: int) -> None:
+        """Cancela a sessão e remove o arquivo parcial"""
+        sessao = self.obter_sessao(token, escritorio_id)
+        self._exigir_ativa(sessao)
+        self.caminho_parcial(token).unlink(missing_ok=True)
+        sessao.status = STATUS_CANCELADA
+        self.db.commit()
+    
+    def limpar_expiradas(self) -> int:
+        """Cancela sessões ativas expiradas e remove seus arquivos parciais"""
+        expiradas = self.db.query(UploadSessao).filter(
+            UploadSessao.status == STATUS_ATIVA,
+            UploadSessao.expira_em < datetime.now(timezone.utc)
+        ).all()
+        for sessao in expiradas:
+            self.caminho_parcial(sessao.token).unlink(missing_ok=True)
+            sessao.status = STATUS_CANCELADA
+        self.db.commit()
+        return len(expiradas)
+    
+    @staticmethod
+    def montar_resposta(sessao: UploadSessao) -> UploadSessaoResponse:
+        intervalos = sessao.intervalos or []
+        return UploadSessaoResponse(
+            token=sessao.token,
+            projeto_id=sessao.projeto_id,
+            nome=sessao.nome,
+            tamanho=sessao.tamanho,
+            recebido=sum(fim - inicio for inicio, fim in intervalos),
+            intervalos=intervalos,
+            status=sessao.status,
+            expira_em=sessao.expira_em,
+            tamanho_maximo_parte=settings.DOCUMENT_UPLOAD_MAX_CHUNK_SIZE,
+            documento_id=sessao.documento_id
+        )
@@ -0,0 +1,337 @@
+"""
+Armazenamento de uploads endereçado por conteúdo
+
+Cada arquivo processado é gravado uma única vez em
+blobs/<hash[0:2]>/<hash[2:4]>/<hash>.jpg (variantes com sufixo _<tamanho>)
+e registrado em upload_blobs com a contagem de registros que o referenciam
+(colaborador.foto, escritorio.logo, projeto_documento.arquivo e
+movimentos.comprovante). Um upload idêntico a um já armazenado não é
+reprocessado nem regravado. Blobs sem referências são removidos pela coleta
+de lixo (scripts/gc_uploads.py).
+"""
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.upload_blob import UploadBlob
+from app.utils.upload import (
+    validate_image_type, stream_upload_to_temp, run_in_upload_pool, encode_image,
+    write_files, record_upload_timings, delete_upload_file
+)
+
+
+PREFIXO_BLOBS = "blobs"
+
+# Colunas que referenciam arquivos do store (tabela, coluna)
+COLUNAS_REFERENCIA = (
+    ("colaborador", "foto"),
+    ("escritorio", "logo"),
+    ("projeto_documento", "arquivo"),
+    ("movimentos", "comprovante"),
+)
+
+
+def caminho_blob(hash_conteudo: str, extensao: str = "jpg", sufixo: str = "") -> str:
+    """Caminho relativo do blob em diretórios particionados pelo prefixo do hash"""
+    return f"{PREFIXO_BLOBS}/{hash_conteudo[:2]}/{hash_conteudo[2:4]}/{hash_conteudo}{sufixo}.{extensao}"
+
+
+class UploadStore:
+    """Grava, referencia e coleta arquivos endereçados por conteúdo"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    async def salvar_imagem(
+        self,
+        file: UploadFile,
+        gerar_variantes: bool = True
+    ) -> Tuple[str, Optional[Dict[str, Dict[str, str]]]]:
+        """
+        Armazena a imagem (e variantes) e retorna (caminho relativo, variantes)
+        
+        O blob é criado com ref_count 0; quem gravar o caminho em um registro
+        deve chamar adicionar_referencia na mesma transação. As consultas e
+        commits da sessão rodam no threadpool, fora do event loop.
+        """
+        validate_image_type(file)
+        tempos: Dict[str, float] = {}
+        inicio_total = time.perf_counter()
+        
+        inicio = time.perf_counter()
+        temporario, origem_hash = await stream_upload_to_temp(file)
+        tempos["recebimento"] = time.perf_counter() - inicio
+        
+        try:
+            # Mesmo upload original já processado: nada a recodificar nem gravar
+            reaproveitado, _ = await run_in_threadpool(
+                self._reaproveitar, UploadBlob.origem_hash == origem_hash, gerar_variantes
+            )
+            if reaproveitado:
+                record_upload_timings(tempos, inicio_total, reaproveitado[0])
+                return reaproveitado
+            
+            principal, codificadas = await run_in_upload_pool(
+                tempos, encode_image, temporario, tempos, gerar_variantes
+            )
+        finally:
+            os.unlink(temporario)
+        
+        hash_conteudo = hashlib.sha256(principal).hexdigest()
+        reaproveitado, blob = await run_in_threadpool(
+            self._reaproveitar, UploadBlob.hash == hash_conteudo, bool(codificadas)
+        )
+        if reaproveitado:
+            record_upload_timings(tempos, inicio_total, reaproveitado[0])
+            return reaproveitado
+        
+        caminho = caminho_blob(hash_conteudo)
+        raiz = Path(settings.UPLOAD_DIR)
+        arquivos = [(raiz / caminho, principal)]
+        variantes: Dict[str, Dict[str, str]] = {}
+        for tamanho, formatos in codificadas.items():
+            variantes[str(tamanho)] = {}
+            for extensao, conteudo in formatos.items():
+                caminho_variante = caminho_blob(hash_conteudo, extensao, f"_{tamanho}")
+                arquivos.append((raiz / caminho_variante, conteudo))
+                variantes[str(tamanho)][extensao] = caminho_variante
+        
+        await run_in_upload_pool(tempos, write_files, arquivos, tempos)
+        
+        def registrar() -> Tuple[str, Optional[Dict[str, Dict[str, str]]]]:
+            registrado = self._registrar_blob(hash_conteudo, origem_hash, caminho, len(principal), variantes or None, blob)
+            return registrado.caminho, registrado.variantes
+        
+        resultado = await run_in_threadpool(registrar)
+        record_upload_timings(tempos, inicio_total, caminho)
+        return resultado
+    
+    def _reaproveitar(
+        self,
+        criterio,
+        precisa_variantes: bool
+    ) -> Tuple[Optional[Tuple[str, Optional[Dict[str, Dict[str, str]]]]], Optional[UploadBlob]]:
+        """
+        Busca o blob pelo critério; se ele já tiver o que foi pedido, renova
+        updated_at e retorna ((caminho, variantes), blob), senão (None, blob)
+        """
+        blob = self.db.query(UploadBlob).filter(criterio).first()
+        if blob is None or not (blob.variantes or not precisa_variantes):
+            return None, blob
+        resultado = (blob.caminho, blob.variantes)
+        if not self._tocar(blob):
+            # Removido pela coleta de lixo: o chamador grava o arquivo de novo
+            return None, None
+        return resultado, blob
+    
+    def _tocar(
+        self,
+        blob: UploadBlob,
+        commit: bool = True,
+        variantes: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> bool:
+        """
+        Renova updated_at (e grava as variantes, se informadas) com a linha bloqueada
+        
+        O UPDATE ... RETURNING espera uma coleta de lixo em andamento sobre o
+        blob e renova a carência; retorna False se o blob já foi removido.
+        """
+        valores = {"updated_at": func.now()}
+        if variantes is not None:
+            valores["variantes"] = variantes
+        atualizado = self.db.execute(
+            update(UploadBlob).where(UploadBlob.id == blob.id).values(**valores).returning(UploadBlob.id),
+            execution_options={"synchronize_session": False}
+        ).scalar()
+        if atualizado is None:
+            self.db.expunge(blob)
+            return False
+        if commit:
+            self.db.commit()
+        else:
+            self.db.expire(blob)
+        return True
+    
+    def _buscar_por_hash(self, hash_conteudo: str) -> Optional[UploadBlob]:
+        return self.db.query(UploadBlob).filter(UploadBlob.hash == hash_conteudo).first()
+    
+    def _registrar_blob(
+        self,
+        hash_conteudo: str,
+        origem_hash: Optional[str],
+        caminho: str,
+        tamanho: int,
+        variantes: Optional[Dict[str, Dict[str, str]]],
+        existente: Optional[UploadBlob],
+        commit: bool = True
+    ) -> UploadBlob:
+        """
+        Cria o registro do blob (ou completa as variantes de um existente)
+        
+        Com commit=False a inserção fica em um savepoint da transação do chamador.
+        """
+        if existente is not None and self._tocar(existente, commit, variantes):
+            return existente
+        
+        blob = UploadBlob(
+            hash=hash_conteudo,
+            origem_hash=origem_hash,
+            caminho=caminho,
+            tamanho=tamanho,
+            variantes=variantes,
+            ref_count=0
+        )
+        if not commit:
+            try:
+                with self.db.begin_nested():
+                    self.db.add(blob)
+            except IntegrityError:
+                # Upload concorrente do mesmo conteúdo: só o savepoint é desfeito
+                return self._buscar_por_hash(hash_conteudo)
+            return blob
+        
+        self.db.add(blob)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Upload concorrente do mesmo conteúdo: os arquivos gravados são idênticos
+            self.db.rollback()
+            return self._buscar_por_hash(hash_conteudo)
+        return blob
+    
+    def importar_arquivo(self, origem: Path, hash_conteudo: str, extensao: str, commit: bool = True) -> str:
+        """
+        Move um arquivo já gravado em disco (ex.: upload em partes) para o store
+        
+        Se o conteúdo já estiver armazenado, descarta a origem. Retorna o caminho
+        relativo do blob (ref_count inalterado; chame adicionar_referencia).
+        Com commit=False o registro fica na transação do chamador, que faz o
+        commit (e mantém os locks que já tiver) até o fim.
+        """
+        blob = self._buscar_por_hash(hash_conteudo)
+        if blob is not None and self._tocar(blob, commit):
+            origem.unlink(missing_ok=True)
+            return blob.caminho
+        
+        caminho = caminho_blob(hash_conteudo, extensao.lstrip(".").lower() or "bin")
+        destino = Path(settings.UPLOAD_DIR) / caminho
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        tamanho = origem.stat().st_size
+        os.replace(origem, destino)
+        return self._registrar_blob(hash_conteudo, None, caminho, tamanho, None, None, commit).caminho
+    
+    def adicionar_referencia(self, caminho: Optional[str]) -> None:
+        """Conta uma nova referência ao blob (não faz commit)"""
+        if caminho:
+            self.db.execute(
+                text("UPDATE upload_blobs SET ref_count = ref_count + 1, updated_at = now() WHERE caminho = :caminho"),
+                {"caminho": caminho}
+            )
+    
+    def remover_referencia(
+        self,
+        caminho: Optional[str],
+        variantes: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> None:
+        """
+        Descarta uma referência ao arquivo (não faz commit)
+        
+        Arquivos do store ficam para a coleta de lixo; arquivos antigos, gravados
+        fora do store, são removidos do disco imediatamente.
+        """
+        if not caminho:
+            return
+        if not caminho.startswith(f"{PREFIXO_BLOBS}/"):
+            delete_upload_file(caminho, variantes)
+            return
+        self.db.execute(
+            text("""
+                UPDATE upload_blobs
+                SET ref_count = GREATEST(ref_count - 1, 0), updated_at = now()
+                WHERE caminho = :caminho
+            """),
+            {"caminho": caminho}
+        )
+    
+    def recontar_referencias(self) -> int:
+        """
+        Recalcula ref_count a partir das colunas que referenciam arquivos
+        
+        Corrige contagens de caminhos gravados por fluxos que não passam pelo
+        store (ex.: comprovante informado diretamente). Retorna os blobs alterados.
+        """
+        referencias = " UNION ALL ".join(
+            f"SELECT {coluna} AS caminho FROM {tabela} WHERE {coluna} LIKE '{PREFIXO_BLOBS}/%'"
+            for tabela, coluna in COLUNAS_REFERENCIA
+        )
+        resultado = self.db.execute(text(f"""
+            UPDATE upload_blobs b
+            SET ref_count = COALESCE(r.total, 0), updated_at = now()
+            FROM upload_blobs b2
+            LEFT JOIN (
+                SELECT caminho, count(*) AS total FROM ({referencias}) refs GROUP BY caminho
+            ) r ON r.caminho = b2.caminho
+            WHERE b.id = b2.id AND b.ref_count <> COALESCE(r.total, 0)
+        """))
+        self.db.commit()
+        return resultado.rowcount
+    
+    def coletar_lixo(
+        self,
+        tamanho_lote: int = None,
+        carencia_minutos: int = None,
+        dry_run: bool = False
+    ) -> int:
+        """
+        Remove, em lotes, blobs sem referências há mais de carencia_minutos
+        
+        A carência protege blobs recém-enviados que ainda não foram associados
+        a um registro. As linhas são removidas e o commit é feito antes de apagar
+        os arquivos: um rollback nunca deixa registros apontando para arquivos
+        apagados. Retorna o número de blobs removidos (ou que seriam removidos).
+        """
+        tamanho_lote = tamanho_lote or settings.UPLOAD_GC_BATCH_SIZE
+        carencia_minutos = settings.UPLOAD_GC_GRACE_MINUTES if carencia_minutos is None else carencia_minutos
+        limite = datetime.now(timezone.utc) - timedelta(minutes=carencia_minutos)
+        removidos = 0
+        ultimo_id = 0
+        
+        while True:
+            query = self.db.query(UploadBlob).filter(
+                UploadBlob.ref_count == 0,
+                UploadBlob.updated_at < limite,
+                UploadBlob.id > ultimo_id
+            ).order_by(UploadBlob.id).limit(tamanho_lote)
+            if not dry_run and self.db.get_bind().dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True)
+            lote: List[UploadBlob] = query.all()
+            if not lote:
+                break
+            ultimo_id = lote[-1].id
+            
+            if not dry_run:
+                arquivos = [(blob.caminho, blob.variantes) for blob in lote]
+                for blob in lote:
+                    self.db.delete(blob)
+                self.db.commit()
+                
+                # Conteúdo reenviado (e registrado de novo) depois do commit: os arquivos voltaram a ser usados
+                caminhos = [caminho for caminho, _ in arquivos]
+                registrados = {
+                    caminho for (caminho,) in
+                    self.db.query(UploadBlob.caminho).filter(UploadBlob.caminho.in_(caminhos)).all()
+                }
+                for caminho, variantes in arquivos:
+                    if caminho not in registrados:
+                        delete_upload_file(caminho, variantes)
+            removidos += len(lote)
+        
+        return removidos
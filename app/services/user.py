@@ -1,8 +1,8 @@
 from sqlalchemy.orm import Session
 from app.repositories.user import UserRepository
-from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.schemas.user import UserCreate, UserUpdate, UserResponse, ColaboradorEscritorioPerfilResponse
 from app.core.exceptions import NotFoundException, ConflictException
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class UserService:
@@ -20,6 +20,84 @@ class UserService:
     ) -> List[UserResponse]:
         """Lista todos os usuários, opcionalmente filtrado por escritório"""
         users = self.repository.get_all(escritorio_id, skip, limit, ativo, search)
+        return self._serializar(users)
+    
+    def get_page_by_cursor(
+        self,
+        escritorio_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[UserResponse], Optional[str]]:
+        """Lista usuários paginando por cursor, opcionalmente filtrado por escritório"""
+        users, next_cursor = self.repository.get_page_by_cursor(escritorio_id, cursor, limit, ativo, search)
+        return self._serializar(users), next_cursor
+    
+    def get_colaboradores_escritorio(
+        self,
+        escritorio_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        ativo: Optional[bool] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[UserResponse], Optional[str]]:
+        """Lista colaboradores do escritório com perfis e dados do vínculo (consultas em lote)"""
+        colaboradores, next_cursor = self.repository.get_colaboradores_escritorio(
+            escritorio_id=escritorio_id, skip=skip, limit=limit, ativo=ativo, search=search, cursor=cursor
+        )
+        return [
+            self._montar_colaborador(colaborador, vinculo, perfis)
+            for colaborador, vinculo, perfis in colaboradores
+        ], next_cursor
+    
+    def _montar_colaborador(self, colaborador, vinculo: dict, perfis: list) -> UserResponse:
+        """Monta UserResponse com perfis e dados do vínculo no escritório atual"""
+        try:
+            response = UserResponse.model_validate(colaborador)
+        except Exception:
+            # Se falhar a serialização dos escritórios, responder sem eles
+            response = UserResponse(
+                id=colaborador.id,
+                nome=colaborador.nome,
+                email=colaborador.email,
+                cpf=colaborador.cpf,
+                telefone=colaborador.telefone,
+                data_nascimento=colaborador.data_nascimento,
+                perfil=colaborador.perfil,
+                tipo=colaborador.tipo or 'Geral',
+                ativo=colaborador.ativo,
+                foto=colaborador.foto,
+                foto_variantes=colaborador.foto_variantes,
+                foto_miniatura=colaborador.foto_miniatura,
+                ultimo_acesso=colaborador.ultimo_acesso,
+                tipo_pix=colaborador.tipo_pix,
+                chave_pix=colaborador.chave_pix,
+                is_system_admin=getattr(colaborador, 'is_system_admin', False),
+                created_at=colaborador.created_at,
+                updated_at=colaborador.updated_at,
+                escritorios=[]
+            )
+        
+        perfis_list = []
+        for perfil in perfis:
+            try:
+                perfis_list.append(ColaboradorEscritorioPerfilResponse.model_validate(perfil, from_attributes=True))
+            except Exception:
+                # Perfil inválido fica fora da resposta
+                continue
+        
+        response.perfis = perfis_list
+        response.socio = bool(vinculo.get('socio')) if vinculo.get('socio') is not None else False
+        response.banco = vinculo.get('banco') or None
+        response.agencia = vinculo.get('agencia') or None
+        response.tipo_conta = vinculo.get('tipo_conta') or None
+        response.conta = vinculo.get('conta') or None
+        return response
+    
+    def _serializar(self, users) -> List[UserResponse]:
+        """Serializa usuários, tolerando falhas nos relacionamentos"""
         result = []
         for user in users:
             try:
@@ -58,6 +136,8 @@ class UserService:
                         'tipo': user.tipo or 'Geral',
                         'ativo': user.ativo,
                         'foto': user.foto,
+                        'foto_variantes': user.foto_variantes,
+                        'foto_miniatura': user.foto_miniatura,
                         'ultimo_acesso': user.ultimo_acesso,
                         'tipo_pix': user.tipo_pix,
                         'chave_pix': user.chave_pix,
@@ -121,6 +201,13 @@ class UserService:
             raise NotFoundException(f"Usuário {user_id} não encontrado")
         return UserResponse.from_orm(db_user)
     
+    def update_foto(self, user_id: int, foto: str, foto_variantes: Optional[dict] = None) -> UserResponse:
+        """Atualiza a foto do usuário e suas variantes de tamanho"""
+        db_user = self.repository.update_foto(user_id, foto, foto_variantes)
+        if not db_user:
+            raise NotFoundException(f"Usuário {user_id} não encontrado")
+        return UserResponse.from_orm(db_user)
+    
     def delete(self, user_id: int, permanent: bool = False) -> bool:
         """
         Remove usuário
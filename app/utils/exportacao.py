@@ -0,0 +1,224 @@
+"""
+Geração incremental de CSV e XLSX para exportações
+
+Os geradores recebem um iterável de linhas (tuplas) e produzem blocos de
+bytes à medida que as linhas chegam, com memória constante independente do
+número de linhas:
+
+- CSV no padrão do Excel em português: UTF-8 com BOM, separador ";",
+  decimais com vírgula e datas dd/mm/aaaa
+- XLSX montado direto no formato ZIP (zipfile em modo streaming), com a
+  planilha em inlineStr (sem tabela de strings compartilhadas em memória)
+- comprimir_gzip envolve qualquer um dos geradores
+
+Textos que o Excel/LibreOffice interpretariam como fórmula (começando com
+=, +, -, @, tabulação ou CR) saem prefixados com apóstrofo.
+"""
+import csv
+import io
+import re
+import zipfile
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Sequence
+from xml.sax.saxutils import escape
+
+
+TAMANHO_BLOCO = 64 * 1024
+
+MEDIA_TYPE_CSV = "text/csv; charset=utf-8"
+MEDIA_TYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MEDIA_TYPE_GZIP = "application/gzip"
+
+_BOM = "\ufeff"
+_CARACTERES_INVALIDOS_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_EPOCH_EXCEL = datetime(1899, 12, 30)
+_INICIO_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _texto_seguro(valor: str) -> str:
+    """Texto que não é avaliado como fórmula pela planilha (injeção de fórmula)"""
+    return f"'{valor}" if valor.startswith(_INICIO_FORMULA) else valor
+
+
+def _valor_csv(valor: Any) -> Any:
+    if valor is None:
+        return ""
+    if isinstance(valor, bool):
+        return "Sim" if valor else "Não"
+    if isinstance(valor, (Decimal, float)):
+        return str(valor).replace(".", ",")
+    if isinstance(valor, datetime):
+        return valor.strftime("%d/%m/%Y %H:%M:%S")
+    if isinstance(valor, date):
+        return valor.strftime("%d/%m/%Y")
+    if isinstance(valor, str):
+        return _texto_seguro(valor)
+    return valor
+
+
+def gerar_csv(cabecalho: Sequence[str], linhas: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """CSV em blocos de ~TAMANHO_BLOCO bytes"""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, delimiter=";", lineterminator="\r\n")
+    buffer.write(_BOM)
+    escritor.writerow(cabecalho)
+    
+    for linha in linhas:
+        escritor.writerow([_valor_csv(valor) for valor in linha])
+        if buffer.tell() >= TAMANHO_BLOCO:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_CONTENT_TYPES = (
+    _XML
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    _XML
+    + f'<Relationships xmlns="{_NS_PKG_REL}">'
+    f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_RELS = (
+    _XML
+    + f'<Relationships xmlns="{_NS_PKG_REL}">'
+    f'<Relationship Id="rId1" Type="{_NS_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+# Estilos: 0 padrão, 1 data, 2 número com 2 casas, 3 cabeçalho em negrito
+_STYLES = (
+    _XML
+    + f'<styleSheet xmlns="{_NS_MAIN}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs></styleSheet>'
+)
+_INICIO_PLANILHA = (
+    _XML
+    + f'<worksheet xmlns="{_NS_MAIN}">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews><sheetData>'
+)
+_FIM_PLANILHA = '</sheetData></worksheet>'
+
+
+def _texto_xml(valor: str) -> str:
+    return escape(_CARACTERES_INVALIDOS_XML.sub("", valor))
+
+
+def _celula_xlsx(valor: Any, estilo: int = 0) -> str:
+    if valor is None:
+        return "<c/>"
+    if isinstance(valor, bool):
+        return f'<c t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, int):
+        return f"<c><v>{valor}</v></c>"
+    if isinstance(valor, (Decimal, float)):
+        return f'<c s="2"><v>{valor}</v></c>'
+    if isinstance(valor, datetime):
+        serial = (valor.replace(tzinfo=None) - _EPOCH_EXCEL).total_seconds() / 86400
+        return f'<c s="1"><v>{serial}</v></c>'
+    if isinstance(valor, date):
+        return f'<c s="1"><v>{(valor - _EPOCH_EXCEL.date()).days}</v></c>'
+    estilo_attr = f' s="{estilo}"' if estilo else ""
+    return f'<c t="inlineStr"{estilo_attr}><is><t xml:space="preserve">{_texto_xml(_texto_seguro(str(valor)))}</t></is></c>'
+
+
+def _linha_xlsx(numero: int, valores: Iterable[Any], estilo: int = 0) -> str:
+    return f'<row r="{numero}">' + "".join(_celula_xlsx(valor, estilo) for valor in valores) + "</row>"
+
+
+class _SaidaEmBlocos:
+    """Destino não posicionável do zipfile: acumula o que foi escrito até ser drenado"""
+    
+    def __init__(self):
+        self._partes: List[bytes] = []
+    
+    def write(self, dados) -> int:
+        self._partes.append(bytes(dados))
+        return len(dados)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drenar(self) -> bytes:
+        dados = b"".join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+def gerar_xlsx(cabecalho: Sequence[str], linhas: Iterable[Sequence[Any]], nome_planilha: str = "Dados") -> Iterator[bytes]:
+    """XLSX (uma planilha, cabeçalho congelado) em blocos à medida que as linhas chegam"""
+    saida = _SaidaEmBlocos()
+    # Sem seek/tell o zipfile grava em modo streaming (descritores de dados após cada arquivo)
+    with zipfile.ZipFile(saida, mode="w", compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+        arquivo_zip.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        arquivo_zip.writestr("_rels/.rels", _RELS)
+        arquivo_zip.writestr(
+            "xl/workbook.xml",
+            _XML + f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}"><sheets>'
+            f'<sheet name="{_texto_xml(nome_planilha[:31])}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        )
+        arquivo_zip.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        arquivo_zip.writestr("xl/styles.xml", _STYLES)
+        
+        with arquivo_zip.open("xl/worksheets/sheet1.xml", mode="w", force_zip64=True) as planilha:
+            pendente = [_INICIO_PLANILHA, _linha_xlsx(1, cabecalho, estilo=3)]
+            tamanho = 0
+            for numero, linha in enumerate(linhas, start=2):
+                xml = _linha_xlsx(numero, linha)
+                pendente.append(xml)
+                tamanho += len(xml)
+                if tamanho >= TAMANHO_BLOCO:
+                    planilha.write("".join(pendente).encode("utf-8"))
+                    pendente.clear()
+                    tamanho = 0
+                    dados = saida.drenar()
+                    if dados:
+                        yield dados
+            pendente.append(_FIM_PLANILHA)
+            planilha.write("".join(pendente).encode("utf-8"))
+    
+    yield saida.drenar()
+
+
+def comprimir_gzip(blocos: Iterable[bytes], nivel: int = 6) -> Iterator[bytes]:
+    """Comprime um gerador de blocos no formato gzip, sem acumular o conteúdo"""
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+    for bloco in blocos:
+        dados = compressor.compress(bloco)
+        if dados:
+            yield dados
+    yield compressor.flush()
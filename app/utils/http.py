@@ -0,0 +1,20 @@
+"""
+Utilitários HTTP (validação condicional)
+"""
+from typing import Optional
+
+
+def etag_corresponde(if_none_match: Optional[str], etag: str) -> bool:
+    """Verifica se o header If-None-Match contém o ETag (comparação fraca)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    valor = etag[2:] if etag.startswith("W/") else etag
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        if candidato.startswith("W/"):
+            candidato = candidato[2:]
+        if candidato == valor:
+            return True
+    return False
@@ -0,0 +1,324 @@
+"""
+Leitura incremental de CSV e XLSX para importações
+
+Os leitores recebem o arquivo enviado (binário, posicionável) e produzem
+(número da linha, valores) uma linha por vez, sem carregar a planilha em
+memória:
+
+- CSV: UTF-8 (com ou sem BOM) ou Windows-1252, separador detectado no
+  cabeçalho (";", "," ou tabulação); aceita o próprio CSV das exportações
+- XLSX: primeira planilha lida com iterparse; só a tabela de strings
+  compartilhadas fica em memória
+
+Os conversores aceitam o formato brasileiro (dd/mm/aaaa, 1.234,56, Sim/Não)
+além do ISO, e levantam ValueError com a mensagem para o usuário.
+"""
+import codecs
+import csv
+import io
+import re
+import unicodedata
+import zipfile
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+
+LinhaImportada = Tuple[int, List[Any]]
+
+TAMANHO_AMOSTRA = 64 * 1024
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_EPOCH_EXCEL = datetime(1899, 12, 30)
+_REFERENCIA_CELULA = re.compile(r"([A-Z]+)")
+
+_VERDADEIROS = {"sim", "s", "true", "t", "1", "verdadeiro", "ativo", "x"}
+_FALSOS = {"nao", "n", "false", "f", "0", "falso", "inativo"}
+# Apóstrofo que as exportações põem antes de textos com cara de fórmula
+_FORMULA_PROTEGIDA = re.compile(r"^'(?=[=+\-@\t\r])")
+
+
+class ArquivoInvalido(ValueError):
+    """Arquivo que não pode ser lido como CSV/XLSX"""
+
+
+def normalizar_cabecalho(titulo: Any) -> str:
+    """Título de coluna sem acentos, em minúsculas e com "_" (ex.: "Data de entrada" -> "data_de_entrada")"""
+    texto = unicodedata.normalize("NFKD", str(titulo or "")).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "_", texto.lower()).strip("_")
+
+
+def _linha_vazia(valores: List[Any]) -> bool:
+    return all(valor is None or (isinstance(valor, str) and not valor.strip()) for valor in valores)
+
+
+# ========== CSV ==========
+
+def _detectar_codificacao(amostra: bytes) -> str:
+    if amostra.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        amostra.decode("utf-8")
+    except UnicodeDecodeError as erro:
+        # Caractere multibyte cortado no fim da amostra não indica outra codificação
+        if erro.start < len(amostra) - 3:
+            return "cp1252"
+    return "utf-8"
+
+
+def _detectar_separador(primeira_linha: str) -> str:
+    return max((";", ",", "\t"), key=primeira_linha.count)
+
+
+def ler_csv(arquivo: BinaryIO) -> Iterator[LinhaImportada]:
+    """Linhas do CSV (a primeira é o cabeçalho), numeradas a partir de 1"""
+    amostra = arquivo.read(TAMANHO_AMOSTRA)
+    if not amostra.strip():
+        raise ArquivoInvalido("Arquivo vazio")
+    codificacao = _detectar_codificacao(amostra)
+    separador = _detectar_separador(amostra.decode(codificacao, errors="ignore").split("\n", 1)[0])
+    arquivo.seek(0)
+    
+    texto = io.TextIOWrapper(arquivo, encoding=codificacao, newline="")
+    try:
+        leitor = csv.reader(texto, delimiter=separador)
+        for numero, valores in enumerate(leitor, start=1):
+            if not _linha_vazia(valores):
+                yield numero, valores
+    except UnicodeDecodeError:
+        raise ArquivoInvalido("Codificação do CSV não reconhecida: salve o arquivo em UTF-8")
+    except csv.Error as erro:
+        raise ArquivoInvalido(f"CSV inválido: {erro}")
+    finally:
+        # Não fecha o arquivo do upload junto com o wrapper
+        texto.detach()
+
+
+# ========== XLSX ==========
+
+def _primeira_planilha(arquivo_zip: zipfile.ZipFile) -> str:
+    """Caminho da primeira planilha do workbook"""
+    try:
+        with arquivo_zip.open("xl/workbook.xml") as workbook:
+            sheet = next(
+                elem for _, elem in iterparse(workbook) if elem.tag == f"{_NS_MAIN}sheet"
+            )
+        relacao = sheet.get(f"{_NS_REL}id")
+        with arquivo_zip.open("xl/_rels/workbook.xml.rels") as rels:
+            for _, elem in iterparse(rels):
+                if elem.tag == f"{_NS_PKG_REL}Relationship" and elem.get("Id") == relacao:
+                    alvo = elem.get("Target").lstrip("/")
+                    return alvo if alvo.startswith("xl/") else f"xl/{alvo}"
+    except (KeyError, StopIteration):
+        pass
+    return "xl/worksheets/sheet1.xml"
+
+
+def _strings_compartilhadas(arquivo_zip: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in arquivo_zip.namelist():
+        return []
+    strings = []
+    with arquivo_zip.open("xl/sharedStrings.xml") as origem:
+        for _, elem in iterparse(origem):
+            if elem.tag == f"{_NS_MAIN}si":
+                # Texto simples em <t> ou com formatação em vários <r><t> (fonética <rPh> fica de fora)
+                partes = elem.findall(f"{_NS_MAIN}t") + elem.findall(f"{_NS_MAIN}r/{_NS_MAIN}t")
+                strings.append("".join(t.text or "" for t in partes))
+                elem.clear()
+    return strings
+
+
+def _indice_coluna(referencia: Optional[str], padrao: int) -> int:
+    if not referencia:
+        return padrao
+    letras = _REFERENCIA_CELULA.match(referencia)
+    if not letras:
+        return padrao
+    indice = 0
+    for letra in letras.group(1):
+        indice = indice * 26 + ord(letra) - ord("A") + 1
+    return indice - 1
+
+
+def _valor_celula(celula, strings: List[str]) -> Any:
+    tipo = celula.get("t")
+    if tipo == "inlineStr":
+        return "".join(t.text or "" for t in celula.iter(f"{_NS_MAIN}t"))
+    
+    valor = celula.find(f"{_NS_MAIN}v")
+    if valor is None or valor.text is None:
+        return None
+    if tipo == "s":
+        return strings[int(valor.text)]
+    if tipo == "b":
+        return valor.text == "1"
+    if tipo in ("str", "e", "d"):
+        return valor.text
+    numero = float(valor.text)
+    return int(numero) if numero.is_integer() else numero
+
+
+def ler_xlsx(arquivo: BinaryIO) -> Iterator[LinhaImportada]:
+    """Linhas da primeira planilha (a primeira é o cabeçalho), com o número da linha no Excel"""
+    try:
+        arquivo_zip = zipfile.ZipFile(arquivo)
+    except zipfile.BadZipFile:
+        raise ArquivoInvalido("XLSX inválido: o arquivo não é uma planilha do Excel")
+    
+    with arquivo_zip:
+        strings = _strings_compartilhadas(arquivo_zip)
+        try:
+            planilha = arquivo_zip.open(_primeira_planilha(arquivo_zip))
+        except KeyError:
+            raise ArquivoInvalido("XLSX inválido: planilha não encontrada")
+        
+        with planilha:
+            sheet_data = None
+            numero = 0
+            try:
+                for evento, elem in iterparse(planilha, events=("start", "end")):
+                    if evento == "start":
+                        if elem.tag == f"{_NS_MAIN}sheetData":
+                            sheet_data = elem
+                        continue
+                    if elem.tag != f"{_NS_MAIN}row":
+                        continue
+                    
+                    numero = int(elem.get("r") or numero + 1)
+                    valores: List[Any] = []
+                    for celula in elem.iter(f"{_NS_MAIN}c"):
+                        indice = _indice_coluna(celula.get("r"), len(valores))
+                        valores.extend([None] * (indice - len(valores)))
+                        valores.append(_valor_celula(celula, strings))
+                    # Libera as linhas já lidas (memória constante)
+                    if sheet_data is not None:
+                        sheet_data.clear()
+                    
+                    if not _linha_vazia(valores):
+                        yield numero, valores
+            except SyntaxError as erro:
+                raise ArquivoInvalido(f"XLSX inválido: {erro}")
+
+
+# ========== Conversores ==========
+
+def texto(valor: Any) -> Optional[str]:
+    if valor is None:
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    resultado = _FORMULA_PROTEGIDA.sub("", str(valor)).strip()
+    return resultado or None
+
+
+def data(valor: Any) -> Optional[date]:
+    if valor is None or valor == "":
+        return None
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        # Número de série do Excel
+        return (_EPOCH_EXCEL + timedelta(days=int(valor))).date()
+    
+    valor = str(valor).strip()
+    if not valor:
+        return None
+    for formato in ("%d/%m/%Y", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(valor).date()
+    except ValueError:
+        raise ValueError(f"Data inválida: '{valor}' (use dd/mm/aaaa)")
+
+
+def decimal(valor: Any) -> Optional[Decimal]:
+    if valor is None or valor == "":
+        return None
+    original = valor
+    if isinstance(valor, Decimal):
+        resultado = valor
+    elif isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        resultado = Decimal(str(valor))
+    else:
+        original = str(valor).strip()
+        numero = original.replace("R$", "").replace(" ", "").replace("\xa0", "")
+        if not numero:
+            return None
+        if "," in numero:
+            # Formato brasileiro: 1.234,56
+            numero = numero.replace(".", "").replace(",", ".")
+        try:
+            resultado = Decimal(numero)
+        except InvalidOperation:
+            raise ValueError(f"Valor numérico inválido: '{original}'")
+    # NaN e infinito não cabem em nenhuma coluna numérica
+    if not resultado.is_finite():
+        raise ValueError(f"Valor numérico inválido: '{original}'")
+    return resultado
+
+
+def inteiro(valor: Any) -> Optional[int]:
+    numero = decimal(valor)
+    if numero is None:
+        return None
+    if numero != numero.to_integral_value():
+        raise ValueError(f"Número inteiro inválido: '{valor}'")
+    return int(numero)
+
+
+def numerico(precisao: int, escala: int):
+    """Conversor para uma coluna Numeric(precisao, escala): arredonda as casas e limita os dígitos inteiros"""
+    quantum = Decimal(1).scaleb(-escala)
+    digitos_inteiros = precisao - escala
+    
+    def converter(valor: Any) -> Optional[Decimal]:
+        numero = decimal(valor)
+        if numero is None:
+            return None
+        # Só arredonda o que cabe (quantize falha acima da precisão do contexto)
+        if numero.adjusted() < digitos_inteiros:
+            numero = numero.quantize(quantum, ROUND_HALF_UP)
+        if numero.adjusted() >= digitos_inteiros:
+            raise ValueError(f"Valor fora do limite: '{valor}' (máximo de {digitos_inteiros} dígitos antes da vírgula)")
+        return numero
+    
+    return converter
+
+
+def booleano(valor: Any) -> Optional[bool]:
+    if valor is None or valor == "":
+        return None
+    if isinstance(valor, bool):
+        return valor
+    chave = normalizar_cabecalho(valor)
+    if chave in _VERDADEIROS:
+        return True
+    if chave in _FALSOS:
+        return False
+    raise ValueError(f"Valor lógico inválido: '{valor}' (use Sim ou Não)")
+
+
+def rotulo(opcoes: Dict[int, str]):
+    """Conversor que aceita o código ou o rótulo (ex.: 2 ou "Receita")"""
+    por_rotulo = {normalizar_cabecalho(nome): codigo for codigo, nome in opcoes.items()}
+    
+    def converter(valor: Any) -> Optional[int]:
+        if valor is None or valor == "":
+            return None
+        codigo = por_rotulo.get(normalizar_cabecalho(valor))
+        if codigo is not None:
+            return codigo
+        try:
+            return inteiro(valor)
+        except ValueError:
+            raise ValueError(f"Valor inválido: '{valor}' (use {', '.join(opcoes.values())})")
+    
+    return converter
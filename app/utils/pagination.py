@@ -0,0 +1,243 @@
+"""
+Utilitários de paginação
+
+Paginação por chave (keyset/cursor): em vez de offset, a próxima página é
+obtida filtrando pelos valores da chave de ordenação do último registro
+da página anterior, mantendo custo constante em páginas profundas.
+
+Página com total: registros e total retornados na mesma consulta via
+COUNT(*) OVER(), com estimativa do planejador para conjuntos muito grandes.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from sqlalchemy import func, select, tuple_
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codifica os valores da chave de ordenação em um token opaco"""
+    serializaveis = []
+    for value in values:
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        serializaveis.append(value)
+    raw = json.dumps(serializaveis, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, columns: Sequence) -> List[Any]:
+    """Decodifica o token, convertendo os valores para o tipo de cada coluna"""
+    try:
+        padding = "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(token + padding))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("quantidade de valores inválida")
+        return [_converter(value, column) for value, column in zip(values, columns)]
+    except (ValueError, TypeError, ArithmeticError):
+        # ArithmeticError: decimal.InvalidOperation e OverflowError (ex.: Infinity em coluna inteira)
+        raise BadRequestException("Cursor de paginação inválido")
+
+
+def _converter(value: Any, column) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return python_type(value)
+
+
+def paginate_by_cursor(
+    query,
+    columns: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+    row_key: Optional[Callable[[Any], Sequence[Any]]] = None
+) -> Tuple[list, Optional[str]]:
+    """
+    Aplica paginação por chave a uma query
+
+    Args:
+        query: Query já filtrada (sem order_by/offset/limit)
+        columns: Colunas da chave de ordenação (a última deve ser única, ex.: id)
+        cursor: Token da página anterior (None ou vazio para a primeira página)
+        limit: Tamanho da página
+        descending: Ordenação decrescente
+        row_key: Extrai os valores da chave de um registro
+            (padrão: atributos com o nome de cada coluna)
+
+    Returns:
+        Tupla (registros, próximo cursor ou None se não houver mais páginas)
+    """
+    rows = _cursor_query(query, columns, cursor, limit, descending).all()
+    return _cortar_pagina(rows, columns, limit, row_key)
+
+
+async def paginate_by_cursor_async(
+    db,
+    statement,
+    columns: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+    row_key: Optional[Callable[[Any], Sequence[Any]]] = None
+) -> Tuple[list, Optional[str]]:
+    """Versão de paginate_by_cursor para select() em uma AsyncSession"""
+    result = await db.execute(_cursor_query(statement, columns, cursor, limit, descending))
+    return _cortar_pagina(list(result.scalars().all()), columns, limit, row_key)
+
+
+def _cursor_query(query, columns: Sequence, cursor: Optional[str], limit: int, descending: bool):
+    """Aplica filtro da chave, ordenação e limit+1 (Query ou select())"""
+    if cursor:
+        valores = decode_cursor(cursor, columns)
+        chave = tuple_(*columns)
+        query = query.filter(chave < tuple_(*valores) if descending else chave > tuple_(*valores))
+
+    ordem = [column.desc() for column in columns] if descending else list(columns)
+    return query.order_by(*ordem).limit(limit + 1)
+
+
+def _cortar_pagina(
+    rows: list,
+    columns: Sequence,
+    limit: int,
+    row_key: Optional[Callable[[Any], Sequence[Any]]]
+) -> Tuple[list, Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if row_key is None:
+            row_key = lambda row: [getattr(row, column.key) for column in columns]
+        next_cursor = encode_cursor(row_key(rows[-1]))
+
+    return rows, next_cursor
+
+
+def set_next_cursor_header(response, next_cursor: Optional[str]) -> None:
+    """Expõe o próximo cursor no header X-Next-Cursor"""
+    if response is not None and next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
+def fetch_page_with_total(
+    query,
+    order_by: Sequence,
+    skip: int,
+    limit: int,
+    approximate: bool = False
+) -> Tuple[list, int, bool]:
+    """
+    Retorna uma página e o total de registros do filtro em uma única consulta
+
+    Args:
+        query: Query já filtrada (sem order_by/offset/limit)
+        order_by: Expressões de ordenação da página
+        skip: Número de registros a pular
+        limit: Tamanho da página
+        approximate: Se True, usa a estimativa do planejador quando ela passar de
+            PAGINATION_APPROX_COUNT_THRESHOLD (evita contar conjuntos muito grandes)
+
+    Returns:
+        Tupla (registros, total, total_estimado)
+    """
+    if approximate:
+        estimativa = estimate_count(query)
+        if estimativa is not None and estimativa >= settings.PAGINATION_APPROX_COUNT_THRESHOLD:
+            items = query.order_by(*order_by).offset(skip).limit(limit).all()
+            return items, estimativa, True
+
+    rows = (
+        query.add_columns(func.count().over().label("_total"))
+        .order_by(*order_by)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    if rows:
+        return [row[0] for row in rows], rows[0][-1], False
+
+    # Página vazia: só é preciso contar se a página estiver além do fim
+    total = query.order_by(None).count() if skip else 0
+    return [], total, False
+
+
+async def fetch_page_with_total_async(
+    db,
+    statement,
+    order_by: Sequence,
+    skip: int,
+    limit: int,
+    approximate: bool = False
+) -> Tuple[list, int, bool]:
+    """Versão de fetch_page_with_total para select() em uma AsyncSession"""
+    if approximate:
+        estimativa = await db.run_sync(lambda session: estimate_statement_count(session, statement))
+        if estimativa is not None and estimativa >= settings.PAGINATION_APPROX_COUNT_THRESHOLD:
+            result = await db.execute(statement.order_by(*order_by).offset(skip).limit(limit))
+            return list(result.scalars().all()), estimativa, True
+
+    result = await db.execute(
+        statement.add_columns(func.count().over().label("_total"))
+        .order_by(*order_by)
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = result.all()
+    if rows:
+        return [row[0] for row in rows], rows[0][-1], False
+
+    # Página vazia: só é preciso contar se a página estiver além do fim
+    total = 0
+    if skip:
+        contagem = select(func.count()).select_from(statement.order_by(None).subquery())
+        total = (await db.execute(contagem)).scalar_one()
+    return [], total, False
+
+
+def estimate_count(query) -> Optional[int]:
+    """
+    Estimativa de linhas do planejador do PostgreSQL (EXPLAIN) para a query
+
+    Retorna None em outros bancos ou se não for possível estimar.
+    """
+    return estimate_statement_count(query.session, query.order_by(None).statement)
+
+
+def estimate_statement_count(session, statement) -> Optional[int]:
+    """Estimativa do planejador para um select() executado pela sessão (síncrona)"""
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    compiled = statement.order_by(None).compile(dialect=bind.dialect)
+    params = compiled.params
+    if compiled.positional:
+        # Drivers com parâmetros posicionais (ex.: asyncpg)
+        params = tuple(compiled.params[nome] for nome in compiled.positiontup)
+    try:
+        # Savepoint para que uma falha não aborte a transação da requisição
+        with session.begin_nested():
+            plano = session.connection().exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + str(compiled), params
+            ).scalar()
+        if isinstance(plano, str):
+            plano = json.loads(plano)
+        return int(plano[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        print(f"Não foi possível estimar a contagem: {e}")
+        return None
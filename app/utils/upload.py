@@ -1,11 +1,18 @@
 import os
-import uuid
+import hashlib
+import asyncio
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from fastapi import UploadFile, HTTPException
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from PIL import Image
 import io
 from app.core.config import get_settings
+from app.core.metrics import UPLOAD_ETAPA_DURACAO
+from app.utils.variantes import get_variant_path
 
 settings = get_settings()
 
@@ -13,41 +20,88 @@ settings = get_settings()
 ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/jpg", "image/png", "image/gif", "image/webp"]
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_IMAGE_DIMENSIONS = (2000, 2000)  # Máximo de 2000x2000 pixels
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
+# Formatos gerados para cada variante de tamanho (formato Pillow -> extensão)
+FORMATOS_VARIANTES = {"WEBP": "webp", "JPEG": "jpg"}
 
-def validate_image(file: UploadFile) -> None:
-    """Valida se o arquivo é uma imagem válida"""
-    # Verificar tipo MIME
-    if file.content_type not in ALLOWED_IMAGE_TYPES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Tipo de arquivo não permitido. Tipos permitidos: {', '.join(ALLOWED_IMAGE_TYPES)}"
-        )
+# Pool dedicado ao processamento de imagens (decode/resize/encode/gravação),
+# fora da thread do event loop; o semáforo limita quantos uploads ficam em processamento
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_semaforo = asyncio.Semaphore(settings.UPLOAD_PROCESSING_CONCURRENCY)
+
+
+class UploadMetricas:
+    """Tempos acumulados por etapa do pipeline de upload (em segundos)"""
     
-    # Verificar tamanho do arquivo
-    file.file.seek(0, os.SEEK_END)
-    file_size = file.file.tell()
-    file.file.seek(0)
+    ETAPAS = ("recebimento", "espera", "decodificacao", "redimensionamento", "codificacao", "gravacao", "total")
     
-    if file_size > MAX_IMAGE_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Arquivo muito grande. Tamanho máximo: {MAX_IMAGE_SIZE / (1024 * 1024):.1f}MB"
-        )
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dados = {etapa: {"quantidade": 0, "soma": 0.0, "max": 0.0} for etapa in self.ETAPAS}
     
-    if file_size == 0:
+    def registrar(self, tempos: Dict[str, float]) -> None:
+        with self._lock:
+            for etapa, segundos in tempos.items():
+                dados = self._dados.setdefault(etapa, {"quantidade": 0, "soma": 0.0, "max": 0.0})
+                dados["quantidade"] += 1
+                dados["soma"] += segundos
+                dados["max"] = max(dados["max"], segundos)
+    
+    def resumo(self) -> Dict[str, Dict[str, float]]:
+        """Quantidade, média e máximo (ms) por etapa"""
+        with self._lock:
+            return {
+                etapa: {
+                    "quantidade": dados["quantidade"],
+                    "media_ms": round(dados["soma"] / dados["quantidade"] * 1000, 2) if dados["quantidade"] else 0.0,
+                    "max_ms": round(dados["max"] * 1000, 2),
+                }
+                for etapa, dados in self._dados.items()
+            }
+
+
+upload_metricas = UploadMetricas()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.UPLOAD_PROCESSING_WORKERS,
+                thread_name_prefix="upload-imagem"
+            )
+        return _pool
+
+
+def shutdown_upload_pool() -> None:
+    """Encerra o pool de processamento aguardando os uploads em andamento"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def validate_image_type(file: UploadFile) -> None:
+    """Valida o tipo MIME da imagem"""
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
             status_code=400,
-            detail="Arquivo vazio"
+            detail=f"Tipo de arquivo não permitido. Tipos permitidos: {', '.join(ALLOWED_IMAGE_TYPES)}"
         )
 
 
-def process_image(file: UploadFile, max_dimensions: tuple = MAX_IMAGE_DIMENSIONS) -> bytes:
-    """Processa e redimensiona a imagem se necessário"""
+def _carregar_imagem(origem, max_dimensions: tuple, tempos: Dict[str, float]) -> Image.Image:
+    """Decodifica a imagem em RGB e reduz para caber em max_dimensions"""
     try:
-        # Ler a imagem
-        image_data = file.file.read()
-        image = Image.open(io.BytesIO(image_data))
+        inicio = time.perf_counter()
+        image = Image.open(origem)
+        # JPEG: decodificar já em escala reduzida quando a imagem é muito maior que o limite
+        image.draft('RGB', max_dimensions)
+        image.load()
         
         # Converter para RGB se necessário (para JPEG)
         if image.mode in ('RGBA', 'LA', 'P'):
@@ -59,17 +113,14 @@ def process_image(file: UploadFile, max_dimensions: tuple = MAX_IMAGE_DIMENSIONS
             image = rgb_image
         elif image.mode != 'RGB':
             image = image.convert('RGB')
+        tempos["decodificacao"] = time.perf_counter() - inicio
         
         # Redimensionar se necessário
+        inicio = time.perf_counter()
         if image.size[0] > max_dimensions[0] or image.size[1] > max_dimensions[1]:
             image.thumbnail(max_dimensions, Image.Resampling.LANCZOS)
-        
-        # Salvar em bytes
-        output = io.BytesIO()
-        image.save(output, format='JPEG', quality=85, optimize=True)
-        output.seek(0)
-        
-        return output.read()
+        tempos["redimensionamento"] = time.perf_counter() - inicio
+        return image
     except Exception as e:
         raise HTTPException(
             status_code=400,
@@ -77,53 +128,137 @@ def process_image(file: UploadFile, max_dimensions: tuple = MAX_IMAGE_DIMENSIONS
         )
 
 
-def save_upload_file(file: UploadFile, subdirectory: str = "colaboradores") -> str:
+def _codificar(image: Image.Image, formato: str) -> bytes:
+    """Codifica a imagem em JPEG ou WebP"""
+    output = io.BytesIO()
+    if formato == "WEBP":
+        image.save(output, format='WEBP', quality=80, method=4)
+    else:
+        image.save(output, format='JPEG', quality=85, optimize=True)
+    return output.getvalue()
+
+
+def _gravar(conteudo: bytes, destino: Path) -> None:
+    """Grava em arquivo temporário e renomeia, para nunca expor arquivo parcial"""
+    temporario = destino.with_name(destino.name + ".tmp")
+    with open(temporario, "wb") as f:
+        f.write(conteudo)
+    os.replace(temporario, destino)
+
+
+async def stream_upload_to_temp(file: UploadFile) -> Tuple[str, str]:
     """
-    Salva um arquivo de upload e retorna o caminho relativo
-    
-    Args:
-        file: Arquivo a ser salvo
-        subdirectory: Subdiretório onde salvar (ex: "colaboradores", "documentos")
+    Copia o upload em blocos para um arquivo temporário, validando o tamanho
     
     Returns:
-        Caminho relativo do arquivo salvo (ex: "colaboradores/abc123.jpg")
+        Tupla (caminho do arquivo temporário, sha256 do conteúdo recebido)
     """
-    # Validar arquivo
-    validate_image(file)
-    
-    # Processar imagem (redimensionar se necessário)
-    processed_image = process_image(file)
-    
-    # Criar diretório se não existir
-    upload_dir = Path(settings.UPLOAD_DIR) / subdirectory
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Gerar nome único para o arquivo
-    file_extension = Path(file.filename).suffix.lower() if file.filename else ".jpg"
-    if file_extension not in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
-        file_extension = ".jpg"
-    
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = upload_dir / unique_filename
+    recebidos = 0
+    digest = hashlib.sha256()
+    descritor, caminho = tempfile.mkstemp(prefix="upload-", suffix=".img")
+    try:
+        with os.fdopen(descritor, "wb") as destino:
+            while True:
+                bloco = await file.read(UPLOAD_CHUNK_SIZE)
+                if not bloco:
+                    break
+                recebidos += len(bloco)
+                if recebidos > MAX_IMAGE_SIZE:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Arquivo muito grande. Tamanho máximo: {MAX_IMAGE_SIZE / (1024 * 1024):.1f}MB"
+                    )
+                digest.update(bloco)
+                destino.write(bloco)
+        if recebidos == 0:
+            raise HTTPException(
+                status_code=400,
+                detail="Arquivo vazio"
+            )
+        return caminho, digest.hexdigest()
+    except BaseException:
+        os.unlink(caminho)
+        raise
+
+
+async def run_in_upload_pool(tempos: Dict[str, float], func: Callable, *args):
+    """Executa func no pool de processamento respeitando o limite de concorrência"""
+    inicio = time.perf_counter()
+    async with _semaforo:
+        tempos["espera"] = tempos.get("espera", 0.0) + time.perf_counter() - inicio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_pool(), func, *args)
+
+
+def encode_image(
+    origem: str,
+    tempos: Dict[str, float],
+    gerar_variantes: bool = False
+) -> Tuple[bytes, Dict[int, Dict[str, bytes]]]:
+    """
+    Etapa executada no pool: processa a imagem em JPEG e, opcionalmente, as variantes
     
-    # Salvar arquivo
-    with open(file_path, "wb") as f:
-        f.write(processed_image)
+    Returns:
+        Tupla (JPEG principal, {tamanho: {extensão: conteúdo}}) com uma versão
+        WebP e uma JPEG para cada tamanho de IMAGE_VARIANT_SIZES
+    """
+    image = _carregar_imagem(origem, MAX_IMAGE_DIMENSIONS, tempos)
     
-    # Retornar caminho relativo
-    return f"{subdirectory}/{unique_filename}"
+    inicio = time.perf_counter()
+    principal = _codificar(image, "JPEG")
+    variantes: Dict[int, Dict[str, bytes]] = {}
+    if gerar_variantes:
+        # Do maior para o menor, reduzindo a partir da variante anterior
+        reduzida = image
+        for tamanho in sorted(settings.IMAGE_VARIANT_SIZES, reverse=True):
+            reduzida = reduzida.copy()
+            reduzida.thumbnail((tamanho, tamanho), Image.Resampling.LANCZOS)
+            variantes[tamanho] = {
+                extensao: _codificar(reduzida, formato)
+                for formato, extensao in FORMATOS_VARIANTES.items()
+            }
+    tempos["codificacao"] = time.perf_counter() - inicio
+    return principal, variantes
+
+
+def write_files(arquivos: List[Tuple[Path, bytes]], tempos: Dict[str, float]) -> None:
+    """Etapa executada no pool: grava os arquivos (criando os diretórios)"""
+    inicio = time.perf_counter()
+    for caminho, conteudo in arquivos:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        _gravar(conteudo, caminho)
+    tempos["gravacao"] = time.perf_counter() - inicio
 
 
-def delete_upload_file(file_path: str) -> bool:
+def record_upload_timings(tempos: Dict[str, float], inicio_total: float, relativo: str) -> None:
+    """Acumula os tempos do upload nas métricas e registra uploads lentos"""
+    tempos["total"] = time.perf_counter() - inicio_total
+    upload_metricas.registrar(tempos)
+    for etapa, segundos in tempos.items():
+        UPLOAD_ETAPA_DURACAO.labels(etapa).observe(segundos)
+    if tempos["total"] * 1000 >= settings.UPLOAD_SLOW_LOG_MS:
+        etapas = ", ".join(f"{etapa}={segundos * 1000:.1f}ms" for etapa, segundos in tempos.items())
+        print(f"Upload lento em {relativo}: {etapas}")
+
+
+def delete_upload_file(file_path: str, variantes: Optional[Dict[str, Dict[str, str]]] = None) -> bool:
     """
     Deleta um arquivo de upload
     
     Args:
         file_path: Caminho relativo do arquivo (ex: "colaboradores/abc123.jpg")
+        variantes: Variantes de tamanho do arquivo, removidas junto
     
     Returns:
         True se deletado com sucesso, False caso contrário
     """
+    for formatos in (variantes or {}).values():
+        for caminho in formatos.values():
+            try:
+                (Path(settings.UPLOAD_DIR) / caminho).unlink(missing_ok=True)
+            except Exception:
+                pass
+    
     try:
         full_path = Path(settings.UPLOAD_DIR) / file_path
         if full_path.exists():
@@ -134,22 +269,28 @@ def delete_upload_file(file_path: str) -> bool:
         return False
 
 
-def get_file_url(file_path: Optional[str]) -> Optional[str]:
+def get_file_url(
+    file_path: Optional[str],
+    variantes: Optional[Dict[str, Dict[str, str]]] = None,
+    size: Optional[int] = None,
+    formato: str = "webp"
+) -> Optional[str]:
     """
     Retorna a URL completa do arquivo
     
     Args:
         file_path: Caminho relativo do arquivo
+        variantes: Variantes de tamanho do arquivo (ver UploadStore.salvar_imagem)
+        size: Tamanho de exibição em px; escolhe a menor variante que o atenda
+        formato: Formato preferido da variante (webp ou jpg)
     
     Returns:
         URL completa ou None se não houver arquivo
     """
-    if not file_path:
+    path = get_variant_path(file_path, variantes, size, formato)
+    if not path:
         return None
     
     # Em produção, isso pode ser uma URL de CDN ou S3
     # Por enquanto, retornamos o caminho relativo que será servido pelo FastAPI
-    return f"/uploads/{file_path}"
-
-
-
+    return f"/uploads/{path}"
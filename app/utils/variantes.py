@@ -0,0 +1,30 @@
+"""
+Escolha da variante de tamanho de uma imagem (fotos e logos)
+
+Funções puras sobre o JSON de variantes gravado no banco, sem dependência
+do processamento de imagens; usadas pelos modelos e por app.utils.upload.
+"""
+from typing import Dict, Optional
+
+
+def get_variant_path(
+    file_path: Optional[str],
+    variantes: Optional[Dict[str, Dict[str, str]]] = None,
+    size: Optional[int] = None,
+    formato: str = "webp"
+) -> Optional[str]:
+    """
+    Escolhe o caminho relativo mais adequado para exibir a imagem em `size` px
+    
+    Usa a menor variante com pelo menos `size` px (ou a maior disponível) no
+    formato pedido; sem variantes ou sem size, retorna o arquivo original.
+    """
+    if not file_path:
+        return None
+    if not size or not variantes:
+        return file_path
+    
+    tamanhos = sorted(int(tamanho) for tamanho in variantes)
+    escolhido = next((tamanho for tamanho in tamanhos if tamanho >= size), tamanhos[-1])
+    formatos = variantes.get(str(escolhido)) or {}
+    return formatos.get(formato) or formatos.get("jpg") or file_path
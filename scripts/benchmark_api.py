@@ -0,0 +1,237 @@
+"""
+Benchmark reproduzível da API com dados sintéticos multi-escritório
+Uso: python scripts/benchmark_api.py [--escritorios 3] [--clientes 2000] [--movimentos 5000]
+                                     [--semente 42] [--requisicoes 500] [--concorrencia 50]
+                                     [--saida resultado.json] [--baseline anterior.json]
+
+Gera os escritórios com DadosSinteticosSeeds (mesma semente, mesmos dados) no
+banco de DATABASE_URL - use um banco dedicado - e executa a aplicação real
+(app.main) no mesmo processo via httpx + ASGI, com os tokens dos
+administradores sintéticos e as requisições distribuídas entre os
+escritórios. Para cada rota mede p50/p95/p99, requisições por segundo e
+comandos SQL por requisição.
+
+Com --reusar resultado.json os escritórios de uma execução anterior são
+reaproveitados (sem gerar dados). Com --baseline, o resultado é comparado
+rota a rota e o script termina com código 1 se o p95 de alguma rota piorar
+mais que --tolerancia por cento.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import platform
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anyio.to_thread
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.security import create_access_token
+from app.database import SessionLocal
+from app.services.seeds_sinteticos import ESCALA_PADRAO, DadosSinteticosSeeds
+
+
+ROTAS = {
+    "clientes": "/api/v1/clientes/?limit=20",
+    "clientes_busca": "/api/v1/clientes/?limit=20&search=Silva",
+    "clientes_cursor": "/api/v1/clientes/?limit=20&cursor=",
+    "projetos": "/api/v1/projetos?limit=20",
+    "propostas": "/api/v1/propostas?limit=20",
+    "movimentos": "/api/v1/movimentos?limit=50",
+    "movimentos_resumo": "/api/v1/movimentos/resumo",
+    "relatorio_dre": "/api/v1/relatorios/dre?data_inicio=2000-01-01",
+    "relatorio_fluxo_caixa": "/api/v1/relatorios/fluxo-caixa?data_inicio=2000-01-01",
+    "servicos": "/api/v1/servicos",
+    "servicos_hierarquia": "/api/v1/servicos/hierarquia",
+    "colaboradores": "/api/v1/colaboradores/",
+}
+
+
+class _Contador:
+    __slots__ = ("comandos",)
+    
+    def __init__(self):
+        self.comandos = 0
+
+
+# Contador da requisição atual; o contexto é copiado para o threadpool das rotas síncronas
+_contador_atual: ContextVar[Optional[_Contador]] = ContextVar("contador_sql", default=None)
+
+
+def _contar_comando(conn, cursor, statement, parameters, context, executemany):
+    contador = _contador_atual.get()
+    if contador is not None:
+        contador.comandos += 1
+
+
+def percentil(valores: List[float], p: float) -> float:
+    indice = max(int(round(len(valores) * p / 100)) - 1, 0)
+    return valores[min(indice, len(valores) - 1)]
+
+
+def gerar_dados(escritorios: int, semente: int, escala: dict) -> List[dict]:
+    db = SessionLocal()
+    try:
+        seeds = DadosSinteticosSeeds(db, semente=semente, escala=escala)
+        gerados = []
+        for indice in range(escritorios):
+            inicio = time.perf_counter()
+            resumo = seeds.gerar_escritorio(indice)
+            print(f"🏢 Escritório {resumo['escritorio_id']} gerado em {time.perf_counter() - inicio:.1f}s", file=sys.stderr)
+            gerados.append(resumo)
+        return gerados
+    finally:
+        db.close()
+
+
+async def medir(client: httpx.AsyncClient, url: str, tokens: List[str], requisicoes: int, concorrencia: int) -> dict:
+    latencias = []
+    comandos = []
+    erros = 0
+    semaforo = asyncio.Semaphore(concorrencia)
+    
+    async def requisitar(numero: int):
+        nonlocal erros
+        async with semaforo:
+            contador = _Contador()
+            _contador_atual.set(contador)
+            headers = {"Authorization": f"Bearer {tokens[numero % len(tokens)]}"}
+            inicio = time.perf_counter()
+            resposta = await client.get(url, headers=headers)
+            latencias.append(time.perf_counter() - inicio)
+            comandos.append(contador.comandos)
+            if resposta.status_code != 200:
+                erros += 1
+    
+    inicio = time.perf_counter()
+    # Cada tarefa roda em uma cópia do contexto: contadores não se misturam
+    await asyncio.gather(*(requisitar(numero) for numero in range(requisicoes)))
+    duracao = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "requisicoes_por_segundo": round(requisicoes / duracao, 1),
+        "p50_ms": round(percentil(latencias, 50) * 1000, 2),
+        "p95_ms": round(percentil(latencias, 95) * 1000, 2),
+        "p99_ms": round(percentil(latencias, 99) * 1000, 2),
+        "sql_por_requisicao": round(sum(comandos) / len(comandos), 2),
+        "sql_max": max(comandos),
+        "erros": erros,
+    }
+
+
+async def executar(escritorios: List[dict], rotas: List[str], requisicoes: int, concorrencia: int, threads: int) -> dict:
+    from app.main import app
+    
+    # Limite do threadpool onde o FastAPI executa as rotas síncronas (padrão 40)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threads
+    tokens = [
+        create_access_token(data={
+            "sub": str(escritorio["admin_id"]),
+            "escritorio_id": escritorio["escritorio_id"],
+            "perfil": "Administrador",
+        })
+        for escritorio in escritorios
+    ]
+    
+    event.listen(Engine, "before_cursor_execute", _contar_comando)
+    # O ASGITransport não dispara o lifespan
+    await app.router.startup()
+    resultados = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for nome in rotas:
+                url = ROTAS[nome]
+                # Aquecimento: abre as conexões dos pools e preenche os caches
+                await medir(client, url, tokens, min(concorrencia, requisicoes), concorrencia)
+                resultados[nome] = await medir(client, url, tokens, requisicoes, concorrencia)
+                print(f"⏱️  {nome}: p95 {resultados[nome]['p95_ms']}ms", file=sys.stderr)
+    finally:
+        await app.router.shutdown()
+        event.remove(Engine, "before_cursor_execute", _contar_comando)
+    return resultados
+
+
+def comparar(resultados: dict, baseline: dict, tolerancia: float) -> dict:
+    """Variação percentual de cada métrica em relação ao baseline (positivo = maior)"""
+    comparacao = {}
+    for nome, atual in resultados.items():
+        anterior = baseline.get("resultados", {}).get(nome)
+        if not anterior:
+            continue
+        variacao = {}
+        for metrica in ("p50_ms", "p95_ms", "p99_ms", "requisicoes_por_segundo", "sql_por_requisicao"):
+            if anterior.get(metrica):
+                variacao[metrica] = round((atual[metrica] - anterior[metrica]) / anterior[metrica] * 100, 1)
+        variacao["regressao"] = variacao.get("p95_ms", 0) > tolerancia
+        comparacao[nome] = variacao
+    return comparacao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da API com dados sintéticos multi-escritório")
+    parser.add_argument("--escritorios", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=42)
+    for chave, padrao in ESCALA_PADRAO.items():
+        parser.add_argument(f"--{chave.replace('_', '-')}", type=int, default=padrao, dest=chave)
+    parser.add_argument("--reusar", help="JSON de uma execução anterior cujos escritórios serão reaproveitados")
+    parser.add_argument("--rotas", nargs="+", choices=list(ROTAS), default=list(ROTAS))
+    parser.add_argument("--requisicoes", type=int, default=500, help="Requisições por rota")
+    parser.add_argument("--concorrencia", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=40, help="Threads para as rotas síncronas")
+    parser.add_argument("--saida", help="Arquivo JSON do resultado (padrão: stdout)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--tolerancia", type=float, default=10.0, help="Piora máxima do p95 (%%) aceita")
+    args = parser.parse_args()
+    escala = {chave: getattr(args, chave) for chave in ESCALA_PADRAO}
+    
+    if args.reusar:
+        with open(args.reusar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        escritorios, escala, semente = anterior["escritorios"], anterior["escala"], anterior["semente"]
+    else:
+        semente = args.semente
+        escritorios = gerar_dados(args.escritorios, semente, escala)
+    
+    resultados = asyncio.run(executar(escritorios, args.rotas, args.requisicoes, args.concorrencia, args.threads))
+    resultado = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "semente": semente,
+        "escala": escala,
+        "escritorios": escritorios,
+        "requisicoes": args.requisicoes,
+        "concorrencia": args.concorrencia,
+        "threads_sincronas": args.threads,
+        "resultados": resultados,
+    }
+    
+    regressoes = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as arquivo:
+            resultado["comparacao"] = comparar(resultados, json.load(arquivo), args.tolerancia)
+        regressoes = [nome for nome, variacao in resultado["comparacao"].items() if variacao["regressao"]]
+    
+    saida = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(saida)
+        print(f"💾 Resultado salvo em {args.saida}", file=sys.stderr)
+    else:
+        print(saida)
+    
+    if regressoes:
+        print(f"❌ p95 piorou mais de {args.tolerancia}% em: {', '.join(regressoes)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark das rotas de leitura: engine síncrono x assíncrono (asyncpg)
+Uso: python scripts/benchmark_async.py --usuario-id 1 --escritorio-id 1 [--requisicoes 2000] [--concorrencia 200]
+
+Monta, no mesmo processo (httpx + ASGI), uma aplicação com os routers síncronos
+e outra com os assíncronos, e mede a listagem de clientes, a de projetos e a
+hierarquia de serviços em alta concorrência. Usa o banco de DATABASE_URL; o
+cache da hierarquia é limpo antes de cada medição e o do principal pode ser
+desligado com --sem-cache-principal para medir também a autenticação.
+Resultado em JSON.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import time
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anyio.to_thread
+import httpx
+from fastapi import FastAPI
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.database import SessionLocal, dispose_async_engine
+from app.api.v1.endpoints import clientes, projetos, servicos
+from app.api.v1.endpoints import clientes_async, projetos_async, servicos_async
+from app.services.servico_hierarquia_cache import invalidar_hierarquia
+
+
+ROTAS = {
+    "clientes": "/api/v1/clientes/?limit=20",
+    "projetos": "/api/v1/projetos?limit=20",
+    "servicos_hierarquia": "/api/v1/servicos/hierarquia",
+}
+
+
+def limpar_cache_hierarquia(escritorio_id: int) -> None:
+    db = SessionLocal()
+    try:
+        invalidar_hierarquia(db, escritorio_id)
+    finally:
+        db.close()
+
+
+def criar_app(assincrono: bool) -> FastAPI:
+    app = FastAPI()
+    if assincrono:
+        app.include_router(clientes_async.router, prefix="/api/v1/clientes")
+        app.include_router(projetos_async.router, prefix="/api/v1/projetos")
+        app.include_router(servicos_async.router, prefix="/api/v1/servicos")
+    else:
+        app.include_router(clientes.router, prefix="/api/v1/clientes")
+        app.include_router(projetos.router, prefix="/api/v1/projetos")
+        app.include_router(servicos.router, prefix="/api/v1/servicos")
+    return app
+
+
+async def medir(client: httpx.AsyncClient, url: str, requisicoes: int, concorrencia: int) -> dict:
+    latencias = []
+    erros = 0
+    semaforo = asyncio.Semaphore(concorrencia)
+    
+    async def requisitar():
+        nonlocal erros
+        async with semaforo:
+            inicio = time.perf_counter()
+            resposta = await client.get(url)
+            latencias.append(time.perf_counter() - inicio)
+            if resposta.status_code != 200:
+                erros += 1
+    
+    inicio = time.perf_counter()
+    await asyncio.gather(*(requisitar() for _ in range(requisicoes)))
+    duracao = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "requisicoes_por_segundo": round(requisicoes / duracao, 1),
+        "p50_ms": round(latencias[len(latencias) // 2] * 1000, 2),
+        "p95_ms": round(latencias[int(len(latencias) * 0.95) - 1] * 1000, 2),
+        "p99_ms": round(latencias[int(len(latencias) * 0.99) - 1] * 1000, 2),
+        "erros": erros,
+    }
+
+
+async def executar(
+    usuario_id: int,
+    escritorio_id: int,
+    requisicoes: int,
+    concorrencia: int,
+    threads: int,
+    sem_cache_principal: bool
+) -> dict:
+    # Limite do threadpool onde o FastAPI executa as rotas síncronas (padrão 40)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threads
+    cache_principal_original = settings.PRINCIPAL_CACHE_ENABLED
+    if sem_cache_principal:
+        settings.PRINCIPAL_CACHE_ENABLED = False
+    
+    token = create_access_token(data={"sub": str(usuario_id), "escritorio_id": escritorio_id})
+    headers = {"Authorization": f"Bearer {token}"}
+    resultados = {}
+    try:
+        for modo, assincrono in (("sincrono", False), ("assincrono", True)):
+            transport = httpx.ASGITransport(app=criar_app(assincrono))
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+                resultados[modo] = {}
+                for nome, url in ROTAS.items():
+                    limpar_cache_hierarquia(escritorio_id)
+                    # Aquecimento: abre as conexões dos pools antes de medir
+                    await medir(client, url, min(concorrencia, requisicoes), concorrencia)
+                    limpar_cache_hierarquia(escritorio_id)
+                    resultados[modo][nome] = await medir(client, url, requisicoes, concorrencia)
+    finally:
+        settings.PRINCIPAL_CACHE_ENABLED = cache_principal_original
+        await dispose_async_engine()
+    
+    return {
+        "requisicoes": requisicoes,
+        "concorrencia": concorrencia,
+        "threads_sincronas": threads,
+        "cache_principal": not sem_cache_principal,
+        "resultados": resultados,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das rotas de leitura síncronas x assíncronas")
+    parser.add_argument("--usuario-id", type=int, required=True, help="Usuário ativo usado no token")
+    parser.add_argument("--escritorio-id", type=int, required=True, help="Escritório do contexto")
+    parser.add_argument("--requisicoes", type=int, default=2000)
+    parser.add_argument("--concorrencia", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=40, help="Threads para as rotas síncronas")
+    parser.add_argument("--sem-cache-principal", action="store_true", help="Buscar o usuário no banco a cada requisição")
+    args = parser.parse_args()
+    
+    resultado = asyncio.run(executar(
+        args.usuario_id, args.escritorio_id, args.requisicoes, args.concorrencia,
+        args.threads, args.sem_cache_principal
+    ))
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Mede memória e tempo da exportação real de movimentos de um escritório
+Uso: python scripts/benchmark_exportacao.py --escritorio-id N [--formatos csv csv_gzip xlsx]
+
+Exporta os movimentos do escritório pelo mesmo caminho dos endpoints
+(cursor no servidor, banco de DATABASE_URL) e mede, com tracemalloc, o pico
+de memória de cada formato. A verificação de memória constante com 1 milhão
+de linhas sintéticas, sem banco, fica em tests/test_exportacao.py.
+Resultado em JSON.
+"""
+import sys
+import os
+import argparse
+import json
+import time
+import tracemalloc
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.repositories.movimento_repository import MovimentoRepository
+from app.services.exportacao import FORMATO_CSV, FORMATO_XLSX, gerar_exportacao
+from app.utils.exportacao import comprimir_gzip
+
+
+FORMATOS = {
+    "csv": lambda montar: gerar_exportacao(montar, FORMATO_CSV, "Movimentos"),
+    "csv_gzip": lambda montar: comprimir_gzip(gerar_exportacao(montar, FORMATO_CSV, "Movimentos")),
+    "xlsx": lambda montar: gerar_exportacao(montar, FORMATO_XLSX, "Movimentos"),
+}
+
+
+def medir(blocos) -> dict:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    inicio = time.perf_counter()
+    tamanho = 0
+    for bloco in blocos:
+        tamanho += len(bloco)
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "pico_kb": round(pico / 1024, 1),
+        "tamanho_mb": round(tamanho / 1024 / 1024, 2),
+        "segundos": round(duracao, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória da exportação real de movimentos")
+    parser.add_argument("--escritorio-id", type=int, required=True)
+    parser.add_argument("--formatos", nargs="+", choices=list(FORMATOS), default=list(FORMATOS))
+    args = parser.parse_args()
+    
+    def montar(db):
+        return MovimentoRepository(db).get_exportacao(args.escritorio_id)
+    
+    resultado = {"escritorio_id": args.escritorio_id, "formatos": {}}
+    for formato in args.formatos:
+        medicao = medir(FORMATOS[formato](montar))
+        resultado["formatos"][formato] = medicao
+        print(f"⏱️  {formato}: pico {medicao['pico_kb']} KB em {medicao['segundos']}s", file=sys.stderr)
+    
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
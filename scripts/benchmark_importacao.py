@@ -0,0 +1,135 @@
+"""
+Mede a vazão (linhas/s) das importações de clientes e movimentos
+Uso: python scripts/benchmark_importacao.py --escritorio-id N [--linhas 10000 100000]
+                                            [--entidades clientes movimentos] [--formatos csv xlsx]
+                                            [--gravar] [--minimo 1000]
+
+Gera arquivos sintéticos no formato das exportações (CSV com ";" e vírgula
+decimal, XLSX) e os importa no escritório pelo mesmo serviço dos endpoints
+(banco de DATABASE_URL). Por padrão roda em dry-run (lê, converte, valida e
+checa duplicados, sem gravar); com --gravar os registros são inseridos de
+fato e ficam no escritório. Termina com código 1 se alguma medição ficar
+abaixo de --minimo linhas/s. Resultado em JSON.
+"""
+import sys
+import os
+import argparse
+import json
+import tempfile
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services.importacao import FORMATO_CSV, FORMATO_XLSX, ImportacaoService
+from app.utils.exportacao import gerar_csv, gerar_xlsx
+
+
+CABECALHO_CLIENTES = [
+    "Nome", "Tipo de pessoa", "Identificação", "E-mail", "Telefone", "Data de nascimento",
+    "Logradouro", "Número", "Bairro", "Cidade", "UF", "CEP", "Ativo",
+]
+CABECALHO_MOVIMENTOS = [
+    "Data de entrada", "Data de efetivação", "Competência", "Tipo", "Descrição", "Observação",
+    "Valor", "Acréscimo", "Desconto", "Valor resultante", "Plano de contas", "Ativo",
+]
+
+
+def clientes_sinteticos(quantidade: int):
+    # Prefixo único por execução: com --gravar, CPFs não colidem com importações anteriores
+    prefixo = uuid.uuid4().int % 1000
+    for numero in range(quantidade):
+        juridica = numero % 5 == 0
+        yield (
+            f"Cliente Sintético {numero + 1}", "Jurídica" if juridica else "Física",
+            f"{prefixo:03d}{numero:011d}", f"cliente{numero + 1}@importacao.arqmanager", "(11) 99999-0000",
+            None if juridica else date(1960, 1, 1) + timedelta(days=numero % 15000),
+            "Rua das Palmeiras", str(numero % 2000), "Centro", "São Paulo", "SP", "01000-000", True,
+        )
+
+
+def movimentos_sinteticos(quantidade: int):
+    inicio = date(2020, 1, 1)
+    for numero in range(quantidade):
+        entrada = inicio + timedelta(days=numero % 1500)
+        valor = Decimal(numero % 100000 + 1) / 100
+        yield (
+            entrada, entrada + timedelta(days=3), entrada.replace(day=1),
+            "Receita" if numero % 2 else "Despesa", f"Lançamento importado {numero + 1}", None,
+            valor, None, Decimal("0.00"), valor, "1.1.1", True,
+        )
+
+
+ENTIDADES = {
+    "clientes": (CABECALHO_CLIENTES, clientes_sinteticos, "importar_clientes"),
+    "movimentos": (CABECALHO_MOVIMENTOS, movimentos_sinteticos, "importar_movimentos"),
+}
+GERADORES = {FORMATO_CSV: gerar_csv, FORMATO_XLSX: gerar_xlsx}
+
+
+def gerar_arquivo(entidade: str, formato: str, quantidade: int) -> str:
+    """Arquivo temporário com as linhas sintéticas (gravado em blocos)"""
+    cabecalho, linhas, _ = ENTIDADES[entidade]
+    descritor, caminho = tempfile.mkstemp(prefix=f"importacao-{entidade}-", suffix=f".{formato}")
+    with os.fdopen(descritor, "wb") as destino:
+        for bloco in GERADORES[formato](cabecalho, linhas(quantidade)):
+            destino.write(bloco)
+    return caminho
+
+
+def medir(entidade: str, formato: str, quantidade: int, escritorio_id: int, dry_run: bool) -> dict:
+    caminho = gerar_arquivo(entidade, formato, quantidade)
+    db = SessionLocal()
+    try:
+        with open(caminho, "rb") as arquivo:
+            importar = getattr(ImportacaoService(db), ENTIDADES[entidade][2])
+            resultado = importar(arquivo, escritorio_id, formato, dry_run=dry_run)
+    finally:
+        db.close()
+        os.unlink(caminho)
+    return {
+        "linhas": resultado["total_linhas"],
+        "validas": resultado["validas"],
+        "importadas": resultado["importadas"],
+        "com_erro": resultado["com_erro"],
+        "segundos": resultado["duracao_segundos"],
+        "linhas_por_segundo": resultado["linhas_por_segundo"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vazão das importações CSV/XLSX")
+    parser.add_argument("--escritorio-id", type=int, required=True)
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--entidades", nargs="+", choices=list(ENTIDADES), default=list(ENTIDADES))
+    parser.add_argument("--formatos", nargs="+", choices=list(GERADORES), default=list(GERADORES))
+    parser.add_argument("--gravar", action="store_true", help="Inserir de fato (padrão: dry-run)")
+    parser.add_argument("--minimo", type=float, default=1000, help="Vazão mínima aceitável em linhas/s")
+    args = parser.parse_args()
+    
+    resultado = {"escritorio_id": args.escritorio_id, "dry_run": not args.gravar, "minimo": args.minimo, "medicoes": {}}
+    falhas = []
+    for entidade in args.entidades:
+        for formato in args.formatos:
+            for quantidade in sorted(args.linhas):
+                chave = f"{entidade}.{formato}.{quantidade}"
+                medicao = medir(entidade, formato, quantidade, args.escritorio_id, not args.gravar)
+                resultado["medicoes"][chave] = medicao
+                print(f"⏱️  {chave}: {medicao['linhas_por_segundo']:.0f} linhas/s", file=sys.stderr)
+                if medicao["com_erro"]:
+                    print(f"⚠️  {chave}: {medicao['com_erro']} linhas com erro", file=sys.stderr)
+                if medicao["linhas_por_segundo"] < args.minimo:
+                    falhas.append(chave)
+    
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    if falhas:
+        print(f"❌ Vazão abaixo de {args.minimo:.0f} linhas/s em: {', '.join(falhas)}", file=sys.stderr)
+        sys.exit(1)
+    print("✅ Vazão dentro do mínimo em todas as medições", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Mede o custo das métricas no caminho da requisição
+Uso: python scripts/benchmark_metrics.py [--requisicoes 5000] [--comandos 20000]
+
+Compara, no mesmo processo (httpx + ASGI), uma rota simples com e sem o
+MetricsMiddleware, e a execução de comandos SQL (SQLite em memória) com e
+sem os eventos de cursor. Falha (código 1) se o custo por requisição passar
+de METRICS_OVERHEAD_BUDGET_US. Resultado em JSON.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import time
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, registrar_eventos_banco
+
+
+def criar_app(com_metricas: bool) -> FastAPI:
+    app = FastAPI()
+    
+    @app.get("/itens/{item_id}")
+    def obter_item(item_id: int):
+        return {"id": item_id}
+    
+    if com_metricas:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def medir_requisicoes(com_metricas: bool, requisicoes: int) -> float:
+    """Microssegundos por requisição (sequencial, para isolar o custo)"""
+    transport = httpx.ASGITransport(app=criar_app(com_metricas))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(200):
+            await client.get(f"/itens/{i}")
+        inicio = time.perf_counter()
+        for i in range(requisicoes):
+            await client.get(f"/itens/{i}")
+        return (time.perf_counter() - inicio) / requisicoes * 1_000_000
+
+
+def medir_comandos(comandos: int) -> float:
+    """Microssegundos por comando SQL"""
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        inicio = time.perf_counter()
+        for _ in range(comandos):
+            conn.execute(text("SELECT 1"))
+        return (time.perf_counter() - inicio) / comandos * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo das métricas por requisição")
+    parser.add_argument("--requisicoes", type=int, default=5000)
+    parser.add_argument("--comandos", type=int, default=20000)
+    args = parser.parse_args()
+    
+    sem_middleware = asyncio.run(medir_requisicoes(False, args.requisicoes))
+    com_middleware = asyncio.run(medir_requisicoes(True, args.requisicoes))
+    sem_eventos = medir_comandos(args.comandos)
+    registrar_eventos_banco()
+    com_eventos = medir_comandos(args.comandos)
+    
+    custo_requisicao = com_middleware - sem_middleware
+    custo_comando = com_eventos - sem_eventos
+    resultado = {
+        "requisicao_us": {
+            "sem_metricas": round(sem_middleware, 1),
+            "com_metricas": round(com_middleware, 1),
+            "custo": round(custo_requisicao, 1),
+        },
+        "comando_sql_us": {
+            "sem_eventos": round(sem_eventos, 2),
+            "com_eventos": round(com_eventos, 2),
+            "custo": round(custo_comando, 2),
+        },
+        "orcamento_us": settings.METRICS_OVERHEAD_BUDGET_US,
+        "dentro_do_orcamento": custo_requisicao <= settings.METRICS_OVERHEAD_BUDGET_US,
+    }
+    print(json.dumps(resultado, indent=2))
+    if not resultado["dentro_do_orcamento"]:
+        print(f"❌ Custo das métricas acima do orçamento ({custo_requisicao:.1f}us)")
+        sys.exit(1)
+    print("✅ Custo das métricas dentro do orçamento")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark do envio de /uploads nos modos disponíveis
+Uso: python scripts/benchmark_uploads.py [--tamanho-kb 512] [--requisicoes 500] [--concorrencia 20]
+
+Compara, no mesmo processo (httpx + ASGI), o StaticFiles anterior com os modos
+app, app com Range, x-accel e x-sendfile do roteador de uploads. Nos modos de
+proxy o número mede apenas o custo da API, que é o que deixa de ocupar o worker.
+Resultado em JSON.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+from app.core.config import settings
+from app.api import uploads
+
+
+def criar_app(diretorio: str) -> FastAPI:
+    app = FastAPI()
+    app.mount("/static-uploads", StaticFiles(directory=diretorio), name="static-uploads")
+    app.include_router(uploads.router)
+    return app
+
+
+async def medir(client: httpx.AsyncClient, url: str, requisicoes: int, concorrencia: int, headers: dict = None) -> dict:
+    latencias = []
+    bytes_recebidos = 0
+    semaforo = asyncio.Semaphore(concorrencia)
+    
+    async def requisitar():
+        nonlocal bytes_recebidos
+        async with semaforo:
+            inicio = time.perf_counter()
+            resposta = await client.get(url, headers=headers)
+            latencias.append(time.perf_counter() - inicio)
+            bytes_recebidos += len(resposta.content)
+            assert resposta.status_code in (200, 206), resposta.status_code
+    
+    inicio = time.perf_counter()
+    await asyncio.gather(*(requisitar() for _ in range(requisicoes)))
+    duracao = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "requisicoes_por_segundo": round(requisicoes / duracao, 1),
+        "mb_por_segundo": round(bytes_recebidos / duracao / (1024 * 1024), 2),
+        "p50_ms": round(latencias[len(latencias) // 2] * 1000, 2),
+        "p95_ms": round(latencias[int(len(latencias) * 0.95) - 1] * 1000, 2),
+    }
+
+
+async def executar(tamanho_kb: int, requisicoes: int, concorrencia: int) -> dict:
+    diretorio = tempfile.mkdtemp(prefix="bench-uploads-")
+    upload_dir_original = settings.UPLOAD_DIR
+    modo_original = settings.UPLOAD_SERVE_MODE
+    try:
+        nome = "benchmark.bin"
+        with open(os.path.join(diretorio, nome), "wb") as f:
+            f.write(os.urandom(tamanho_kb * 1024))
+        settings.UPLOAD_DIR = diretorio
+        
+        transport = httpx.ASGITransport(app=criar_app(diretorio))
+        resultados = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            resultados["staticfiles"] = await medir(client, f"/static-uploads/{nome}", requisicoes, concorrencia)
+            
+            settings.UPLOAD_SERVE_MODE = uploads.MODO_APP
+            resultados["app"] = await medir(client, f"/uploads/{nome}", requisicoes, concorrencia)
+            resultados["app_range_64kb"] = await medir(
+                client, f"/uploads/{nome}", requisicoes, concorrencia, {"Range": "bytes=0-65535"}
+            )
+            
+            settings.UPLOAD_SERVE_MODE = uploads.MODO_X_ACCEL
+            resultados["x_accel"] = await medir(client, f"/uploads/{nome}", requisicoes, concorrencia)
+            
+            settings.UPLOAD_SERVE_MODE = uploads.MODO_X_SENDFILE
+            resultados["x_sendfile"] = await medir(client, f"/uploads/{nome}", requisicoes, concorrencia)
+        
+        return {
+            "tamanho_kb": tamanho_kb,
+            "requisicoes": requisicoes,
+            "concorrencia": concorrencia,
+            "modos": resultados,
+        }
+    finally:
+        settings.UPLOAD_DIR = upload_dir_original
+        settings.UPLOAD_SERVE_MODE = modo_original
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do envio de uploads")
+    parser.add_argument("--tamanho-kb", type=int, default=512)
+    parser.add_argument("--requisicoes", type=int, default=500)
+    parser.add_argument("--concorrencia", type=int, default=20)
+    args = parser.parse_args()
+    
+    resultado = asyncio.run(executar(args.tamanho_kb, args.requisicoes, args.concorrencia))
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
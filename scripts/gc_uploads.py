@@ -0,0 +1,52 @@
+"""
+Coleta de lixo dos uploads: remove sessões de upload expiradas, recalcula
+referências e remove blobs não referenciados
+Uso: python scripts/gc_uploads.py [--lote N] [--carencia-minutos N] [--sem-recontagem] [--dry-run]
+"""
+import sys
+import os
+import argparse
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services.upload_store import UploadStore
+from app.services.upload_sessao_service import UploadSessaoService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coleta de lixo dos uploads")
+    parser.add_argument("--lote", type=int, default=None, help="Blobs removidos por transação (padrão: UPLOAD_GC_BATCH_SIZE)")
+    parser.add_argument("--carencia-minutos", type=int, default=None, help="Idade mínima sem referências (padrão: UPLOAD_GC_GRACE_MINUTES)")
+    parser.add_argument("--sem-recontagem", action="store_true", help="Não recalcular ref_count antes da coleta")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas conta os blobs que seriam removidos (sem recontagem)")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        store = UploadStore(db)
+        
+        if not args.dry_run:
+            expiradas = UploadSessaoService(db).limpar_expiradas()
+            print(f"⌛ Sessões de upload expiradas removidas: {expiradas}")
+        
+        if not args.sem_recontagem and not args.dry_run:
+            alterados = store.recontar_referencias()
+            print(f"🔢 Contagens de referência corrigidas: {alterados}")
+        
+        removidos = store.coletar_lixo(args.lote, args.carencia_minutos, dry_run=args.dry_run)
+        if args.dry_run:
+            print(f"🔎 Blobs que seriam removidos: {removidos}")
+        else:
+            print(f"🗑️  Blobs removidos: {removidos}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Erro na coleta de lixo dos uploads: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
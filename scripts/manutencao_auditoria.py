@@ -0,0 +1,47 @@
+"""
+Manutenção das partições de auditoria: cria partições futuras e aplica a retenção
+Uso: python scripts/manutencao_auditoria.py [--meses-futuros N] [--retencao N] [--dry-run]
+
+Deve ser agendado (ex.: cron diário).
+"""
+import sys
+import os
+import argparse
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services.auditoria_manutencao import AuditoriaManutencaoService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção das partições de auditoria")
+    parser.add_argument("--meses-futuros", type=int, default=None, help="Partições a criar à frente (padrão: AUDIT_PARTITIONS_AHEAD)")
+    parser.add_argument("--retencao", type=int, default=None, help="Meses de retenção (padrão: AUDIT_RETENTION_MONTHS; 0 desativa)")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas lista as partições que seriam removidas")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        service = AuditoriaManutencaoService(db)
+        
+        if not args.dry_run:
+            criadas = service.criar_particoes_futuras(args.meses_futuros)
+            print(f"✅ Partições garantidas: {', '.join(criadas)}")
+        
+        removidas = service.aplicar_retencao(args.retencao, dry_run=args.dry_run)
+        if args.dry_run:
+            print(f"🔎 Partições que seriam removidas: {', '.join(removidas) or 'nenhuma'}")
+        else:
+            print(f"🗑️  Partições removidas: {', '.join(removidas) or 'nenhuma'}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Erro na manutenção da auditoria: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Reconstrói o resumo mensal de movimentos a partir da tabela movimentos
+Uso: python scripts/reconstruir_resumo_movimentos.py [--escritorio-id N]
+
+Para carga inicial ou correção. Escritas em movimentos ficam bloqueadas
+enquanto o resumo é recalculado.
+"""
+import sys
+import os
+import argparse
+import time
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services.movimento_service import MovimentoService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstrói o resumo mensal de movimentos")
+    parser.add_argument("--escritorio-id", type=int, default=None, help="Apenas um escritório (padrão: todos)")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        inicio = time.perf_counter()
+        linhas = MovimentoService(db).reconstruir_resumo(args.escritorio_id)
+        alvo = f"escritório {args.escritorio_id}" if args.escritorio_id else "todos os escritórios"
+        print(f"✅ Resumo mensal reconstruído ({alvo}): {linhas} linhas em {time.perf_counter() - inicio:.1f}s")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Erro ao reconstruir o resumo: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Configuração comum dos testes
+
+Os testes rodam em SQLite (arquivo temporário por teste), sem PostgreSQL;
+as variáveis obrigatórias das Settings recebem valores de teste antes de
+importar o app.
+"""
+import os
+import tempfile
+from datetime import datetime, timezone
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'arqmanager-testes.db')}")
+os.environ.setdefault("SECRET_KEY", "chave-de-testes")
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registra os modelos no metadata)
+import app.models.cache_versao  # noqa: F401
+from app.database import Base
+
+
+# Colunas de colaborador_escritorio criadas só pelas migrations
+COLUNAS_VINCULO = {
+    "socio": "BOOLEAN",
+    "banco": "VARCHAR(100)",
+    "agencia": "VARCHAR(20)",
+    "tipo_conta": "VARCHAR(20)",
+    "conta": "VARCHAR(30)",
+    "pix_tipo": "VARCHAR(20)",
+    "pix_chave": "VARCHAR(255)",
+}
+
+
+# Tabelas que dependem de recursos do PostgreSQL (auditoria: PK composta com autoincremento)
+TABELAS_SO_POSTGRESQL = {"auditoria"}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'testes.db'}")
+    
+    @event.listens_for(engine, "connect")
+    def _funcoes_postgresql(conexao, registro):
+        # Funções usadas em SQL textual pelos repositórios
+        conexao.create_function("now", 0, lambda: datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f"))
+        conexao.create_function("greatest", -1, lambda *valores: max(valores))
+    
+    Base.metadata.create_all(engine, tables=[
+        tabela for tabela in Base.metadata.sorted_tables if tabela.name not in TABELAS_SO_POSTGRESQL
+    ])
+    with engine.begin() as conexao:
+        for coluna, tipo in COLUNAS_VINCULO.items():
+            conexao.execute(text(f"ALTER TABLE colaborador_escritorio ADD COLUMN {coluna} {tipo}"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    sessao = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield sessao
+    finally:
+        sessao.close()
@@ -0,0 +1,118 @@
+"""
+Writer assíncrono de auditoria: fila cheia, retentativas e encerramento
+"""
+import time
+
+from app.services.auditoria_writer import AuditoriaWriter, POLITICA_AGUARDAR, POLITICA_DESCARTAR
+
+
+class SessaoFalsa:
+    """Sessão que registra os lotes gravados (e falha nas primeiras `falhas` gravações)"""
+    
+    def __init__(self, destino: list, falhas: list):
+        self.destino = destino
+        self.falhas = falhas
+        self.lote = None
+    
+    def execute(self, comando, lote):
+        if self.falhas and self.falhas[0] > 0:
+            self.falhas[0] -= 1
+            raise RuntimeError("banco indisponível")
+        self.lote = list(lote)
+    
+    def commit(self):
+        self.destino.extend(self.lote)
+    
+    def rollback(self):
+        self.lote = None
+    
+    def close(self):
+        pass
+
+
+def criar_writer(gravados: list, falhas: int = 0, **opcoes) -> AuditoriaWriter:
+    contador = [falhas]
+    return AuditoriaWriter(session_factory=lambda: SessaoFalsa(gravados, contador), espera_retentativa=0, **opcoes)
+
+
+def registro(numero: int) -> dict:
+    return {"usuario_id": 1, "acao": "CREATE", "entidade": "Cliente", "entidade_id": numero}
+
+
+def test_fila_cheia_descarta_na_politica_drop():
+    writer = criar_writer([], max_size=2, politica=POLITICA_DESCARTAR)
+    
+    assert writer.enfileirar(registro(1))
+    assert writer.enfileirar(registro(2))
+    assert not writer.enfileirar(registro(3))
+    
+    estatisticas = writer.estatisticas()
+    assert estatisticas["enfileirados"] == 2
+    assert estatisticas["descartados"] == 1
+    assert estatisticas["pendentes"] == 2
+
+
+def test_fila_cheia_aguarda_ate_o_timeout_na_politica_block():
+    writer = criar_writer([], max_size=1, politica=POLITICA_AGUARDAR, block_timeout=0.2)
+    assert writer.enfileirar(registro(1))
+    
+    inicio = time.monotonic()
+    assert not writer.enfileirar(registro(2))
+    assert time.monotonic() - inicio >= 0.2
+    assert writer.estatisticas()["descartados"] == 1
+
+
+def test_fila_cheia_na_politica_block_aceita_quando_a_thread_libera_espaco():
+    gravados = []
+    writer = criar_writer(gravados, max_size=1, batch_size=1, flush_interval=0.01, politica=POLITICA_AGUARDAR, block_timeout=2)
+    writer.iniciar()
+    try:
+        for numero in range(20):
+            assert writer.enfileirar(registro(numero))
+    finally:
+        writer.parar()
+    
+    assert [r["entidade_id"] for r in gravados] == list(range(20))
+    assert writer.estatisticas()["descartados"] == 0
+
+
+def test_encerramento_grava_o_que_esta_na_fila():
+    gravados = []
+    # Intervalo longo: sem o encerramento, nada seria gravado durante o teste
+    writer = criar_writer(gravados, batch_size=3, flush_interval=60)
+    writer.iniciar()
+    for numero in range(10):
+        writer.enfileirar(registro(numero))
+    
+    writer.parar(timeout=5)
+    
+    assert not writer.ativo
+    assert sorted(r["entidade_id"] for r in gravados) == list(range(10))
+    estatisticas = writer.estatisticas()
+    assert estatisticas["gravados"] == 10
+    assert estatisticas["pendentes"] == 0
+
+
+def test_lote_com_falha_e_repetido():
+    gravados = []
+    writer = criar_writer(gravados, falhas=2, retentativas=3)
+    lote = [registro(1), registro(2)]
+    
+    writer._gravar(lote)
+    
+    assert gravados == lote
+    estatisticas = writer.estatisticas()
+    assert estatisticas["retentativas"] == 2
+    assert estatisticas["falhas"] == 0
+
+
+def test_lote_descartado_apos_esgotar_as_tentativas_e_contabilizado():
+    gravados = []
+    writer = criar_writer(gravados, falhas=10, retentativas=2)
+    
+    writer._gravar([registro(1), registro(2)])
+    
+    assert gravados == []
+    estatisticas = writer.estatisticas()
+    assert estatisticas["retentativas"] == 2
+    assert estatisticas["falhas"] == 2
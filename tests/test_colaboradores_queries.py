@@ -0,0 +1,83 @@
+"""
+Listagem de colaboradores: número de consultas independente do tamanho da página
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.models.user import ColaboradorEscritorioPerfil, Escritorio, User, user_escritorio
+from app.services.user import UserService
+
+
+MAXIMO_CONSULTAS = 3
+
+
+@contextmanager
+def contar_consultas(engine):
+    """Conta as instruções enviadas ao banco dentro do bloco"""
+    consultas = []
+    
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+
+def criar_colaboradores(db, quantidade: int) -> int:
+    escritorio = Escritorio(nome_fantasia="Escritório Teste", razao_social="Escritório Teste Ltda", email="escritorio@teste.com")
+    outro = Escritorio(nome_fantasia="Outro", razao_social="Outro Ltda", email="outro@teste.com")
+    db.add_all([escritorio, outro])
+    db.flush()
+    
+    for numero in range(quantidade):
+        colaborador = User(nome=f"Colaborador {numero:04d}", email=f"colaborador{numero}@teste.com", senha="x")
+        db.add(colaborador)
+        db.flush()
+        db.execute(insert(user_escritorio).values(
+            colaborador_id=colaborador.id, escritorio_id=escritorio.id, ativo=True
+        ))
+        db.execute(insert(user_escritorio).values(
+            colaborador_id=colaborador.id, escritorio_id=outro.id, ativo=True
+        ))
+        db.add_all([
+            ColaboradorEscritorioPerfil(colaborador_id=colaborador.id, escritorio_id=escritorio.id, perfil="Produção"),
+            ColaboradorEscritorioPerfil(colaborador_id=colaborador.id, escritorio_id=escritorio.id, perfil="Financeiro"),
+        ])
+    db.commit()
+    return escritorio.id
+
+
+@pytest.mark.parametrize("cursor", [None, ""])
+def test_consultas_constantes_com_o_tamanho_da_pagina(engine, db, cursor):
+    escritorio_id = criar_colaboradores(db, 100)
+    service = UserService(db)
+    
+    contagens = {}
+    for limite in (1, 10, 100):
+        db.expire_all()
+        with contar_consultas(engine) as consultas:
+            colaboradores, _ = service.get_colaboradores_escritorio(
+                escritorio_id=escritorio_id, limit=limite, cursor=cursor
+            )
+        assert len(colaboradores) == limite
+        contagens[limite] = len(consultas)
+    
+    assert contagens[100] <= MAXIMO_CONSULTAS
+    assert len(set(contagens.values())) == 1, contagens
+
+
+def test_pagina_traz_perfis_e_escritorios(db):
+    escritorio_id = criar_colaboradores(db, 3)
+    
+    colaboradores, _ = UserService(db).get_colaboradores_escritorio(escritorio_id=escritorio_id)
+    
+    assert [c.nome for c in colaboradores] == ["Colaborador 0000", "Colaborador 0001", "Colaborador 0002"]
+    for colaborador in colaboradores:
+        assert sorted(p.perfil for p in colaborador.perfis) == ["Financeiro", "Produção"]
+        assert len(colaborador.escritorios) == 2
+        assert colaborador.socio is False
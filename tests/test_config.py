@@ -0,0 +1,24 @@
+"""
+Settings: /metrics não fica exposto sem token fora de desenvolvimento
+"""
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+BASE = {"DATABASE_URL": "sqlite://", "SECRET_KEY": "x"}
+
+
+def test_metricas_desligadas_por_padrao():
+    assert Settings(**BASE, ENVIRONMENT="production").METRICS_ENABLED is False
+
+
+def test_metricas_sem_token_fora_de_desenvolvimento_sao_rejeitadas():
+    with pytest.raises(ValidationError, match="METRICS_TOKEN"):
+        Settings(**BASE, ENVIRONMENT="production", METRICS_ENABLED=True)
+
+
+@pytest.mark.parametrize("ambiente, token", [("development", None), ("production", "token-do-coletor")])
+def test_metricas_habilitadas_com_token_ou_em_desenvolvimento(ambiente, token):
+    assert Settings(**BASE, ENVIRONMENT=ambiente, METRICS_ENABLED=True, METRICS_TOKEN=token).METRICS_ENABLED
@@ -0,0 +1,65 @@
+"""
+DB_PRE_PING: valores aceitos e validação periódica pela ociosidade no pool
+"""
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine, text
+
+from app.core import db_pool
+from app.core.config import Settings
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+    
+    def monotonic(self):
+        return self.agora
+    
+    def perf_counter(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(db_pool, "time", relogio)
+    return relogio
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch, relogio):
+    monkeypatch.setattr(db_pool.settings, "DB_PRE_PING", db_pool.PRE_PING_PERIODIC)
+    monkeypatch.setattr(db_pool.settings, "DB_PRE_PING_INTERVAL_SECONDS", 30)
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", **db_pool.engine_kwargs("teste-pre-ping"))
+    db_pool.get_pool_metricas()["teste-pre-ping"].resetar()
+    db_pool.instrumentar_engine("teste-pre-ping", engine)
+    yield engine
+    engine.dispose()
+
+
+def _usar(engine, segundos: float, relogio: Relogio) -> None:
+    with engine.connect() as conexao:
+        relogio.agora += segundos
+        conexao.execute(text("SELECT 1"))
+
+
+def test_valor_desconhecido_e_rejeitado():
+    with pytest.raises(ValidationError):
+        Settings(DATABASE_URL="sqlite://", SECRET_KEY="x", DB_PRE_PING="sempre")
+
+
+def test_conexao_em_uso_continuo_nao_e_pingada(engine, relogio):
+    # Cada uso dura mais que o intervalo, mas a conexão volta ao pool e sai logo em seguida
+    for _ in range(3):
+        _usar(engine, 60, relogio)
+    
+    assert db_pool.get_pool_metricas()["teste-pre-ping"].resumo()["pings"] == 0
+
+
+def test_conexao_ociosa_no_pool_e_pingada(engine, relogio):
+    _usar(engine, 0, relogio)
+    relogio.agora += 31
+    _usar(engine, 0, relogio)
+    
+    assert db_pool.get_pool_metricas()["teste-pre-ping"].resumo()["pings"] == 1
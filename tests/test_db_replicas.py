@@ -0,0 +1,98 @@
+"""
+Read-your-writes: marca assinada da última escrita levada pelo cliente
+"""
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import database
+from app.core import db_replicas
+from app.core.config import settings
+from app.core.security import create_access_token
+
+
+USUARIO = 7
+
+
+@pytest.fixture(autouse=True)
+def configuracao(monkeypatch):
+    monkeypatch.setattr(settings, "DB_REPLICA_STICKY_SECONDS", 5)
+    # Sem registro local: só a marca do cliente decide
+    db_replicas._escritas.clear()
+
+
+@pytest.fixture
+def replicas(tmp_path, monkeypatch):
+    replicas = db_replicas.ReplicaSet([f"sqlite:///{tmp_path / 'replica.db'}"])
+    monkeypatch.setattr(database, "replicas", replicas)
+    monkeypatch.setattr(db_replicas.RoutingSession, "replicas", replicas)
+    yield replicas
+    for engine in replicas.engines.values():
+        engine.dispose()
+
+
+def _authorization(user_id: int = USUARIO) -> str:
+    return f"Bearer {create_access_token({'sub': str(user_id)})}"
+
+
+def test_marca_valida_mantem_usuario_no_primario():
+    assert db_replicas.escreveu_recentemente(USUARIO, db_replicas.assinar_escrita(USUARIO))
+
+
+@pytest.mark.parametrize("marca", [
+    None,
+    "",
+    "lixo",
+    db_replicas.assinar_escrita(USUARIO + 1),
+    db_replicas.assinar_escrita(USUARIO)[:-1] + "0",
+    db_replicas.assinar_escrita(USUARIO, time.time() - 60),
+])
+def test_marca_ausente_alheia_adulterada_ou_vencida_e_ignorada(marca):
+    assert not db_replicas.escreveu_recentemente(USUARIO, marca)
+
+
+def test_sessao_de_leitura_usa_primario_com_a_marca(replicas):
+    db = database.abrir_sessao_leitura(_authorization(), db_replicas.assinar_escrita(USUARIO))
+    try:
+        assert "replica" not in db.info
+    finally:
+        db.close()
+    
+    db = database.abrir_sessao_leitura(_authorization())
+    try:
+        assert db.info["replica"] == "replica_0"
+    finally:
+        db.close()
+
+
+def test_escrita_devolve_marca_e_leitura_seguinte_fica_no_primario(replicas, monkeypatch):
+    from app.main import registrar_escritas
+    
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", ["sqlite://"])
+    app = FastAPI()
+    app.middleware("http")(registrar_escritas)
+    
+    @app.post("/itens")
+    def criar():
+        return {}
+    
+    @app.get("/itens")
+    def listar(db: Session = Depends(database.get_read_db)):
+        return {"replica": db.info.get("replica")}
+    
+    client = TestClient(app)
+    headers = {"Authorization": _authorization()}
+    
+    resposta = client.post("/itens", headers=headers)
+    marca = resposta.headers[db_replicas.HEADER_ULTIMA_ESCRITA]
+    assert resposta.cookies[db_replicas.COOKIE_ULTIMA_ESCRITA] == marca
+    
+    # Outro worker: nada no registro local, só o que o cliente devolve
+    db_replicas._escritas.clear()
+    assert client.get("/itens", headers=headers).json()["replica"] is None
+    client.cookies.clear()
+    assert client.get("/itens", headers={**headers, db_replicas.HEADER_ULTIMA_ESCRITA: marca}).json()["replica"] is None
+    assert client.get("/itens", headers=headers).json()["replica"] == "replica_0"
@@ -0,0 +1,50 @@
+"""
+Importação de movimentos: valores ajustados a Numeric(15, 2) linha a linha
+"""
+import io
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.movimento import Movimento
+from app.models.movimento_resumo_mensal import MovimentoResumoMensal
+from app.models.user import Escritorio
+from app.services.importacao import FORMATO_CSV, VALOR_MOVIMENTO, ImportacaoService
+
+
+@pytest.mark.parametrize("bruto, esperado", [
+    ("1.234,565", Decimal("1234.57")),
+    ("R$ 10,005", Decimal("10.01")),
+    (0.1, Decimal("0.10")),
+    ("9999999999999,99", Decimal("9999999999999.99")),
+    ("", None),
+])
+def test_valor_e_arredondado_a_duas_casas(bruto, esperado):
+    assert VALOR_MOVIMENTO(bruto) == esperado
+
+
+@pytest.mark.parametrize("bruto", ["10000000000000", "9999999999999,995", "1e40", 1e20, "NaN", "inf"])
+def test_valor_fora_de_numeric_15_2_e_rejeitado(bruto):
+    with pytest.raises(ValueError):
+        VALOR_MOVIMENTO(bruto)
+
+
+def test_linha_fora_do_limite_vira_erro_e_as_demais_entram_arredondadas(db):
+    escritorio = Escritorio(nome_fantasia="Escritório", razao_social="Escritório Ltda", email="e@teste.com")
+    db.add(escritorio)
+    db.commit()
+    arquivo = io.BytesIO(
+        "Data de entrada;Tipo;Descrição;Valor\n"
+        "10/03/2024;Receita;Honorários;10,005\n"
+        "11/03/2024;Receita;Consultoria;20,004\n"
+        "12/03/2024;Receita;Erro de digitação;123456789012345\n".encode("utf-8")
+    )
+    
+    resultado = ImportacaoService(db).importar_movimentos(arquivo, escritorio.id, FORMATO_CSV)
+    
+    assert resultado["importadas"] == 2
+    assert [erro["linha"] for erro in resultado["erros"]] == [4]
+    assert sorted(db.scalars(select(Movimento.valor))) == [Decimal("10.01"), Decimal("20.00")]
+    # O resumo mensal recebe os mesmos valores gravados nos movimentos
+    assert db.scalar(select(func.sum(MovimentoResumoMensal.total))) == Decimal("30.01")
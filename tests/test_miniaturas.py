@@ -0,0 +1,44 @@
+"""
+Miniaturas de foto e logo: resolvidas pelo modelo, sem o schema importar o processamento de imagens
+"""
+import subprocess
+import sys
+from datetime import datetime
+
+from app.models.user import Escritorio, User
+from app.schemas.user import EscritorioResponse, UserResponse
+
+
+VARIANTES = {
+    "64": {"webp": "colaboradores/a_64.webp", "jpg": "colaboradores/a_64.jpg"},
+    "256": {"webp": "colaboradores/a_256.webp", "jpg": "colaboradores/a_256.jpg"},
+}
+
+
+def test_schemas_nao_importam_o_modulo_de_upload():
+    codigo = "import app.schemas.user, sys; print('app.utils.upload' in sys.modules, 'PIL' in sys.modules)"
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True).stdout
+    assert saida.split() == ["False", "False"]
+
+
+def test_user_response_le_a_miniatura_do_modelo():
+    agora = datetime.now()
+    user = User(
+        id=1, nome="Ana", email="ana@teste.com", tipo="Geral", ativo=True, is_system_admin=False, foto="colaboradores/a.jpg",
+        foto_variantes=VARIANTES, created_at=agora, updated_at=agora
+    )
+    
+    assert UserResponse.model_validate(user).foto_miniatura == "colaboradores/a_64.webp"
+    user.foto_variantes = None
+    assert UserResponse.model_validate(user).foto_miniatura == "colaboradores/a.jpg"
+
+
+def test_escritorio_response_le_a_miniatura_do_modelo():
+    agora = datetime.now()
+    escritorio = Escritorio(
+        id=1, nome_fantasia="E", razao_social="E Ltda", email="e@teste.com", ativo=True,
+        logo="escritorios/l.png", logo_variantes={"256": {"webp": "escritorios/l_256.webp"}},
+        created_at=agora, updated_at=agora
+    )
+    
+    assert EscritorioResponse.model_validate(escritorio).logo_miniatura == "escritorios/l_256.webp"
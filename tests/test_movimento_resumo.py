@@ -0,0 +1,117 @@
+"""
+Resumo mensal de movimentos: divisão do período e manutenção incremental
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func
+
+from app.models.movimento import Movimento
+from app.models.movimento_resumo_mensal import MovimentoResumoMensal
+from app.repositories.movimento_repository import MovimentoRepository
+from app.repositories.movimento_resumo_repository import MovimentoResumoRepository, dividir_periodo
+from app.schemas.movimento import MovimentoCreate, MovimentoUpdate
+
+
+@pytest.mark.parametrize("inicio, fim, esperado", [
+    (date(2024, 1, 1), date(2024, 3, 31), ((date(2024, 1, 1), date(2024, 3, 1)), [])),
+    (date(2024, 1, 15), date(2024, 3, 10), (
+        (date(2024, 2, 1), date(2024, 2, 1)),
+        [(date(2024, 1, 15), date(2024, 1, 31)), (date(2024, 3, 1), date(2024, 3, 10))],
+    )),
+    (date(2024, 2, 5), date(2024, 2, 20), (None, [(date(2024, 2, 5), date(2024, 2, 20))])),
+    (None, date(2024, 2, 29), ((None, date(2024, 2, 1)), [])),
+    (date(2024, 3, 15), date(2024, 1, 10), (None, [])),
+    (date(2024, 2, 20), date(2024, 2, 5), (None, [])),
+])
+def test_dividir_periodo(inicio, fim, esperado):
+    assert dividir_periodo(inicio, fim) == esperado
+
+
+def test_total_de_periodo_invertido_e_zero(db):
+    assert MovimentoResumoRepository(db).get_total(1, date(2024, 3, 15), date(2024, 1, 10)) == Decimal(0)
+
+
+def movimento(data_entrada: date, valor: str, tipo: int = 2, codigo=None, ativo: bool = True) -> MovimentoCreate:
+    return MovimentoCreate(
+        tipo=tipo, data_entrada=data_entrada, descricao="Movimento", valor=Decimal(valor),
+        codigo_plano_contas=codigo, ativo=ativo
+    )
+
+
+def resumo(db) -> dict:
+    """Linhas do resumo mensal com movimentos (deltas podem deixar linhas zeradas)"""
+    return {
+        (linha.escritorio_id, linha.mes, linha.tipo, linha.codigo_plano_contas): (linha.quantidade, Decimal(linha.total))
+        for linha in db.query(MovimentoResumoMensal).all()
+        if linha.quantidade or linha.total
+    }
+
+
+def agregado(db) -> dict:
+    """O mesmo resumo calculado com GROUP BY sobre movimentos"""
+    mes = func.strftime("%Y-%m-01", Movimento.data_entrada)
+    codigo = func.coalesce(Movimento.codigo_plano_contas, "")
+    linhas = db.query(
+        Movimento.escritorio_id, mes, Movimento.tipo, codigo, func.count(), func.sum(Movimento.valor)
+    ).filter(Movimento.ativo == True).group_by(Movimento.escritorio_id, mes, Movimento.tipo, codigo).all()
+    return {
+        (escritorio_id, date.fromisoformat(inicio), tipo, plano): (quantidade, Decimal(total))
+        for escritorio_id, inicio, tipo, plano, quantidade, total in linhas
+    }
+
+
+def test_resumo_acompanha_criacao_alteracao_e_exclusao(db):
+    repo = MovimentoRepository(db)
+    receita = repo.create(movimento(date(2024, 1, 10), "100.00", codigo="1.1"), 1)
+    despesa = repo.create(movimento(date(2024, 1, 20), "40.00", tipo=1), 1)
+    repo.create(movimento(date(2024, 2, 5), "70.00"), 2)
+    assert resumo(db) == agregado(db)
+    
+    # Muda mês, tipo e plano de contas: a contribuição sai de uma linha e entra em outra
+    repo.update(receita.id, MovimentoUpdate(data_entrada=date(2024, 3, 1), valor=Decimal("150.00"), codigo_plano_contas=None), 1)
+    repo.update(despesa.id, MovimentoUpdate(tipo=2), 1)
+    assert resumo(db) == agregado(db)
+    
+    assert repo.delete(despesa.id, 1)
+    assert resumo(db) == agregado(db)
+    assert resumo(db) == {
+        (1, date(2024, 3, 1), 2, ""): (1, Decimal("150.00")),
+        (2, date(2024, 2, 1), 2, ""): (1, Decimal("70.00")),
+    }
+
+
+def test_resumo_ignora_movimentos_inativos(db):
+    repo = MovimentoRepository(db)
+    inativo = repo.create(movimento(date(2024, 1, 10), "100.00", ativo=False), 1)
+    repo.create(movimento(date(2024, 1, 11), "30.00"), 1)
+    assert resumo(db) == agregado(db) == {(1, date(2024, 1, 1), 2, ""): (1, Decimal("30.00"))}
+    
+    repo.update(inativo.id, MovimentoUpdate(ativo=True), 1)
+    assert resumo(db) == agregado(db) == {(1, date(2024, 1, 1), 2, ""): (2, Decimal("130.00"))}
+    
+    repo.update(inativo.id, MovimentoUpdate(ativo=False, valor=Decimal("500.00")), 1)
+    assert resumo(db) == agregado(db) == {(1, date(2024, 1, 1), 2, ""): (1, Decimal("30.00"))}
+    
+    # Excluir um movimento inativo não altera o resumo
+    assert repo.delete(inativo.id, 1)
+    assert resumo(db) == agregado(db)
+
+
+def test_resumo_de_insercao_em_lote(db):
+    repo = MovimentoRepository(db)
+    repo.create(movimento(date(2024, 1, 5), "10.00"), 1)
+    
+    repo.create_em_lote([
+        movimento(date(2024, 1, 15), "20.00"),
+        movimento(date(2024, 1, 25), "30.00"),
+        movimento(date(2024, 2, 1), "5.50", tipo=1, codigo="2.1"),
+        movimento(date(2024, 2, 2), "99.00", ativo=False),
+    ], 1)
+    db.commit()
+    
+    assert resumo(db) == agregado(db) == {
+        (1, date(2024, 1, 1), 2, ""): (3, Decimal("60.00")),
+        (1, date(2024, 2, 1), 1, "2.1"): (1, Decimal("5.50")),
+    }
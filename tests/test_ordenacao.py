@@ -0,0 +1,140 @@
+"""
+Reordenação em lote de etapas e tarefas: uma instrução, isolada por escritório
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.models.etapa import Etapa
+from app.models.servico import Servico
+from app.models.tarefa import Tarefa
+from app.repositories.ordenacao import atualizar_ordem
+from app.services.etapa_service import EtapaService
+from app.services.tarefa_service import TarefaService
+
+
+@pytest.fixture
+def hierarquia(db):
+    """Dois escritórios, cada um com um serviço, três etapas e três tarefas na primeira etapa"""
+    dados = {}
+    for escritorio_id in (1, 2):
+        servico = Servico(nome=f"Serviço {escritorio_id}", escritorio_id=escritorio_id)
+        db.add(servico)
+        db.flush()
+        etapas = [
+            Etapa(servico_id=servico.id, nome=f"Etapa {ordem}", ordem=ordem, escritorio_id=escritorio_id)
+            for ordem in range(3)
+        ]
+        db.add_all(etapas)
+        db.flush()
+        tarefas = [
+            Tarefa(etapa_id=etapas[0].id, nome=f"Tarefa {ordem}", ordem=ordem, escritorio_id=escritorio_id)
+            for ordem in range(3)
+        ]
+        db.add_all(tarefas)
+        db.flush()
+        dados[escritorio_id] = (servico.id, [etapa.id for etapa in etapas], [tarefa.id for tarefa in tarefas])
+    db.commit()
+    return dados
+
+
+@pytest.fixture
+def instrucoes(engine):
+    executadas = []
+    event.listen(engine, "before_cursor_execute", lambda conexao, cursor, sql, *args: executadas.append(sql))
+    return executadas
+
+
+def ordens(db, modelo, ids) -> list:
+    db.expire_all()
+    por_id = {registro.id: registro.ordem for registro in db.query(modelo).filter(modelo.id.in_(ids))}
+    return [por_id[registro_id] for registro_id in ids]
+
+
+def test_atualizar_ordem_em_uma_instrucao_so_no_escritorio(db, hierarquia, instrucoes):
+    _, etapas, _ = hierarquia[1]
+    _, outras, _ = hierarquia[2]
+    
+    # IDs de outro escritório na lista não são alterados
+    gravados = atualizar_ordem(db, Etapa.__table__, [etapas[2], outras[0], etapas[0], etapas[1]], 1)
+    db.commit()
+    
+    assert len([sql for sql in instrucoes if sql.lstrip().upper().startswith("UPDATE")]) == 1
+    assert {registro_id: ordem for registro_id, (ordem, _) in gravados.items()} == {etapas[2]: 0, etapas[0]: 2, etapas[1]: 3}
+    assert ordens(db, Etapa, etapas) == [2, 3, 0]
+    assert ordens(db, Etapa, outras) == [0, 1, 2]
+
+
+def test_reordenar_etapas_monta_a_resposta_sem_refresh(db, hierarquia, instrucoes):
+    servico_id, etapas, _ = hierarquia[1]
+    _, outras, _ = hierarquia[2]
+    nova_ordem = [etapas[2], etapas[0], etapas[1]]
+    
+    resposta = EtapaService(db).reordenar_etapas(servico_id, nova_ordem, 1)
+    
+    assert [etapa.id for etapa in resposta] == nova_ordem
+    assert [etapa.ordem for etapa in resposta] == [0, 1, 2]
+    assert len(resposta[1].tarefas) == 3
+    # Uma consulta das etapas antes do UPDATE e nenhuma depois (sem refresh por etapa)
+    consultas = [sql for sql in instrucoes if "etapas" in sql]
+    assert [sql.lstrip().split()[0].upper() for sql in consultas] == ["SELECT", "UPDATE"]
+    assert ordens(db, Etapa, nova_ordem) == [0, 1, 2]
+    assert ordens(db, Etapa, outras) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("trocar", [
+    lambda etapas, outras: [etapas[0], etapas[0], etapas[1]],
+    lambda etapas, outras: [etapas[0], etapas[1], outras[2]],
+    lambda etapas, outras: [etapas[0], etapas[1]],
+])
+def test_reordenar_etapas_rejeita_lista_invalida(db, hierarquia, trocar):
+    servico_id, etapas, _ = hierarquia[1]
+    _, outras, _ = hierarquia[2]
+    
+    with pytest.raises(HTTPException) as erro:
+        EtapaService(db).reordenar_etapas(servico_id, trocar(etapas, outras), 1)
+    
+    assert erro.value.status_code == 400
+    assert ordens(db, Etapa, etapas) == [0, 1, 2]
+    assert ordens(db, Etapa, outras) == [0, 1, 2]
+
+
+def test_reordenar_etapas_de_servico_de_outro_escritorio(db, hierarquia):
+    servico_id, etapas, _ = hierarquia[2]
+    
+    with pytest.raises(HTTPException) as erro:
+        EtapaService(db).reordenar_etapas(servico_id, list(reversed(etapas)), 1)
+    
+    assert erro.value.status_code == 404
+    assert ordens(db, Etapa, etapas) == [0, 1, 2]
+
+
+def test_reordenar_tarefas_monta_a_resposta_sem_refresh(db, hierarquia, instrucoes):
+    servico_id, etapas, tarefas = hierarquia[1]
+    _, _, outras = hierarquia[2]
+    nova_ordem = [tarefas[1], tarefas[2], tarefas[0]]
+    
+    resposta = TarefaService(db).reordenar_tarefas(etapas[0], nova_ordem, 1, servico_id)
+    
+    assert [tarefa.id for tarefa in resposta] == nova_ordem
+    assert [tarefa.ordem for tarefa in resposta] == [0, 1, 2]
+    consultas = [sql for sql in instrucoes if "tarefas" in sql]
+    assert [sql.lstrip().split()[0].upper() for sql in consultas] == ["SELECT", "UPDATE"]
+    assert ordens(db, Tarefa, nova_ordem) == [0, 1, 2]
+    assert ordens(db, Tarefa, outras) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("trocar", [
+    lambda tarefas, outras: [tarefas[2], tarefas[2], tarefas[0]],
+    lambda tarefas, outras: [tarefas[2], tarefas[1], outras[0]],
+])
+def test_reordenar_tarefas_rejeita_lista_invalida(db, hierarquia, trocar):
+    _, etapas, tarefas = hierarquia[1]
+    _, _, outras = hierarquia[2]
+    
+    with pytest.raises(HTTPException) as erro:
+        TarefaService(db).reordenar_tarefas(etapas[0], trocar(tarefas, outras), 1)
+    
+    assert erro.value.status_code == 400
+    assert ordens(db, Tarefa, tarefas) == [0, 1, 2]
+    assert ordens(db, Tarefa, outras) == [0, 1, 2]
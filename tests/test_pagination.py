@@ -0,0 +1,94 @@
+"""
+Paginação por cursor: percorre todas as páginas com empates na chave e rejeita cursores inválidos
+"""
+import base64
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.core.exceptions import BadRequestException
+from app.models.movimento import Movimento
+from app.utils.pagination import decode_cursor, encode_cursor, paginate_by_cursor
+
+
+COLUNAS = [Movimento.data_entrada, Movimento.id]
+
+
+@pytest.fixture
+def movimentos(db):
+    # Várias linhas por data: o id desempata a chave de ordenação
+    datas = [date(2024, 1, 1)] * 4 + [date(2024, 1, 2)] * 3 + [date(2024, 1, 3)] * 4
+    db.add_all([
+        Movimento(escritorio_id=1, tipo=2, data_entrada=data, descricao=f"M{indice}", valor=Decimal("10.00"))
+        for indice, data in enumerate(datas)
+    ])
+    db.commit()
+    return [(movimento.data_entrada, movimento.id) for movimento in db.query(Movimento).all()]
+
+
+def token(valores) -> str:
+    return base64.urlsafe_b64encode(json.dumps(valores).encode()).decode().rstrip("=")
+
+
+def percorrer(db, limit: int, descending: bool) -> list:
+    vistos, cursor, paginas = [], None, 0
+    while True:
+        pagina, cursor = paginate_by_cursor(db.query(Movimento), COLUNAS, cursor, limit, descending)
+        assert len(pagina) <= limit
+        vistos.extend((movimento.data_entrada, movimento.id) for movimento in pagina)
+        paginas += 1
+        if cursor is None:
+            return vistos, paginas
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 3, 4, 11, 20])
+def test_percorre_todas_as_paginas_com_empates(db, movimentos, limit, descending):
+    vistos, paginas = percorrer(db, limit, descending)
+    
+    assert vistos == sorted(movimentos, reverse=descending)
+    assert paginas == max(1, -(-len(movimentos) // limit))
+
+
+def test_cursor_preserva_os_tipos_da_chave():
+    cursor = encode_cursor([date(2024, 1, 2), Decimal("10.50"), 7])
+    
+    assert decode_cursor(cursor, [Movimento.data_entrada, Movimento.valor, Movimento.id]) == [
+        date(2024, 1, 2), Decimal("10.50"), 7
+    ]
+
+
+@pytest.mark.parametrize("cursor, colunas", [
+    ("não é base64", COLUNAS),
+    ("!!!!", COLUNAS),
+    (base64.urlsafe_b64encode(b"\xff\xfe").decode(), COLUNAS),
+    (token({"data_entrada": "2024-01-01", "id": 1}), COLUNAS),
+    (token(["2024-01-01"]), COLUNAS),
+    (token(["2024-01-01", 1, 2]), COLUNAS),
+    (token(["ontem", 1]), COLUNAS),
+    (token(["2024-01-01", "um"]), COLUNAS),
+    (token(["2024-01-01", [1]]), COLUNAS),
+    (token([20240101, 1]), COLUNAS),
+    (token(["dez reais", 1]), [Movimento.valor, Movimento.id]),
+    (token(["2024-01-01", float("inf")]), COLUNAS),
+])
+def test_cursor_invalido_e_erro_400(cursor, colunas):
+    with pytest.raises(BadRequestException) as erro:
+        decode_cursor(cursor, colunas)
+    
+    assert erro.value.status_code == 400
+
+
+def test_cursor_adulterado_nunca_e_erro_interno(db, movimentos):
+    _, cursor = paginate_by_cursor(db.query(Movimento), COLUNAS, None, 2)
+    
+    # Cada troca de caractere gera uma página válida ou 400, nunca outra exceção
+    for posicao in range(len(cursor)):
+        for caractere in "A_-0z=":
+            adulterado = cursor[:posicao] + caractere + cursor[posicao + 1:]
+            try:
+                paginate_by_cursor(db.query(Movimento), COLUNAS, adulterado, 2)
+            except BadRequestException:
+                pass
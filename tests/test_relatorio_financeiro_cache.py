@@ -0,0 +1,66 @@
+"""
+Cache dos relatórios financeiros: versão compartilhada e invalidação pelo serviço
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.cache import InMemoryCache
+from app.models.user import Escritorio
+from app.repositories.cache_versao_repository import CacheVersaoRepository, ESCOPO_RELATORIOS
+from app.schemas.movimento import MovimentoCreate, MovimentoUpdate
+from app.services import relatorio_financeiro_cache as cache
+from app.services.movimento_service import MovimentoService
+
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    cache.set_relatorio_cache_backend(InMemoryCache(max_size=100, ttl_seconds=60))
+
+
+@pytest.fixture
+def escritorio_id(db):
+    escritorio = Escritorio(nome_fantasia="Escritório", razao_social="Escritório Ltda", email="e@teste.com")
+    db.add(escritorio)
+    db.commit()
+    return escritorio.id
+
+
+def versao(db, escritorio_id: int) -> int:
+    return CacheVersaoRepository(db).obter(ESCOPO_RELATORIOS, escritorio_id)
+
+
+def test_invalidacao_em_outro_worker_troca_a_chave(engine, db, escritorio_id):
+    chave = cache.chave_relatorio(db, escritorio_id, date(2024, 1, 1), date(2024, 12, 31))
+    cache.salvar_relatorio(chave, {"receitas": 0})
+    
+    # Outro worker: sessão própria, sem acesso ao cache em memória deste processo
+    with Session(engine) as outro:
+        cache.invalidar_relatorios(outro, escritorio_id)
+    
+    atual = cache.chave_relatorio(db, escritorio_id, date(2024, 1, 1), date(2024, 12, 31))
+    assert atual != chave
+    assert cache.obter_relatorio(atual) is None
+
+
+def test_invalidar_todos_troca_a_versao_de_cada_escritorio(db, escritorio_id):
+    cache.invalidar_relatorios(db)
+    
+    assert versao(db, escritorio_id) == 1
+    assert versao(db, escritorio_id + 1) == 1
+
+
+def test_escritas_do_servico_invalidam_os_relatorios(db, escritorio_id):
+    service = MovimentoService(db)
+    movimento = service.criar_movimento(MovimentoCreate(
+        tipo=2, data_entrada=date(2024, 3, 10), descricao="Honorários", valor=Decimal("100.00")
+    ), escritorio_id)
+    assert versao(db, escritorio_id) == 1
+    
+    service.atualizar_movimento(movimento.id, MovimentoUpdate(valor=Decimal("150.00")), escritorio_id)
+    assert versao(db, escritorio_id) == 2
+    
+    service.deletar_movimento(movimento.id, escritorio_id)
+    assert versao(db, escritorio_id) == 3
@@ -0,0 +1,74 @@
+"""
+Cache da hierarquia: versão compartilhada pelo banco entre workers
+"""
+import json
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.cache import InMemoryCache
+from app.models.servico import Servico
+from app.models.user import Escritorio
+from app.repositories.cache_versao_repository import CacheVersaoRepository, ESCOPO_HIERARQUIA
+from app.services import servico_hierarquia_cache as cache
+from app.services.servico_service import ServicoService
+
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    cache.set_hierarquia_cache_backend(InMemoryCache(max_size=100, ttl_seconds=60))
+
+
+@pytest.fixture
+def escritorio_id(db):
+    escritorio = Escritorio(nome_fantasia="Escritório", razao_social="Escritório Ltda", email="e@teste.com")
+    db.add(escritorio)
+    db.commit()
+    return escritorio.id
+
+
+def nomes(corpo: bytes) -> list:
+    return [servico["nome"] for servico in json.loads(corpo)]
+
+
+def test_invalidar_incrementa_so_o_escritorio(db, escritorio_id):
+    versoes = CacheVersaoRepository(db)
+    assert versoes.obter(ESCOPO_HIERARQUIA, escritorio_id) == 0
+    
+    cache.invalidar_hierarquia(db, escritorio_id)
+    cache.invalidar_hierarquia(db, escritorio_id)
+    
+    assert versoes.obter(ESCOPO_HIERARQUIA, escritorio_id) == 2
+    assert versoes.obter(ESCOPO_HIERARQUIA, escritorio_id + 1) == 0
+
+
+def test_carga_anterior_a_invalidacao_nao_fica_como_atual(db, escritorio_id):
+    versoes = CacheVersaoRepository(db)
+    chave = cache.chave_hierarquia(escritorio_id, None, versoes.obter(ESCOPO_HIERARQUIA, escritorio_id))
+    
+    # Escrita concorrente com a carga: o corpo antigo é salvo depois da invalidação
+    cache.invalidar_hierarquia(db, escritorio_id)
+    cache.salvar_hierarquia(chave, b"[]")
+    
+    atual = cache.chave_hierarquia(escritorio_id, None, versoes.obter(ESCOPO_HIERARQUIA, escritorio_id))
+    assert cache.obter_hierarquia(atual) is None
+
+
+def test_escrita_em_outro_worker_invalida_o_cache_local(engine, db, escritorio_id):
+    db.add(Servico(nome="Projeto", escritorio_id=escritorio_id))
+    db.commit()
+    service = ServicoService(db)
+    etag, corpo = service.obter_hierarquia_serializada(escritorio_id)
+    assert nomes(corpo) == ["Projeto"]
+    assert service.obter_hierarquia_serializada(escritorio_id) == (etag, corpo)
+    
+    # Outro worker: sessão própria, sem acesso ao cache em memória deste processo
+    with Session(engine) as outro:
+        outro.add(Servico(nome="Reforma", escritorio_id=escritorio_id))
+        outro.commit()
+        CacheVersaoRepository(outro).incrementar(ESCOPO_HIERARQUIA, escritorio_id)
+    
+    db.rollback()
+    novo_etag, novo_corpo = service.obter_hierarquia_serializada(escritorio_id)
+    assert nomes(novo_corpo) == ["Projeto", "Reforma"]
+    assert novo_etag != etag
@@ -0,0 +1,58 @@
+"""
+Endpoints de upload de imagem: consultas e commits fora do event loop
+"""
+import io
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import event
+
+from app.api.deps import get_current_user
+from app.api.v1.endpoints import escritorios
+from app.core.config import settings
+from app.database import get_db
+from app.models.upload_blob import UploadBlob
+from app.models.user import ColaboradorEscritorioPerfil, Escritorio
+
+
+def imagem_png() -> bytes:
+    conteudo = io.BytesIO()
+    Image.new("RGB", (300, 200), "blue").save(conteudo, "PNG")
+    return conteudo.getvalue()
+
+
+def test_upload_de_logo_nao_usa_o_banco_no_event_loop(engine, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    escritorio = Escritorio(nome_fantasia="Escritório", razao_social="Escritório Ltda", email="e@teste.com")
+    db.add(escritorio)
+    db.flush()
+    escritorio_id = escritorio.id
+    # Administrador pelo perfil do vínculo: a verificação de permissão consulta o banco
+    db.add(ColaboradorEscritorioPerfil(colaborador_id=1, escritorio_id=escritorio_id, perfil="Administrador"))
+    db.commit()
+    
+    app = FastAPI()
+    app.include_router(escritorios.router, prefix="/escritorios")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "escritorio_id": escritorio_id, "is_system_admin": False}
+    threads_do_loop = []
+    
+    @app.middleware("http")
+    async def registrar_thread_do_loop(request, call_next):
+        threads_do_loop.append(threading.current_thread())
+        return await call_next(request)
+    
+    threads = []
+    event.listen(engine, "before_cursor_execute", lambda *args: threads.append(threading.current_thread()))
+    
+    resposta = TestClient(app).post(
+        f"/escritorios/{escritorio_id}/logo",
+        files={"file": ("logo.png", imagem_png(), "image/png")}
+    )
+    
+    assert resposta.status_code == 200, resposta.text
+    assert resposta.json()["logo"].startswith("blobs/")
+    assert db.query(UploadBlob).one().ref_count == 1
+    assert threads and threads_do_loop[0] not in threads
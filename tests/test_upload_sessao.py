@@ -0,0 +1,123 @@
+"""
+Upload em partes: limite do intervalo informado e finalização em uma transação
+"""
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+from app.models.projeto_documento import ProjetoDocumento
+from app.models.upload_blob import UploadBlob
+from app.models.upload_sessao import UploadSessao
+from app.services import upload_sessao_service
+from app.services.upload_sessao_service import STATUS_ATIVA, STATUS_FINALIZADA, UploadSessaoService
+
+
+CONTEUDO = b"0123456789" * 10
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+def criar_sessao(db, token: str, intervalos=None, sha256=None) -> UploadSessao:
+    """
+    Sessão pendente na transação; o teste mantém a referência para que o mapa
+    de identidade preserve expira_em com fuso (o SQLite não guarda o fuso)
+    """
+    sessao = UploadSessao(
+        token=token, escritorio_id=1, projeto_id=1, usuario_id=1, nome="planta.pdf", extensao=".pdf",
+        tamanho=len(CONTEUDO), sha256=sha256, intervalos=intervalos or [], status=STATUS_ATIVA,
+        expira_em=datetime.now(timezone.utc) + timedelta(hours=1)
+    )
+    db.add(sessao)
+    db.flush()
+    caminho = UploadSessaoService.caminho_parcial(token)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    caminho.write_bytes(b"\0" * len(CONTEUDO))
+    return sessao
+
+
+async def blocos(*partes: bytes):
+    for parte in partes:
+        yield parte
+
+
+def test_parte_maior_que_o_intervalo_e_rejeitada_sem_gravar(db):
+    sessao = criar_sessao(db, "sessao-1")
+    service = UploadSessaoService(db)
+    
+    with pytest.raises(BadRequestException):
+        asyncio.run(service.receber_parte("sessao-1", 1, 0, 10, blocos(b"A" * 8, b"B" * 8)))
+    
+    assert UploadSessaoService.caminho_parcial(sessao.token).read_bytes() == b"\0" * len(CONTEUDO)
+
+
+def test_finalizar_faz_um_unico_commit(engine, db):
+    sha256 = hashlib.sha256(CONTEUDO).hexdigest()
+    sessao = criar_sessao(db, "sessao-2", intervalos=[[0, len(CONTEUDO)]], sha256=sha256)
+    UploadSessaoService.caminho_parcial("sessao-2").write_bytes(CONTEUDO)
+    commits = []
+    # COMMIT real na conexão (savepoints não contam): o lock da sessão vale até o fim
+    event.listen(engine, "commit", lambda conexao: commits.append(conexao))
+    
+    documento = asyncio.run(UploadSessaoService(db).finalizar("sessao-2", 1))
+    
+    assert len(commits) == 1
+    assert documento.arquivo.startswith("blobs/")
+    blob = db.query(UploadBlob).filter(UploadBlob.caminho == documento.arquivo).one()
+    assert blob.ref_count == 1
+    assert sessao.status == STATUS_FINALIZADA
+    assert db.query(ProjetoDocumento).count() == 1
+
+
+def test_finalizar_calcula_o_hash_antes_do_lock_e_fora_do_loop(db, monkeypatch):
+    sha256 = hashlib.sha256(CONTEUDO).hexdigest()
+    sessao = criar_sessao(db, "sessao-3", intervalos=[[0, len(CONTEUDO)]], sha256=sha256)
+    UploadSessaoService.caminho_parcial("sessao-3").write_bytes(CONTEUDO)
+    service = UploadSessaoService(db)
+    eventos = []
+    obter_original = service.obter_sessao
+    
+    def obter_sessao(token, escritorio_id, bloquear=False):
+        eventos.append(("lock" if bloquear else "leitura", threading.get_ident()))
+        return obter_original(token, escritorio_id, bloquear)
+    
+    def calcular(caminho):
+        eventos.append(("hash", threading.get_ident()))
+        return hashlib.sha256(caminho.read_bytes()).hexdigest()
+    
+    monkeypatch.setattr(service, "obter_sessao", obter_sessao)
+    monkeypatch.setattr(upload_sessao_service, "_calcular_sha256", calcular)
+    
+    asyncio.run(service.finalizar("sessao-3", 1))
+    
+    assert [nome for nome, _ in eventos] == ["leitura", "hash", "lock"]
+    assert all(thread != threading.get_ident() for _, thread in eventos)
+    assert sessao.status == STATUS_FINALIZADA
+
+
+def test_receber_parte_consulta_o_banco_fora_do_loop(db, monkeypatch):
+    sessao = criar_sessao(db, "sessao-4")
+    service = UploadSessaoService(db)
+    threads = []
+    obter_original = service.obter_sessao
+    
+    def obter_sessao(token, escritorio_id, bloquear=False):
+        threads.append(threading.get_ident())
+        return obter_original(token, escritorio_id, bloquear)
+    
+    monkeypatch.setattr(service, "obter_sessao", obter_sessao)
+    
+    asyncio.run(service.receber_parte("sessao-4", 1, 0, 10, blocos(b"A" * 10)))
+    
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+    assert sessao.intervalos == [[0, 10]]
@@ -0,0 +1,104 @@
+"""
+Store de uploads: consultas e commits fora do event loop
+"""
+import asyncio
+import io
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from PIL import Image
+from sqlalchemy import event, text
+from starlette.datastructures import Headers, UploadFile
+
+from app.core.config import settings
+from app.models.upload_blob import UploadBlob
+from app.services import upload_store
+from app.services.upload_store import UploadStore, caminho_blob
+from app.utils.upload import delete_upload_file
+
+
+def imagem_png() -> bytes:
+    conteudo = io.BytesIO()
+    Image.new("RGB", (300, 200), "red").save(conteudo, "PNG")
+    return conteudo.getvalue()
+
+
+def test_salvar_imagem_nao_usa_o_banco_no_event_loop(engine, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    threads = []
+    event.listen(engine, "before_cursor_execute", lambda *args: threads.append(threading.current_thread()))
+    conteudo = imagem_png()
+    
+    async def enviar_duas_vezes():
+        resultados = []
+        for _ in range(2):
+            arquivo = UploadFile(io.BytesIO(conteudo), filename="a.png", headers=Headers({"content-type": "image/png"}))
+            resultados.append(await UploadStore(db).salvar_imagem(arquivo))
+        return resultados, threading.current_thread()
+    
+    (primeiro, segundo), thread_do_loop = asyncio.run(enviar_duas_vezes())
+    
+    assert primeiro == segundo
+    assert primeiro[0].startswith("blobs/")
+    assert (tmp_path / primeiro[0]).exists()
+    assert threads and thread_do_loop not in threads
+
+
+def criar_blob(db, hash_conteudo: str, atualizado_em=None) -> UploadBlob:
+    blob = UploadBlob(
+        hash=hash_conteudo, caminho=caminho_blob(hash_conteudo, "bin"), tamanho=3, ref_count=0,
+        updated_at=atualizado_em or datetime.now(timezone.utc)
+    )
+    db.add(blob)
+    db.commit()
+    arquivo = Path(settings.UPLOAD_DIR) / blob.caminho
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    arquivo.write_bytes(b"abc")
+    return blob
+
+
+def test_coleta_de_lixo_faz_commit_antes_de_apagar_os_arquivos(engine, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    blob = criar_blob(db, "a" * 64, datetime.now(timezone.utc) - timedelta(days=1))
+    caminho = blob.caminho
+    linhas_ao_apagar = []
+    
+    def apagar(arquivo, variantes=None):
+        # Conexão separada: só enxerga o que já foi confirmado
+        with engine.connect() as conexao:
+            linhas_ao_apagar.append(conexao.execute(text("SELECT count(*) FROM upload_blobs")).scalar())
+        return delete_upload_file(arquivo, variantes)
+    
+    monkeypatch.setattr(upload_store, "delete_upload_file", apagar)
+    
+    assert UploadStore(db).coletar_lixo(carencia_minutos=60) == 1
+    assert linhas_ao_apagar == [0]
+    assert not (tmp_path / caminho).exists()
+
+
+def test_reaproveitamento_de_blob_coletado_grava_de_novo(engine, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    hash_conteudo = "b" * 64
+    criar_blob(db, hash_conteudo)
+    store = UploadStore(db)
+    buscar = store._buscar_por_hash
+    
+    def buscar_e_coletar(hash_procurado):
+        encontrado = buscar(hash_procurado)
+        # Coleta de lixo concorrente remove a linha e o arquivo depois da busca
+        with engine.begin() as conexao:
+            conexao.execute(text("DELETE FROM upload_blobs WHERE id = :id"), {"id": encontrado.id})
+        (tmp_path / encontrado.caminho).unlink()
+        return encontrado
+    
+    monkeypatch.setattr(store, "_buscar_por_hash", buscar_e_coletar)
+    origem = tmp_path / "upload.part"
+    origem.write_bytes(b"abc")
+    
+    caminho = store.importar_arquivo(origem, hash_conteudo, ".bin")
+    
+    assert (tmp_path / caminho).read_bytes() == b"abc"
+    novo = db.query(UploadBlob).filter(UploadBlob.hash == hash_conteudo).one()
+    assert not origem.exists()
+    assert novo.caminho == caminho
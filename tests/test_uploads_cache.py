@@ -0,0 +1,56 @@
+"""
+/uploads: Cache-Control imutável só para os blobs endereçados por hash
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import uploads
+from app.core.config import settings
+from app.services.upload_store import caminho_blob
+
+
+HASH = "ab" + "cd" + "0" * 60
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "UPLOAD_SERVE_MODE", uploads.MODO_APP)
+    for caminho in (caminho_blob(HASH), caminho_blob(HASH, "webp", "_64"), "colaboradores/3f2a.jpg", "documentos/planta.pdf"):
+        arquivo = tmp_path / caminho
+        arquivo.parent.mkdir(parents=True, exist_ok=True)
+        arquivo.write_bytes(b"conteudo")
+    app = FastAPI()
+    app.include_router(uploads.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("caminho", [caminho_blob(HASH), caminho_blob(HASH, "webp", "_64")])
+def test_blob_e_imutavel_com_etag_do_hash(client, caminho):
+    resposta = client.get(f"/uploads/{caminho}")
+    
+    assert resposta.status_code == 200
+    assert "immutable" in resposta.headers["cache-control"]
+    assert resposta.headers["etag"].strip('"').startswith(HASH)
+
+
+@pytest.mark.parametrize("caminho", ["colaboradores/3f2a.jpg", "documentos/planta.pdf"])
+def test_arquivo_fora_do_store_e_revalidado(client, caminho):
+    resposta = client.get(f"/uploads/{caminho}")
+    
+    assert resposta.status_code == 200
+    assert "immutable" not in resposta.headers["cache-control"]
+    assert "no-cache" in resposta.headers["cache-control"]
+    
+    revalidacao = client.get(f"/uploads/{caminho}", headers={"If-None-Match": resposta.headers["etag"]})
+    assert revalidacao.status_code == 304
+
+
+def test_caminho_em_blobs_fora_do_formato_nao_e_imutavel(client, tmp_path):
+    arquivo = tmp_path / "blobs" / "manual.pdf"
+    arquivo.write_bytes(b"x")
+    
+    resposta = client.get("/uploads/blobs/manual.pdf")
+    
+    assert "immutable" not in resposta.headers["cache-control"]